@@ -0,0 +1,115 @@
+"""
+碰撞检测基准：对比逐对遍历（旧实现）、空间哈希分层检测与“子弹池 + 空间哈希”的单帧耗时。
+
+运行：
+    python benchmarks/bench_collision.py [--bullets 1200] [--enemies 200] [--frames 60]
+
+场景为静止快照：随机散布的敌人与子弹（约 90% 玩家子弹、10% 敌人子弹），
+每帧对同一批对象执行一次完整的碰撞检测（不修改血量），只统计检测本身的耗时。
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pycache_init  # must import first to set sys.pycache_prefix
+import pygame
+
+from config.settings import WIDTH, HEIGHT
+from entities.bullet import Bullet
+from entities.enemy import Enemy
+from entities.player import Player
+from entities.projectile_pool import ProjectilePool
+from game.collision import CollisionWorld
+
+
+def build_scene(n_bullets, n_enemies, seed=1234):
+    rng = random.Random(seed)
+    player = Player(WIDTH // 2, HEIGHT // 2)
+    enemies = [Enemy(rng.randint(0, WIDTH - 36), rng.randint(0, HEIGHT - 36)) for _ in range(n_enemies)]
+    bullets = []
+    for i in range(n_bullets):
+        owner = 'enemy' if i % 10 == 0 else 'player'
+        pos = (rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT))
+        bullets.append(Bullet(pos, (1, 0), 0, owner))
+    return player, enemies, bullets
+
+
+def naive_collisions(player, enemies, bullets):
+    """旧实现：每颗玩家子弹遍历全部敌人。"""
+    hits = 0
+    for b in bullets:
+        if b.owner == 'player':
+            for e in enemies:
+                if e.alive and b.rect.colliderect(e.rect):
+                    hits += 1
+                    break
+        elif b.rect.colliderect(player.rect):
+            hits += 1
+    return hits
+
+
+def hashed_collisions(world, player, enemies, bullets):
+    """新实现：每帧重建空间哈希，子弹只检测目标层中附近的候选。"""
+    world.rebuild(player, enemies)
+    hits = 0
+    for b in bullets:
+        if world.first_hit(b) is not None:
+            hits += 1
+    return hits
+
+
+def pooled_collisions(world, player, enemies, pool):
+    """子弹保存在结构化数组池中：敌方子弹向量化判定，玩家子弹复用探测矩形查询空间哈希。"""
+    world.rebuild(player, enemies)
+    hits = 0
+    for _ in world.pool_hits(pool):
+        hits += 1
+    return hits
+
+
+def time_frames(fn, frames):
+    samples = []
+    result = None
+    for _ in range(frames):
+        t0 = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    samples.sort()
+    return samples[len(samples) // 2], sum(samples) / len(samples), result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--bullets', type=int, default=1200)
+    parser.add_argument('--enemies', type=int, default=200)
+    parser.add_argument('--frames', type=int, default=60)
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    player, enemies, bullets = build_scene(args.bullets, args.enemies)
+    world = CollisionWorld()
+
+    naive_med, naive_avg, naive_hits = time_frames(lambda: naive_collisions(player, enemies, bullets), args.frames)
+    hash_med, hash_avg, hash_hits = time_frames(lambda: hashed_collisions(world, player, enemies, bullets), args.frames)
+    pool = ProjectilePool()
+    pool.extend(bullets)
+    pool_med, pool_avg, pool_hits = time_frames(lambda: pooled_collisions(world, player, enemies, pool), args.frames)
+    pygame.quit()
+
+    print(f'bullets={args.bullets} enemies={args.enemies} frames={args.frames}')
+    print(f'naive : median {naive_med:7.3f} ms  mean {naive_avg:7.3f} ms  hits={naive_hits}')
+    print(f'hashed: median {hash_med:7.3f} ms  mean {hash_avg:7.3f} ms  hits={hash_hits}')
+    print(f'pooled: median {pool_med:7.3f} ms  mean {pool_avg:7.3f} ms  hits={pool_hits}')
+    if hash_med > 0 and pool_med > 0:
+        print(f'speedup hashed x{naive_med / hash_med:.1f}, pooled x{naive_med / pool_med:.1f}')
+    return 0 if naive_hits == hash_hits == pool_hits else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
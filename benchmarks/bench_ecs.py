@@ -0,0 +1,110 @@
+"""
+ECS 系统基准：逐对象绘制/空间哈希碰撞 vs 原型表上的渲染系统/碰撞系统。
+
+运行：
+    python benchmarks/bench_ecs.py [--counts 400 1600 4000] [--bullets 1000] [--repeat 20]
+
+每个规模在 960x640 范围内随机放置敌人（朝向随机、部分受伤），用 SDL dummy 驱动离屏绘制；
+碰撞在同一批敌人上放 `--bullets` 颗玩家子弹（四分之一为连续碰撞），比较两种做法处理全部命中的中位耗时。
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pycache_init  # must import first to set sys.pycache_prefix
+import pygame
+
+from config.settings import WIDTH, HEIGHT, SIM_TICK_MS
+from entities.enemy import Enemy
+from entities.enemy_batch import EnemyBatch
+from entities.projectile_pool import ProjectilePool
+from entities.systems import RenderSystem, collision_system
+from game.collision import CollisionWorld
+
+
+def make_enemies(count, seed):
+    rng = random.Random(seed)
+    out = []
+    for _ in range(count):
+        e = Enemy(rng.randint(0, WIDTH - 36), rng.randint(0, HEIGHT - 36),
+                  archetype=rng.choice(['grunt', 'shotgunner', 'sniper']))
+        ang = rng.random() * math.tau
+        e.dir = (math.cos(ang), math.sin(ang))
+        e.angle = math.degrees(ang)
+        e.hp = rng.randint(1, e.max_hp)
+        out.append(e)
+    return out
+
+
+def make_pool(count, seed):
+    rng = random.Random(seed)
+    pool = ProjectilePool()
+    for _ in range(count):
+        swept = rng.random() < 0.25
+        pool.spawn((rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT)), (rng.uniform(-1, 1), rng.uniform(-1, 1)),
+                   40 if swept else 6, 'player', swept=swept)
+    pool.update(SIM_TICK_MS)
+    return pool
+
+
+def median_ms(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--counts', type=int, nargs='+', default=[400, 1600, 4000])
+    parser.add_argument('--bullets', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    surf = pygame.Surface((WIDTH, HEIGHT))
+    print(f'{"enemies":>8}{"draw obj ms":>13}{"draw sys ms":>13}{"hits obj ms":>13}{"hits sys ms":>13}')
+    for n in args.counts:
+        enemies = make_enemies(n, seed=n)
+        batch = EnemyBatch(enemies, min_size=0)
+        batch.animating = False
+        renderer = RenderSystem()
+        renderer.draw(surf, batch.table)
+
+        def draw_objects():
+            for e in enemies:
+                if e.alive:
+                    e.draw(surf)
+
+        pool = make_pool(args.bullets, seed=n)
+        world = CollisionWorld()
+
+        def hits_objects():
+            world.rebuild(None, enemies)
+            return sum(1 for _ in world.pool_hits(pool))
+
+        def hits_system():
+            return sum(1 for _ in collision_system(batch.table, pool, None))
+
+        assert hits_objects() == hits_system()
+        draw_obj = median_ms(draw_objects, args.repeat)
+        draw_sys = median_ms(lambda: renderer.draw(surf, batch.table), args.repeat)
+        hit_obj = median_ms(hits_objects, args.repeat)
+        hit_sys = median_ms(hits_system, args.repeat)
+        print(f'{n:>8}{draw_obj:>13.3f}{draw_sys:>13.3f}{hit_obj:>13.3f}{hit_sys:>13.3f}')
+    pygame.quit()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
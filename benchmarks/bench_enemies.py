@@ -0,0 +1,103 @@
+"""
+敌人推进基准：对比逐对象 `Enemy.update` + `Enemy.try_shoot`（旧实现）、`EnemyBatch.step`
+与启用 AI LOD 调度的 `EnemyBatch.step` 的单帧耗时。
+
+运行：
+    python benchmarks/bench_enemies.py [--enemies 200] [--frames 300]
+
+敌人随机分布、三分之二巡逻，玩家沿椭圆移动；两种实现使用相同的初始状态，
+开火生成的子弹写入各自的子弹池（每帧推进池子以免无限增长）。
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pycache_init  # must import first to set sys.pycache_prefix
+import pygame
+
+from config.settings import WIDTH, HEIGHT, SIM_TICK_MS
+from entities.enemy import Enemy
+from entities.enemy_batch import EnemyBatch
+from entities.projectile_pool import ProjectilePool
+
+
+def make_enemies(count):
+    rng = random.Random(7)
+    random.seed(7)
+    kinds = ('grunt', 'shotgunner', 'sniper')
+    return [Enemy(rng.randint(20, WIDTH - 20), rng.randint(20, HEIGHT - 20),
+                  patrol_radius=rng.choice([0, 40, 80]), archetype=kinds[i % 3]) for i in range(count)]
+
+
+def player_pos(t):
+    return (int(WIDTH / 2 + math.cos(t * 0.01) * 300), int(HEIGHT / 2 + math.sin(t * 0.013) * 200))
+
+
+def run_objects(count, frames):
+    enemies = make_enemies(count)
+    pool = ProjectilePool()
+    samples = []
+    now = 0.0
+    for t in range(frames):
+        now += SIM_TICK_MS
+        target = player_pos(t)
+        t0 = time.perf_counter()
+        for e in enemies:
+            if e.alive:
+                e.update(SIM_TICK_MS, now)
+                e.try_shoot(target, now, pool=pool)
+        samples.append((time.perf_counter() - t0) * 1000.0)
+        pool.update(SIM_TICK_MS)
+    return samples
+
+
+def run_batch(count, frames, lod=False):
+    batch = EnemyBatch(make_enemies(count), min_size=0, lod=lod)
+    pool = ProjectilePool()
+    samples = []
+    now = 0.0
+    for t in range(frames):
+        now += SIM_TICK_MS
+        target = player_pos(t)
+        t0 = time.perf_counter()
+        batch.step(SIM_TICK_MS, now, target, pool)
+        samples.append((time.perf_counter() - t0) * 1000.0)
+        pool.update(SIM_TICK_MS)
+    return samples
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return ordered[len(ordered) // 2], sum(ordered) / len(ordered)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--enemies', type=int, default=200)
+    parser.add_argument('--frames', type=int, default=300)
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    obj_med, obj_avg = summarize(run_objects(args.enemies, args.frames))
+    batch_med, batch_avg = summarize(run_batch(args.enemies, args.frames))
+    lod_med, lod_avg = summarize(run_batch(args.enemies, args.frames, lod=True))
+    pygame.quit()
+
+    print(f'enemies={args.enemies} frames={args.frames}')
+    print(f'objects: median {obj_med:7.3f} ms  mean {obj_avg:7.3f} ms')
+    print(f'batch:   median {batch_med:7.3f} ms  mean {batch_avg:7.3f} ms')
+    print(f'lod:     median {lod_med:7.3f} ms  mean {lod_avg:7.3f} ms')
+    if batch_med > 0 and lod_med > 0:
+        print(f'speedup x{obj_med / batch_med:.1f} (batch)  x{obj_med / lod_med:.1f} (lod)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
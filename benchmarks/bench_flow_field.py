@@ -0,0 +1,101 @@
+"""
+寻路基准：对比每个追击者各自做一次 A*（8 邻接、八方向距离启发）与一次共享流场重算 + 每个追击者查表。
+
+运行：
+    python benchmarks/bench_flow_field.py [--map 2] [--chasers 8 32 128 512] [--repeat 20]
+
+在给定地图的障碍物布局上随机放置追击者（只取可通行格），目标为玩家出生点附近。
+A* 与流场使用同一张 `NavGrid` 邻接表；报告“玩家换格一次”时全部追击者取到下一路点的中位耗时。
+"""
+
+import argparse
+import heapq
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pycache_init  # must import first to set sys.pycache_prefix
+
+from config.settings import MAP_OBSTACLE_LAYOUTS
+from maps.navigation import NavGrid, FlowField
+
+
+def astar_next(grid, start, goal):
+    """单个追击者的 A*：返回从 start 出发的第一步格子（不可达为 -1）。"""
+    cols = grid.cols
+    gr, gc = divmod(goal, cols)
+
+    def h(idx):
+        r, c = divmod(idx, cols)
+        dr, dc = abs(r - gr), abs(c - gc)
+        return max(dr, dc) + (math.sqrt(2) - 1) * min(dr, dc)
+
+    best = {start: 0.0}
+    came = {}
+    heap = [(h(start), 0.0, start)]
+    while heap:
+        _, g, u = heapq.heappop(heap)
+        if u == goal:
+            while came.get(u, start) != start:
+                u = came[u]
+            return u
+        if g > best[u]:
+            continue
+        for v, cost in grid.neighbors[u]:
+            ng = g + cost
+            if ng < best.get(v, math.inf):
+                best[v] = ng
+                came[v] = u
+                heapq.heappush(heap, (ng + h(v), ng, v))
+    return -1
+
+
+def median_ms(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--map', type=int, default=2)
+    parser.add_argument('--chasers', type=int, nargs='+', default=[8, 32, 128, 512])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    grid = NavGrid(MAP_OBSTACLE_LAYOUTS[min(args.map, len(MAP_OBSTACLE_LAYOUTS) - 1)])
+    free = [i for i, b in enumerate(grid.blocked) if not b]
+    target = (80, 80)
+    goal = grid.cell_of(target)
+    rng = random.Random(7)
+
+    print(f'map={args.map} grid={grid.cols}x{grid.rows} free={len(free)}')
+    print(f'{"chasers":>8}{"A* ms":>12}{"flow ms":>12}{"speedup":>9}')
+    for n in args.chasers:
+        starts = [rng.choice(free) for _ in range(n)]
+        positions = [grid.center_of(i) for i in starts]
+
+        def per_agent():
+            return [astar_next(grid, s, goal) for s in starts]
+
+        def shared():
+            flow = FlowField(grid)
+            flow.retarget(target)
+            return [flow.steer(p) for p in positions]
+
+        astar_ms = median_ms(per_agent, args.repeat)
+        flow_ms = median_ms(shared, args.repeat)
+        print(f'{n:>8}{astar_ms:>12.3f}{flow_ms:>12.3f}{astar_ms / flow_ms:>8.1f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""
+几何内核微基准：对比逐点调用 `vec_from_points` / `distance` / `aim_info` 与数组版本
+`vecs_from_points` / `distances` / `aim_infos` 的耗时。
+
+运行：
+    python benchmarks/bench_geometry.py [--sizes 8 64 512 4096] [--repeat 200]
+
+每种规模先构造同一批随机点对（约 5% 重合，覆盖零距离回退），
+标量版本逐点循环并收集结果，数组版本一次调用；报告每次调用的中位耗时。
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pycache_init  # must import first to set sys.pycache_prefix
+import numpy as np
+
+from utils import vec_from_points, distance, aim_info, vecs_from_points, distances, aim_infos
+
+
+def make_points(n, seed=7):
+    rng = random.Random(seed)
+    a = [(rng.uniform(0, 800), rng.uniform(0, 600)) for _ in range(n)]
+    b = [p if rng.random() < 0.05 else (rng.uniform(0, 800), rng.uniform(0, 600)) for p in a]
+    return a, b
+
+
+def median_ms(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def bench_size(n, repeat):
+    a, b = make_points(n)
+    ax, ay = np.array(a).T.copy()
+    bx, by = np.array(b).T.copy()
+    kernels = (
+        ('vec_from_points', lambda: [vec_from_points(p, q) for p, q in zip(a, b)],
+         lambda: vecs_from_points(ax, ay, bx, by)),
+        ('distance', lambda: [distance(p, q) for p, q in zip(a, b)],
+         lambda: distances(ax, ay, bx, by)),
+        ('aim_info', lambda: [aim_info(p, q) for p, q in zip(a, b)],
+         lambda: aim_infos(ax, ay, bx, by)),
+    )
+    rows = []
+    for name, scalar, batched in kernels:
+        rows.append((name, median_ms(scalar, repeat), median_ms(batched, repeat)))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[8, 64, 512, 4096])
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args(argv)
+
+    print(f'{"kernel":<16}{"n":>6}{"scalar ms":>12}{"batched ms":>12}{"speedup":>9}')
+    for n in args.sizes:
+        for name, scalar_ms, batched_ms in bench_size(n, args.repeat):
+            speedup = scalar_ms / batched_ms if batched_ms > 0 else float('inf')
+            print(f'{name:<16}{n:>6}{scalar_ms:>12.4f}{batched_ms:>12.4f}{speedup:>8.1f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+子弹推进基准：对比逐对象 `Bullet.update` + 列表重建（旧实现）与 `ProjectilePool.update` 的单帧耗时。
+
+运行：
+    python benchmarks/bench_projectiles.py [--bullets 2000] [--frames 120]
+
+子弹从屏幕中央随机方向射出，射程足够长，测量期间大多数子弹保持存活；
+每当数量跌破一半时补充到目标数量，两种实现使用相同的随机序列。
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pycache_init  # must import first to set sys.pycache_prefix
+import pygame
+
+from config.settings import WIDTH, HEIGHT
+from entities.bullet import Bullet
+from entities.projectile_pool import ProjectilePool
+
+
+def make_bullets(rng, count):
+    bullets = []
+    for _ in range(count):
+        ang = rng.uniform(0, math.tau)
+        pos = (rng.uniform(100, WIDTH - 100), rng.uniform(100, HEIGHT - 100))
+        bullets.append(Bullet(pos, (math.cos(ang), math.sin(ang)), rng.uniform(1, 3), 'player', max_range=2000))
+    return bullets
+
+
+def run_list(count, frames):
+    rng = random.Random(7)
+    bullets = make_bullets(rng, count)
+    samples = []
+    for _ in range(frames):
+        t0 = time.perf_counter()
+        for b in bullets:
+            b.update(16)
+        bullets = [b for b in bullets if b.alive]
+        samples.append((time.perf_counter() - t0) * 1000.0)
+        if len(bullets) < count // 2:
+            bullets.extend(make_bullets(rng, count - len(bullets)))
+    return samples
+
+
+def run_pool(count, frames):
+    rng = random.Random(7)
+    pool = ProjectilePool()
+    pool.extend(make_bullets(rng, count))
+    samples = []
+    for _ in range(frames):
+        t0 = time.perf_counter()
+        pool.update(16)
+        samples.append((time.perf_counter() - t0) * 1000.0)
+        if len(pool) < count // 2:
+            pool.extend(make_bullets(rng, count - len(pool)))
+    return samples
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return ordered[len(ordered) // 2], sum(ordered) / len(ordered)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--bullets', type=int, default=2000)
+    parser.add_argument('--frames', type=int, default=120)
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    list_med, list_avg = summarize(run_list(args.bullets, args.frames))
+    pool_med, pool_avg = summarize(run_pool(args.bullets, args.frames))
+    pygame.quit()
+
+    print(f'bullets={args.bullets} frames={args.frames}')
+    print(f'list: median {list_med:7.3f} ms  mean {list_avg:7.3f} ms')
+    print(f'pool: median {pool_med:7.3f} ms  mean {pool_avg:7.3f} ms')
+    if pool_med > 0:
+        print(f'speedup x{list_med / pool_med:.1f}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
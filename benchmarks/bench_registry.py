@@ -0,0 +1,87 @@
+"""
+实体注册表基准：保留全部死者的敌人列表 vs 注册表压缩后的迭代列表。
+
+运行：
+    python benchmarks/bench_registry.py [--spawned 1000 5000 20000] [--alive 0.05] [--ticks 300]
+
+模拟一张刷过 `--spawned` 个敌人、只剩 `--alive` 比例存活的地图，比较每个逻辑步的例行扫描：
+逐个检查 `alive` 的清场判断、存活计数与两次“只处理存活者”的遍历（推进与绘制），
+对比注册表的计数/清场事件与压缩后的列表。
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pycache_init  # must import first to set sys.pycache_prefix
+import pygame
+
+from config.settings import WIDTH, HEIGHT
+from entities.enemy import Enemy
+from entities.registry import EntityRegistry
+
+
+def make_enemies(count, alive, seed):
+    rng = random.Random(seed)
+    enemies = [Enemy(rng.randint(0, WIDTH - 36), rng.randint(0, HEIGHT - 36)) for _ in range(count)]
+    for e in enemies:
+        if rng.random() >= alive:
+            e.alive = False
+    return enemies
+
+
+def scan_list(enemies):
+    cleared = all(not e.alive for e in enemies)
+    live = sum(1 for e in enemies if e.alive)
+    for _ in range(2):
+        for e in enemies:
+            if e.alive:
+                pass
+    return cleared, live
+
+
+def scan_registry(registry):
+    registry.compact()
+    cleared = registry.live == 0
+    live = registry.live
+    for _ in range(2):
+        for e in registry.entities:
+            if e.alive:
+                pass
+    return cleared, live
+
+
+def per_tick_ms(fn, arg, ticks):
+    t0 = time.perf_counter()
+    for _ in range(ticks):
+        result = fn(arg)
+    return (time.perf_counter() - t0) * 1000.0 / ticks, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--spawned', type=int, nargs='+', default=[1000, 5000, 20000])
+    parser.add_argument('--alive', type=float, default=0.05)
+    parser.add_argument('--ticks', type=int, default=300)
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    print(f'{"spawned":>8}{"alive":>7}{"list ms/tick":>14}{"registry ms/tick":>18}')
+    for n in args.spawned:
+        enemies = make_enemies(n, args.alive, seed=n)
+        list_ms, expected = per_tick_ms(scan_list, enemies, args.ticks)
+        registry = EntityRegistry(make_enemies(n, args.alive, seed=n))
+        reg_ms, got = per_tick_ms(scan_registry, registry, args.ticks)
+        assert got == expected
+        print(f'{n:>8}{got[1]:>7}{list_ms:>14.3f}{reg_ms:>18.3f}')
+    pygame.quit()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
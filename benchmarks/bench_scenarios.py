@@ -0,0 +1,431 @@
+"""
+场景基准套件：在 SDL dummy 驱动下无窗口运行命名场景，统计每帧及各阶段耗时的 p50/p95/p99 与内存分配，
+并输出 JSON 结果，便于跨提交对比。
+
+运行：
+    python benchmarks/bench_scenarios.py [--frames 600] [--only bullets_vs_grunts] [--out results.json]
+    python benchmarks/bench_scenarios.py --out new.json --compare old.json [--fail-over 15]
+
+场景：
+    bullets_vs_grunts  1000 颗玩家子弹 vs 50 个小兵（每帧补满子弹，含渲染）
+    boss_ring_storm    Boss 技能1 弹幕环持续发射（含渲染）
+    shop_idle          商店界面空闲 10 秒（事件、绘制、翻页）
+    menu_particles     开始菜单粒子动画
+    horde_surge        无尽模式 400 个追击敌人围攻（分离、流场、视线、子弹池全开，玩家转圈射击，含渲染）
+
+每个场景先跑计时轮（前 `--warmup` 帧不计），再用 tracemalloc 跑较短的分配轮：
+每帧记录分配峰值（相对帧开始时）与净增长。阶段由 `Game.lap` 钩子划分。
+"""
+
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pycache_init  # must import first to set sys.pycache_prefix
+import numpy as np
+import pygame
+
+from config.settings import WIDTH, HEIGHT, BULLET_SPEED, SIM_TICK_MS, MAP_COUNT, SHOP_MEDKIT_COST, SHOP_MEDKIT_HEAL
+from entities.factory import EnemyFactory
+from entities.weapons import SHOP_WEAPONS
+from game.game import Game
+from game.input_source import InputSource, InputState
+from game.shop_ui import ShopUI, ShopState, ShopItem
+from game.start_menu import StartMenu
+
+RESULTS_VERSION = 1
+# 不会被打死的血量，保证场景负载在整个测量期间保持稳定
+UNKILLABLE_HP = 10 ** 9
+
+
+class PhaseTimer:
+    """按帧收集阶段耗时：`begin` 开始一帧，`lap(name)` 记录自上一个标记以来的耗时，`end` 结束一帧。"""
+
+    def __init__(self):
+        self.frames = []
+        self.phases = {}
+        self._current = {}
+        self._start = self._last = 0.0
+
+    def begin(self):
+        self._current = {}
+        self._start = self._last = time.perf_counter()
+
+    def lap(self, name):
+        t = time.perf_counter()
+        self._current[name] = self._current.get(name, 0.0) + (t - self._last) * 1000.0
+        self._last = t
+
+    def end(self, record=True):
+        if not record:
+            return
+        self.frames.append((time.perf_counter() - self._start) * 1000.0)
+        for name, ms in self._current.items():
+            self.phases.setdefault(name, []).append(ms)
+
+
+def percentiles(samples):
+    """返回 p50/p95/p99（最近秩）与均值、最大值。"""
+    if not samples:
+        return {'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'mean': 0.0, 'max': 0.0}
+    ordered = sorted(samples)
+    n = len(ordered)
+
+    def rank(p):
+        return ordered[min(n - 1, max(0, math.ceil(p / 100.0 * n) - 1))]
+    return {
+        'p50': rank(50),
+        'p95': rank(95),
+        'p99': rank(99),
+        'mean': sum(ordered) / n,
+        'max': ordered[-1],
+    }
+
+
+class _Idle(InputSource):
+    """场景中玩家不操作：鼠标停在屏幕中央。"""
+
+    def poll(self, game):
+        return InputState(mouse_pos=(WIDTH // 2, HEIGHT // 2))
+
+
+class _Spin(InputSource):
+    """场景中玩家原地转圈并持续射击。"""
+
+    def __init__(self):
+        self.tick = 0
+
+    def poll(self, game):
+        self.tick += 1
+        cx, cy = game.player.rect.center
+        a = self.tick * 0.05
+        return InputState(mouse_pos=(int(cx + math.cos(a) * 200), int(cy + math.sin(a) * 200)), fire=True)
+
+
+class Scenario:
+    """场景基类：`setup` 构建状态，`frame(timer)` 执行一帧并用 timer.lap 划分阶段。"""
+    name = ''
+    description = ''
+
+    def __init__(self, screen, font):
+        self.screen = screen
+        self.font = font
+
+    def setup(self):
+        pass
+
+    def frame(self, timer):
+        raise NotImplementedError
+
+    def _make_game(self, seed=1, input_source=None, mode='campaign'):
+        random.seed(seed)
+        game = Game(self.screen, None, self.font, self.font, input_source=input_source or _Idle(), headless=True,
+                    start_time=0, mode=mode)
+        game.player.hp = UNKILLABLE_HP
+        return game
+
+
+class BulletsVsGrunts(Scenario):
+    name = 'bullets_vs_grunts'
+    description = '1000 player bullets vs 50 grunts'
+    BULLETS = 1000
+    GRUNTS = 50
+
+    def setup(self):
+        self.game = game = self._make_game()
+        self.rng = np.random.default_rng(1)
+        factory = EnemyFactory()
+        rng = random.Random(1)
+        enemies = []
+        for _ in range(self.GRUNTS):
+            e = factory.create('grunt', rng.randint(60, WIDTH - 60), rng.randint(60, HEIGHT - 60),
+                               patrol_radius=rng.choice([0, 40, 80]))
+            e.hp = UNKILLABLE_HP
+            enemies.append(e)
+        game.curmap.enemies = enemies
+        game.player.rect.center = (WIDTH // 2, HEIGHT // 2)
+
+    def _top_up(self):
+        pool = self.game.bullets
+        missing = self.BULLETS - len(pool.alive_indices('player'))
+        if missing <= 0:
+            return
+        ang = self.rng.uniform(0, math.tau, missing)
+        cx, cy = self.game.player.rect.center
+        pool.spawn_batch(np.full(missing, float(cx)), np.full(missing, float(cy)), np.cos(ang), np.sin(ang),
+                         BULLET_SPEED, 'player', damage=1, max_range=2000)
+
+    def frame(self, timer):
+        self._top_up()
+        timer.lap('spawn')
+        self.game.lap = timer.lap
+        self.game.update(SIM_TICK_MS)
+        self.game.draw()
+
+
+class BossRingStorm(Scenario):
+    name = 'boss_ring_storm'
+    description = 'boss skill1 ring storm'
+
+    def setup(self):
+        self.game = game = self._make_game()
+        game.current_map_idx = MAP_COUNT - 1
+        self.boss = game.curmap.enemies[0]
+        self.boss.hp = self.boss.max_hp = UNKILLABLE_HP
+        game.player.rect.center = (self.boss.rect.centerx - 200, self.boss.rect.centery)
+
+    def frame(self, timer):
+        boss = self.boss
+        # 保持弹幕态：技能1结束立刻重开，并压住突进
+        boss.skill2_cooldown_remaining = UNKILLABLE_HP
+        if not boss.skill1_active:
+            boss._start_skill1(self.game.sim_time)
+        timer.lap('spawn')
+        self.game.lap = timer.lap
+        self.game.update(SIM_TICK_MS)
+        self.game.draw()
+
+
+class ShopIdle(Scenario):
+    name = 'shop_idle'
+    description = 'shop idle 10s'
+
+    def setup(self):
+        self.game = self._make_game()
+        entries = list(SHOP_WEAPONS) + [ShopItem('Medkit', SHOP_MEDKIT_COST, desc=f'恢复 +{SHOP_MEDKIT_HEAL} HP', heal_amount=SHOP_MEDKIT_HEAL)]
+        self.state = ShopState(self.game.player, entries)
+        self.ui = ShopUI(self.font, self.font, width=WIDTH, height=HEIGHT)
+        self.ui.rebuild_layout(len(entries))
+
+    def frame(self, timer):
+        for event in pygame.event.get():
+            self.ui.handle_event(event)
+        timer.lap('events')
+        self.ui.draw(self.screen, self.state)
+        timer.lap('render')
+        pygame.display.flip()
+        timer.lap('flip')
+
+
+class MenuParticles(Scenario):
+    name = 'menu_particles'
+    description = 'menu particles'
+
+    def setup(self):
+        random.seed(1)
+        self.menu = StartMenu(self.screen, self.font, self.font, width=WIDTH, height=HEIGHT)
+
+    def frame(self, timer):
+        pygame.event.pump()
+        timer.lap('events')
+        # StartMenu.draw 内含粒子更新、绘制与翻页
+        self.menu.draw(16)
+        timer.lap('render')
+
+
+class HordeSurge(Scenario):
+    name = 'horde_surge'
+    description = 'horde mode, 400 chasers'
+    ENEMIES = 400
+    WAVE = 12
+
+    def setup(self):
+        self.game = game = self._make_game(input_source=_Spin(), mode='horde')
+        horde = game.curmap
+        # 直接进入第 WAVE 波：一次刷满并把本波标记为已刷完，测量期间不会再开新波
+        horde.wave = self.WAVE
+        horde.wave_total = self.ENEMIES
+        horde.next_spawn = horde.wave_started = 0
+        enemies = horde._spawn_burst(self.ENEMIES)
+        for e in enemies:
+            e.hp = UNKILLABLE_HP
+        horde.enemies = enemies
+        game.player.rect.center = (WIDTH // 2, HEIGHT // 2 - 40)
+
+    def frame(self, timer):
+        timer.lap('spawn')
+        self.game.lap = timer.lap
+        self.game.update(SIM_TICK_MS)
+        self.game.draw()
+
+
+SCENARIOS = {cls.name: cls for cls in (BulletsVsGrunts, BossRingStorm, ShopIdle, MenuParticles, HordeSurge)}
+
+
+def _gc_collections():
+    return sum(s['collections'] for s in gc.get_stats())
+
+
+def run_scenario(cls, screen, font, frames=600, warmup=30, alloc_frames=120):
+    """运行一个场景并返回结果字典（计时轮 + tracemalloc 分配轮）。"""
+    scenario = cls(screen, font)
+    scenario.setup()
+    timer = PhaseTimer()
+    gc_before = _gc_collections()
+    for i in range(warmup + frames):
+        timer.begin()
+        scenario.frame(timer)
+        timer.end(record=i >= warmup)
+    gc_runs = _gc_collections() - gc_before
+
+    peaks, nets = [], []
+    if alloc_frames > 0:
+        scenario = cls(screen, font)
+        scenario.setup()
+        tracemalloc.start()
+        try:
+            for _ in range(alloc_frames):
+                before, _ = tracemalloc.get_traced_memory()
+                tracemalloc.reset_peak()
+                scenario.frame(_NullTimer)
+                after, peak = tracemalloc.get_traced_memory()
+                peaks.append(peak - before)
+                nets.append(after - before)
+        finally:
+            tracemalloc.stop()
+
+    return {
+        'description': cls.description,
+        'frames': len(timer.frames),
+        'frame_ms': percentiles(timer.frames),
+        'phases_ms': {name: percentiles(s) for name, s in timer.phases.items()},
+        'alloc': {
+            'frames': len(peaks),
+            'peak_bytes': percentiles(peaks),
+            'net_bytes_total': sum(nets),
+        },
+        'gc_collections': gc_runs,
+    }
+
+
+class _NullTimer:
+    @staticmethod
+    def lap(name):
+        pass
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=5,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run_suite(names=None, frames=600, warmup=30, alloc_frames=120):
+    """运行选定场景，返回完整结果字典（含环境元数据）。"""
+    names = list(names or SCENARIOS)
+    pygame.init()
+    try:
+        screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        font = pygame.font.SysFont(None, 24)
+        scenarios = {}
+        for name in names:
+            scenarios[name] = run_scenario(SCENARIOS[name], screen, font, frames=frames, warmup=warmup,
+                                           alloc_frames=alloc_frames)
+    finally:
+        pygame.quit()
+    return {
+        'version': RESULTS_VERSION,
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'frames': frames,
+            'warmup': warmup,
+            'alloc_frames': alloc_frames,
+        },
+        'scenarios': scenarios,
+    }
+
+
+def compare(new, old, fail_over=None):
+    """
+    打印新旧结果中每个场景整帧与各阶段 p50/p95 的变化，返回超过阈值的退化条目列表。
+
+    参数:
+        fail_over: 整帧 p95 变慢超过该百分比视为退化；None 表示只打印不判定
+    """
+    regressions = []
+    for name, cur in new['scenarios'].items():
+        base = old.get('scenarios', {}).get(name)
+        if base is None:
+            print(f'{name}: 旧结果中没有该场景')
+            continue
+        print(f'{name} ({cur["description"]})')
+        rows = [('frame', cur['frame_ms'], base['frame_ms'])]
+        for phase, stats in cur['phases_ms'].items():
+            if phase in base.get('phases_ms', {}):
+                rows.append((phase, stats, base['phases_ms'][phase]))
+        for label, c, b in rows:
+            cells = []
+            for key in ('p50', 'p95'):
+                delta = (c[key] - b[key]) / b[key] * 100.0 if b[key] > 0 else 0.0
+                cells.append(f'{key} {b[key]:8.3f} -> {c[key]:8.3f} ms ({delta:+6.1f}%)')
+            print(f'  {label:<12} ' + '  '.join(cells))
+        b95 = base['frame_ms']['p95']
+        if fail_over is not None and b95 > 0:
+            delta = (cur['frame_ms']['p95'] - b95) / b95 * 100.0
+            if delta > fail_over:
+                regressions.append((name, delta))
+    return regressions
+
+
+def print_results(results):
+    for name, res in results['scenarios'].items():
+        f = res['frame_ms']
+        print(f'{name} ({res["description"]}): frames={res["frames"]} '
+              f'p50 {f["p50"]:.3f} p95 {f["p95"]:.3f} p99 {f["p99"]:.3f} ms  gc={res["gc_collections"]}')
+        for phase, p in res['phases_ms'].items():
+            print(f'  {phase:<12} p50 {p["p50"]:8.3f}  p95 {p["p95"]:8.3f}  p99 {p["p99"]:8.3f} ms')
+        a = res['alloc']
+        if a['frames']:
+            print(f'  alloc peak/frame p50 {a["peak_bytes"]["p50"] / 1024:.1f} KiB  '
+                  f'p99 {a["peak_bytes"]["p99"] / 1024:.1f} KiB  net {a["net_bytes_total"] / 1024:.1f} KiB')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--frames', type=int, default=600, help='每个场景计时的帧数')
+    parser.add_argument('--warmup', type=int, default=30, help='不计入统计的预热帧数')
+    parser.add_argument('--alloc-frames', type=int, default=120, help='tracemalloc 分配轮的帧数，0 表示跳过')
+    parser.add_argument('--only', action='append', choices=sorted(SCENARIOS), help='只运行指定场景（可重复）')
+    parser.add_argument('--out', default=None, help='写入 JSON 结果的路径')
+    parser.add_argument('--compare', default=None, help='与之对比的旧 JSON 结果')
+    parser.add_argument('--fail-over', type=float, default=None, help='整帧 p95 变慢超过该百分比时返回非零')
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.only, frames=args.frames, warmup=args.warmup, alloc_frames=args.alloc_frames)
+    print_results(results)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            old = json.load(f)
+        regressions = compare(results, old, fail_over=args.fail_over)
+        for name, delta in regressions:
+            print(f'REGRESSION {name}: frame p95 {delta:+.1f}%')
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
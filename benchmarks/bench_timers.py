@@ -0,0 +1,80 @@
+"""
+定时器基准：每步轮询/衰减冷却与武器视觉计时 vs 分层时间轮。
+
+运行：
+    python benchmarks/bench_timers.py [--counts 200 1000 5000] [--busy 0.05] [--ticks 600]
+
+每个规模放置不巡逻的敌人，其中 `--busy` 比例的敌人面对近处的玩家按冷却开火，其余处于空闲；
+逐步调用 `update` 与开火者的 `try_shoot`，比较未接入时间轮（每个敌人每步推进武器计时）与接入时间轮
+（只有开火后视觉计时未结束的武器推进，冷却到期由回调标记）的每步平均耗时。
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pycache_init  # must import first to set sys.pycache_prefix
+import pygame
+
+from config.settings import SIM_TICK_MS, WIDTH, HEIGHT
+from entities.enemy import Enemy
+from entities.timer_wheel import TimerWheel
+
+
+def make_enemies(count, busy, seed):
+    rng = random.Random(seed)
+    enemies = [Enemy(rng.randint(0, WIDTH - 36), rng.randint(0, HEIGHT - 36),
+                     archetype=rng.choice(['grunt', 'shotgunner', 'sniper'])) for _ in range(count)]
+    shooters = rng.sample(enemies, int(count * busy))
+    return enemies, shooters
+
+
+def run(enemies, shooters, ticks, timers):
+    """推进 `ticks` 步，返回 (每步平均耗时 ms, 开火次数)。"""
+    now = 0.0
+    shots = 0
+    t0 = time.perf_counter()
+    for _ in range(ticks):
+        now += SIM_TICK_MS
+        if timers is not None:
+            timers.advance(now)
+        for e in enemies:
+            e.update(SIM_TICK_MS, now)
+        for e in shooters:
+            cx, cy = e.rect.center
+            if e.try_shoot((cx + 60, cy), now) is not None:
+                shots += 1
+    return (time.perf_counter() - t0) * 1000.0 / ticks, shots
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--counts', type=int, nargs='+', default=[200, 1000, 5000])
+    parser.add_argument('--busy', type=float, default=0.05)
+    parser.add_argument('--ticks', type=int, default=600)
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    print(f'{"enemies":>8}{"poll ms/tick":>14}{"wheel ms/tick":>15}{"shots":>8}{"timers fired":>14}')
+    for n in args.counts:
+        enemies, shooters = make_enemies(n, args.busy, seed=n)
+        poll_ms, poll_shots = run(enemies, shooters, args.ticks, None)
+        enemies, shooters = make_enemies(n, args.busy, seed=n)
+        timers = TimerWheel()
+        timers.advance(0.0)
+        for e in enemies:
+            e.use_timers(timers)
+        wheel_ms, wheel_shots = run(enemies, shooters, args.ticks, timers)
+        assert poll_shots == wheel_shots
+        print(f'{n:>8}{poll_ms:>14.3f}{wheel_ms:>15.3f}{wheel_shots:>8}{timers.fired:>14}')
+    pygame.quit()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+视线基准：每步为全部敌人查询到玩家的视线，对比逐个射线检测与 `VisibilityGrid` 按格对缓存。
+
+运行：
+    python benchmarks/bench_visibility.py [--map 2] [--pillars 0] [--enemies 8 64 256] [--frames 300]
+
+`--pillars N` 在地图布局之外再随机放 N 根 24px 小柱子（模拟障碍物更多的地图）。
+敌人随机分布在可通行位置，玩家沿椭圆移动。比较三种做法的单步中位耗时：
+- rects：线段逐个与障碍物矩形求交（`Rect.clipline`）；
+- grid：不经缓存的格子行进（`cells_clear`）；
+- cached：`visible`（同一格对只算一次）。
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pycache_init  # must import first to set sys.pycache_prefix
+import pygame
+
+from config.settings import WIDTH, HEIGHT, SIM_TICK_MS, MAP_OBSTACLE_LAYOUTS
+from maps.visibility import VisibilityGrid
+
+
+def player_pos(t):
+    return (WIDTH / 2 + math.cos(t * 0.01) * 380, HEIGHT / 2 + math.sin(t * 0.013) * 260)
+
+
+def median_ms(samples):
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def run(count, frames, obstacles):
+    rng = random.Random(7)
+    vis = VisibilityGrid(obstacles)
+    enemies = []
+    while len(enemies) < count:
+        p = (rng.uniform(20, WIDTH - 20), rng.uniform(20, HEIGHT - 20))
+        if not vis.opaque[vis.cell_of(p)]:
+            enemies.append(p)
+
+    def rects(target):
+        return [not any(ob.clipline(p, target) for ob in obstacles) for p in enemies]
+
+    def grid(target):
+        cb = vis.cell_of(target)
+        return [vis.cells_clear(vis.cell_of(p), cb) for p in enemies]
+
+    def cached(target):
+        return [vis.visible(p, target) for p in enemies]
+
+    out = []
+    for fn in (rects, grid, cached):
+        samples = []
+        for t in range(frames):
+            target = player_pos(t * SIM_TICK_MS / 16)
+            t0 = time.perf_counter()
+            fn(target)
+            samples.append((time.perf_counter() - t0) * 1000.0)
+        out.append(median_ms(samples))
+    return out, vis
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--map', type=int, default=2)
+    parser.add_argument('--pillars', type=int, default=0)
+    parser.add_argument('--enemies', type=int, nargs='+', default=[8, 64, 256])
+    parser.add_argument('--frames', type=int, default=300)
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    obstacles = [pygame.Rect(r) for r in MAP_OBSTACLE_LAYOUTS[min(args.map, len(MAP_OBSTACLE_LAYOUTS) - 1)]]
+    rng = random.Random(3)
+    for _ in range(args.pillars):
+        obstacles.append(pygame.Rect(rng.randrange(0, WIDTH - 24), rng.randrange(0, HEIGHT - 24), 24, 24))
+    print(f'map={args.map} obstacles={len(obstacles)} frames={args.frames}')
+    print(f'{"enemies":>8}{"rects ms":>11}{"grid ms":>11}{"cached ms":>11}{"hit rate":>10}')
+    for n in args.enemies:
+        (rects_ms, grid_ms, cached_ms), vis = run(n, args.frames, obstacles)
+        rate = vis.hits / max(1, vis.hits + vis.misses)
+        print(f'{n:>8}{rects_ms:>11.4f}{grid_ms:>11.4f}{cached_ms:>11.4f}{rate:>9.0%}')
+    pygame.quit()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,9 +6,24 @@
 # ========== 窗口配置 ==========
 WIDTH = 960
 HEIGHT = 640
-FPS = 60
+FPS = 60  # 渲染帧率上限（逻辑步进频率见 SIM_TICK_MS）
 WINDOW_TITLE = "Cross-Domain-Survival"
 
+# ========== 模拟步进配置 ==========
+# 速度类配置（PLAYER_SPEED、BULLET_SPEED 等）以“60 FPS 下每帧移动的像素”为单位
+SPEED_REFERENCE_MS = 1000 / 60
+# 固定逻辑步长（ms）：游戏逻辑按固定频率推进，与渲染帧率无关
+SIM_TICK_MS = 1000 / 60
+# 单个渲染帧最多计入的真实时间（ms），避免窗口拖动/卡顿后一次补跑过多逻辑
+MAX_FRAME_MS = 250
+# 单个渲染帧内最多执行的逻辑步数
+MAX_SIM_STEPS_PER_FRAME = 5
+# 逻辑追赶不及时最多连续跳过的渲染帧数，超过后丢弃积压时间
+MAX_SKIPPED_RENDERS = 3
+# 分层时间轮：每层的槽数（2 的幂，第 0 层每槽一个逻辑步，上一层每槽覆盖下一层一整圈）与层数；64 槽 x 4 层覆盖约 77 小时，更远的定时器放在溢出表
+TIMER_WHEEL_SLOTS = 64
+TIMER_WHEEL_LEVELS = 4
+
 # ========== 玩家配置 ==========
 PLAYER_SPEED = 4.0
 PLAYER_SIZE = 36
@@ -22,6 +37,10 @@ BULLET_SIZE = 6
 DEFAULT_BULLET_DAMAGE = 20
 DEFAULT_BULLET_RANGE = 800  # px
 
+# ========== 碰撞配置 ==========
+# 空间哈希网格单元边长（像素），应不小于常见目标（敌人 36px）的尺寸
+COLLISION_CELL_SIZE = 64
+
 # ========== 敌人配置 ==========
 ENEMY_SIZE = 36
 ENEMY_HP = 30
@@ -46,6 +65,9 @@ ENEMY_ARCHETYPES = {
 		'bullet_damage': 10,
 		'weapon': 'shotgun',
 		'money': 170,
+		# 沿共享流场追击玩家：速度（60 FPS 下每帧移动的像素）与停下开火的距离
+		'chase_speed': 1.8,
+		'chase_stop': 140,
 	},
 	# 精准火力：狙击，慢冷却高伤害
 	'sniper': {
@@ -64,9 +86,22 @@ ENEMY_ARCHETYPES = {
 		'bullet_damage': 18,
 		'weapon': 'heavy cannon',
 		'money': 1500,
+		# 技能1 使用的弹幕图案（见 BULLET_PATTERNS）
+		'skill1_pattern': 'boss_ring',
 	},
 }
 
+# ========== 弹幕图案配置 ==========
+# kind: 'spread' 扇形散射 / 'ring' 带缺口的环 / 'spiral' 多臂螺旋（每次发射整体旋转 step_deg）
+BULLET_PATTERNS = {
+	# Boss 技能1：每 20° 一发，每 5 发留出第 4、5 发作为缺口
+	'boss_ring': {'kind': 'ring', 'step_deg': 20, 'gap_every': 5, 'gaps': (3, 4)},
+	# 密集环：每 10° 一发，无缺口
+	'dense_ring': {'kind': 'ring', 'step_deg': 10},
+	# 螺旋：6 臂，每次发射旋转 13°
+	'boss_spiral': {'kind': 'spiral', 'arms': 6, 'step_deg': 13},
+}
+
 # 每张地图的敌人类型权重（按索引取，超出则用最后一组）
 ENEMY_SPAWN_WEIGHTS = [
 	{'grunt': 1.0},
@@ -79,6 +114,21 @@ ENEMY_SPAWN_WEIGHTS = [
 MAP_COUNT = 4
 RESOURCE_COUNT_PER_MAP = 0  # 地面资源已禁用
 
+# 每张地图的障碍物矩形 (x, y, w, h)（按索引取，超出则用最后一组）
+# 首张地图与 Boss 地图保持空旷；玩家出生点 (80, 80) 附近不放障碍物
+MAP_OBSTACLE_LAYOUTS = [
+	[],
+	[(260, 160, 40, 260), (520, 0, 40, 220), (520, 380, 40, 260), (700, 300, 180, 40)],
+	[(200, 200, 80, 80), (440, 120, 80, 80), (680, 200, 80, 80), (320, 420, 80, 80), (580, 420, 80, 80)],
+	[],
+]
+# 导航网格单元边长（像素）；障碍物按敌人半边长外扩后覆盖到的格子不可通行
+NAV_CELL_SIZE = 32
+# 视线查询的栅格边长（像素）：与障碍物重叠的格子视为不透明，越小越精确、缓存键越多
+LOS_CELL_SIZE = 16
+# 视线缓存项上限（按格对计），超过后整体清空
+LOS_CACHE_MAX = 200000
+
 # Boss 大小（像素），可在此处调整 boss 体积
 BOSS_SIZE = 96
 
@@ -129,6 +179,7 @@ COLOR_ENEMY_BULLET = (255, 90, 90)
 COLOR_RESOURCE = (255, 215, 110)
 COLOR_PORTAL = (160, 80, 255)
 COLOR_EXIT = (60, 200, 120)
+COLOR_OBSTACLE = (70, 76, 96)
 COLOR_HP_BAR_BG = (200, 60, 60)
 COLOR_HP_BAR_FG = (60, 200, 100)
 COLOR_TEXT = (255, 255, 255)
@@ -141,6 +192,69 @@ UI_COLOR_TEXT_SECONDARY = (200, 200, 200)
 UI_COLOR_MONEY = (255, 235, 120)
 UI_HUD_PADDING = 10
 
+# ========== 敌人批处理 ==========
+# 普通敌人数不少于该值时才用 EnemyBatch 向量化推进；敌人很少时 NumPy 的固定开销反而比逐个推进更慢
+ENEMY_BATCH_MIN = 24
+# 是否对批处理敌人启用 AI 细节层级（LOD）分时调度
+AI_LOD = True
+# 距玩家该距离内的敌人每个逻辑步都推进
+AI_NEAR_RADIUS = 160
+# 冷却剩余时间(ms)不超过该值且在检测范围内的敌人每步推进，保证开火时刻不被延后
+AI_FIRE_LOOKAHEAD_MS = 150
+# 检测范围内但较远的敌人每隔多少逻辑步推进一次
+AI_REDUCED_INTERVAL = 3
+# 超出检测范围（只巡逻）的敌人每隔多少逻辑步推进一次
+AI_PATROL_INTERVAL = 6
+# 每个逻辑步最多推进多少个非近距敌人；超出的顺延到下一步（近距/将开火的敌人不受限）
+AI_UPDATE_BUDGET = 128
+# 追击中的批处理敌人彼此保持的分离半径（像素），0 表示不做分离
+ENEMY_SEPARATION_RADIUS = 30
+# 完全重叠时每帧（60 FPS）被推开的最大像素数
+ENEMY_SEPARATION_SPEED = 1.5
+# 批量绘制时旋转贴图按该角度（度）量化后缓存；0 表示不量化（每个角度单独缓存）
+SPRITE_ANGLE_STEP = 1.0
+# 旋转贴图缓存的最多条目数，超出时整体清空
+SPRITE_CACHE_MAX = 4096
+# 地图敌人列表中的死者超过存活数的该比例时压缩（换列表会重建敌人批处理，不宜每次死亡都换）
+ENTITY_COMPACT_RATIO = 0.25
+
+# ========== 无尽模式 ==========
+# 使用的障碍物布局（MAP_OBSTACLE_LAYOUTS 下标）
+HORDE_LAYOUT = 2
+# 第一波敌人数与每波的增长倍率；单波人数上限
+HORDE_FIRST_WAVE = 12
+HORDE_WAVE_GROWTH = 1.35
+HORDE_MAX_WAVE = 400
+# 同时在场的敌人上限（超出的刷怪顺延）
+HORDE_MAX_ALIVE = 600
+# 上一波剩余不超过该比例时提前开始下一波；否则最迟隔多久(ms)开始
+HORDE_CLEAR_RATIO = 0.25
+HORDE_WAVE_INTERVAL_MS = 20000
+# 每隔多久(ms)刷一批、每批最多多少个（分批刷出，敌人列表不必每步重建）
+HORDE_SPAWN_INTERVAL_MS = 250
+HORDE_SPAWN_BURST = 24
+# 原型没有追击参数时使用的追击速度与停步距离
+HORDE_CHASE_SPEED = 1.4
+HORDE_CHASE_STOP = 110
+
+# ========== 性能剖析配置 ==========
+# 剖析输出目录（相对当前工作目录）：帧阶段 CSV、会话 .pstats 与折叠调用栈
+PROFILE_DIR = 'profiles'
+# 帧剖析器环形缓冲保存的帧数
+PROFILER_HISTORY = 600
+# 叠加层显示的滚动平均窗口（帧）
+PROFILER_AVG_FRAMES = 60
+# 会话剖析（--profile）采样线程的采样间隔（ms）
+PROFILE_SAMPLE_MS = 5
+# trace 记录（--trace）最多保留的事件数（约 15 个/帧），超出后丢弃
+TRACE_MAX_EVENTS = 1000000
+# 卡顿监视（--watchdog）：单帧超过该时长视为卡顿（ms），卡顿期间的调用栈采样间隔（ms）
+HITCH_THRESHOLD_MS = 33
+HITCH_SAMPLE_MS = 2
+# 运行指标（--metrics）：JSONL 写入间隔（秒）与 Prometheus 指标名前缀
+METRICS_INTERVAL_S = 5
+METRICS_PREFIX = 'cds_'
+
 # ========== 近战武器贴图默认 ==========
 MELEE_SPRITE_SIZE = (32, 12)
 MELEE_SPRITE_FALLBACK_COLOR = (180, 120, 80)
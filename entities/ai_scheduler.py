@@ -0,0 +1,98 @@
+"""
+敌人 AI 细节层级（LOD）与分时调度
+
+按到玩家的距离和开火时机把敌人分为三档：
+
+- FULL：靠近玩家（`AI_NEAR_RADIUS` 内）或冷却即将结束（`AI_FIRE_LOOKAHEAD_MS` 内）且在检测范围内，每个逻辑步都推进；
+- REDUCED：在检测范围内但较远，每 `AI_REDUCED_INTERVAL` 步推进一次；
+- PATROL：超出 `detect_range`，只巡逻不瞄准/开火，每 `AI_PATROL_INTERVAL` 步推进一次。
+
+降频的敌人累计跳过的时间，到期时一次性按累计 dt 推进（巡逻位置只取决于相位，结果与逐步推进一致）。
+初始计数按下标错开，使同档敌人分散到不同逻辑步。每步非 FULL 敌人的推进次数受 `AI_UPDATE_BUDGET` 限制，
+超出的按“等待最久优先”顺延到下一步；FULL 档从不顺延。
+
+预算按推进次数而不是真实耗时计算：按墙钟时间裁剪会让模拟结果依赖机器快慢，录像回放与无窗口复现都会失配。
+"""
+
+import numpy as np
+from config.settings import (
+    AI_NEAR_RADIUS, AI_FIRE_LOOKAHEAD_MS, AI_REDUCED_INTERVAL, AI_PATROL_INTERVAL, AI_UPDATE_BUDGET
+)
+
+FULL = 0
+REDUCED = 1
+PATROL = 2
+
+
+def classify(dist, detect_range, until_ready, near=AI_NEAR_RADIUS, lookahead=AI_FIRE_LOOKAHEAD_MS):
+    """
+    逐行给出 LOD 档位。
+
+    Args:
+        dist: 到玩家的距离数组
+        detect_range: 检测范围数组
+        until_ready: 距冷却结束的剩余时间(ms)数组（<= 0 表示已可开火）
+    """
+    in_range = dist <= detect_range
+    full = (dist <= near) | (in_range & (until_ready <= lookahead))
+    return np.where(full, FULL, np.where(in_range, REDUCED, PATROL)).astype(np.int8)
+
+
+class AIScheduler:
+    """
+    n 个敌人的分档调度状态。
+
+    每个逻辑步调用 `plan`，得到本步需要推进的行、是否瞄准/开火、各行应推进的累计 dt。
+    """
+
+    def __init__(self, n, budget=AI_UPDATE_BUDGET, reduced_interval=AI_REDUCED_INTERVAL,
+                 patrol_interval=AI_PATROL_INTERVAL):
+        self.n = n
+        self.budget = budget
+        self.intervals = np.array([1, reduced_interval, patrol_interval], dtype=np.int32)
+        self.accum = np.zeros(n)
+        # 距上次推进经过的步数；按下标错开初值，同档敌人分散到不同步
+        self.age = np.arange(n, dtype=np.int32) % max(reduced_interval, patrol_interval)
+        self.tier = np.full(n, FULL, dtype=np.int8)
+        # 最近一步各档推进数与顺延数（调试/指标用）
+        self.stats = {'full': 0, 'reduced': 0, 'patrol': 0, 'deferred': 0}
+
+    def state(self):
+        """可序列化的调度状态（供快照使用）。"""
+        return {'accum': self.accum.copy(), 'age': self.age.copy()}
+
+    def load_state(self, state):
+        if len(state['accum']) != self.n:
+            raise ValueError('调度状态与敌人数量不一致')
+        self.accum = np.array(state['accum'], dtype=np.float64)
+        self.age = np.array(state['age'], dtype=np.int32)
+
+    def plan(self, dt, dist, detect_range, until_ready, alive):
+        """
+        Returns:
+            (due, aim, dts)：本步推进的布尔掩码、其中需要瞄准/开火的掩码、每行累计 dt（未推进的行为 0）
+        """
+        self.accum[alive] += dt
+        self.age[alive] += 1
+        self.tier = tier = classify(dist, detect_range, until_ready)
+        due = alive & (self.age >= self.intervals[tier])
+        full = due & (tier == FULL)
+        rest = np.flatnonzero(due & ~full)
+        deferred = 0
+        if len(rest) > self.budget:
+            # 等待最久的优先；同龄按下标，保证结果可复现
+            order = np.argsort(-self.age[rest], kind='stable')
+            drop = rest[order[self.budget:]]
+            due[drop] = False
+            deferred = len(drop)
+        dts = np.where(due, self.accum, 0.0)
+        self.accum[due] = 0.0
+        self.age[due] = 0
+        aim = due & (tier != PATROL)
+        self.stats = {
+            'full': int(np.count_nonzero(full)),
+            'reduced': int(np.count_nonzero(due & (tier == REDUCED))),
+            'patrol': int(np.count_nonzero(due & (tier == PATROL))),
+            'deferred': deferred,
+        }
+        return due, aim, dts
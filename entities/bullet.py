@@ -3,7 +3,7 @@
 """
 
 import pygame
-from config.settings import BULLET_SIZE, WIDTH, HEIGHT, COLOR_PLAYER_BULLET, COLOR_ENEMY_BULLET, DEFAULT_BULLET_RANGE, DEFAULT_BULLET_DAMAGE
+from config.settings import BULLET_SIZE, WIDTH, HEIGHT, COLOR_PLAYER_BULLET, COLOR_ENEMY_BULLET, DEFAULT_BULLET_RANGE, DEFAULT_BULLET_DAMAGE, SPEED_REFERENCE_MS
 
 
 class Bullet:
@@ -11,17 +11,21 @@ class Bullet:
     子弹类：由玩家或敌人发射
     """
     
-    def __init__(self, pos, direction, speed, owner, damage=None, max_range=None):
+    def __init__(self, pos, direction, speed, owner, damage=None, max_range=None, swept=False):
         """
         初始化子弹
         
         参数:
             pos: (x, y) 子弹初始位置
             direction: (dx, dy) 移动方向向量
-            speed: 移动速度
+            speed: 移动速度（60 FPS 下每帧像素，见 SPEED_REFERENCE_MS）
             owner: 'player' 或 'enemy' 标识子弹所有者
+            swept: 是否使用连续碰撞（按上一位置到当前位置的线段检测），用于高速弹丸
         """
         self.x, self.y = pos
+        # 上一帧位置：连续碰撞检测使用 (prev_x, prev_y) -> (x, y) 线段
+        self.prev_x, self.prev_y = self.x, self.y
+        self.swept = swept
         self.dx, self.dy = direction
         self.speed = speed
         # 伤害与射程
@@ -39,10 +43,12 @@ class Bullet:
         更新子弹位置
         
         参数:
-            dt: 帧时间差(ms)
+            dt: 逻辑步长(ms)，位移按 dt 折算
         """
-        self.x += self.dx * self.speed
-        self.y += self.dy * self.speed
+        self.prev_x, self.prev_y = self.x, self.y
+        step = self.speed * (dt / SPEED_REFERENCE_MS)
+        self.x += self.dx * step
+        self.y += self.dy * step
         self.rect.x = int(self.x - BULLET_SIZE // 2)
         self.rect.y = int(self.y - BULLET_SIZE // 2)
         
@@ -0,0 +1,202 @@
+"""
+基于原型（archetype）的实体-组件存储
+
+同一组组件的实体放在一张 `Archetype` 表里：每个组件一列连续的 NumPy 数组，行 [0, count) 在用，
+容量按 `ProjectilePool` 相同的方式翻倍增长；删除用“末行补洞”，各列始终保持紧凑，
+系统（`entities/systems.py` 与 `EnemyBatch`）按列整段切片向量化处理，不逐个访问 Python 对象。
+
+`owners` 与行一一对应，保存门面对象（`Enemy` 等）：碰撞结果、奖励结算等仍以对象为单位返回，
+已有的类照常可用，只是热路径读写的是这里的列。
+
+`World` 按名称管理原型并分配全局实体 id；`query(*components)` 返回包含全部组件且非空的原型，
+系统据此遍历，不关心具体是哪种实体。`Column` 描述符把对象属性映射到其 `table` 的整列视图，
+让 `EnemyBatch` 这类已有的数组代码直接在原型表上运算。
+"""
+
+import numpy as np
+
+# 新建原型表的初始容量（行）
+_INITIAL_CAPACITY = 64
+
+
+class Archetype:
+    """
+    一种组件组合的实体表。
+
+    参数:
+        name: 原型名称（`World` 中的键）
+        fields: [(组件名, dtype), ...]
+        capacity: 初始容量（行）
+    """
+
+    def __init__(self, name, fields, capacity=_INITIAL_CAPACITY):
+        self.name = name
+        self.fields = tuple((field, np.dtype(dtype)) for field, dtype in fields)
+        self.components = frozenset(field for field, _ in self.fields)
+        self.capacity = max(1, int(capacity))
+        self.count = 0
+        self.columns = {field: np.zeros(self.capacity, dtype=dtype) for field, dtype in self.fields}
+        self.eids = np.zeros(self.capacity, dtype=np.int64)
+        self.owners = []
+        # 实体 id -> 行号
+        self._rows = {}
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, eid):
+        return eid in self._rows
+
+    def column(self, field):
+        """组件 `field` 在用部分的视图（原地写入即修改存储）。"""
+        return self.columns[field][:self.count]
+
+    def row(self, eid):
+        """实体所在行；不在本表时抛出 KeyError。"""
+        return self._rows[eid]
+
+    def _reserve(self, extra):
+        """保证还能容纳 `extra` 行，不够时容量翻倍。"""
+        need = self.count + extra
+        if need <= self.capacity:
+            return
+        cap = self.capacity
+        while cap < need:
+            cap *= 2
+        for field, arr in self.columns.items():
+            grown = np.zeros(cap, dtype=arr.dtype)
+            grown[:self.count] = arr[:self.count]
+            self.columns[field] = grown
+        eids = np.zeros(cap, dtype=np.int64)
+        eids[:self.count] = self.eids[:self.count]
+        self.eids = eids
+        self.capacity = cap
+
+    def extend(self, eids, owners, values):
+        """
+        追加多行。
+
+        参数:
+            eids: 实体 id 序列
+            owners: 与 `eids` 等长的门面对象序列
+            values: {组件名: 标量或与 `eids` 等长的数组}；缺省的组件为 0
+
+        Returns:
+            新行的切片
+        """
+        eids = np.asarray(eids, dtype=np.int64)
+        k = len(eids)
+        if len(owners) != k:
+            raise ValueError('owners 与 eids 长度不一致')
+        unknown = set(values) - self.components
+        if unknown:
+            raise KeyError(f'原型 {self.name} 没有组件 {sorted(unknown)}')
+        self._reserve(k)
+        s = slice(self.count, self.count + k)
+        for field, arr in self.columns.items():
+            arr[s] = values.get(field, 0)
+        self.eids[s] = eids
+        self.owners.extend(owners)
+        for r, eid in enumerate(eids.tolist(), start=s.start):
+            self._rows[eid] = r
+        self.count += k
+        return s
+
+    def remove(self, eid):
+        """删除一行：最后一行搬进空位，列保持紧凑（行序会变化）。"""
+        r = self._rows.pop(eid)
+        last = self.count - 1
+        if r != last:
+            for arr in self.columns.values():
+                arr[r] = arr[last]
+            moved = int(self.eids[last])
+            self.eids[r] = moved
+            self.owners[r] = self.owners[last]
+            self._rows[moved] = r
+        self.owners.pop()
+        self.count = last
+
+    def clear(self):
+        self.count = 0
+        self.owners = []
+        self._rows = {}
+
+
+class World:
+    """按名称管理原型表，分配全局唯一的实体 id。"""
+
+    def __init__(self):
+        self.archetypes = {}
+        self._where = {}
+        self._next_eid = 0
+
+    def archetype(self, name, fields=None):
+        """取名为 `name` 的原型；不存在时按 `fields` 新建（组件组合必须一致）。"""
+        table = self.archetypes.get(name)
+        if table is None:
+            if fields is None:
+                raise KeyError(f'没有原型 {name}')
+            table = self.archetypes[name] = Archetype(name, fields)
+        elif fields is not None and table.components != {field for field, _ in fields}:
+            raise ValueError(f'原型 {name} 的组件与已有定义不一致')
+        return table
+
+    def spawn(self, name, owners, **values):
+        """
+        在原型 `name` 中创建 `len(owners)` 个实体。
+
+        Returns:
+            新实体 id 数组（与 `owners` 同序）
+        """
+        table = self.archetypes[name]
+        start = self._next_eid
+        eids = np.arange(start, start + len(owners), dtype=np.int64)
+        self._next_eid += len(owners)
+        table.extend(eids, owners, values)
+        for eid in eids.tolist():
+            self._where[eid] = table
+        return eids
+
+    def despawn(self, eid):
+        """删除一个实体；不存在时忽略。"""
+        table = self._where.pop(eid, None)
+        if table is not None:
+            table.remove(eid)
+
+    def clear(self, name):
+        """清空原型 `name` 的全部实体。"""
+        table = self.archetypes.get(name)
+        if table is None:
+            return
+        for eid in table.eids[:table.count].tolist():
+            self._where.pop(eid, None)
+        table.clear()
+
+    def owner(self, eid):
+        """实体的门面对象。"""
+        table = self._where[eid]
+        return table.owners[table.row(eid)]
+
+    def query(self, *components):
+        """包含全部 `components` 且非空的原型表列表（按创建顺序）。"""
+        need = set(components)
+        return [t for t in self.archetypes.values() if t.count and need <= t.components]
+
+
+class Column:
+    """
+    描述符：`obj.<name>` 读出 `obj.table.column(name)`，赋值时原地写入该列。
+
+    赋值的右值可以是标量或与在用行数等长的数组；读出的是视图，下标赋值同样写回存储。
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return obj.table.column(self.name)
+
+    def __set__(self, obj, value):
+        obj.table.column(self.name)[...] = value
@@ -9,7 +9,7 @@ from copy import copy
 from config.settings import (
     ENEMY_SIZE, ENEMY_HP, ENEMY_FIRE_COOLDOWN, ENEMY_DETECT_RANGE,
     BULLET_SPEED, COLOR_ENEMY, ENEMY_BULLET_DAMAGE, ENEMY_ARCHETYPES,
-    WIDTH, HEIGHT,
+    WIDTH, HEIGHT, SPEED_REFERENCE_MS,
 )
 
 # Boss 大小常量（可选覆盖）
@@ -17,6 +17,7 @@ from config.settings import BOSS_SIZE
 from utils import vec_from_points, aim_info
 from entities.bullet import Bullet
 from entities.weapons import RangedWeapon, SHOP_WEAPONS, MeleeWeapon
+from entities.patterns import compile_pattern
 
 
 class Enemy:
@@ -46,8 +47,24 @@ class Enemy:
         self.money = base.get('money', 150)
         self.patrol_center = (x, y)
         self.patrol_radius = patrol_radius
+        # 追击：由地图设置共享流场（`maps.navigation.FlowField`）；chase_speed 为 0 的原型只巡逻
+        self.chase_speed = base.get('chase_speed', 0)
+        self.chase_stop = base.get('chase_stop', 0)
+        # 追击的最大路径长度（px）；None 表示取检测范围
+        self.chase_range = None
+        self.flow = None
+        self._chase_pos = None
+        # 视线查询（`maps.visibility.VisibilityGrid`）；None 表示地图没有遮挡
+        self.vis = None
         self.last_shot = 0
-        self.alive = True
+        # 地图的 `TimerWheel`；为 None 时开火冷却与武器视觉计时按逻辑步轮询/衰减（不在地图上的敌人、测试与基准）
+        self.timers = None
+        # 接入时间轮后由到期回调维护：开火冷却是否已结束、武器视觉计时是否仍需逐步衰减
+        self._loaded = True
+        self._weapon_busy = False
+        # 所属的 `EntityRegistry`（由地图登记）；死亡时通知它更新存活计数
+        self.registry = None
+        self._alive = True
         # 简单圆形巡逻角度
         self._angle = random.random() * math.pi * 2
         # 朝向（单位向量）及角度（度）用于贴图旋转
@@ -67,6 +84,20 @@ class Enemy:
         except Exception:
             pass
 
+    @property
+    def alive(self):
+        return self._alive
+
+    @alive.setter
+    def alive(self, value):
+        if self._alive and not value:
+            self._alive = False
+            if self.registry is not None:
+                self.registry.died(self)
+        else:
+            # 复活不通知注册表：地图上的敌人死亡后不会再复活
+            self._alive = bool(value)
+
     def _build_weapon_from_archetype(self, base):
         """根据原型名从 `SHOP_WEAPONS` 中选择武器，找不到则回退到基础手枪。"""
         wname = (base or {}).get('weapon', 'basic pistol')
@@ -93,15 +124,17 @@ class Enemy:
             pass
         return weapon
 
-    def update(self, dt):
+    def update(self, dt, now=None):
         """
-        更新敌人位置（巡逻）
+        更新敌人位置（巡逻/追击）
         
         参数:
-            dt: 帧时间差(ms)
+            dt: 逻辑步长(ms)
+            now: 模拟时钟(ms)；普通敌人不使用，保持与 Boss 相同的调用签名
         """
-        # 如果有巡逻半径，执行圆形巡逻
-        if self.patrol_radius > 0:
+        # 追击中的敌人沿流场移动，否则按巡逻半径执行圆形巡逻
+        chasing = self.chases() and self._chase(dt)
+        if not chasing and self.patrol_radius > 0:
             self._angle += dt * 0.001
             cx, cy = self.patrol_center
             old_center = self.rect.center
@@ -114,22 +147,113 @@ class Enemy:
             if dist != 0:
                 self.dir = (ndx, ndy)
                 self.angle = math.degrees(math.atan2(ndy, ndx))
-        # 如果存在武器则更新武器的视觉效果
-        try:
-            if isinstance(self.weapon, RangedWeapon):
-                self.weapon.update(dt)
-            elif isinstance(self.weapon, MeleeWeapon):
-                self.weapon.update(dt)
-        except Exception:
-            pass
+        # 如果存在武器则更新武器的视觉效果（接入时间轮时只在开火后、视觉计时结束前推进）
+        if self.timers is None or self._weapon_busy:
+            try:
+                if isinstance(self.weapon, RangedWeapon):
+                    self.weapon.update(dt)
+                elif isinstance(self.weapon, MeleeWeapon):
+                    self.weapon.update(dt)
+            except Exception:
+                pass
+
+    def use_timers(self, timers):
+        """
+        接入地图的时间轮：开火冷却与武器视觉计时改由到期回调维护，
+        冷却中或武器空闲的敌人每步不再比较 `now - last_shot`，也不再推进武器计时。
+        """
+        self.timers = timers
+        self._loaded = False
+        self._weapon_busy = False
+        timers.schedule(self.last_shot + self.fire_cooldown, self._on_reloaded, self.last_shot)
+
+    def _arm_timers(self, visual):
+        """开火后登记冷却到期与（`visual` 为真时）武器视觉结束的回调；未接入时间轮时什么也不做。"""
+        timers = self.timers
+        if timers is None:
+            return
+        shot = self.last_shot
+        self._loaded = False
+        timers.schedule(shot + self.fire_cooldown, self._on_reloaded, shot)
+        if visual:
+            self._weapon_busy = True
+            # 逐步衰减在 visual_ms 之后的第一个逻辑步归零，再晚一步置零与逐步衰减的结果相同
+            timers.schedule(shot + self.weapon.visual_ms() + timers.tick_ms, self._on_weapon_idle, shot)
+
+    def _on_reloaded(self, now, shot):
+        """开火冷却到期；`shot` 为登记时的 last_shot，之后又开过火的旧回调直接忽略。"""
+        if shot != self.last_shot:
+            return
+        if now - self.last_shot >= self.fire_cooldown:
+            self._loaded = True
+        else:
+            # 浮点舍入使到期时刻略早于轮询表达式成立的时刻：下一步再判定
+            self.timers.schedule(now, self._on_reloaded, shot)
+
+    def _on_weapon_idle(self, now, shot):
+        """武器视觉计时结束：置零并停止逐步推进。"""
+        if shot != self.last_shot:
+            return
+        self._weapon_busy = False
+        self.weapon.settle()
+
+    def chases(self):
+        """是否为追击型敌人（原型带 chase_speed 且地图提供了流场）。"""
+        return self.chase_speed > 0 and self.flow is not None
+
+    def _chase(self, dt):
+        """
+        沿共享流场向玩家移动一步。
+
+        Returns:
+            是否处于追击状态；玩家超出追击范围（按绕行路径长度）或不可达时返回 False 并回到巡逻
+        """
+        pos = self.rect.center
+        step = self.flow.steer(pos)
+        limit = self.detect_range if self.chase_range is None else self.chase_range
+        if step is None or step[2] > limit:
+            self._end_chase()
+            return False
+        if self._chase_pos is None:
+            self._chase_pos = (float(pos[0]), float(pos[1]))
+        tx, ty = self.flow.target
+        x, y = self._chase_pos
+        if math.hypot(tx - x, ty - y) <= self.chase_stop:
+            # 已到开火距离：原地停住
+            return True
+        ndx, ndy, dist = vec_from_points((x, y), (step[0], step[1]))
+        move = min(dist, self.chase_speed * (dt / SPEED_REFERENCE_MS))
+        if dist != 0:
+            x += ndx * move
+            y += ndy * move
+            self._chase_pos = (x, y)
+            self.rect.center = (round(x), round(y))
+            self.dir = (ndx, ndy)
+            self.angle = math.degrees(math.atan2(ndy, ndx))
+        return True
+
+    def can_see(self, pos):
+        """与 `pos` 之间是否没有障碍物遮挡（按格缓存，每步查询开销很小）。"""
+        vis = self.vis
+        return vis is None or vis.visible(self.rect.center, pos)
+
+    def _end_chase(self):
+        """结束追击：把巡逻圆心挪到当前位置对应处，恢复巡逻时不会瞬移回原巡逻圈。"""
+        if self._chase_pos is None:
+            return
+        self._chase_pos = None
+        cx, cy = self.rect.center
+        self.patrol_center = (cx - math.cos(self._angle) * self.patrol_radius,
+                              cy - math.sin(self._angle) * self.patrol_radius)
 
-    def try_shoot(self, player, now):
+    def try_shoot(self, player, now, pool=None):
         """
         尝试射击玩家
         
         Args:
             player_pos: (x, y) 玩家位置
             now: 当前时间戳(ms)
+            pool: 可选的 `ProjectilePool`，给出时子弹直接写入池中并返回发射数量
         
         Returns:
             Bullet对象或None
@@ -150,8 +274,9 @@ class Enemy:
             self.dir = (dirx, diry)
             self.angle = math.degrees(math.atan2(diry, dirx))
         
-        # 仅在玩家在检测范围内且冷却时间满足时射击
-        if dist <= self.detect_range and now - self.last_shot >= self.fire_cooldown:
+        # 仅在玩家在检测范围内、冷却时间满足且视线未被障碍物挡住时射击
+        loaded = self._loaded if self.timers is not None else now - self.last_shot >= self.fire_cooldown
+        if dist <= self.detect_range and loaded and self.can_see(player_pos):
             self.last_shot = now
             # 计算与玩家相似的枪口安装位置
             center = pygame.math.Vector2(self.rect.center)
@@ -159,20 +284,29 @@ class Enemy:
             hand_offset_dist = max(0, (self.rect.width // 2) - 2)
             hand_offset = direction * hand_offset_dist + pygame.math.Vector2(-direction.y, direction.x) * 10
             gun_pos = (int(center.x + hand_offset.x), int(center.y + hand_offset.y))
-            # 触发武器视觉效果
-            try:
-                if isinstance(self.weapon, RangedWeapon):
-                    self.weapon.trigger_fire_visual()
-                    # 武器开火创造子弹对象
-                    return self.weapon.fire(gun_pos, player_pos, owner='enemy')
-            except Exception:
-                pass
-            # 回退：创建简单子弹（使用当前武器的伤害以保持一致性）
-            b = Bullet(gun_pos, (dirx, diry), BULLET_SPEED * 0.30, 'enemy', damage=getattr(self.weapon, 'damage', self.bullet_damage))
-            return b
+            return self._fire(gun_pos, player_pos, dirx, diry, pool)
         
         return None
 
+    def _fire(self, gun_pos, player_pos, dirx, diry, pool=None):
+        """从枪口位置向玩家开火（冷却判定与 last_shot 由调用方负责）；返回值同 `try_shoot`。"""
+        # 触发武器视觉效果
+        try:
+            if isinstance(self.weapon, RangedWeapon):
+                self.weapon.trigger_fire_visual()
+                self._arm_timers(visual=True)
+                # 武器开火创造子弹对象
+                return self.weapon.fire(gun_pos, player_pos, owner='enemy', pool=pool)
+        except Exception:
+            pass
+        self._arm_timers(visual=False)
+        # 回退：创建简单子弹（使用当前武器的伤害以保持一致性）
+        b = Bullet(gun_pos, (dirx, diry), BULLET_SPEED * 0.30, 'enemy', damage=getattr(self.weapon, 'damage', self.bullet_damage))
+        if pool is not None:
+            pool.append(b)
+            return 1
+        return b
+
     def draw(self, surf):
         """
         绘制敌人及其生命条
@@ -254,6 +388,9 @@ class BossEnemy(Enemy):
         self.skill1_active = False
         self.skill1_until = 0
         self.skill1_last_emit = 0
+        # 弹幕图案（见 settings.BULLET_PATTERNS）与已发射次数（螺旋图案据此旋转）
+        self.skill1_pattern = self.archetype.get('skill1_pattern', 'boss_ring')
+        self.skill1_emissions = 0
 
         # 技能2（突进）
         self.skill2_cooldown = 1400
@@ -265,6 +402,8 @@ class BossEnemy(Enemy):
         self.dash_vec = pygame.math.Vector2(0, 0)
         self.dash_has_hit = False
         self.dash_damage = getattr(self, 'bullet_damage', 40)
+        # 接入时间轮时各技能冷却到期的定时器（技能名 -> Timer）
+        self._skill_timers = {}
 
     # ---------------------------- 辅助方法 ----------------------------
     def _player_pos(self):
@@ -294,13 +433,23 @@ class BossEnemy(Enemy):
         self.skill1_last_emit = 0
         self.state = 'BURST'
         self.state_timer = 0
+        if self.timers is not None:
+            self.timers.schedule(self.skill1_until, self._on_skill1_over, self.skill1_until)
 
-    def _end_skill1(self):
+    def _end_skill1(self, now=None):
         # 结束技能1并进入冷却
         self.skill1_active = False
         self.skill1_cooldown_remaining = self.skill1_cooldown
         self.state = 'ORBIT'
         self.state_timer = 0
+        if self.timers is not None and now is not None:
+            # 与逐步递减一致：结束的这一步已扣掉一个逻辑步的冷却
+            self._cooldown_timer('skill1', now + self.skill1_cooldown - self.timers.tick_ms)
+
+    def _on_skill1_over(self, now, until):
+        """技能1持续时间到期（重新开启过的旧回调按 `until` 忽略）。"""
+        if self.skill1_active and self.skill1_until == until:
+            self._end_skill1(now)
 
     def _start_dash(self, player_pos):
         dx = player_pos.x - self.x
@@ -314,16 +463,31 @@ class BossEnemy(Enemy):
         self.state = 'DASH_LOCK'
         self.state_timer = 0
 
-    def _end_dash(self):
+    def _end_dash(self, now=None):
         # 结束突进并进入恢复态
         self.skill2_active = False
         self.skill2_cooldown_remaining = self.skill2_cooldown
         self.state = 'RECOVER'
         self.state_timer = 0
         self.dash_has_hit = False
+        if self.timers is not None and now is not None:
+            self._cooldown_timer('skill2', now + self.skill2_cooldown)
+
+    def _cooldown_timer(self, name, at):
+        """登记技能 `name` 的冷却在 `at` 结束（取代该技能尚未到期的旧定时器）。"""
+        self.timers.cancel(self._skill_timers.get(name))
+        self._skill_timers[name] = self.timers.schedule(at, self._on_skill_ready, name)
+
+    def _on_skill_ready(self, now, name):
+        """技能冷却结束：剩余冷却直接归零。"""
+        self._skill_timers.pop(name, None)
+        setattr(self, name + '_cooldown_remaining', 0)
 
     def _tick_cooldowns(self, dt, now):
-        # 推进冷却计时器并自动结束技能
+        # 推进冷却计时器并自动结束技能；接入时间轮时技能结束与冷却到期都由定时器回调处理，
+        # 冷却中的 `*_cooldown_remaining` 保持为完整冷却时长，到期时归零
+        if self.timers is not None:
+            return
         if self.skill1_active and now >= self.skill1_until:
             self._end_skill1()
         if self.skill1_cooldown_remaining > 0:
@@ -337,9 +501,10 @@ class BossEnemy(Enemy):
         self.rect.centerx = int(self.x)
         self.rect.centery = int(self.y)
 
-    def update(self, dt):
-        """Boss 行为更新：推进冷却并根据状态机移动。"""
-        now = pygame.time.get_ticks()
+    def update(self, dt, now=None):
+        """Boss 行为更新：推进冷却并根据状态机移动。`now` 为模拟时钟(ms)，缺省时取真实时钟。"""
+        if now is None:
+            now = pygame.time.get_ticks()
         self._tick_cooldowns(dt, now)
 
         self.state_timer += dt
@@ -359,7 +524,7 @@ class BossEnemy(Enemy):
             self.y += move.y
             out_bounds = (self.x < 0 or self.x > WIDTH or self.y < 0 or self.y > HEIGHT)
             if out_bounds or self.state_timer >= self.dash_ms:
-                self._end_dash()
+                self._end_dash(now)
         elif self.state == 'RECOVER':
             if self.state_timer >= self.recover_ms:
                 self.state = 'ORBIT'
@@ -368,29 +533,25 @@ class BossEnemy(Enemy):
         self._sync_rect_and_clamp()
 
         # 武器视觉效果更新
-        try:
-            if isinstance(self.weapon, (RangedWeapon, MeleeWeapon)):
-                self.weapon.update(dt)
-        except Exception:
-            pass
+        if self.timers is None or self._weapon_busy:
+            try:
+                if isinstance(self.weapon, (RangedWeapon, MeleeWeapon)):
+                    self.weapon.update(dt)
+            except Exception:
+                pass
 
-    def _emit_skill1(self, dirx, diry):
-        bullets = []
-        center = pygame.math.Vector2(self.rect.center)
-        base_angle = math.degrees(math.atan2(diry, dirx))
-        step = 20
-        for i, a in enumerate(range(0, 360, step)):
-            if (i % 5) in (3, 4):
-                continue
-            ang = math.radians(a + base_angle)
-            vx = math.cos(ang)
-            vy = math.sin(ang)
-            bpos = (int(center.x + vx * (self.rect.width // 2)), int(center.y + vy * (self.rect.height // 2)))
-            b = Bullet(bpos, (vx, vy), BULLET_SPEED * 0.85, 'enemy', damage=self.bullet_damage)
-            bullets.append(b)
-        return bullets
-
-    def try_shoot(self, player, now):
+    def _emit_skill1(self, dirx, diry, pool=None):
+        """按预编译的技能1图案整批发射弹幕；写入池时返回发射数量，否则返回子弹列表。"""
+        pattern = compile_pattern(self.skill1_pattern)
+        emission = self.skill1_emissions
+        self.skill1_emissions += 1
+        args = (self.rect.center, (dirx, diry), BULLET_SPEED * 0.85, 'enemy')
+        kwargs = {'damage': self.bullet_damage, 'offset': self.rect.width // 2, 'emission': emission}
+        if pool is not None:
+            return len(pattern.emit(pool, *args, **kwargs))
+        return pattern.bullets(*args, **kwargs)
+
+    def try_shoot(self, player, now, pool=None):
         """处理 Boss 的技能触发与弹幕生成；此处也处理突进命中逻辑。"""
         player_pos = player.rect.center if hasattr(player, 'rect') else player
         self.last_player_pos = player_pos
@@ -414,7 +575,7 @@ class BossEnemy(Enemy):
         if self.skill1_active:
             if now - self.skill1_last_emit >= self.skill1_emit_interval:
                 self.skill1_last_emit = now
-                return self._emit_skill1(dirx, diry)
+                return self._emit_skill1(dirx, diry, pool=pool)
             return None
 
         # 如果技能1冷却完且玩家在检测范围内，触发技能1
@@ -428,7 +589,7 @@ class BossEnemy(Enemy):
             return None
 
         # 备用方案：常规拍摄
-        return super().try_shoot(player, now)
+        return super().try_shoot(player, now, pool=pool)
 
     def draw(self, surf):
         # 对象图片
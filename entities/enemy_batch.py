@@ -0,0 +1,356 @@
+"""
+敌人批处理模块：以结构化数组（struct-of-arrays）推进普通敌人的巡逻与瞄准
+
+`Enemy.update` / `Enemy.try_shoot` 逐个对象计算巡逻三角函数、`vec_from_points`、`atan2`
+并分配若干 `Vector2`，冷却中的敌人也不例外。`EnemyBatch` 把一张地图上普通敌人的
+巡逻中心/半径/相位、当前位置、朝向、检测范围与冷却复制到 NumPy 数组中，
+每个逻辑步用少量向量化操作算出全部巡逻位置、朝向角、到玩家的距离与“可开火”掩码，
+只有真正开火的敌人才回到逐对象的 `Enemy._fire`（武器视觉与子弹生成）。
+
+这些数组是 `World` 中 'enemy' 原型表的组件列（见 `entities/ecs.py`），批处理的属性经 `Column` 描述符读写整列；
+碰撞与绘制系统（`entities/systems.py`）直接读同一组列。敌人对象作为门面保留（快照、Boss、逐个推进的路径都读对象）：
+每步把位置/朝向写回对象，开火时同步 `last_shot`。重写了 `update`/`try_shoot` 的子类（Boss）不进批处理，放在 `others` 中照常逐个推进。
+
+追击型敌人（共享同一流场）也在批内推进：按格下标从 `FlowField.arrays` 查出路点与路径长度，
+一次算完全部追击者的移动；随后对追击中的行做分离转向（`utils.separation_pushes`，均匀网格邻居查询），
+避免大群敌人沿同一路径挤成一团，推进不可通行格的分离位移会被放弃。
+
+`lod=True` 时由 `AIScheduler` 按距离/开火时机分档：每步只推进到期的行（远处的敌人按累计 dt 隔几步推进一次，
+超出检测范围的只巡逻不瞄准），写回与武器计时也只涉及这些行，见 `entities/ai_scheduler.py`。
+"""
+
+import numpy as np
+from config.settings import (
+    ENEMY_BATCH_MIN, ENEMY_SIZE, ENEMY_SEPARATION_RADIUS, ENEMY_SEPARATION_SPEED,
+    SPEED_REFERENCE_MS, WIDTH, HEIGHT,
+)
+from entities.ai_scheduler import AIScheduler
+from entities.ecs import World, Column
+from entities.enemy import Enemy
+from utils import vecs_from_points, separation_pushes
+
+
+# 批处理敌人在 `World` 中的原型名与组件（位置为中心点；px/py 为上一逻辑步开始时的位置，供渲染插值）
+ENEMY_ARCHETYPE = 'enemy'
+ENEMY_COMPONENTS = (
+    ('pcx', np.float64), ('pcy', np.float64), ('radius', np.float64), ('patrols', np.bool_),
+    ('phase', np.float64), ('x', np.float64), ('y', np.float64), ('px', np.float64), ('py', np.float64),
+    ('hand', np.float64), ('detect_range', np.float64), ('cooldown', np.float64), ('last_shot', np.float64),
+    ('dirx', np.float64), ('diry', np.float64), ('angle', np.float64),
+    ('chasers', np.bool_), ('chase_speed', np.float64), ('chase_stop', np.float64), ('chase_range', np.float64),
+    ('chasing', np.bool_), ('cx', np.float64), ('cy', np.float64),
+    # 最近一步的到玩家距离与开火掩码（供调度/调试读取）、武器视觉计时是否仍在衰减
+    ('dist', np.float64), ('ready', np.bool_), ('animating', np.bool_),
+)
+
+
+def batchable(enemy):
+    """是否使用基础 `Enemy` 的巡逻/追击/射击逻辑（可以批量推进）。"""
+    cls = type(enemy)
+    return cls.update is Enemy.update and cls.try_shoot is Enemy.try_shoot
+
+
+class EnemyBatch:
+    """
+    一组敌人的批量推进器。
+
+    参数:
+        enemies: 地图上的敌人列表；构建后该列表不应再增删（调用方据 `matches` 判断是否需要重建）
+        min_size: 可批处理的敌人少于该数量时全部放进 `others` 逐个推进
+        lod: 是否用 `AIScheduler` 分档降频推进
+        separation: 追击者之间的分离半径（像素），0 表示不做分离
+        world: 存放组件列的 `World`（缺省新建一个）；构建时清空其中的 'enemy' 原型表
+    """
+
+    pcx = Column()
+    pcy = Column()
+    radius = Column()
+    patrols = Column()
+    phase = Column()
+    x = Column()
+    y = Column()
+    px = Column()
+    py = Column()
+    hand = Column()
+    detect_range = Column()
+    cooldown = Column()
+    last_shot = Column()
+    dirx = Column()
+    diry = Column()
+    angle = Column()
+    chasers = Column()
+    chase_speed = Column()
+    chase_stop = Column()
+    chase_range = Column()
+    chasing = Column()
+    cx = Column()
+    cy = Column()
+    dist = Column()
+    ready = Column()
+    animating = Column()
+
+    def __init__(self, enemies, min_size=ENEMY_BATCH_MIN, lod=False, separation=ENEMY_SEPARATION_RADIUS, world=None):
+        self.source = enemies
+        self.size = len(enemies)
+        # 批内追击者共用一个流场（同一张地图）；流场不同的追击者逐个推进
+        self.flow = next((e.flow for e in enemies if batchable(e) and e.chases()), None)
+        self.enemies = [e for e in enemies if batchable(e) and (not e.chases() or e.flow is self.flow)]
+        inside = set(map(id, self.enemies))
+        self.others = [e for e in enemies if id(e) not in inside]
+        if len(self.enemies) < min_size:
+            self.enemies, self.others = [], list(enemies)
+        objs = self.enemies
+        n = self.n = len(objs)
+
+        def column(fn, dtype=np.float64):
+            return np.fromiter((fn(e) for e in objs), dtype=dtype, count=n)
+
+        # 组件存放在 world 的 'enemy' 原型表中（一次只对应一个批处理，重建时清空）
+        self.world = world if world is not None else World()
+        self.world.clear(ENEMY_ARCHETYPE)
+        self.table = self.world.archetype(ENEMY_ARCHETYPE, ENEMY_COMPONENTS)
+        x = column(lambda e: e.rect.centerx)
+        y = column(lambda e: e.rect.centery)
+        radius = column(lambda e: e.patrol_radius)
+        chasing = column(lambda e: e._chase_pos is not None, dtype=bool)
+        self.eids = self.world.spawn(
+            ENEMY_ARCHETYPE, objs,
+            pcx=column(lambda e: e.patrol_center[0]),
+            pcy=column(lambda e: e.patrol_center[1]),
+            radius=radius,
+            patrols=radius > 0,
+            phase=column(lambda e: e._angle),
+            x=x, y=y, px=x, py=y,
+            hand=column(lambda e: max(0, (e.rect.width // 2) - 2)),
+            detect_range=column(lambda e: e.detect_range),
+            cooldown=column(lambda e: e.fire_cooldown),
+            last_shot=column(lambda e: e.last_shot),
+            dirx=column(lambda e: e.dir[0]),
+            diry=column(lambda e: e.dir[1]),
+            angle=column(lambda e: e.angle),
+            # 追击：是否追击型、速度/停步距离/最大路径长度，以及追击中的浮点位置（未追击的行取当前位置）
+            chasers=column(lambda e: e.chases(), dtype=bool),
+            chase_speed=column(lambda e: e.chase_speed),
+            chase_stop=column(lambda e: e.chase_stop),
+            chase_range=column(lambda e: e.detect_range if e.chase_range is None else e.chase_range),
+            chasing=chasing,
+            cx=column(lambda e: e._chase_pos[0] if e._chase_pos is not None else e.rect.centerx),
+            cy=column(lambda e: e._chase_pos[1] if e._chase_pos is not None else e.rect.centery),
+            # 视觉计时仍在衰减的武器；其余武器的 update 是空操作，不必逐个调用
+            animating=True,
+        )
+        self.separation = separation
+        self._nav_blocked = np.array(self.flow.grid.blocked, dtype=bool) if self.flow is not None else None
+        self.scheduler = AIScheduler(n) if lod and n else None
+
+    def matches(self, enemies):
+        """批处理是否仍对应这份敌人列表（同一列表且数量未变）。"""
+        return enemies is self.source and len(enemies) == self.size
+
+    def _chase(self, rows, dts, alive):
+        """
+        `rows` 中的追击者沿共享流场推进一步（`Enemy._chase` 的数组版本），随后对追击中的行做分离。
+
+        Returns:
+            (chased, moved)：本步处于追击状态的行（不再巡逻）、位置移动了的行
+        """
+        n = self.n
+        flow = self.flow
+        table = flow.arrays()
+        if table is None:
+            chased = np.zeros(n, dtype=bool)
+        else:
+            wx, wy, path = table
+            cells = self._cells(self.x, self.y)
+            at_target = cells == flow.target_cell
+            plen = np.where(at_target, 0.0, path[cells])
+            chased = rows & (at_target | np.isfinite(plen)) & (plen <= self.chase_range)
+
+        # 结束追击：巡逻圆心挪到当前位置对应处，恢复巡逻时不会瞬移回原巡逻圈
+        end = rows & ~chased & self.chasing
+        if end.any():
+            self.pcx = np.where(end, self.x - np.cos(self.phase) * self.radius, self.pcx)
+            self.pcy = np.where(end, self.y - np.sin(self.phase) * self.radius, self.pcy)
+        start = chased & ~self.chasing
+        self.cx = np.where(start, self.x, self.cx)
+        self.cy = np.where(start, self.y, self.cy)
+        self.chasing = (self.chasing & ~rows) | chased
+        moved = np.zeros(n, dtype=bool)
+        if not chased.any():
+            return chased, moved
+
+        # 已到开火距离的行原地停住，其余朝路点（目标格内为目标本身）前进
+        tx, ty = flow.target
+        go = chased & (np.hypot(tx - self.cx, ty - self.cy) > self.chase_stop)
+        px = np.where(at_target, tx, wx[cells])
+        py = np.where(at_target, ty, wy[cells])
+        ndx, ndy, dist = vecs_from_points(self.cx, self.cy, px, py)
+        step = np.minimum(dist, self.chase_speed * (dts / SPEED_REFERENCE_MS))
+        moved = go & (dist != 0)
+        nx = np.where(moved, self.cx + ndx * step, self.cx)
+        ny = np.where(moved, self.cy + ndy * step, self.cy)
+        self.dirx = np.where(moved, ndx, self.dirx)
+        self.diry = np.where(moved, ndy, self.diry)
+
+        if self.separation > 0:
+            # ---- 分离：邻居取全部存活敌人，只推开追击中的行；推进不可通行格则放弃这一步分离 ----
+            idx = np.flatnonzero(alive)
+            ax = np.where(chased, nx, self.x)[idx]
+            ay = np.where(chased, ny, self.y)[idx]
+            sx, sy = separation_pushes(ax, ay, self.separation, rows=np.flatnonzero(chased[idx]))
+            ox = np.zeros(n)
+            oy = np.zeros(n)
+            ox[idx] = sx
+            oy[idx] = sy
+            # 单步位移不超过 ENEMY_SEPARATION_SPEED（按帧折算）
+            mag = np.hypot(ox, oy)
+            scale = ENEMY_SEPARATION_SPEED * (dts / SPEED_REFERENCE_MS) / np.maximum(mag, 1.0)
+            half = ENEMY_SIZE / 2
+            qx = np.clip(nx + ox * scale, half, WIDTH - half)
+            qy = np.clip(ny + oy * scale, half, HEIGHT - half)
+            pushed = chased & (mag > 0) & ~self._nav_blocked[self._cells(qx, qy)]
+            nx = np.where(pushed, qx, nx)
+            ny = np.where(pushed, qy, ny)
+            moved = moved | pushed
+
+        self.cx = np.where(chased, nx, self.cx)
+        self.cy = np.where(chased, ny, self.cy)
+        # 与 round() 相同的银行家舍入
+        self.x = np.where(moved, np.round(nx), self.x)
+        self.y = np.where(moved, np.round(ny), self.y)
+        return chased, moved
+
+    def _cells(self, x, y):
+        """坐标数组所在的导航格下标（与 `NavGrid.cell_of` 相同的取法）。"""
+        grid = self.flow.grid
+        col = np.clip(np.floor_divide(x, grid.cell), 0, grid.cols - 1).astype(np.intp)
+        row = np.clip(np.floor_divide(y, grid.cell), 0, grid.rows - 1).astype(np.intp)
+        return row * grid.cols + col
+
+    def step(self, dt, now, player, pool=None):
+        """
+        推进一个逻辑步：追击/巡逻、面向玩家、按冷却开火。未启用 LOD 与分离时等价于对每个存活敌人依次调用
+        `update(dt, now)` 与 `try_shoot(player, now, pool)`；启用 LOD 时只推进调度器给出的到期行。
+
+        Returns:
+            本步开火的敌人数
+        """
+        objs = self.enemies
+        n = self.n
+        if n == 0:
+            return 0
+        alive = np.fromiter((e.alive for e in objs), dtype=bool, count=n)
+        if not alive.any():
+            return 0
+
+        player_pos = player.rect.center if hasattr(player, 'rect') else player
+        scheduler = self.scheduler
+        if scheduler is None:
+            due = aim = alive
+            dts = dt
+        else:
+            # ---- 分档：到期的行按累计 dt 推进，只巡逻的行不瞄准/开火 ----
+            dist = np.hypot(self.x - player_pos[0], self.y - player_pos[1])
+            until_ready = self.cooldown - (now - self.last_shot)
+            due, aim, dts = scheduler.plan(dt, dist, self.detect_range, until_ready, alive)
+            if not due.any():
+                return 0
+
+        # ---- 追击：沿流场移动；处于追击状态的行本步不巡逻 ----
+        chase = due & self.chasers
+        if chase.any():
+            chased, moved = self._chase(chase, dts, alive)
+        else:
+            chased = moved = np.zeros(n, dtype=bool)
+
+        # ---- 巡逻：圆周上的新位置（与 int() 一样向零取整）及移动方向 ----
+        patrol = due & self.patrols & ~chased
+        if patrol.any():
+            self.phase = np.where(patrol, self.phase + dts * 0.001, self.phase)
+            nx = np.where(patrol, np.trunc(self.pcx + np.cos(self.phase) * self.radius), self.x)
+            ny = np.where(patrol, np.trunc(self.pcy + np.sin(self.phase) * self.radius), self.y)
+            mdx, mdy, mdist = vecs_from_points(self.x, self.y, nx, ny)
+            stepped = mdist > 0
+            self.dirx = np.where(stepped, mdx, self.dirx)
+            self.diry = np.where(stepped, mdy, self.diry)
+            moved = moved | stepped
+            self.x = nx
+            self.y = ny
+
+        # ---- 瞄准：到玩家的单位方向与距离 ----
+        adx, ady, dist = vecs_from_points(self.x, self.y, player_pos[0], player_pos[1])
+        seen = aim & (dist > 0)
+        self.dirx = np.where(seen, adx, self.dirx)
+        self.diry = np.where(seen, ady, self.diry)
+        turned = seen | moved
+        self.angle = np.where(turned, np.degrees(np.arctan2(self.diry, self.dirx)), self.angle)
+        self.dist = dist
+        self.ready = ready = aim & (dist <= self.detect_range) & (now - self.last_shot >= self.cooldown)
+
+        # ---- 写回对象：朝向（本步推进者）、追击状态（追击者）、位置与巡逻相位（巡逻者） ----
+        dirx = self.dirx.tolist()
+        diry = self.diry.tolist()
+        angle = self.angle.tolist()
+        for i in np.flatnonzero(due & turned).tolist():
+            e = objs[i]
+            e.dir = (dirx[i], diry[i])
+            e.angle = angle[i]
+        xs = self.x.tolist()
+        ys = self.y.tolist()
+        if chase.any():
+            cx = self.cx.tolist()
+            cy = self.cy.tolist()
+            pcx = self.pcx.tolist()
+            pcy = self.pcy.tolist()
+            for i in np.flatnonzero(chase).tolist():
+                e = objs[i]
+                if chased[i]:
+                    e._chase_pos = (cx[i], cy[i])
+                    e.rect.center = (int(xs[i]), int(ys[i]))
+                elif e._chase_pos is not None:
+                    e._chase_pos = None
+                    e.patrol_center = (pcx[i], pcy[i])
+        if patrol.any():
+            phase = self.phase.tolist()
+            for i in np.flatnonzero(patrol).tolist():
+                e = objs[i]
+                e.rect.center = (int(xs[i]), int(ys[i]))
+                e._angle = phase[i]
+
+        # ---- 武器视觉计时：只推进仍在衰减的武器（未到期的行留到下次按累计 dt 推进） ----
+        animating = np.flatnonzero(self.animating)
+        if len(animating):
+            done = []
+            for i in animating.tolist():
+                weapon = objs[i].weapon
+                if alive[i] and not due[i]:
+                    continue
+                if alive[i] and hasattr(weapon, 'is_animating'):
+                    weapon.update(dt if scheduler is None else float(dts[i]))
+                    if weapon.is_animating():
+                        continue
+                done.append(i)
+            self.animating[done] = False
+
+        # ---- 开火：只有冷却完毕、在范围内且视线未被遮挡的敌人回到逐对象路径 ----
+        fired = np.flatnonzero(ready)
+        if len(fired):
+            seen = [i for i in fired.tolist() if objs[i].can_see(player_pos)]
+            if len(seen) < len(fired):
+                fired = np.array(seen, dtype=np.intp)
+                ready = np.zeros(n, dtype=bool)
+                ready[fired] = True
+                self.ready = ready
+        if len(fired) == 0:
+            return 0
+        self.last_shot[fired] = now
+        gx = np.trunc(self.x[fired] + adx[fired] * self.hand[fired] - ady[fired] * 10).tolist()
+        gy = np.trunc(self.y[fired] + ady[fired] * self.hand[fired] + adx[fired] * 10).tolist()
+        fdx = adx[fired].tolist()
+        fdy = ady[fired].tolist()
+        for k, i in enumerate(fired.tolist()):
+            e = objs[i]
+            e.last_shot = now
+            e._fire((int(gx[k]), int(gy[k])), player_pos, fdx[k], fdy[k], pool)
+        self.animating[fired] = True
+        return len(fired)
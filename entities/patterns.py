@@ -0,0 +1,123 @@
+"""
+弹幕图案模块：把散射、带缺口的环、螺旋等发射图案预编译为单位方向表
+
+每个图案只在编译时计算一次三角函数，得到相对瞄准方向（0 弧度）的 cos/sin 表；
+发射时用瞄准单位向量做一次向量化旋转，再整批写入 `ProjectilePool`，
+不再对每颗子弹重复 atan2/cos/sin 与对象分配。
+"""
+
+import math
+from functools import lru_cache
+import numpy as np
+from config.settings import BULLET_PATTERNS
+from entities.bullet import Bullet
+
+
+class BulletPattern:
+    """
+    预编译的发射图案。
+
+    参数:
+        angles: 相对瞄准方向的偏转角（弧度）序列
+        spin: 每次发射额外整体旋转的弧度（螺旋图案使用，其余为 0）
+    """
+
+    def __init__(self, angles, spin=0.0):
+        angles = np.asarray(angles, dtype=np.float64)
+        self.cos = np.cos(angles)
+        self.sin = np.sin(angles)
+        self.spin = spin
+
+    def __len__(self):
+        return len(self.cos)
+
+    def directions(self, aim=(1, 0), emission=0):
+        """
+        返回旋转到瞄准方向后的单位方向数组 (dxs, dys)。
+
+        参数:
+            aim: (ax, ay) 瞄准方向，零向量时按 (1, 0) 处理
+            emission: 第几次发射；螺旋图案据此叠加 `spin * emission` 的旋转
+        """
+        ax, ay = aim
+        mag = math.hypot(ax, ay)
+        if mag == 0:
+            ax, ay = 1.0, 0.0
+        elif mag != 1:
+            ax, ay = ax / mag, ay / mag
+        if self.spin:
+            r = self.spin * emission
+            c, s = math.cos(r), math.sin(r)
+            ax, ay = ax * c - ay * s, ax * s + ay * c
+        return self.cos * ax - self.sin * ay, self.sin * ax + self.cos * ay
+
+    def _positions(self, origin, dxs, dys, offset):
+        ox, oy = origin
+        if not offset:
+            return np.full(len(dxs), float(ox)), np.full(len(dys), float(oy))
+        # 与逐颗生成时的 int() 取整保持一致
+        return np.trunc(ox + dxs * offset), np.trunc(oy + dys * offset)
+
+    def emit(self, pool, origin, aim, speed, owner, damage=None, max_range=None, swept=False, offset=0, emission=0):
+        """
+        整批发射到子弹池，返回新子弹的槽位数组。
+
+        参数:
+            offset: 子弹出生点沿各自方向离 `origin` 的距离（例如 Boss 体型半径）
+        """
+        dxs, dys = self.directions(aim, emission)
+        xs, ys = self._positions(origin, dxs, dys, offset)
+        return pool.spawn_batch(xs, ys, dxs, dys, speed, owner, damage=damage, max_range=max_range, swept=swept)
+
+    def bullets(self, origin, aim, speed, owner, damage=None, max_range=None, swept=False, offset=0, emission=0):
+        """与 `emit` 相同的图案，但返回 `Bullet` 对象列表（供不使用子弹池的调用方）。"""
+        dxs, dys = self.directions(aim, emission)
+        xs, ys = self._positions(origin, dxs, dys, offset)
+        return [Bullet((x, y), (dx, dy), speed, owner, damage=damage, max_range=max_range, swept=swept)
+                for x, y, dx, dy in zip(xs.tolist(), ys.tolist(), dxs.tolist(), dys.tolist())]
+
+
+@lru_cache(maxsize=None)
+def spread_pattern(count, spread):
+    """扇形散射：`count` 发均匀分布在以瞄准方向为中心、总张角 `spread`（弧度）的扇形内。"""
+    count = max(1, int(count))
+    if count == 1:
+        return BulletPattern([0.0])
+    return BulletPattern(np.linspace(-spread / 2, spread / 2, count))
+
+
+@lru_cache(maxsize=None)
+def ring_pattern(step_deg, gap_every=0, gaps=()):
+    """环形：每 `step_deg` 度一发；`gap_every` > 0 时，序号 i % gap_every 落在 `gaps` 中的方向留空。"""
+    angles = []
+    for i, a in enumerate(range(0, 360, int(step_deg))):
+        if gap_every and (i % gap_every) in gaps:
+            continue
+        angles.append(math.radians(a))
+    return BulletPattern(angles)
+
+
+@lru_cache(maxsize=None)
+def spiral_pattern(arms, step_deg):
+    """螺旋：`arms` 条均分的旋臂，每次发射整体旋转 `step_deg` 度。"""
+    arms = max(1, int(arms))
+    return BulletPattern([2 * math.pi * k / arms for k in range(arms)], spin=math.radians(step_deg))
+
+
+def compile_pattern(spec):
+    """
+    将图案配置编译为 `BulletPattern`（结果缓存，重复编译不会重新计算三角函数）。
+
+    参数:
+        spec: `BULLET_PATTERNS` 中的名称，或形如 {'kind': 'ring', ...} 的配置字典
+    """
+    if isinstance(spec, str):
+        spec = BULLET_PATTERNS[spec]
+    kind = spec.get('kind')
+    if kind == 'spread':
+        return spread_pattern(spec.get('count', 1), spec.get('spread', 0.0))
+    if kind == 'ring':
+        return ring_pattern(spec.get('step_deg', 20), spec.get('gap_every', 0), tuple(spec.get('gaps', ())))
+    if kind == 'spiral':
+        return spiral_pattern(spec.get('arms', 1), spec.get('step_deg', 0))
+    raise ValueError(f'unknown bullet pattern kind: {kind!r}')
@@ -64,30 +64,44 @@ class Player:
             self.inventory.append(pistol)
             self.apply_weapon_upgrade(pistol.name)
 
-    def move(self, dx, dy):
+    def move(self, dx, dy, obstacles=()):
         """
-        移动玩家并受屏幕边界限制
+        移动玩家并受屏幕边界与障碍物限制
         
         参数:
             dx: x 方向移动距离
             dy: y 方向移动距离
+            obstacles: 障碍物矩形列表；按轴分别移动，撞上时贴着障碍物停下（可沿墙滑动）
         """
         # 支持浮点移动，通过直接修改 rect 的坐标
         self.rect.x += dx
+        for ob in obstacles:
+            if self.rect.colliderect(ob):
+                if dx > 0:
+                    self.rect.right = ob.left
+                elif dx < 0:
+                    self.rect.left = ob.right
         self.rect.y += dy
+        for ob in obstacles:
+            if self.rect.colliderect(ob):
+                if dy > 0:
+                    self.rect.bottom = ob.top
+                elif dy < 0:
+                    self.rect.top = ob.bottom
         # 限制在屏幕范围内
         self.rect.clamp_ip(pygame.Rect(0, 0, WIDTH, HEIGHT))
 
-    def try_shoot(self, target_pos, now):
+    def try_shoot(self, target_pos, now, pool=None):
         """
         尝试射击子弹
         
         参数:
             target_pos: (x, y) 目标位置
             now: 当前时间戳(ms)
+            pool: 可选的 `ProjectilePool`，给出时子弹直接写入池中
         
         返回:
-            Bullet 对象或 None
+            子弹列表（或写入池时的发射数量），未射击返回 None
         """
         weapon = self.inventory[self.equipped_idx]
         if isinstance(weapon, RangedWeapon):
@@ -102,9 +116,9 @@ class Player:
             # 炮塔开火返回子弹列表
             try:
                 gun_pos, direction = self.get_gun_mount(target_pos)
-                return weapon.fire((int(gun_pos.x), int(gun_pos.y)), target_pos)
+                return weapon.fire((int(gun_pos.x), int(gun_pos.y)), target_pos, pool=pool)
             except Exception:
-                return weapon.fire(self.rect.center, target_pos)
+                return weapon.fire(self.rect.center, target_pos, pool=pool)
         else:
             # 未装备远程武器
             return None
@@ -138,7 +152,20 @@ class Player:
         except Exception:
             pass
 
-    def try_melee(self, now, enemies, bullets):
+    def melee_ready(self, now):
+        """当前装备为近战武器且冷却已结束时返回 True。"""
+        weapon = self.inventory[self.equipped_idx]
+        return isinstance(weapon, MeleeWeapon) and now - self.last_melee >= weapon.cooldown
+
+    def try_melee(self, now, enemies, bullets, aim_pos=None, index=None, hit=None):
+        """
+        尝试近战攻击。
+
+        参数:
+            aim_pos: 挥砍瞄准点（通常为鼠标位置）；缺省时沿当前朝向 `dir` 挥砍
+            index: 可选的敌人空间索引，透传给 `MeleeWeapon.attack`
+            hit: 可选的伤害登记回调，透传给 `MeleeWeapon.attack`
+        """
         weapon = self.inventory[self.equipped_idx]
         if isinstance(weapon, MeleeWeapon):
             if now - self.last_melee < weapon.cooldown:
@@ -148,7 +175,12 @@ class Player:
                 weapon.trigger_swing_visual()
             except Exception:
                 pass
-            hit_enemies, reflected = weapon.attack(self.rect.center, enemies, bullets)
+            facing = self.dir
+            if aim_pos is not None:
+                fx, fy, dist = vec_from_points(self.rect.center, aim_pos)
+                if dist != 0:
+                    facing = (fx, fy)
+            hit_enemies, reflected = weapon.attack(self.rect.center, enemies, bullets, facing=facing, index=index, hit=hit)
             return hit_enemies, reflected
         return None
 
@@ -208,12 +240,13 @@ class Player:
             return True
         return False
 
-    def draw(self, surf):
+    def draw(self, surf, now=None):
         """
         绘制玩家及其生命条
         
         Args:
             surf: pygame表面对象
+            now: 模拟时钟(ms)，用于判断武器冷却灰显；缺省时取真实时钟
         """
         # 绘制玩家身体（会根据最后已知的角度进行旋转）
         if self.image:
@@ -262,6 +295,7 @@ class Player:
                 images=self.images,
                 hand_offset_dist=hand_offset_dist,
                 last_shot_time=self.last_shot,
+                now=now,
                 show_gray_cooldown=True,
             )
         elif isinstance(weapon, MeleeWeapon):
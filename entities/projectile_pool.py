@@ -0,0 +1,387 @@
+"""
+子弹池模块：以结构化数组（struct-of-arrays）保存全部在场子弹
+
+每颗子弹不再是独立的 `Bullet` 对象，而是预分配 NumPy 数组中的一行：
+位置（及上一帧位置）、方向、速度、伤害、剩余射程、所有者、是否连续碰撞。每帧的推进、越界/射程剔除与压缩
+都是少量向量化操作。`BulletView` 提供与 `Bullet` 兼容的属性接口，
+供近战反弹等仍按对象访问子弹的代码使用。
+"""
+
+import numpy as np
+import pygame
+from utils import segment_aabb_hits, arc_mask, arc_half_cos
+from config.settings import (
+    BULLET_SIZE, WIDTH, HEIGHT, COLOR_PLAYER_BULLET, COLOR_ENEMY_BULLET,
+    DEFAULT_BULLET_RANGE, DEFAULT_BULLET_DAMAGE, COLLISION_CELL_SIZE, SPEED_REFERENCE_MS
+)
+
+# 所有者编码（数组中以 int8 存储）
+OWNER_PLAYER = 0
+OWNER_ENEMY = 1
+OWNER_CODES = {'player': OWNER_PLAYER, 'enemy': OWNER_ENEMY}
+OWNER_NAMES = {OWNER_PLAYER: 'player', OWNER_ENEMY: 'enemy'}
+
+# 超出屏幕多少像素后剔除子弹（与 Bullet.update 保持一致）
+CULL_MARGIN = 50
+
+# 网格索引：网格列数（覆盖剔除边距在内的整个可活动区域，另留一格余量）
+_GRID_COLS = (WIDTH + 2 * CULL_MARGIN) // COLLISION_CELL_SIZE + 3
+
+# 列名 -> dtype
+_FIELDS = (
+    ('x', np.float64),
+    ('y', np.float64),
+    ('px', np.float64),
+    ('py', np.float64),
+    ('dx', np.float64),
+    ('dy', np.float64),
+    ('speed', np.float64),
+    ('damage', np.int32),
+    ('remaining', np.float64),
+    ('owner', np.int8),
+    ('swept', np.bool_),
+    ('alive', np.bool_),
+)
+
+
+def owner_code(owner):
+    """将 'player'/'enemy' 转为数组编码；未知所有者按敌方处理。"""
+    return OWNER_CODES.get(owner, OWNER_ENEMY)
+
+
+class ProjectilePool:
+    """
+    预分配的子弹池。
+
+    槽位 [0, count) 为在用子弹；`update` 结束时会把已死亡的子弹压缩掉，
+    因此 `BulletView` 只在下一次 `update`/`compact` 之前有效。
+    """
+
+    def __init__(self, capacity=1024):
+        self.capacity = max(16, int(capacity))
+        self.count = 0
+        for name, dtype in _FIELDS:
+            setattr(self, name, np.zeros(self.capacity, dtype=dtype))
+        # 按网格单元排序的空间索引 (排序后的单元键, 对应槽位)，位置变化后失效，查询时惰性重建
+        self._grid = None
+
+    # ---------------------------- 容量与写入 ----------------------------
+    def _reserve(self, extra):
+        need = self.count + extra
+        if need <= self.capacity:
+            return
+        new_cap = self.capacity
+        while new_cap < need:
+            new_cap *= 2
+        for name, dtype in _FIELDS:
+            old = getattr(self, name)
+            arr = np.zeros(new_cap, dtype=dtype)
+            arr[:self.count] = old[:self.count]
+            setattr(self, name, arr)
+        self.capacity = new_cap
+
+    def spawn(self, pos, direction, speed, owner, damage=None, max_range=None, swept=False):
+        """
+        写入一颗子弹并返回其槽位索引。
+
+        参数与 `Bullet.__init__` 一致。
+        """
+        self._reserve(1)
+        self._grid = None
+        i = self.count
+        self.x[i], self.y[i] = pos
+        self.px[i] = self.x[i]
+        self.py[i] = self.y[i]
+        self.dx[i], self.dy[i] = direction
+        self.speed[i] = speed
+        self.damage[i] = damage if damage is not None else DEFAULT_BULLET_DAMAGE
+        self.remaining[i] = max_range if max_range is not None else DEFAULT_BULLET_RANGE
+        self.owner[i] = owner_code(owner)
+        self.swept[i] = swept
+        self.alive[i] = True
+        self.count += 1
+        return i
+
+    def spawn_batch(self, xs, ys, dxs, dys, speed, owner, damage=None, max_range=None, swept=False):
+        """
+        一次写入一批子弹（xs/ys/dxs/dys 为等长数组，其余参数对整批相同），返回槽位数组。
+        """
+        k = len(xs)
+        if k == 0:
+            return np.zeros(0, dtype=np.int64)
+        self._reserve(k)
+        self._grid = None
+        s = slice(self.count, self.count + k)
+        self.x[s] = xs
+        self.y[s] = ys
+        self.px[s] = self.x[s]
+        self.py[s] = self.y[s]
+        self.dx[s] = dxs
+        self.dy[s] = dys
+        self.speed[s] = speed
+        self.damage[s] = damage if damage is not None else DEFAULT_BULLET_DAMAGE
+        self.remaining[s] = max_range if max_range is not None else DEFAULT_BULLET_RANGE
+        self.owner[s] = owner_code(owner)
+        self.swept[s] = swept
+        self.alive[s] = True
+        self.count += k
+        return np.arange(s.start, s.stop)
+
+    def append(self, bullet):
+        """接收一个 `Bullet`（或兼容对象）并拷贝进池中。"""
+        self.spawn((bullet.x, bullet.y), (bullet.dx, bullet.dy), bullet.speed, bullet.owner,
+                   damage=bullet.damage, max_range=bullet.max_range - getattr(bullet, 'travelled', 0),
+                   swept=getattr(bullet, 'swept', False))
+
+    def extend(self, bullets):
+        for b in bullets:
+            self.append(b)
+
+    def clear(self):
+        self.count = 0
+        self._grid = None
+
+    def state(self):
+        """返回在用槽位各列的拷贝，供快照保存。"""
+        n = self.count
+        return {name: getattr(self, name)[:n].copy() for name, _ in _FIELDS}
+
+    def load_state(self, state):
+        """用 `state()` 的结果整体替换池内容。"""
+        n = len(state['x'])
+        self.clear()
+        self._reserve(n)
+        for name, _ in _FIELDS:
+            getattr(self, name)[:n] = state[name]
+        self.count = n
+
+    # ---------------------------- 每帧推进 ----------------------------
+    def update(self, dt):
+        """
+        推进全部子弹并剔除越界/射程耗尽的子弹，然后压缩数组。
+
+        参数:
+            dt: 逻辑步长(ms)；与 `Bullet.update` 相同，位移按 dt 折算
+        """
+        # 先压缩上一帧碰撞中死亡的子弹
+        self.compact()
+        self._grid = None
+        n = self.count
+        if n == 0:
+            return
+        x = self.x[:n]
+        y = self.y[:n]
+        self.px[:n] = x
+        self.py[:n] = y
+        step = self.speed[:n] * (dt / SPEED_REFERENCE_MS)
+        x += self.dx[:n] * step
+        y += self.dy[:n] * step
+        self.remaining[:n] -= step
+        self.alive[:n] = ((x > -CULL_MARGIN) & (x < WIDTH + CULL_MARGIN)
+                          & (y > -CULL_MARGIN) & (y < HEIGHT + CULL_MARGIN)
+                          & (self.remaining[:n] > 0))
+        self.compact()
+
+    def compact(self):
+        """移除 alive=False 的槽位，保持在用子弹连续存放。"""
+        n = self.count
+        if n == 0:
+            return
+        alive = self.alive[:n]
+        if alive.all():
+            return
+        keep = np.flatnonzero(alive)
+        k = len(keep)
+        self._grid = None
+        for name, _ in _FIELDS:
+            arr = getattr(self, name)
+            arr[:k] = arr[keep]
+        self.count = k
+
+    # ---------------------------- 查询 ----------------------------
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        """按槽位顺序产出存活子弹的 `BulletView`。"""
+        for i in np.flatnonzero(self.alive[:self.count]).tolist():
+            yield BulletView(self, i)
+
+    def alive_indices(self, owner=None):
+        """返回存活子弹的槽位数组，可按所有者过滤。"""
+        n = self.count
+        mask = self.alive[:n]
+        if owner is not None:
+            mask = mask & (self.owner[:n] == owner_code(owner))
+        return np.flatnonzero(mask)
+
+    def rect_columns(self, idx):
+        """返回给定槽位子弹矩形的 (left, top) 整数列表，与 `Bullet.rect` 的取整方式一致。"""
+        half = BULLET_SIZE // 2
+        left = (self.x[idx] - half).astype(np.int64).tolist()
+        top = (self.y[idx] - half).astype(np.int64).tolist()
+        return left, top
+
+    def overlapping(self, rect, owner=None):
+        """
+        返回与 `rect` 相交的存活子弹槽位（向量化判定）。
+
+        普通子弹按当前位置做 AABB 判定；连续碰撞子弹用上一位置到当前位置的线段
+        与按子弹半径外扩的矩形求交，高速弹丸在单帧跨过目标时也能命中。
+        """
+        idx = self.alive_indices(owner)
+        if len(idx) == 0:
+            return idx
+        half = BULLET_SIZE // 2
+        left = np.trunc(self.x[idx] - half)
+        top = np.trunc(self.y[idx] - half)
+        rx, ry, rw, rh = rect
+        hit = (left < rx + rw) & (left + BULLET_SIZE > rx) & (top < ry + rh) & (top + BULLET_SIZE > ry)
+        swept = self.swept[idx]
+        if swept.any():
+            sidx = idx[swept]
+            hit[swept] = segment_aabb_hits(self.px[sidx], self.py[sidx], self.x[sidx], self.y[sidx],
+                                           rx - half, ry - half, rx + rw + half, ry + rh + half)
+        return idx[hit]
+
+    def segment_columns(self, idx):
+        """返回给定槽位子弹本帧运动线段的 (x0, y0, x1, y1) 浮点列表。"""
+        return (self.px[idx].tolist(), self.py[idx].tolist(),
+                self.x[idx].tolist(), self.y[idx].tolist())
+
+    def _cell_keys(self, x, y):
+        cs = COLLISION_CELL_SIZE
+        col = np.floor_divide(x + CULL_MARGIN, cs).astype(np.int64) + 1
+        row = np.floor_divide(y + CULL_MARGIN, cs).astype(np.int64) + 1
+        return row * _GRID_COLS + np.clip(col, 0, _GRID_COLS - 1)
+
+    def _grid_index(self):
+        """返回 (排序后的单元键, 对应槽位)，本帧内多次查询共享同一份索引。"""
+        if self._grid is None:
+            n = self.count
+            keys = self._cell_keys(self.x[:n], self.y[:n])
+            order = np.argsort(keys, kind='stable')
+            self._grid = (keys[order], order)
+        return self._grid
+
+    def query_radius(self, center, radius, owner=None, facing=None, arc_deg=360.0):
+        """
+        返回距 `center` 不超过 `radius` 的存活子弹槽位（按槽位升序）。
+
+        先用网格索引取出覆盖圆的各行单元对应的连续区段，再对候选做精确距离判定，
+        不必扫描整个池。给出 `facing` 时只保留扇形（张角 `arc_deg`）内的子弹。
+        """
+        if self.count == 0:
+            return np.zeros(0, dtype=np.int64)
+        keys, order = self._grid_index()
+        cx, cy = center
+        cs = COLLISION_CELL_SIZE
+        c0 = max(0, int((cx - radius + CULL_MARGIN) // cs) + 1)
+        c1 = min(_GRID_COLS - 1, int((cx + radius + CULL_MARGIN) // cs) + 1)
+        r0 = int((cy - radius + CULL_MARGIN) // cs) + 1
+        r1 = int((cy + radius + CULL_MARGIN) // cs) + 1
+        parts = []
+        for row in range(r0, r1 + 1):
+            lo = np.searchsorted(keys, row * _GRID_COLS + c0, side='left')
+            hi = np.searchsorted(keys, row * _GRID_COLS + c1, side='right')
+            if hi > lo:
+                parts.append(order[lo:hi])
+        if not parts:
+            return np.zeros(0, dtype=np.int64)
+        idx = np.sort(np.concatenate(parts))
+        mask = self.alive[idx]
+        if owner is not None:
+            mask &= self.owner[idx] == owner_code(owner)
+        dx = self.x[idx] - cx
+        dy = self.y[idx] - cy
+        mask &= dx * dx + dy * dy <= radius * radius
+        if facing is not None:
+            mask &= arc_mask(dx, dy, facing, arc_half_cos(arc_deg))
+        return idx[mask]
+
+    def query_arc(self, center, radius, facing, arc_deg, owner=None):
+        """扇形查询：`query_radius` 的便捷写法。"""
+        return self.query_radius(center, radius, owner=owner, facing=facing, arc_deg=arc_deg)
+
+    def views(self, idx):
+        """将槽位数组转换为 `BulletView` 列表。"""
+        return [BulletView(self, i) for i in np.asarray(idx).tolist()]
+
+    def kill(self, i):
+        self.alive[i] = False
+
+    # ---------------------------- 渲染 ----------------------------
+    def draw(self, surf, alpha=1.0):
+        """
+        按所有者颜色绘制全部存活子弹。
+
+        参数:
+            alpha: 渲染插值系数，子弹画在上一位置与当前位置之间 `alpha` 处（1 为当前位置）
+        """
+        half = BULLET_SIZE // 2
+        for owner, color in ((OWNER_PLAYER, COLOR_PLAYER_BULLET), (OWNER_ENEMY, COLOR_ENEMY_BULLET)):
+            idx = self.alive_indices(OWNER_NAMES[owner])
+            if len(idx) == 0:
+                continue
+            if alpha >= 1.0:
+                left, top = self.rect_columns(idx)
+            else:
+                px = self.px[idx]
+                py = self.py[idx]
+                left = (px + (self.x[idx] - px) * alpha - half).astype(np.int64).tolist()
+                top = (py + (self.y[idx] - py) * alpha - half).astype(np.int64).tolist()
+            for lx, ty in zip(left, top):
+                surf.fill(color, (lx, ty, BULLET_SIZE, BULLET_SIZE))
+
+
+def _column(name):
+    def getter(self):
+        return getattr(self._pool, name)[self._i].item()
+
+    def setter(self, value):
+        getattr(self._pool, name)[self._i] = value
+    return property(getter, setter)
+
+
+class BulletView:
+    """
+    池中单颗子弹的 `Bullet` 兼容视图，读写直接作用于池数组。
+
+    仅在下一次 `ProjectilePool.update`/`compact` 之前有效。
+    """
+
+    __slots__ = ('_pool', '_i')
+
+    def __init__(self, pool, i):
+        self._pool = pool
+        self._i = i
+
+    x = _column('x')
+    y = _column('y')
+    dx = _column('dx')
+    dy = _column('dy')
+    speed = _column('speed')
+    damage = _column('damage')
+    swept = _column('swept')
+    alive = _column('alive')
+
+    @property
+    def slot(self):
+        return self._i
+
+    @property
+    def owner(self):
+        return OWNER_NAMES[int(self._pool.owner[self._i])]
+
+    @owner.setter
+    def owner(self, value):
+        self._pool.owner[self._i] = owner_code(value)
+
+    @property
+    def rect(self):
+        half = BULLET_SIZE // 2
+        return pygame.Rect(int(self.x - half), int(self.y - half), BULLET_SIZE, BULLET_SIZE)
+
+    def draw(self, surf):
+        color = COLOR_PLAYER_BULLET if self.owner == 'player' else COLOR_ENEMY_BULLET
+        pygame.draw.rect(surf, color, self.rect)
@@ -0,0 +1,108 @@
+"""
+实体注册表：地图上敌人的迭代列表、按类型的存活计数与“清场”事件
+
+死亡的敌人原本一直留在 `GameMap.enemies` 中，每个逻辑步的推进、碰撞、绘制都要逐个检查 `alive`，
+`Game.update` 还每步用 `all(not e.alive ...)` 判断是否该生成传送门。`EntityRegistry` 负责：
+
+- `entities`：迭代列表。死者积累到存活数的 `ENTITY_COMPACT_RATIO` 以上时由 `compact` 换成只含存活者的新列表
+  （顺序不变）。换列表会让 `Game` 重建敌人批处理，按比例压缩使重建次数与死亡数无关地保持很少；
+- `counts` / `live`：按 `kind` 的存活数与总存活数。实体的 `alive` 由真变假时通知注册表（见 `Enemy.alive`），
+  所以子弹、近战或直接赋值的击杀都会计入；
+- 存活数归零时依次调用 `on_cleared` 登记的回调（地图据此生成传送门），代替每步轮询。
+
+注册表随地图一起进快照。
+"""
+
+from config.settings import ENTITY_COMPACT_RATIO
+
+
+class EntityRegistry:
+    """
+    参数:
+        entities: 初始实体列表（直接作为迭代列表使用，不复制）
+        compact_ratio: 死者数超过存活数的该比例时压缩迭代列表
+    """
+
+    def __init__(self, entities=None, compact_ratio=ENTITY_COMPACT_RATIO):
+        self.compact_ratio = compact_ratio
+        self._cleared = []
+        self.entities = []
+        self.counts = {}
+        self.live = 0
+        # 迭代列表中尚未压缩掉的死者数
+        self.dead = 0
+        if entities is not None:
+            self.reset(entities)
+
+    def __len__(self):
+        return self.live
+
+    @staticmethod
+    def _kind(entity):
+        return getattr(entity, 'kind', type(entity).__name__)
+
+    def on_cleared(self, callback):
+        """登记存活数归零时调用的 `callback()`。"""
+        self._cleared.append(callback)
+
+    def add(self, entity):
+        """加入一个实体（追加到当前迭代列表末尾）。"""
+        entity.registry = self
+        self.entities.append(entity)
+        if entity.alive:
+            kind = self._kind(entity)
+            self.counts[kind] = self.counts.get(kind, 0) + 1
+            self.live += 1
+        else:
+            self.dead += 1
+
+    def extend(self, entities):
+        for entity in entities:
+            self.add(entity)
+
+    def reset(self, entities):
+        """换成一份新的实体列表并重新计数；原来还有存活者而新列表没有时视为清场。"""
+        had_live = self.live > 0
+        for entity in self.entities:
+            if entity.registry is self:
+                entity.registry = None
+        self.entities = entities
+        self.counts = {}
+        self.live = 0
+        self.dead = 0
+        for entity in entities:
+            entity.registry = self
+            if entity.alive:
+                kind = self._kind(entity)
+                self.counts[kind] = self.counts.get(kind, 0) + 1
+                self.live += 1
+            else:
+                self.dead += 1
+        if had_live and self.live == 0:
+            self._emit_cleared()
+
+    def died(self, entity):
+        """实体的 `alive` 由真变假时调用。"""
+        kind = self._kind(entity)
+        self.counts[kind] -= 1
+        self.live -= 1
+        self.dead += 1
+        if self.live == 0:
+            self._emit_cleared()
+
+    def _emit_cleared(self):
+        for callback in self._cleared:
+            callback()
+
+    def compact(self, force=False):
+        """
+        死者较多（或 `force`）时把迭代列表换成只含存活者的新列表。
+
+        Returns:
+            是否换了列表
+        """
+        if self.dead == 0 or (not force and self.dead <= self.live * self.compact_ratio):
+            return False
+        self.entities = [e for e in self.entities if e.alive]
+        self.dead = 0
+        return True
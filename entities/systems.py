@@ -0,0 +1,269 @@
+"""
+在 `World` 原型表上运行的系统：渲染插值、批量绘制与子弹碰撞
+
+移动、冷却与开火系统由 `EnemyBatch.step` 承担（它的数组就是 'enemy' 原型表的组件列）；
+这里补上另外几个按列整段处理的系统：
+
+- `remember_positions`：逻辑步开始前把 x/y 列整段复制到 px/py，渲染时在两者之间插值，
+  代替逐个敌人写进字典的做法；
+- `RenderSystem`：批量绘制普通敌人。身体与挂载武器的旋转贴图按量化角度缓存，生命条按宽度缓存，
+  每个敌人的三次绘制都变成 blit，整张表用一次 `Surface.blits` 按原有顺序画完；武器视觉计时仍在衰减
+  （后坐力/闪光/抖动）或不是远程武器的敌人回到门面对象的 `draw`；
+- `collision_system`：玩家子弹与原型表中敌人矩形的命中检测，按网格候选对向量化筛选，
+  产出的 (槽位, 目标) 序列与 `CollisionWorld.pool_hits` 相同。
+"""
+
+import numpy as np
+import pygame
+from config.settings import ENEMY_SIZE, BULLET_SIZE, COLOR_ENEMY, SPRITE_ANGLE_STEP, SPRITE_CACHE_MAX
+from entities.weapons import RangedWeapon
+from utils import grid_pairs, segment_aabb_entries
+
+# 占位枪械与生命条的颜色（与 `RangedWeapon.render_mounted` / `Enemy.draw` 一致）
+_GUN_PLACEHOLDER_COLOR = (200, 200, 200)
+_HP_BAR_BG = (120, 120, 120)
+_HP_BAR_FG = (200, 200, 60)
+# 挂载武器的侧向偏移与生命条高度/离敌人顶边的距离（像素）
+_LATERAL_OFFSET = 10
+_HP_BAR_HEIGHT = 5
+_HP_BAR_GAP = 6
+
+
+def remember_positions(world):
+    """把带 x/y/px/py 组件的原型表的当前位置记为上一逻辑步位置。"""
+    for table in world.query('x', 'y', 'px', 'py'):
+        table.column('px')[:] = table.column('x')
+        table.column('py')[:] = table.column('y')
+
+
+def _round_away(v):
+    """四舍五入（.5 远离零），与 pygame 把浮点坐标写进 Rect 时的取整一致。"""
+    return np.trunc(v + np.copysign(0.5, v))
+
+
+class SpriteCache:
+    """
+    旋转贴图缓存：键为 (贴图标识, 是否水平翻转, 量化角度)。
+
+    参数:
+        step: 角度量化步长（度），0 表示不量化
+        max_size: 条目上限，超出时整体清空
+    """
+
+    def __init__(self, step=SPRITE_ANGLE_STEP, max_size=SPRITE_CACHE_MAX):
+        self.step = step
+        self.max_size = max_size
+        self._cache = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._cache)
+
+    def rotated(self, key, angle, make, flip=False):
+        """
+        返回旋转 `angle` 度（逆时针）的贴图。
+
+        参数:
+            key: 源贴图的稳定标识（贴图对象本身或武器外观键）
+            make: 未命中时调用，返回源贴图
+        """
+        step = self.step
+        q = round(angle / step) if step else angle
+        entry = (key, flip, q)
+        surf = self._cache.get(entry)
+        if surf is not None:
+            self.hits += 1
+            return surf
+        self.misses += 1
+        if len(self._cache) >= self.max_size:
+            self._cache.clear()
+        image = make()
+        if flip:
+            image = pygame.transform.flip(image, True, False)
+        surf = self._cache[entry] = pygame.transform.rotate(image, q * step if step else angle)
+        return surf
+
+
+class RenderSystem:
+    """
+    普通敌人的批量绘制系统。
+
+    参数:
+        images: 可选的 `ImageManager`（武器贴图从这里取，与 `render_mounted` 相同）
+    """
+
+    def __init__(self, images=None):
+        self.images = images
+        self.sprites = SpriteCache()
+        self._plain = {}
+        self._bars = {}
+
+    def _body(self, size):
+        """没有贴图的敌人：纯色方块（与 `pygame.draw.rect` 填充相同）。"""
+        surf = self._plain.get(size)
+        if surf is None:
+            surf = self._plain[size] = pygame.Surface(size)
+            surf.fill(COLOR_ENEMY)
+        return surf
+
+    def _bar(self, width, hp_w):
+        """生命条：灰底上叠 `hp_w` 宽的黄条。"""
+        key = (width, hp_w)
+        surf = self._bars.get(key)
+        if surf is None:
+            surf = self._bars[key] = pygame.Surface((width, _HP_BAR_HEIGHT))
+            surf.fill(_HP_BAR_BG)
+            if hp_w > 0:
+                surf.fill(_HP_BAR_FG, (0, 0, hp_w, _HP_BAR_HEIGHT))
+        return surf
+
+    def _gun_image(self, weapon):
+        """与 `render_mounted` 相同的枪械源贴图（占位图填成浅灰）。"""
+        gun_img, is_placeholder = weapon.get_gun_image(self.images)
+        if gun_img is None:
+            gun_img = pygame.Surface((14, 5), flags=pygame.SRCALPHA)
+            is_placeholder = True
+        if is_placeholder:
+            gun_img.fill(_GUN_PLACEHOLDER_COLOR)
+        return gun_img
+
+    def draw(self, surf, table, alpha=1.0):
+        """
+        按行序绘制 `table` 中存活的敌人（位置在 px/py 与 x/y 之间按 `alpha` 插值）。
+
+        Returns:
+            本次绘制的敌人数
+        """
+        n = table.count
+        if n == 0:
+            return 0
+        owners = table.owners
+        alive = np.fromiter((o.alive for o in owners), dtype=bool, count=n)
+        rows = np.flatnonzero(alive)
+        if len(rows) == 0:
+            return 0
+        x = table.column('x')[rows]
+        y = table.column('y')[rows]
+        if alpha < 1.0:
+            # 与 `Game._lerp_center` 相同：round() 为银行家舍入
+            px = table.column('px')[rows]
+            py = table.column('py')[rows]
+            x = np.round(px + (x - px) * alpha)
+            y = np.round(py + (y - py) * alpha)
+        fallback = table.column('animating')[rows].tolist()
+        # 挂载武器：单位朝向（零向量取 (1, 0)）、aim_info 的贴图角度与翻转、手部位置
+        dx = table.column('dirx')[rows]
+        dy = table.column('diry')[rows]
+        mag = np.hypot(dx, dy)
+        zero = mag == 0
+        dx = np.where(zero, 1.0, dx / np.where(zero, 1.0, mag))
+        dy = np.where(zero, 0.0, dy / np.where(zero, 1.0, mag))
+        gun_angle = np.degrees(np.arctan2(-dy, dx))
+        flip = (gun_angle < -90) | (gun_angle > 90)
+        gun_angle = np.where(gun_angle < -90, gun_angle + 180, np.where(gun_angle > 90, gun_angle - 180, gun_angle))
+        hand = table.column('hand')[rows]
+        gx = _round_away(x + dx * hand - dy * _LATERAL_OFFSET).astype(np.int64)
+        gy = _round_away(y + dy * hand + dx * _LATERAL_OFFSET).astype(np.int64)
+
+        sprites = self.sprites
+        seq = []
+        for k, (i, cx, cy, body_angle, ga, gf, wx, wy) in enumerate(zip(
+                rows.tolist(), x.astype(np.int64).tolist(), y.astype(np.int64).tolist(),
+                table.column('angle')[rows].tolist(), gun_angle.tolist(), flip.tolist(),
+                gx.tolist(), gy.tolist())):
+            e = owners[i]
+            weapon = e.weapon
+            if fallback[k] or not isinstance(weapon, RangedWeapon):
+                # 武器动画中（或近战武器）：按门面对象原样绘制
+                if seq:
+                    surf.blits(seq, doreturn=False)
+                    seq = []
+                cur = e.rect.center
+                e.rect.center = (cx, cy)
+                try:
+                    e.draw(surf)
+                finally:
+                    e.rect.center = cur
+                continue
+            w, h = e.rect.size
+            if e.image:
+                image = e.image
+                body = sprites.rotated(image, -body_angle, lambda: image)
+                seq.append((body, (cx - body.get_width() // 2, cy - body.get_height() // 2)))
+            else:
+                seq.append((self._body((w, h)), (cx - w // 2, cy - h // 2)))
+            look = (weapon.sprite_key or weapon.name, weapon.gun_size)
+            gun = sprites.rotated(look, ga, lambda: self._gun_image(weapon), flip=gf)
+            seq.append((gun, (wx - gun.get_width() // 2, wy - gun.get_height() // 2)))
+            hp_w = int(w * max(0, e.hp) / e.max_hp)
+            seq.append((self._bar(w, hp_w), (cx - w // 2, cy - h // 2 - _HP_BAR_GAP)))
+        if seq:
+            surf.blits(seq, doreturn=False)
+        return len(rows)
+
+
+def _first_alive(slots, targets, owners):
+    """按顺序产出每个槽位第一个仍存活的候选目标（调用方在两次产出之间可能击杀目标）。"""
+    done = None
+    for slot, row in zip(slots.tolist(), targets.tolist()):
+        if slot == done:
+            continue
+        target = owners[row]
+        if target.alive:
+            done = slot
+            yield slot, target
+
+
+def collision_system(table, pool, player):
+    """
+    逐个产出子弹池中的命中 (槽位, 目标)，敌人矩形取自原型表的 x/y 列（中心点，边长 ENEMY_SIZE）。
+
+    与 `CollisionWorld.pool_hits` 的顺序和取舍相同：先是敌人子弹打中玩家，然后是连续碰撞的玩家子弹
+    （取进入参数 t 最小、同 t 时行号最小的目标），最后是普通玩家子弹（取矩形相交中行号最小的目标）；
+    同一逻辑步内先被击杀的敌人会被后续子弹跳过。
+    """
+    if player is not None:
+        for i in pool.overlapping(player.rect, 'enemy').tolist():
+            yield i, player
+    n = table.count
+    if n == 0:
+        return
+    owners = table.owners
+    rows = np.flatnonzero(np.fromiter((o.alive for o in owners), dtype=bool, count=n))
+    if len(rows) == 0:
+        return
+    idx = pool.alive_indices('player')
+    if len(idx) == 0:
+        return
+    size = ENEMY_SIZE
+    left = table.column('x')[rows].astype(np.int64) - size // 2
+    top = table.column('y')[rows].astype(np.int64) - size // 2
+
+    swept = pool.swept[idx]
+    if swept.any():
+        sidx = idx[swept]
+        idx = idx[~swept]
+        pad = BULLET_SIZE // 2
+        x0, y0, x1, y1 = pool.px[sidx], pool.py[sidx], pool.x[sidx], pool.y[sidx]
+        # 候选：线段中点与敌人中心在两轴上都相距小于（外扩后的边长 + 最长线段投影）
+        reach = size + 2 * pad + max(np.abs(x1 - x0).max(), np.abs(y1 - y0).max())
+        b, r = grid_pairs((x0 + x1) * 0.5, (y0 + y1) * 0.5, left + size // 2, top + size // 2, reach)
+        t = segment_aabb_entries(x0[b], y0[b], x1[b], y1[b],
+                                 left[r] - pad, top[r] - pad, left[r] + size + pad, top[r] + size + pad)
+        hit = np.isfinite(t)
+        b, r, t = b[hit], r[hit], t[hit]
+        order = np.lexsort((r, t, b))
+        yield from _first_alive(sidx[b[order]], rows[r[order]], owners)
+    if len(idx) == 0:
+        return
+    half = BULLET_SIZE // 2
+    bl = np.trunc(pool.x[idx] - half)
+    bt = np.trunc(pool.y[idx] - half)
+    # 两个矩形相交时中心在两轴上都相距小于 (size + BULLET_SIZE) / 2，网格边长取两者之和足够
+    b, r = grid_pairs(bl + half, bt + half, left + size // 2, top + size // 2, size + BULLET_SIZE)
+    hit = ((bl[b] < left[r] + size) & (bl[b] + BULLET_SIZE > left[r])
+           & (bt[b] < top[r] + size) & (bt[b] + BULLET_SIZE > top[r]))
+    b, r = b[hit], r[hit]
+    order = np.lexsort((r, b))
+    yield from _first_alive(idx[b[order]], rows[r[order]], owners)
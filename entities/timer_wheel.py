@@ -0,0 +1,198 @@
+"""
+分层时间轮：按模拟时钟登记定时器，到期时回调
+
+武器后坐力/闪光/抖动、Boss 技能冷却、敌人开火冷却原本都靠每个逻辑步逐个递减或比较 `now - last_shot`，
+冷却中和空闲的实体也要付出这份开销。`TimerWheel` 把定时器按到期的逻辑步分桶（Varghese & Lauck 的分层时间轮）：
+
+- 第 0 层每槽对应一个逻辑步，共 `TIMER_WHEEL_SLOTS` 槽；第 L 层每槽覆盖第 L-1 层一整圈；
+  超出最高层范围的定时器放在溢出表，最高层转完一圈时重新分配；
+- `advance(now)` 每步只看第 0 层的当前槽，低层转完一圈时把上一层对应槽的定时器下放（cascade），
+  每个逻辑步的开销与在登记的定时器总数无关；没有定时器时直接跳到当前步，
+  长时间未推进（例如离开后又回到的地图）时把全部条目按新的当前步重新分配，而不是逐步空转；
+- 到期判定与原先的轮询表达式一致：回调在 `at <= now` 的第一个 `advance` 中执行，同一步内按 (at, 登记顺序) 排序，
+  结果只取决于模拟时钟，录像回放与快照恢复后仍可复现。
+
+回调签名为 `callback(now, *args)`。定时器对象与回调（实体的绑定方法）可以随地图一起被快照序列化。
+"""
+
+from config.settings import SIM_TICK_MS, TIMER_WHEEL_SLOTS, TIMER_WHEEL_LEVELS
+
+
+class Timer:
+    """一个已登记的定时器；`cancel` 后不再回调。"""
+
+    __slots__ = ('at', 'seq', 'callback', 'args', 'active')
+
+    def __init__(self, at, seq, callback, args):
+        self.at = at
+        self.seq = seq
+        self.callback = callback
+        self.args = args
+        self.active = True
+
+    def __getstate__(self):
+        return (self.at, self.seq, self.callback, self.args, self.active)
+
+    def __setstate__(self, state):
+        self.at, self.seq, self.callback, self.args, self.active = state
+
+
+class TimerWheel:
+    """
+    参数:
+        tick_ms: 第 0 层每槽的时长（ms），通常为逻辑步长
+        slots: 每层槽数（2 的幂）
+        levels: 层数
+    """
+
+    def __init__(self, tick_ms=SIM_TICK_MS, slots=TIMER_WHEEL_SLOTS, levels=TIMER_WHEEL_LEVELS):
+        if slots < 2 or slots & (slots - 1):
+            raise ValueError('slots 必须是不小于 2 的 2 的幂')
+        self.tick_ms = tick_ms
+        self.slots = slots
+        self.levels = levels
+        self._bits = slots.bit_length() - 1
+        self._mask = slots - 1
+        self._wheels = [[[] for _ in range(slots)] for _ in range(levels)]
+        self._overflow = []
+        # 已越过当前步、等下一次 advance 再判定的定时器（登记在过去或本步内尚未到期）
+        self._hold = []
+        # 下一个要处理的第 0 层步号；第一次 advance 前为 None
+        self._cur = None
+        # 轮内（不含 _hold）的条目数，含已取消但尚未取出的
+        self._queued = 0
+        self._seq = 0
+        self._active = 0
+        # 累计执行的回调次数
+        self.fired = 0
+
+    def __len__(self):
+        """仍有效（未到期、未取消）的定时器数。"""
+        return self._active
+
+    def _tick(self, at):
+        return int(at // self.tick_ms)
+
+    def schedule(self, at, callback, *args):
+        """
+        登记在模拟时刻 `at`(ms) 到期的定时器。
+
+        Returns:
+            `Timer`，可传给 `cancel`
+        """
+        timer = Timer(at, self._seq, callback, args)
+        self._seq += 1
+        self._active += 1
+        if self._cur is None or self._tick(at) < self._cur:
+            self._hold.append(timer)
+        else:
+            self._place(timer)
+        return timer
+
+    def cancel(self, timer):
+        """取消定时器（惰性删除：条目留在槽里，取出时丢弃）。"""
+        if timer is not None and timer.active:
+            timer.active = False
+            self._active -= 1
+
+    def _place(self, timer):
+        """按到期步与当前步的距离放进对应层的槽。"""
+        tick = self._tick(timer.at)
+        delta = tick - self._cur
+        self._queued += 1
+        span = self.slots
+        for level in range(self.levels):
+            if delta < span:
+                self._wheels[level][(tick >> (self._bits * level)) & self._mask].append(timer)
+                return
+            span <<= self._bits
+        self._overflow.append(timer)
+
+    def _cascade(self):
+        """当前步是某些层一圈的起点：从高到低把这些层当前槽里的定时器重新分配到下层。"""
+        cur = self._cur
+        top = 1
+        while top < self.levels and (cur >> (self._bits * top)) & self._mask == 0:
+            top += 1
+        if top == self.levels and self._overflow:
+            pending, self._overflow = self._overflow, []
+            self._queued -= len(pending)
+            for timer in pending:
+                self._place(timer)
+        for level in range(min(top, self.levels - 1), 0, -1):
+            idx = (cur >> (self._bits * level)) & self._mask
+            bucket = self._wheels[level][idx]
+            if bucket:
+                self._wheels[level][idx] = []
+                self._queued -= len(bucket)
+                for timer in bucket:
+                    self._place(timer)
+
+    def _collect(self, timer, now, due):
+        if not timer.active:
+            return
+        if timer.at <= now:
+            due.append(timer)
+        elif self._tick(timer.at) <= self._cur:
+            self._hold.append(timer)
+        else:
+            self._place(timer)
+
+    def _rebase(self, target, now, due):
+        """跳过的步数超过一圈：取出全部条目，以 `target` 为当前步重新判定/分配。"""
+        pending = self._overflow
+        self._overflow = []
+        for wheel in self._wheels:
+            for idx, bucket in enumerate(wheel):
+                if bucket:
+                    pending.extend(bucket)
+                    wheel[idx] = []
+        self._queued = 0
+        self._cur = target
+        for timer in pending:
+            self._collect(timer, now, due)
+
+    def advance(self, now):
+        """
+        推进到模拟时刻 `now`(ms)，执行全部 `at <= now` 的定时器回调。
+
+        Returns:
+            本次执行的回调数
+        """
+        target = self._tick(now)
+        if self._cur is None:
+            self._cur = target
+        due = []
+        held, self._hold = self._hold, []
+        for timer in held:
+            self._collect(timer, now, due)
+        if target - self._cur > self.slots and self._queued:
+            self._rebase(target, now, due)
+        wheel0 = self._wheels[0]
+        while self._cur <= target:
+            if self._queued == 0:
+                # 轮里没有定时器：直接跳到当前步
+                self._cur = target + 1
+                break
+            idx = self._cur & self._mask
+            if idx == 0:
+                self._cascade()
+            bucket = wheel0[idx]
+            if bucket:
+                wheel0[idx] = []
+                self._queued -= len(bucket)
+                for timer in bucket:
+                    self._collect(timer, now, due)
+            self._cur += 1
+        if not due:
+            return 0
+        due.sort(key=lambda t: (t.at, t.seq))
+        for timer in due:
+            # 先前的回调可能取消了后面的定时器
+            if not timer.active:
+                continue
+            timer.active = False
+            self._active -= 1
+            self.fired += 1
+            timer.callback(now, *timer.args)
+        return len(due)
@@ -10,7 +10,11 @@ from typing import List, Tuple
 import pygame
 from entities.bullet import Bullet
 from config.settings import COLOR_PLAYER_BULLET, MELEE_SPRITE_SIZE, MELEE_SPRITE_FALLBACK_COLOR
-from utils import aim_info
+from utils import aim_info, in_arc, arc_half_cos
+from entities.patterns import spread_pattern
+
+# 纯视觉效果（枪口抖动）使用独立随机源，渲染不消耗全局 random，录像回放时模拟结果不受帧率影响
+_FX_RNG = random.Random()
 
 
 @dataclass
@@ -23,7 +27,7 @@ class Weapon:
 
 
 class RangedWeapon(Weapon):
-    def __init__(self, name, cost, cooldown, damage, speed, range_px, pellets=1, spread=0.0, desc=''):
+    def __init__(self, name, cost, cooldown, damage, speed, range_px, pellets=1, spread=0.0, desc='', swept=False):
         super().__init__(name, 'ranged', cost, cooldown, desc)
         self.damage = damage
         self.speed = speed
@@ -34,6 +38,8 @@ class RangedWeapon(Weapon):
         self.base_cooldown = cooldown
         self.pellets = pellets
         self.spread = spread 
+        # 连续碰撞：弹速远大于子弹尺寸时按帧间线段检测，避免低帧率下穿透目标
+        self.swept = swept
         # 枪支图片设置：默认安装的枪支尺寸（宽、高），单位为像素
         self.gun_size = (14, 5)
         # images下的可选枪支图片名（例如'weapons/basic_pistol'）
@@ -74,38 +80,22 @@ class RangedWeapon(Weapon):
             idx = min(lvl, len(rng_add) - 1)
             self.range_px = int(round(self.base_range + rng_add[idx]))
 
-    def fire(self, owner_pos: Tuple[int,int], aim_pos: Tuple[int,int], owner='player'):
+    def fire(self, owner_pos: Tuple[int,int], aim_pos: Tuple[int,int], owner='player', pool=None):
         """
         发射子弹并返回子弹列表
+
+        散弹方向取自预编译的扇形图案（见 `entities.patterns`），不再逐发计算三角函数。
+        若提供 `pool`（`ProjectilePool`），子弹整批直接写入池中，返回发射数量。
         """
         ox, oy = owner_pos
         dx = aim_pos[0] - ox
         dy = aim_pos[1] - oy
-        base_dist = math.hypot(dx, dy)
-        if base_dist == 0:
-            ax, ay = 1, 0
-        else:
-            ax, ay = dx / base_dist, dy / base_dist
-
-        bullets = []
-        # 散弹多发
-        if self.pellets == 1:
-            b = Bullet((ox, oy), (ax, ay), self.speed, owner, damage=self.damage, max_range=self.range_px)
-            bullets.append(b)
-        else:
-            # 围绕瞄准方向生成扩散角度
-            base_angle = math.atan2(ay, ax)
-            for i in range(self.pellets):
-                if self.pellets == 1:
-                    ang = base_angle
-                else:
-                    t = (i - (self.pellets-1)/2) / (self.pellets-1) if self.pellets>1 else 0
-                    ang = base_angle + t * self.spread
-                adx = math.cos(ang)
-                ady = math.sin(ang)
-                b = Bullet((ox, oy), (adx, ady), self.speed, owner, damage=self.damage, max_range=self.range_px)
-                bullets.append(b)
-        return bullets
+        pattern = spread_pattern(self.pellets, self.spread)
+        if pool is not None:
+            return len(pattern.emit(pool, (ox, oy), (dx, dy), self.speed, owner,
+                                    damage=self.damage, max_range=self.range_px, swept=self.swept))
+        return pattern.bullets((ox, oy), (dx, dy), self.speed, owner,
+                               damage=self.damage, max_range=self.range_px, swept=self.swept)
 
     def get_gun_image(self, images=None, fallback_color=(200,200,200), gray=False):
         """
@@ -142,6 +132,21 @@ class RangedWeapon(Weapon):
         self.flash_timer = self.flash_duration
         self.shake_timer = self.shake_duration
 
+    def is_animating(self):
+        """后坐力/闪光/抖动是否仍在衰减；为 False 时 `update` 不会改变任何状态。"""
+        return self.recoil > 0 or self.flash_timer > 0 or self.shake_timer > 0
+
+    def visual_ms(self):
+        """从 `trigger_fire_visual` 起，按 `update` 的线性衰减全部视觉计时归零所需的时间(ms)。"""
+        recoil_ms = self.recoil_strength / self.recoil_return_speed * 1000.0 if self.recoil_return_speed > 0 else 0.0
+        return max(self.flash_duration, self.shake_duration, recoil_ms)
+
+    def settle(self):
+        """把视觉计时直接置零（由定时器在 `visual_ms` 到期时调用，代替逐步 `update`）。"""
+        self.recoil = 0.0
+        self.flash_timer = 0.0
+        self.shake_timer = 0.0
+
     def update(self, dt):
         """更新武器的视觉计时器。dt 单位为毫秒。"""
         if self.recoil > 0:
@@ -215,8 +220,8 @@ class RangedWeapon(Weapon):
 
         shake_offset = pygame.math.Vector2(0, 0)
         if shake_timer > 0:
-            shake_offset.x = random.randint(-shake_strength, shake_strength)
-            shake_offset.y = random.randint(-shake_strength, shake_strength)
+            shake_offset.x = _FX_RNG.randint(-shake_strength, shake_strength)
+            shake_offset.y = _FX_RNG.randint(-shake_strength, shake_strength)
 
         hand_offset = pygame.math.Vector2(direction) * hand_offset_dist + pygame.math.Vector2(-direction.y, direction.x) * lateral_offset
         gun_pos = pygame.math.Vector2(origin) + hand_offset + recoil_offset + shake_offset
@@ -244,41 +249,65 @@ class MeleeWeapon(Weapon):
         self.swing_arc = 140.0  # 摆动总角度
         self.swing_dir = 1 
 
-    def attack(self, owner_pos: Tuple[int,int], enemies: List, bullets: List[Bullet]):
+    def attack(self, owner_pos: Tuple[int,int], enemies: List, bullets: List[Bullet], facing=None, index=None, hit=None):
         """
         执行近战攻击：对 `enemies` 造成伤害并可反弹 `bullets`。
         返回受影响的敌人与被反弹的子弹列表。
+
+        参数:
+            facing: (fx, fy) 挥砍朝向；给出时只命中 `swing_arc` 扇形内的目标（与挥舞动画一致），
+                    为 None 时按整圆判定
+            index: 可选的敌人空间索引（需提供 `query_radius`），给出时不再遍历 `enemies`；
+                   `bullets` 若提供 `query_radius`（如 `ProjectilePool`）同样直接查询索引
+            hit: 可选的伤害登记回调 `hit(enemy, damage)`（如 `CombatResolver.hit`）；缺省时直接扣血并判定死亡
         """
         ox, oy = owner_pos
         hit_enemies = []
         reflected_bullets = []
+        arc = self.swing_arc if facing is not None else 360.0
+        half_cos = arc_half_cos(arc)
         # 伤害敌人
-        for e in enemies:
-            if not getattr(e, 'alive', True):
+        if index is not None:
+            targets = index.query_radius(owner_pos, self.radius, facing=facing, arc_deg=arc)
+        else:
+            targets = []
+            for e in enemies:
+                if not getattr(e, 'alive', True):
+                    continue
+                ex, ey = e.rect.center
+                dist = math.hypot(ex - ox, ey - oy)
+                if dist <= self.radius and in_arc(ex - ox, ey - oy, facing, half_cos):
+                    targets.append(e)
+        for e in targets:
+            hit_enemies.append(e)
+            if hit is not None:
+                hit(e, self.damage)
                 continue
-            ex, ey = e.rect.center
-            dist = math.hypot(ex - ox, ey - oy)
-            if dist <= self.radius:
-                e.hp -= self.damage
-                hit_enemies.append(e)
-                if e.hp <= 0:
-                    e.alive = False
+            e.hp -= self.damage
+            if e.hp <= 0:
+                e.alive = False
 
         # 反弹子弹
         if self.reflect:
-            for b in bullets:
-                if not b.alive or b.owner == 'player':
-                    continue
-                bx, by = b.x, b.y
-                distb = math.hypot(bx - ox, by - oy)
-                if distb <= self.radius:
-                    # 反射：反向并更改所有者
-                    b.dx = -b.dx
-                    b.dy = -b.dy
-                    b.owner = 'player'
-                    # 更改伤害值/颜色
-                    b.damage = int(b.damage * 0.9) 
-                    reflected_bullets.append(b)
+            if hasattr(bullets, 'query_radius'):
+                candidates = bullets.views(bullets.query_radius(owner_pos, self.radius, owner='enemy', facing=facing, arc_deg=arc))
+            else:
+                candidates = []
+                for b in bullets:
+                    if not b.alive or b.owner == 'player':
+                        continue
+                    bx, by = b.x, b.y
+                    distb = math.hypot(bx - ox, by - oy)
+                    if distb <= self.radius and in_arc(bx - ox, by - oy, facing, half_cos):
+                        candidates.append(b)
+            for b in candidates:
+                # 反射：反向并更改所有者
+                b.dx = -b.dx
+                b.dy = -b.dy
+                b.owner = 'player'
+                # 更改伤害值/颜色
+                b.damage = int(b.damage * 0.9) 
+                reflected_bullets.append(b)
         return hit_enemies, reflected_bullets
 
     def get_melee_image(self, images=None, fallback_color=None):
@@ -304,6 +333,18 @@ class MeleeWeapon(Weapon):
         # 每次触发时交替摆动方向，以避免视觉上的突然跳动
         self.swing_dir *= -1
 
+    def is_animating(self):
+        """挥砍动画是否仍在播放；为 False 时 `update` 不会改变任何状态。"""
+        return self.swing_timer > 0
+
+    def visual_ms(self):
+        """从 `trigger_swing_visual` 起挥砍动画播完所需的时间(ms)。"""
+        return self.swing_duration
+
+    def settle(self):
+        """结束挥砍动画（由定时器在 `visual_ms` 到期时调用，代替逐步 `update`）。"""
+        self.swing_timer = 0
+
     def update(self, dt):
         """更新挥砍计时器。dt 单位为毫秒。"""
         if self.swing_timer > 0:
@@ -360,7 +401,7 @@ sg.muzzle_offset = 18
 sg.sprite_key = 'weapons/shotgun'
 sg.sprite_key_gray = 'weapons/shotgun_gray'
 
-sr = RangedWeapon('Sniper Rifle', cost=400, cooldown=900, damage=80, speed=18, range_px=1200, pellets=1, spread=0.0, desc='远距离高伤害的狙击步枪')
+sr = RangedWeapon('Sniper Rifle', cost=400, cooldown=900, damage=80, speed=18, range_px=1200, pellets=1, spread=0.0, desc='远距离高伤害的狙击步枪', swept=True)
 sr.gun_size = (28, 6)
 sr.recoil_strength = 18.0
 sr.recoil_return_speed = 200.0
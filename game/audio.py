@@ -5,7 +5,14 @@
 """
 
 import os
+import time
 import pygame
+from game.trace import traced
+from game import metrics
+
+_PLAYS = metrics.counter('music_plays_total', '成功开始播放音乐的次数')
+_PLAY_FAILURES = metrics.counter('music_play_failures_total', '音乐文件缺失或加载失败次数')
+_LOAD_MS = metrics.gauge('music_load_ms', '最近一次 pygame.mixer.music.load 耗时(ms)')
 
 
 class MusicPlayer:
@@ -32,17 +39,23 @@ class MusicPlayer:
             fname = f"{name}.mp3"
         return os.path.join(self.base_dir, fname)
 
+    @traced('MusicPlayer.play', 'io')
     def play(self, name, loops=-1, volume=0.6, fade_ms=400):
         path = self._full_path(name)
         if not os.path.exists(path):
+            _PLAY_FAILURES.inc()
             return False
         try:
+            t0 = time.perf_counter()
             pygame.mixer.music.load(path)
+            _LOAD_MS.set((time.perf_counter() - t0) * 1000.0)
             pygame.mixer.music.set_volume(volume)
             pygame.mixer.music.play(loops=loops, fade_ms=fade_ms)
             self.current = name
+            _PLAYS.inc()
             return True
         except Exception:
+            _PLAY_FAILURES.inc()
             return False
 
     def stop(self, fade_ms=300):
@@ -0,0 +1,271 @@
+"""碰撞检测模块：均匀网格空间哈希与分层碰撞世界。
+
+`SpatialHash` 把目标矩形按固定大小的网格单元分桶，查询时只返回矩形覆盖的单元内的候选对象；
+`CollisionWorld` 为每个碰撞层（玩家 / 敌人）维护一个空间哈希，每帧重建一次，
+子弹按所有者只检测对应目标层中的附近对象，避免 O(子弹 × 敌人) 的全量遍历。
+标记为连续碰撞（swept）的高速子弹使用“上一位置 -> 当前位置”线段与目标矩形求交，
+即使一帧内跨过整个目标也不会穿透。
+"""
+
+import pygame
+from config.settings import COLLISION_CELL_SIZE, BULLET_SIZE
+from utils import segment_aabb_entry, in_arc, arc_half_cos
+
+# 碰撞层名称
+LAYER_PLAYER = 'player'
+LAYER_ENEMY = 'enemy'
+
+# 子弹所有者 -> 需要检测的目标层
+BULLET_TARGET_LAYERS = {
+    'player': LAYER_ENEMY,
+    'enemy': LAYER_PLAYER,
+}
+
+
+class SpatialHash:
+    """
+    均匀网格空间哈希：单元格坐标 -> ([插入序号], [对象], [矩形]) 三个平行列表。
+
+    查询结果按插入顺序返回，保证与原先按列表顺序遍历时的命中优先级一致。
+    """
+
+    def __init__(self, cell_size=COLLISION_CELL_SIZE):
+        self.cell_size = max(1, int(cell_size))
+        self._cells = {}
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def clear(self):
+        """清空所有单元格（每帧重建前调用）。"""
+        self._cells.clear()
+        self._count = 0
+
+    def _cell_span(self, left, top, right, bottom):
+        cs = self.cell_size
+        # right/bottom 为开区间，减 1 后再取整避免恰好落在边界上的矩形多占一列/一行
+        return int(left // cs), int(top // cs), int((right - 1) // cs), int((bottom - 1) // cs)
+
+    def insert(self, obj, rect):
+        """
+        将对象按其矩形覆盖的全部单元格插入。
+
+        参数:
+            obj: 任意对象（通常为带 `rect` 的实体）
+            rect: pygame.Rect
+        """
+        x, y, w, h = rect
+        c0, r0, c1, r1 = self._cell_span(x, y, x + max(1, w), y + max(1, h))
+        order = self._count
+        cells = self._cells
+        for cx in range(c0, c1 + 1):
+            for cy in range(r0, r1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = ([order], [obj], [rect])
+                else:
+                    bucket[0].append(order)
+                    bucket[1].append(obj)
+                    bucket[2].append(rect)
+        self._count += 1
+
+    def _buckets(self, rect):
+        x, y, w, h = rect
+        c0, r0, c1, r1 = self._cell_span(x, y, x + max(1, w), y + max(1, h))
+        cells = self._cells
+        if c0 == c1 and r0 == r1:
+            bucket = cells.get((c0, r0))
+            return (bucket,) if bucket else ()
+        found = []
+        for cx in range(c0, c1 + 1):
+            for cy in range(r0, r1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.append(bucket)
+        return found
+
+    def query_rect(self, rect):
+        """
+        返回矩形覆盖的单元格中的候选对象（去重，按插入顺序）。
+
+        参数:
+            rect: pygame.Rect 或 (x, y, w, h)
+        """
+        buckets = self._buckets(rect)
+        if len(buckets) == 1:
+            return list(buckets[0][1])
+        seen = {}
+        for orders, objs, _ in buckets:
+            for order, obj in zip(orders, objs):
+                seen[order] = obj
+        return [seen[k] for k in sorted(seen)]
+
+    def query_radius(self, center, radius, facing=None, arc_deg=360.0):
+        """
+        返回矩形中心到 `center` 距离不超过 `radius` 的存活对象（按插入顺序）。
+
+        参数:
+            facing: (fx, fy) 单位向量；给出时只保留落在以其为中心、张角 `arc_deg` 的扇形内的对象
+            arc_deg: 扇形总张角（度），360 表示整圆
+        """
+        cx, cy = center
+        r2 = radius * radius
+        half_cos = arc_half_cos(arc_deg) if facing is not None else -1.0
+        span = (cx - radius, cy - radius, 2 * radius + 1, 2 * radius + 1)
+        found = {}
+        for orders, objs, rects in self._buckets(span):
+            for order, obj, r in zip(orders, objs, rects):
+                if order in found or not getattr(obj, 'alive', True):
+                    continue
+                ex, ey = r.center
+                dx = ex - cx
+                dy = ey - cy
+                if dx * dx + dy * dy <= r2 and in_arc(dx, dy, facing, half_cos):
+                    found[order] = obj
+        return [found[k] for k in sorted(found)]
+
+    def query_arc(self, center, radius, facing, arc_deg):
+        """扇形查询：`query_radius` 的便捷写法。"""
+        return self.query_radius(center, radius, facing=facing, arc_deg=arc_deg)
+
+    def first_overlap(self, rect):
+        """
+        返回与 `rect` 相交、且插入顺序最靠前的对象；没有则返回 None。
+
+        `alive` 属性为 False 的对象（例如同一帧内刚被击杀的敌人）会被跳过。
+        精确相交判定交给 `Rect.collidelist`，在 C 层逐个比较同一单元格内的矩形。
+        """
+        best_order = None
+        best = None
+        for orders, objs, rects in self._buckets(rect):
+            base = 0
+            while True:
+                i = rect.collidelist(rects[base:] if base else rects)
+                if i < 0:
+                    break
+                i += base
+                obj = objs[i]
+                if getattr(obj, 'alive', True):
+                    if best_order is None or orders[i] < best_order:
+                        best_order = orders[i]
+                        best = obj
+                    break
+                base = i + 1
+        return best
+
+    def first_segment_hit(self, x0, y0, x1, y1, pad=0):
+        """
+        返回线段 (x0, y0) -> (x1, y1) 最先进入的对象；没有则返回 None。
+
+        参数:
+            pad: 目标矩形向外扩展的像素（子弹半径），等价于让有尺寸的子弹沿线段扫过
+        """
+        left = min(x0, x1) - pad
+        top = min(y0, y1) - pad
+        span = (left, top, max(x0, x1) + pad - left + 1, max(y0, y1) + pad - top + 1)
+        best_key = None
+        best = None
+        for orders, objs, rects in self._buckets(span):
+            for order, obj, r in zip(orders, objs, rects):
+                if not getattr(obj, 'alive', True):
+                    continue
+                t = segment_aabb_entry(x0, y0, x1, y1, r.left - pad, r.top - pad, r.right + pad, r.bottom + pad)
+                if t is None:
+                    continue
+                key = (t, order)
+                if best_key is None or key < best_key:
+                    best_key = key
+                    best = obj
+        return best
+
+
+class CollisionWorld:
+    """
+    分层碰撞世界：每个碰撞层对应一个空间哈希。
+
+    使用方式：每帧先调用 `rebuild` 重新登记玩家与存活敌人，再对每颗子弹调用 `first_hit`。
+    """
+
+    def __init__(self, cell_size=COLLISION_CELL_SIZE):
+        self.layers = {
+            LAYER_PLAYER: SpatialHash(cell_size),
+            LAYER_ENEMY: SpatialHash(cell_size),
+        }
+        # 查询子弹池时复用的矩形，避免每颗子弹分配一个 pygame.Rect
+        self._probe = pygame.Rect(0, 0, BULLET_SIZE, BULLET_SIZE)
+        self._player = None
+
+    def rebuild(self, player, enemies):
+        """
+        按当前帧的实体位置重建所有碰撞层。
+
+        参数:
+            player: 玩家对象（需要 `rect`）
+            enemies: 敌人列表，仅登记存活的敌人
+        """
+        player_layer = self.layers[LAYER_PLAYER]
+        enemy_layer = self.layers[LAYER_ENEMY]
+        player_layer.clear()
+        enemy_layer.clear()
+        self._player = player
+        if player is not None:
+            player_layer.insert(player, player.rect)
+        for e in enemies:
+            if e.alive:
+                enemy_layer.insert(e, e.rect)
+
+    @property
+    def enemies(self):
+        """敌人层的空间哈希，供近战等半径/扇形查询使用。"""
+        return self.layers[LAYER_ENEMY]
+
+    def first_hit(self, bullet):
+        """
+        返回子弹在其目标层中命中的第一个对象；没有命中返回 None。
+
+        同一帧内已被击杀的敌人（alive=False）会被跳过。
+        """
+        layer = self.layers.get(BULLET_TARGET_LAYERS.get(bullet.owner))
+        if layer is None:
+            return None
+        if getattr(bullet, 'swept', False):
+            return layer.first_segment_hit(bullet.prev_x, bullet.prev_y, bullet.x, bullet.y, BULLET_SIZE // 2)
+        return layer.first_overlap(bullet.rect)
+
+    def pool_hits(self, pool):
+        """
+        逐个产出子弹池中的命中 (槽位, 目标)。
+
+        玩家子弹在敌人层中做空间哈希查询；敌人子弹只与玩家矩形做一次向量化判定。
+        以生成器形式返回，调用方在处理完一次命中（例如击杀敌人）后再继续查询，
+        从而让同一帧内后续子弹跳过已死亡的敌人。
+        """
+        player = self._player
+        if player is not None:
+            for i in pool.overlapping(player.rect, 'enemy').tolist():
+                yield i, player
+
+        enemy_layer = self.layers[LAYER_ENEMY]
+        if len(enemy_layer) == 0:
+            return
+        idx = pool.alive_indices('player')
+        if len(idx) == 0:
+            return
+        swept = pool.swept[idx]
+        if swept.any():
+            sidx = idx[swept]
+            idx = idx[~swept]
+            pad = BULLET_SIZE // 2
+            for i, x0, y0, x1, y1 in zip(sidx.tolist(), *pool.segment_columns(sidx)):
+                target = enemy_layer.first_segment_hit(x0, y0, x1, y1, pad)
+                if target is not None:
+                    yield i, target
+        probe = self._probe
+        left, top = pool.rect_columns(idx)
+        for i, lx, ty in zip(idx.tolist(), left, top):
+            probe.x = lx
+            probe.y = ty
+            target = enemy_layer.first_overlap(probe)
+            if target is not None:
+                yield i, target
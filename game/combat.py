@@ -0,0 +1,85 @@
+"""
+战斗结算：按逻辑步收集伤害事件，对每个目标一次性扣血并发放击杀奖励
+
+伤害原本散落在 `Game.update` 的子弹命中循环与近战分支里，各自扣血、判定死亡、累加击杀数与金币。
+`CombatResolver` 把这些都收拢到一处：
+
+- `hit(target, damage)` / `hurt_player(damage)`：碰撞循环与近战只登记伤害。敌人的累计伤害达到剩余生命时
+  立即把它标记为死亡，命中生成器据此跳过它（与逐次扣血时“同一步内先被击杀的敌人不再挡子弹”一致）；
+- `resolve(player)`：每个逻辑步调用一次，按首次命中的顺序对每个目标扣一次累计伤害，
+  为本步击杀的敌人发放 `money` 奖励，返回本步的 `CombatStats` 并累加进运行指标。
+"""
+
+from dataclasses import dataclass
+from config.settings import MONEY_PER_ENEMY
+from game import metrics
+
+_KILLS = metrics.counter('kills_total', '击杀敌人数')
+_DAMAGE_DEALT = metrics.counter('damage_dealt_total', '玩家对敌人造成的伤害')
+_DAMAGE_TAKEN = metrics.counter('damage_taken_total', '玩家受到的子弹伤害')
+
+
+@dataclass
+class CombatStats:
+    """一个逻辑步的战斗统计。"""
+    hits: int = 0
+    damage_dealt: int = 0
+    damage_taken: int = 0
+    kills: int = 0
+    money: int = 0
+
+
+class CombatResolver:
+    """逐步收集伤害事件并批量结算。"""
+
+    def __init__(self):
+        # 敌人 -> 本步累计伤害（dict 保持首次命中的顺序）；玩家受到的伤害单独累计
+        self._pending = {}
+        self._taken = 0
+        # 本步由累计伤害判定死亡的目标
+        self._killed = []
+        self._hits = 0
+        # 最近一次 resolve 的统计
+        self.stats = CombatStats()
+
+    def hit(self, target, damage):
+        """登记一次对敌人 `target` 的伤害；累计伤害致死时立即标记死亡（生命值在 `resolve` 时扣除）。"""
+        self._hits += 1
+        total = self._pending.get(target, 0) + damage
+        self._pending[target] = total
+        if target.alive and target.hp - total <= 0:
+            target.alive = False
+            self._killed.append(target)
+
+    def hurt_player(self, damage):
+        """登记一次玩家受到的伤害。"""
+        self._hits += 1
+        self._taken += damage
+
+    def resolve(self, player):
+        """
+        对本步登记过伤害的每个目标扣一次血，并为击杀发放奖励。
+
+        Returns:
+            本步的 `CombatStats`
+        """
+        stats = CombatStats(hits=self._hits, damage_taken=self._taken)
+        if self._taken:
+            player.hp -= self._taken
+        for target, damage in self._pending.items():
+            target.hp -= damage
+            stats.damage_dealt += damage
+        for target in self._killed:
+            stats.kills += 1
+            stats.money += getattr(target, 'money', MONEY_PER_ENEMY)
+        player.money += stats.money
+        self._pending = {}
+        self._killed = []
+        self._taken = 0
+        self._hits = 0
+        self.stats = stats
+        if stats.hits:
+            _KILLS.inc(stats.kills)
+            _DAMAGE_DEALT.inc(stats.damage_dealt)
+            _DAMAGE_TAKEN.inc(stats.damage_taken)
+        return stats
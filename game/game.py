@@ -3,20 +3,65 @@
 包含核心游戏逻辑和主循环
 """
 
+import os
 import pygame
 import sys
 import random
+import time
+import weakref
 from config.settings import (
     WIDTH, HEIGHT, FPS, WINDOW_TITLE, MAP_COUNT,
-    PLAYER_MAX_HP, MONEY_PER_RESOURCE, MONEY_PER_ENEMY, BULLET_SPEED
+    PLAYER_MAX_HP, MONEY_PER_RESOURCE, BULLET_SPEED,
+    SPEED_REFERENCE_MS, SIM_TICK_MS, MAX_FRAME_MS, MAX_SIM_STEPS_PER_FRAME, MAX_SKIPPED_RENDERS,
+    PROFILE_DIR, AI_LOD
 )
 from entities.weapons import SHOP_WEAPONS
 from config.settings import SHOP_MEDKIT_COST, SHOP_MEDKIT_HEAL
 from game.shop_ui import ShopItem
 from entities.player import Player
 from maps.game_map import GameMap
+from maps.horde_map import HordeMap
 from game.shop_ui import ShopUI, ShopState
 from game.hud import HUDRenderer
+from game.collision import CollisionWorld
+from game.combat import CombatResolver
+from entities.projectile_pool import ProjectilePool
+from entities.enemy_batch import EnemyBatch
+from entities.ecs import World
+from entities.systems import RenderSystem, collision_system, remember_positions
+from game.input_source import LiveInput
+from game.profiler import FrameProfiler
+from game import trace
+from game import watchdog
+from game import metrics
+
+
+def _no_lap(name):
+    pass
+
+
+_FRAMES = metrics.counter('frames_total', '渲染循环帧数（含跳过渲染的帧）')
+_SIM_TICKS = metrics.counter('sim_ticks_total', '逻辑步数')
+_FPS = metrics.gauge('fps', '帧率（帧间隔的指数滑动平均）')
+_FRAME_MS = metrics.gauge('frame_ms', '最近一帧的帧间隔(ms)')
+_BULLETS_ALIVE = metrics.gauge('bullets_alive', '在场子弹数')
+_ENEMIES_ALIVE = metrics.gauge('enemies_alive', '当前地图存活敌人数')
+_MAP_INDEX = metrics.gauge('map_index', '当前地图序号（从 0 开始）')
+
+
+def _watch_game(game):
+    """让局内仪表在导出时读取最近创建的 Game（弱引用，不延长其生命周期）。"""
+    ref = weakref.ref(game)
+
+    def read(fn):
+        def get():
+            g = ref()
+            return fn(g) if g is not None else None
+        return get
+
+    _BULLETS_ALIVE.set_function(read(lambda g: len(g.bullets)))
+    _ENEMIES_ALIVE.set_function(read(lambda g: g.curmap.registry.live))
+    _MAP_INDEX.set_function(read(lambda g: g.current_map_idx))
 
 
 class Game:
@@ -24,15 +69,21 @@ class Game:
     主游戏类：管理游戏状态、更新和渲染
     """
     
-    def __init__(self, screen, clock, font, bigfont, images=None, music=None, initial_state=None):
+    def __init__(self, screen, clock, font, bigfont, images=None, music=None, initial_state=None,
+                 input_source=None, headless=False, start_time=None, recorder=None, mode='campaign'):
         """
         初始化游戏
         
         参数:
-            screen: pygame 显示表面
+            screen: pygame 显示表面（无窗口运行时可为 None）
             clock: pygame 时钟对象
             font: pygame 小号字体对象
             bigfont: pygame 大号字体对象
+            input_source: 每个逻辑步的输入来源（见 game.input_source），缺省读取键盘鼠标
+            headless: 无窗口运行：商店与结算界面不再等待玩家操作
+            start_time: 模拟时钟起点(ms)，缺省取 pygame.time.get_ticks()
+            recorder: 可选的 `game.replay.InputRecorder`，逐步记录输入与商店操作
+            mode: 'campaign' 按顺序闯关；'horde' 无尽模式（单张 `HordeMap`，敌人按波次不断刷出）
         """
         self.screen = screen
         self.clock = clock
@@ -41,6 +92,16 @@ class Game:
         
         self.images = images
         self.music = music
+        self.input = input_source if input_source is not None else LiveInput()
+        self.headless = headless
+        self.recorder = recorder
+        self.mode = mode
+        # 本局击杀数
+        self.kills = 0
+        # 分阶段计时钩子：update/draw 在每个阶段结束时调用 lap(阶段名)，供基准/剖析器统计耗时
+        self.lap = _no_lap
+        # 逐帧剖析器（F3 切换叠加层），由 run() 在有窗口运行时创建
+        self.profiler = None
         self.player = Player(60, 60, images=images)
         # 若提供 initial_state（存档），则应用对应属性
         if initial_state:
@@ -79,24 +140,49 @@ class Game:
                         pass
             except Exception:
                 pass
-        self.bullets = []
+        # 全部在场子弹保存在结构化数组池中
+        self.bullets = ProjectilePool()
         self.maps = []
         self.current_map_idx = 0
         self.running = True
-        self.last_time = pygame.time.get_ticks()
+        # 模拟时钟(ms)：只随逻辑步进推进，冷却/技能计时都以它为准
+        self.sim_time = start_time if start_time is not None else pygame.time.get_ticks()
+        # 上一逻辑步开始时的实体中心，渲染时在其与当前位置之间插值
+        self._prev_centers = {}
         self.hud = HUDRenderer(font)
+        self.collision = CollisionWorld()
+        # 子弹命中与近战只登记伤害，每个逻辑步在碰撞之后统一结算扣血、击杀与奖励
+        self.combat = CombatResolver()
+        # 组件存储：批处理敌人的各列放在 'enemy' 原型表中，渲染/碰撞系统直接读这些列
+        self.world = World()
+        self.renderer = RenderSystem(self.images)
+        # 当前地图普通敌人的批量推进器，地图或敌人列表变化时重建
+        self._enemy_batch = None
         
         self.spawn_maps()
+        _watch_game(self)
 
+    @trace.traced('spawn_maps')
     def spawn_maps(self):
         """
         生成所有地图
         """
+        if self.mode == 'horde':
+            self.maps.append(HordeMap(images=self.images))
+            return
         for i in range(MAP_COUNT):
             is_final = (i == MAP_COUNT - 1)
             gm = GameMap(i, is_final=is_final, images=self.images)
             self.maps.append(gm)
 
+    def enemy_batch(self):
+        """当前地图敌人的 `EnemyBatch`；切换地图或敌人列表增删后自动重建。"""
+        enemies = self.curmap.enemies
+        batch = self._enemy_batch
+        if batch is None or not batch.matches(enemies):
+            batch = self._enemy_batch = EnemyBatch(enemies, lod=AI_LOD, world=self.world)
+        return batch
+
     @property
     def curmap(self):
         """
@@ -109,31 +195,42 @@ class Game:
 
     def update(self, dt):
         """
-        更新游戏逻辑
+        推进一个逻辑步
         
         Args:
-            dt: 帧时间差(ms)
+            dt: 逻辑步长(ms)，正常运行时恒为 SIM_TICK_MS
         """
-        now = pygame.time.get_ticks()
-        
         # ========== 处理输入 ==========
-        keys = pygame.key.get_pressed()
+        inp = self.input.poll(self)
+        if self.recorder is not None:
+            # 录像在推进前记录输入（到期时先写入本步之前的状态关键帧）
+            self.recorder.tick(inp, game=self)
+
+        self.sim_time += dt
+        now = self.sim_time
+        _SIM_TICKS.inc()
+        self._snapshot_positions()
+
+        if inp.equip is not None:
+            # 武器快捷选择（数字 1-9）
+            self.player.equip_by_index(inp.equip)
+        speed = self.player.speed * (dt / SPEED_REFERENCE_MS)
         dx = dy = 0
-        if keys[pygame.K_w]:
-            dy -= self.player.speed
-        if keys[pygame.K_s]:
-            dy += self.player.speed
-        if keys[pygame.K_a]:
-            dx -= self.player.speed
-        if keys[pygame.K_d]:
-            dx += self.player.speed
+        if inp.up:
+            dy -= speed
+        if inp.down:
+            dy += speed
+        if inp.left:
+            dx -= speed
+        if inp.right:
+            dx += speed
         
         # 对角线速度归一化
         if dx != 0 and dy != 0:
             dx *= 0.7071
             dy *= 0.7071
         
-        self.player.move(dx, dy)
+        self.player.move(dx, dy, self.curmap.obstacles)
         # 更新玩家视觉计时（后坐力/闪光），dt 为毫秒
         try:
             self.player.update(dt)
@@ -141,66 +238,60 @@ class Game:
             pass
 
         # ========== 射击 ==========
-        mpressed = pygame.mouse.get_pressed()
-        mouse_pos = pygame.mouse.get_pos()
-        if mpressed[0]:
-            res = self.player.try_shoot(mouse_pos, now)
-            if res:
-                if isinstance(res, list):
-                    self.bullets.extend(res)
-                else:
-                    self.bullets.append(res)
-        # 近战（右键或 E）
-        if mpressed[2]:
-            melee_res = self.player.try_melee(now, self.curmap.enemies, self.bullets)
-            if melee_res:
-                hit_enemies, reflected = melee_res
-                # 处理击杀奖励的金币
-                for e in hit_enemies:
-                    if not e.alive:
-                        self.player.money += getattr(e, 'money', MONEY_PER_ENEMY)
+        mouse_pos = inp.mouse_pos
+        if inp.fire:
+            # 子弹直接整批写入子弹池
+            self.player.try_shoot(mouse_pos, now, pool=self.bullets)
+        # 近战（右键或 E）：伤害登记到战斗结算，击杀奖励在本步碰撞之后统一发放
+        if inp.melee or inp.melee_key:
+            self._melee(now, mouse_pos)
+
+        lap = self.lap
+        lap('input')
 
         # ========== 更新敌人 ==========
-        for e in self.curmap.enemies:
+        # 普通敌人批量推进（巡逻/瞄准/冷却向量化，只有开火者逐个处理；远处的按 LOD 降频），Boss 等逐个推进
+        # 追击型敌人共享指向玩家的流场：玩家换格后下一次查询时才重算
+        # 地图自身的定时内容（无尽模式开波/刷怪）先于敌人推进
+        self.curmap.update(dt, now)
+        self.curmap.flow.retarget(self.player.rect.center)
+        batch = self.enemy_batch()
+        batch.step(dt, now, self.player, self.bullets)
+        for e in batch.others:
             if e.alive:
-                e.update(dt)
-                b = e.try_shoot(self.player, now)
-                if b:
-                    if isinstance(b, list):
-                        self.bullets.extend(b)
-                    else:
-                        self.bullets.append(b)
-
-        # 当所有敌人被清除后（包含最终地图的 boss 被清除），生成传送门
-        if self.curmap.portal is None:
-            if all(not e.alive for e in self.curmap.enemies):
-                try:
-                    self.curmap.spawn_portal()
-                except Exception:
-                    pass
+                e.update(dt, now)
+                e.try_shoot(self.player, now, pool=self.bullets)
+        # 所有敌人被清除后（包含最终地图的 boss）由地图的注册表触发清场事件生成传送门，这里不再逐个检查
+        lap('enemies')
 
         # ========== 更新子弹 ==========
-        for b in self.bullets:
-            b.update(dt)
-        self.bullets = [b for b in self.bullets if b.alive]
+        # 向量化推进、剔除并压缩子弹池
+        self.bullets.update(dt)
+        lap('bullets')
 
         # ========== 子弹碰撞检测 ==========
-        for b in self.bullets:
-            if b.owner == 'player':
-                # 玩家子弹与敌人碰撞
-                for e in self.curmap.enemies:
-                    if e.alive and b.rect.colliderect(e.rect):
-                        e.hp -= b.damage
-                        b.alive = False
-                        if e.hp <= 0:
-                            e.alive = False
-                            self.player.money += getattr(e, 'money', MONEY_PER_ENEMY)
-                        break
+        # 敌人全部在批处理中时由碰撞系统直接读原型表的位置列；
+        # 否则（Boss、敌人很少）按碰撞层重建空间哈希：玩家子弹只检测附近敌人，敌人子弹只检测玩家
+        pool = self.bullets
+        if batch.others:
+            self.collision.rebuild(self.player, self.curmap.enemies)
+            hits = self.collision.pool_hits(pool)
+        else:
+            hits = collision_system(batch.table, pool, self.player)
+        # 障碍物挡住双方子弹
+        for rect in self.curmap.obstacles:
+            pool.kill(pool.overlapping(rect))
+        combat = self.combat
+        player = self.player
+        for i, target in hits:
+            pool.kill(i)
+            if target is player:
+                combat.hurt_player(int(pool.damage[i]))
             else:
-                # 敌人子弹与玩家碰撞
-                if b.rect.colliderect(self.player.rect):
-                    self.player.hp -= b.damage
-                    b.alive = False
+                combat.hit(target, int(pool.damage[i]))
+        # 对每个目标扣一次累计伤害，发放击杀奖励
+        self.kills += combat.resolve(player).kills
+        lap('collision')
 
         # ========== 检测传送门碰撞 ==========
         if self.curmap.portal and self.player.rect.colliderect(self.curmap.portal):
@@ -218,6 +309,29 @@ class Game:
         # ========== 玩家死亡检测 ==========
         if self.player.hp <= 0:
             self.game_over()
+        lap('portals')
+
+    def _snapshot_positions(self):
+        """记录本逻辑步开始前玩家与敌人的中心位置，供渲染插值使用。"""
+        # 批处理敌人整列复制到 px/py；其余实体（玩家、Boss 等）记在字典里
+        remember_positions(self.world)
+        batch = self._enemy_batch
+        rest = batch.others if batch is not None and batch.matches(self.curmap.enemies) else self.curmap.enemies
+        prev = {self.player: self.player.rect.center}
+        for e in rest:
+            if e.alive:
+                prev[e] = e.rect.center
+        self._prev_centers = prev
+
+    def _melee(self, now, aim_pos):
+        """
+        朝 `aim_pos` 挥砍：先按敌人当前位置刷新碰撞层，再用空间索引做扇形查询。
+        """
+        if not self.player.melee_ready(now):
+            return None
+        self.collision.rebuild(self.player, self.curmap.enemies)
+        return self.player.try_melee(now, self.curmap.enemies, self.bullets,
+                                     aim_pos=aim_pos, index=self.collision.enemies, hit=self.combat.hit)
 
     def switch_map(self):
         """
@@ -227,6 +341,7 @@ class Game:
             # 为下一张地图显示商店；如果商店操作完成，就切换地图
             self.open_shop()
 
+    @trace.traced('open_shop')
     def open_shop(self):
         """
         在切换地图时显示武器购买界面（暂停游戏循环）
@@ -234,38 +349,54 @@ class Game:
         """
         entries = list(SHOP_WEAPONS) + [ShopItem('Medkit', SHOP_MEDKIT_COST, desc=f'恢复 +{SHOP_MEDKIT_HEAL} HP', heal_amount=SHOP_MEDKIT_HEAL)]
         state = ShopState(self.player, entries)
-        ui = ShopUI(self.font, self.bigfont, images=self.images, width=WIDTH, height=HEIGHT)
-        ui.rebuild_layout(len(entries))
 
-        running_shop = True
-        while running_shop:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit(); sys.exit()
-                if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                    pygame.quit(); sys.exit()
-
-                action = ui.handle_event(event)
-                if not action:
-                    continue
-                if action.kind == 'start':
-                    running_shop = False
-                elif action.kind == 'buy' and action.idx is not None:
-                    state.buy(action.idx)
-                elif action.kind == 'upgrade' and action.idx is not None:
-                    state.upgrade(action.idx)
-                elif action.kind == 'equip' and action.idx is not None:
-                    state.equip(action.idx)
-
-            ui.draw(self.screen, state)
-            pygame.display.flip()
-            self.clock.tick(60)
+        if self.headless:
+            # 无窗口运行：由输入源直接给出商店操作
+            for action in self.input.shop_actions(state):
+                if not self._apply_shop_action(state, action):
+                    break
+        else:
+            ui = ShopUI(self.font, self.bigfont, images=self.images, width=WIDTH, height=HEIGHT)
+            ui.rebuild_layout(len(entries))
+
+            running_shop = True
+            while running_shop:
+                watchdog.beat('open_shop')
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        pygame.quit(); sys.exit()
+                    if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                        pygame.quit(); sys.exit()
+
+                    action = ui.handle_event(event)
+                    if action and not self._apply_shop_action(state, action):
+                        running_shop = False
+
+                ui.draw(self.screen, state)
+                pygame.display.flip()
+                self.clock.tick(60)
 
         # 关闭商店后切换地图并重置玩家状态
         self.current_map_idx += 1
         self.player.rect.center = (80, 80)
+        # 传送后不再插值，避免下一帧从旧位置“滑”过来
+        self._prev_centers = {}
         self.player.hp = min(PLAYER_MAX_HP, self.player.hp + 15)
 
+    def _apply_shop_action(self, state, action):
+        """执行一次商店操作；'start' 表示离开商店，返回 False。"""
+        if self.recorder is not None:
+            self.recorder.shop_action(action)
+        if action.kind == 'start':
+            return False
+        if action.kind == 'buy' and action.idx is not None:
+            state.buy(action.idx)
+        elif action.kind == 'upgrade' and action.idx is not None:
+            state.upgrade(action.idx)
+        elif action.kind == 'equip' and action.idx is not None:
+            state.equip(action.idx)
+        return True
+
     def victory(self):
         """
         游戏胜利，显示结算画面
@@ -302,6 +433,8 @@ class Game:
         """
         title = '你阵亡了'
         subtitle = f'携带金钱：¥{self.player.money}'
+        if self.mode == 'horde':
+            subtitle = f'坚持到第 {self.curmap.wave} 波  ' + subtitle
         action = self._end_screen(title, subtitle)
         if action == 'save':
             try:
@@ -322,8 +455,10 @@ class Game:
     def _end_screen(self, title, subtitle):
         """渲染结算界面，含保存/回到菜单/重新开始按钮。
 
-        返回值：'save' | 'menu' | 'restart'
+        返回值：'save' | 'menu' | 'restart'；无窗口运行时直接返回 'menu'
         """
+        if self.headless:
+            return 'menu'
         # 构建按钮
         btn_w = 220
         btn_h = 48
@@ -337,6 +472,7 @@ class Game:
 
         clock = pygame.time.Clock()
         while True:
+            watchdog.beat('end_screen')
             for ev in pygame.event.get():
                 if ev.type == pygame.QUIT:
                     return 'menu'
@@ -371,26 +507,63 @@ class Game:
             clock.tick(60)
 
     def draw_hud(self):
-        self.hud.draw(self.screen, self.player, self.current_map_idx, len(self.maps))
+        wave = self.curmap.wave if self.mode == 'horde' else None
+        self.hud.draw(self.screen, self.player, self.current_map_idx, len(self.maps), wave=wave)
+
+    def _lerp_center(self, entity, alpha):
+        """
+        把实体临时移到上一逻辑步与当前位置之间的插值处。
 
-    def draw(self):
+        返回真实中心，绘制完成后需写回；无需插值时返回 None。
+        """
+        prev = self._prev_centers.get(entity)
+        if prev is None or alpha >= 1.0:
+            return None
+        cur = entity.rect.center
+        if prev == cur:
+            return None
+        entity.rect.center = (round(prev[0] + (cur[0] - prev[0]) * alpha),
+                              round(prev[1] + (cur[1] - prev[1]) * alpha))
+        return cur
+
+    def _draw_interpolated(self, entity, alpha, *args):
+        cur = self._lerp_center(entity, alpha)
+        try:
+            entity.draw(self.screen, *args)
+        finally:
+            if cur is not None:
+                entity.rect.center = cur
+
+    def draw(self, alpha=1.0):
         """
         绘制整个游戏画面
+        
+        Args:
+            alpha: 渲染插值系数，0~1，表示当前时刻位于上一逻辑步与最新逻辑步之间的位置
         """
+        lap = self.lap
         # 绘制地图背景
         self.curmap.draw(self.screen)
+        lap('draw_map')
         
-        # 绘制敌人
-        for e in self.curmap.enemies:
+        # 绘制敌人：批处理敌人由渲染系统整表绘制，其余逐个绘制
+        enemies = self.curmap.enemies
+        batch = self._enemy_batch
+        if batch is not None and batch.matches(enemies) and batch.n:
+            self.renderer.draw(self.screen, batch.table, alpha)
+            enemies = batch.others
+        for e in enemies:
             if e.alive:
-                e.draw(self.screen)
+                self._draw_interpolated(e, alpha)
+        lap('draw_enemies')
         
         # 绘制子弹
-        for b in self.bullets:
-            b.draw(self.screen)
+        self.bullets.draw(self.screen, alpha)
+        lap('draw_bullets')
         
         # 绘制玩家（在最上层）
-        self.player.draw(self.screen)
+        self._draw_interpolated(self.player, alpha, self.sim_time)
+        lap('draw_player')
 
         # 绘制传送门提示
         if self.curmap.portal:
@@ -399,14 +572,50 @@ class Game:
 
         # 绘制HUD
         self.draw_hud()
+        lap('draw_hud')
+        if self.profiler is not None and self.profiler.visible:
+            self.profiler.draw(self.screen)
+            lap('overlay')
         pygame.display.flip()
+        lap('flip')
 
     def run(self):
         """
         主游戏循环
+
+        逻辑以固定步长 SIM_TICK_MS 推进（累加器），渲染帧率由 FPS 单独限制；
+        渲染时按累加器余量在前后两个逻辑步之间插值。逻辑落后时跳过渲染优先追赶。
         """
+        if self.profiler is None:
+            self.profiler = FrameProfiler()
+        profiler = self.profiler
+        self.lap = profiler.lap
+        # 开启 trace 时帧与阶段同时写入 trace（在 run 开始时决定，循环内不再判断）
+        tracer = trace.active()
+        if tracer is not None:
+            profiler_lap, trace_lap = profiler.lap, tracer.lap
+
+            def lap(name):
+                profiler_lap(name)
+                trace_lap(name)
+            self.lap = lap
+        accumulator = 0.0
+        skipped = 0
+        # 累加器反复减去非整数步长会积累浮点误差，比较时留出容差以免丢步
+        step_due = SIM_TICK_MS - 1e-6
+        avg_frame_ms = 1000.0 / FPS
         while self.running:
-            dt = self.clock.tick(FPS)
+            frame_ms = self.clock.tick(FPS)
+            # 限制单帧计入的时间，防止卡顿后一次补跑过多步
+            accumulator += min(frame_ms, MAX_FRAME_MS)
+            watchdog.beat('Game.run')
+            _FRAMES.inc()
+            _FRAME_MS.set(frame_ms)
+            avg_frame_ms += (frame_ms - avg_frame_ms) * 0.1
+            _FPS.set(1000.0 / avg_frame_ms if avg_frame_ms > 0 else 0.0)
+            profiler.begin_frame()
+            if tracer is not None:
+                tracer.begin_frame()
             
             # 处理事件
             for event in pygame.event.get():
@@ -425,6 +634,10 @@ class Game:
                     self.running = False
                     self.end_action = 'menu'
                     break
+                # E / 数字键等按键交给输入源，在下一个逻辑步生效
+                self.input.handle_event(event)
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    profiler.toggle()
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
                         try:
@@ -440,24 +653,39 @@ class Game:
                         self.running = False
                         self.end_action = 'menu'
                         break
-                    if event.key == pygame.K_e:
-                        # 按键触发近战
-                        now = pygame.time.get_ticks()
-                        melee_res = self.player.try_melee(now, self.curmap.enemies, self.bullets)
-                        if melee_res:
-                            hit_enemies, reflected = melee_res
-                            for e in hit_enemies:
-                                if not e.alive:
-                                    self.player.money += MONEY_PER_ENEMY
-                    # 武器快捷选择（数字 1-9）
-                    if pygame.K_1 <= event.key <= pygame.K_9:
-                        idx = event.key - pygame.K_1
-                        self.player.equip_by_index(idx)
-
-            # 更新逻辑
-            self.update(dt)
+            self.lap('events')
+
+            # 固定步长推进逻辑
+            steps = 0
+            while self.running and accumulator >= step_due and steps < MAX_SIM_STEPS_PER_FRAME:
+                self.update(SIM_TICK_MS)
+                accumulator -= SIM_TICK_MS
+                steps += 1
+            if not self.running:
+                break
+
+            # 逻辑仍落后：跳过本帧渲染把时间留给追赶；连续跳过过多则丢弃积压
+            if accumulator >= step_due:
+                if skipped < MAX_SKIPPED_RENDERS:
+                    skipped += 1
+                    profiler.end_frame()
+                    if tracer is not None:
+                        tracer.end_frame()
+                    continue
+                accumulator %= SIM_TICK_MS
+            skipped = 0
 
             # 渲染
-            self.draw()
+            self.draw(max(0.0, accumulator) / SIM_TICK_MS)
+            profiler.end_frame()
+            if tracer is not None:
+                tracer.end_frame()
+        # 打开过剖析叠加层时，把环形缓冲中的帧耗时导出为 CSV
+        if profiler.used:
+            try:
+                path = os.path.join(PROFILE_DIR, time.strftime('frames-%Y%m%d-%H%M%S.csv'))
+                print(f'[Profiler] 帧耗时已导出: {profiler.dump_csv(path)}')
+            except OSError as e:
+                print(f'[Profiler] 导出失败: {e}')
         # 循环结束，返回记录的结局动作（如 'menu' 或 'restart'）
         return getattr(self, 'end_action', None)
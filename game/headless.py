@@ -0,0 +1,86 @@
+"""无窗口快进模拟：不创建窗口、不按帧率节流，直接以固定步长连续调用 `Game.update`。
+
+用于批量跑平衡性/性能对比：
+
+    python main.py --headless --ticks 20000 --seed 7
+    python main.py --headless --horde --ticks 20000 --seed 7   # 无尽模式压力测试
+"""
+
+import random
+import time
+from dataclasses import dataclass
+from typing import Optional
+from config.settings import SIM_TICK_MS
+from game.game import Game
+from game import trace
+from game.input_source import AutoPilot
+
+
+@dataclass
+class HeadlessReport:
+    """一次无窗口运行的结果摘要。"""
+    ticks: int
+    elapsed: float  # 真实耗时（秒）
+    money: int
+    hp: int
+    map_idx: int
+    kills: int = 0
+    end_action: Optional[str] = None
+    # 无尽模式到达的波次（闯关模式为 None）
+    wave: Optional[int] = None
+
+    @property
+    def ticks_per_sec(self) -> float:
+        return self.ticks / self.elapsed if self.elapsed > 0 else float('inf')
+
+    @property
+    def sim_seconds(self) -> float:
+        return self.ticks * SIM_TICK_MS / 1000.0
+
+    def summary(self) -> str:
+        where = f'map={self.map_idx + 1}' if self.wave is None else f'wave={self.wave}'
+        return (f'ticks={self.ticks} sim={self.sim_seconds:.1f}s real={self.elapsed:.3f}s '
+                f'ticks/s={self.ticks_per_sec:.0f} {where} '
+                f'money={self.money} hp={self.hp} kills={self.kills} end={self.end_action}')
+
+
+def make_headless_game(seed=None, input_source=None, initial_state=None, start_time=0, recorder=None,
+                       mode='campaign'):
+    """按种子生成地图并创建无窗口 `Game`；模拟时钟默认从 0 开始，`mode` 见 `Game`。"""
+    random.seed(seed)
+    if input_source is None:
+        input_source = AutoPilot(seed if seed is not None else 0)
+    return Game(None, None, None, None, initial_state=initial_state,
+                input_source=input_source, headless=True, start_time=start_time, recorder=recorder, mode=mode)
+
+
+def run_headless(ticks, seed=None, input_source=None, initial_state=None, game=None, tick_ms=SIM_TICK_MS):
+    """
+    连续推进至多 `ticks` 个逻辑步（游戏结束则提前停止），返回 `HeadlessReport`。
+
+    参数:
+        game: 可选的现成 `Game`（需以 headless=True 创建）；缺省按 seed 新建
+        tick_ms: 逻辑步长(ms)，回放录像时使用录制时的步长
+    """
+    if game is None:
+        game = make_headless_game(seed, input_source, initial_state)
+    done = 0
+    tracer = trace.active()
+    t0 = time.perf_counter()
+    if tracer is None:
+        while done < ticks and game.running:
+            game.update(tick_ms)
+            done += 1
+    else:
+        # 开启 trace 时每个逻辑步记为一帧，阶段由 Game.lap 划分
+        game.lap = tracer.lap
+        while done < ticks and game.running:
+            tracer.begin_frame()
+            game.update(tick_ms)
+            tracer.end_frame()
+            done += 1
+    elapsed = time.perf_counter() - t0
+    return HeadlessReport(ticks=done, elapsed=elapsed, money=game.player.money, hp=game.player.hp,
+                          map_idx=game.current_map_idx, kills=game.kills,
+                          end_action=getattr(game, 'end_action', None),
+                          wave=game.curmap.wave if game.mode == 'horde' else None)
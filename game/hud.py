@@ -8,7 +8,7 @@ class HUDRenderer:
     def __init__(self, font):
         self.font = font
 
-    def draw(self, surf, player, current_map_idx, total_maps):
+    def draw(self, surf, player, current_map_idx, total_maps, wave=None):
         pad = getattr(settings, 'UI_HUD_PADDING', 10)
         color_text = getattr(settings, 'UI_COLOR_TEXT', (255, 255, 255))
         color_money = getattr(settings, 'UI_COLOR_MONEY', (255, 235, 120))
@@ -16,8 +16,9 @@ class HUDRenderer:
 
         hp_surf = self.font.render(f'HP: {player.hp}', True, color_text)
         money_surf = self.font.render(f'¥{player.money}', True, color_money)
+        # 无尽模式显示波次，闯关模式显示地图进度
         map_surf = self.font.render(
-            f'Map {current_map_idx + 1}/{total_maps}',
+            f'Wave {wave}' if wave is not None else f'Map {current_map_idx + 1}/{total_maps}',
             True,
             color_secondary,
         )
@@ -3,6 +3,16 @@
 """
 import os
 import pygame
+from game import trace
+from game import metrics
+
+_CACHE_HITS = metrics.counter('image_cache_hits_total', '贴图缓存命中次数')
+_CACHE_MISSES = metrics.counter('image_cache_misses_total', '贴图缓存未命中（从磁盘加载或生成占位）次数')
+_CACHE_SIZE = metrics.gauge('image_cache_size', '全部 ImageManager 缓存的贴图数')
+_CACHE_HIT_RATIO = metrics.gauge('image_cache_hit_ratio', '贴图缓存命中率')
+_CACHE_HIT_RATIO.set_function(
+    lambda: _CACHE_HITS.value / (_CACHE_HITS.value + _CACHE_MISSES.value)
+    if _CACHE_HITS.value + _CACHE_MISSES.value else 0.0)
 
 
 class ImageManager:
@@ -21,9 +31,20 @@ class ImageManager:
     def get(self, name, scale=None, colorkey=None, fallback_size=(32, 32), fallback_color=(255, 0, 255)):
         """Load and cache an image. Missing files return a colored placeholder surface."""
         key = (name, scale, colorkey)
-        if key in self._cache:
-            return self._cache[key]
+        surf = self._cache.get(key)
+        if surf is not None:
+            _CACHE_HITS.inc()
+            return surf
+
+        _CACHE_MISSES.inc()
+        with trace.span('ImageManager.get', 'io', name=name):
+            surf = self._load(name, scale, colorkey, fallback_size, fallback_color)
+        self._cache[key] = surf
+        _CACHE_SIZE.inc()
+        return surf
 
+    def _load(self, name, scale, colorkey, fallback_size, fallback_color):
+        """缓存未命中时从磁盘加载（或生成占位）并按参数处理。"""
         full_path = self._full_path(name)
         surf = None
         if os.path.exists(full_path):
@@ -49,6 +70,4 @@ class ImageManager:
             pass
         elif scale is not None and isinstance(scale, tuple):
             surf = pygame.transform.smoothscale(surf, scale)
-
-        self._cache[key] = surf
         return surf
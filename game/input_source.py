@@ -0,0 +1,153 @@
+"""输入源模块：把“每个逻辑步的玩家输入”从 pygame 设备读取中抽离出来。
+
+`Game.update` 每步调用一次 `poll(game)` 取得 `InputState`：
+实机运行使用 `LiveInput`（读键盘/鼠标，按键按下沿由事件喂入），
+无窗口批量运行使用 `AutoPilot`（按固定种子的简单脚本操作玩家）。
+"""
+
+import math
+import random
+from dataclasses import dataclass
+from typing import Optional, Tuple
+import pygame
+from game.shop_ui import ShopAction
+
+
+@dataclass
+class InputState:
+    """单个逻辑步的玩家输入。"""
+    up: bool = False
+    down: bool = False
+    left: bool = False
+    right: bool = False
+    mouse_pos: Tuple[int, int] = (0, 0)
+    fire: bool = False        # 左键按住
+    melee: bool = False       # 右键按住
+    melee_key: bool = False   # 本步内按下过 E
+    equip: Optional[int] = None  # 本步内按下的数字键对应的背包索引
+
+
+class InputSource:
+    """输入源接口。"""
+
+    def poll(self, game) -> InputState:
+        """返回本逻辑步的输入；按下沿类输入只在一次 poll 中出现。"""
+        raise NotImplementedError
+
+    def handle_event(self, event):
+        """接收主循环中的 pygame 事件（无窗口输入源忽略）。"""
+
+    def shop_actions(self, state):
+        """无界面运行商店时要执行的操作序列，最后一项应为 'start'。"""
+        return [ShopAction('start')]
+
+
+class LiveInput(InputSource):
+    """从键盘与鼠标读取输入；E 与数字键在事件到达时记录，下一次 poll 时生效。"""
+
+    def __init__(self):
+        self._melee_key = False
+        self._equip = None
+
+    def handle_event(self, event):
+        if event.type != pygame.KEYDOWN:
+            return
+        if event.key == pygame.K_e:
+            self._melee_key = True
+        elif pygame.K_1 <= event.key <= pygame.K_9:
+            self._equip = event.key - pygame.K_1
+
+    def poll(self, game) -> InputState:
+        keys = pygame.key.get_pressed()
+        buttons = pygame.mouse.get_pressed()
+        state = InputState(
+            up=bool(keys[pygame.K_w]),
+            down=bool(keys[pygame.K_s]),
+            left=bool(keys[pygame.K_a]),
+            right=bool(keys[pygame.K_d]),
+            mouse_pos=pygame.mouse.get_pos(),
+            fire=bool(buttons[0]),
+            melee=bool(buttons[2]),
+            melee_key=self._melee_key,
+            equip=self._equip,
+        )
+        self._melee_key = False
+        self._equip = None
+        return state
+
+
+class AutoPilot(InputSource):
+    """
+    无窗口运行使用的脚本玩家：瞄准最近的敌人持续射击，保持中等距离并左右游走；
+    清场后走向传送门/撤离点。所有随机性来自自身的 `random.Random(seed)`。
+    """
+
+    # 与目标保持的距离区间（像素）
+    NEAR = 160
+    FAR = 260
+    # 每隔多少步重新决定游走方向
+    STRAFE_TICKS = 45
+    # 商店中血量低于该值时购买医疗包
+    MEDKIT_BELOW_HP = 70
+
+    def __init__(self, seed=0):
+        self.rng = random.Random(seed)
+        self.tick = 0
+        self.strafe = 1
+
+    def poll(self, game) -> InputState:
+        self.tick += 1
+        if self.tick % self.STRAFE_TICKS == 0:
+            self.strafe = self.rng.choice((-1, 1))
+
+        px, py = game.player.rect.center
+        target = self._nearest_enemy(game, px, py)
+        if target is not None:
+            tx, ty = target.rect.center
+            vx, vy = tx - px, ty - py
+            dist = math.hypot(vx, vy)
+            if dist > self.FAR:
+                mx, my = vx, vy
+            elif dist < self.NEAR:
+                mx, my = -vx, -vy
+            else:
+                mx, my = -vy * self.strafe, vx * self.strafe
+            return self._move(mx, my, mouse_pos=(tx, ty), fire=True)
+
+        goal = game.curmap.portal or game.curmap.exit_rect
+        if goal is None:
+            return InputState(mouse_pos=(px, py))
+        gx, gy = goal.center
+        return self._move(gx - px, gy - py, mouse_pos=(gx, gy))
+
+    def shop_actions(self, state):
+        actions = []
+        if state.player.hp < self.MEDKIT_BELOW_HP:
+            for idx, entry in enumerate(state.items):
+                if getattr(entry, 'heal_amount', 0) > 0:
+                    actions.append(ShopAction('buy', idx))
+                    break
+        actions.append(ShopAction('start'))
+        return actions
+
+    @staticmethod
+    def _nearest_enemy(game, px, py):
+        best = None
+        best_d2 = None
+        for e in game.curmap.enemies:
+            if not e.alive:
+                continue
+            ex, ey = e.rect.center
+            d2 = (ex - px) ** 2 + (ey - py) ** 2
+            if best_d2 is None or d2 < best_d2:
+                best, best_d2 = e, d2
+        return best
+
+    @staticmethod
+    def _move(mx, my, **kwargs):
+        # 分量小于总长 40% 的方向不按键，避免贴着轴线来回抖动
+        length = math.hypot(mx, my)
+        if length == 0:
+            return InputState(**kwargs)
+        tol = 0.4 * length
+        return InputState(up=my < -tol, down=my > tol, left=mx < -tol, right=mx > tol, **kwargs)
@@ -0,0 +1,220 @@
+"""运行指标：计数器/仪表的全局注册表，定期写 JSONL，并可在本机以 Prometheus 文本格式提供。
+
+    python main.py --metrics                         # 每 METRICS_INTERVAL_S 秒写 profiles/metrics-*.jsonl
+    python main.py --metrics soak.jsonl --metrics-port 9464
+    curl http://127.0.0.1:9464/metrics
+
+各模块在模块级声明自己的指标：
+
+    _HITS = metrics.counter('image_cache_hits_total', '贴图缓存命中次数')
+    _HITS.inc()
+
+计数器/仪表始终累计（一次属性加法），只有开启导出时才有后台线程读取。
+仪表可用 `set_function` 在导出时才求值（例如存活敌人数），函数在导出线程中调用，出错时该项跳过。
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from config.settings import PROFILE_DIR, METRICS_INTERVAL_S, METRICS_PREFIX
+
+
+class Counter:
+    """只增不减的计数。"""
+    kind = 'counter'
+
+    def __init__(self, name, help=''):
+        self.name = name
+        self.help = help
+        self.value = 0
+
+    def inc(self, n=1):
+        self.value += n
+
+    def get(self):
+        return self.value
+
+
+class Gauge:
+    """可任意设置的瞬时值；`set_function` 后改为导出时求值。"""
+    kind = 'gauge'
+
+    def __init__(self, name, help=''):
+        self.name = name
+        self.help = help
+        self.value = 0.0
+        self._fn = None
+
+    def set(self, value):
+        self.value = value
+
+    def inc(self, n=1):
+        self.value += n
+
+    def dec(self, n=1):
+        self.value -= n
+
+    def set_function(self, fn):
+        self._fn = fn
+
+    def get(self):
+        if self._fn is not None:
+            return self._fn()
+        return self.value
+
+
+class RateWindow:
+    """记录事件时刻，给出最近 `window_s` 秒内的次数（用于“每分钟存档次数”这类指标）。"""
+
+    def __init__(self, window_s=60.0):
+        self.window = window_s
+        self._times = deque()
+
+    def mark(self, now=None):
+        self._times.append(time.monotonic() if now is None else now)
+
+    def count(self, now=None):
+        now = time.monotonic() if now is None else now
+        times = self._times
+        while times and now - times[0] > self.window:
+            times.popleft()
+        return len(times)
+
+
+class Registry:
+    def __init__(self, prefix=METRICS_PREFIX):
+        self.prefix = prefix
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, help):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help)
+            elif not isinstance(metric, cls):
+                raise ValueError(f'指标 {name} 已注册为 {metric.kind}')
+            return metric
+
+    def counter(self, name, help=''):
+        return self._get_or_create(Counter, name, help)
+
+    def gauge(self, name, help=''):
+        return self._get_or_create(Gauge, name, help)
+
+    def collect(self):
+        """当前全部指标值：[(指标, 值)]；求值失败的仪表跳过。"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        out = []
+        for metric in metrics:
+            try:
+                value = metric.get()
+            except Exception:
+                continue
+            if value is not None:
+                out.append((metric, value))
+        return out
+
+    def snapshot(self):
+        return {metric.name: value for metric, value in self.collect()}
+
+    def prometheus_text(self):
+        lines = []
+        for metric, value in self.collect():
+            name = self.prefix + metric.name
+            if metric.help:
+                lines.append(f'# HELP {name} {metric.help}')
+            lines.append(f'# TYPE {name} {metric.kind}')
+            lines.append(f'{name} {float(value):g}')
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+
+def counter(name, help=''):
+    return REGISTRY.counter(name, help)
+
+
+def gauge(name, help=''):
+    return REGISTRY.gauge(name, help)
+
+
+# ---------------------------- 导出 ----------------------------
+class JsonlWriter:
+    """后台线程每隔 `interval_s` 秒向 JSONL 文件追加一行 `{"ts": ..., "metrics": {...}}`。"""
+
+    def __init__(self, path=None, interval_s=METRICS_INTERVAL_S, registry=REGISTRY):
+        if not path:
+            path = os.path.join(PROFILE_DIR, time.strftime('metrics-%Y%m%d-%H%M%S.jsonl'))
+        self.path = path
+        self.interval = interval_s
+        self.registry = registry
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._thread = threading.Thread(target=self._loop, name='metrics-jsonl', daemon=True)
+        self._thread.start()
+        return self
+
+    def write_once(self):
+        line = json.dumps({'ts': round(time.time(), 3), 'metrics': self.registry.snapshot()}, separators=(',', ':'))
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.write_once()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+            # 退出前再写一行，保证短会话也有结尾数据
+            self.write_once()
+
+
+class MetricsServer:
+    """在 127.0.0.1 上提供 `GET /metrics`（Prometheus 文本格式）；port=0 时由系统分配端口。"""
+
+    def __init__(self, port, registry=REGISTRY, host='127.0.0.1'):
+        registry_ = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = registry_.prometheus_text().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='metrics-http', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self.httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.httpd.server_close()
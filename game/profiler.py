@@ -0,0 +1,151 @@
+"""逐帧分阶段剖析器：环形缓冲记录每帧各阶段耗时，提供叠加层（F3）与 CSV 导出。
+
+`Game.update`/`Game.draw` 在每个阶段结束时调用 `lap(阶段名)`；一帧内可能执行多次逻辑步，
+同名阶段的耗时累加到同一帧。叠加层显示最近若干帧的各阶段平均耗时与帧耗时曲线，
+曲线上的横线为 60 FPS 的 16.6 ms 预算。
+"""
+
+import csv
+import os
+import time
+import numpy as np
+import pygame
+from config.settings import PROFILER_HISTORY, PROFILER_AVG_FRAMES
+
+# 记录的阶段（按一帧内的执行顺序）；未列出的阶段名会被忽略
+PHASES = (
+    'events',
+    'input',
+    'enemies',
+    'bullets',
+    'collision',
+    'portals',
+    'draw_map',
+    'draw_enemies',
+    'draw_bullets',
+    'draw_player',
+    'draw_hud',
+    'overlay',
+    'flip',
+)
+_COLUMNS = {name: i for i, name in enumerate(PHASES)}
+
+FRAME_BUDGET_MS = 1000.0 / 60
+
+# 叠加层布局
+_PANEL_W = 260
+_GRAPH_H = 60
+_LINE_H = 14
+_TEXT_REFRESH_FRAMES = 15
+
+
+class FrameProfiler:
+    """
+    环形缓冲的逐帧阶段计时。
+
+    每帧调用 `begin_frame()`，阶段结束时 `lap(name)`，帧末 `end_frame()`；
+    缓冲中保存最近 `capacity` 帧的 (帧耗时, 各阶段耗时)。
+    """
+
+    def __init__(self, capacity=PROFILER_HISTORY):
+        self.capacity = int(capacity)
+        # 第 0 列为整帧耗时，其后按 PHASES 顺序
+        self._rows = np.zeros((self.capacity, len(PHASES) + 1), dtype=np.float32)
+        self._cur = np.zeros(len(PHASES) + 1, dtype=np.float64)
+        self.frames = 0
+        self.visible = False
+        # 叠加层是否被打开过：退出时据此决定是否导出 CSV
+        self.used = False
+        self._start = self._last = time.perf_counter()
+        self._font = None
+        self._panel = None
+        self._text = []
+
+    # ---------------------------- 记录 ----------------------------
+    def begin_frame(self):
+        self._cur[:] = 0.0
+        self._start = self._last = time.perf_counter()
+
+    def lap(self, name):
+        t = time.perf_counter()
+        col = _COLUMNS.get(name)
+        if col is not None:
+            self._cur[col + 1] += (t - self._last) * 1000.0
+        self._last = t
+
+    def end_frame(self):
+        self._cur[0] = (time.perf_counter() - self._start) * 1000.0
+        self._rows[self.frames % self.capacity] = self._cur
+        self.frames += 1
+
+    def toggle(self):
+        self.visible = not self.visible
+        self.used = self.used or self.visible
+
+    # ---------------------------- 统计 ----------------------------
+    def history(self):
+        """按时间顺序返回缓冲中的全部行 (n, 1 + len(PHASES))。"""
+        n = min(self.frames, self.capacity)
+        if self.frames <= self.capacity:
+            return self._rows[:n]
+        i = self.frames % self.capacity
+        return np.concatenate((self._rows[i:], self._rows[:i]))
+
+    def averages(self, window=PROFILER_AVG_FRAMES):
+        """最近 `window` 帧的平均耗时：返回 (帧耗时, {阶段: 耗时})。"""
+        rows = self.history()[-window:]
+        if len(rows) == 0:
+            return 0.0, {name: 0.0 for name in PHASES}
+        mean = rows.mean(axis=0)
+        return float(mean[0]), {name: float(mean[i + 1]) for i, name in enumerate(PHASES)}
+
+    def dump_csv(self, path):
+        """把缓冲中的帧按时间顺序写为 CSV（列：frame,total_ms,各阶段_ms）。"""
+        rows = self.history()
+        first = self.frames - len(rows)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['frame', 'total_ms'] + [f'{name}_ms' for name in PHASES])
+            for k, row in enumerate(rows.tolist()):
+                writer.writerow([first + k] + [f'{v:.4f}' for v in row])
+        return path
+
+    # ---------------------------- 叠加层 ----------------------------
+    def draw(self, surf):
+        """在左上角绘制各阶段平均耗时与帧耗时曲线。"""
+        if self._font is None:
+            self._font = pygame.font.SysFont(None, 18)
+        # 文本每隔若干帧刷新一次，避免每帧渲染十几行文字
+        if not self._text or self.frames % _TEXT_REFRESH_FRAMES == 0:
+            total, phases = self.averages()
+            lines = [(f'frame {total:6.2f} ms  ({1000.0 / total:5.0f} fps)' if total > 0 else 'frame   -',
+                      (255, 120, 120) if total > FRAME_BUDGET_MS else (230, 230, 230))]
+            for name in PHASES:
+                ms = phases[name]
+                lines.append((f'{name:<13}{ms:7.3f} ms', (255, 200, 120) if ms > FRAME_BUDGET_MS * 0.25 else (200, 200, 200)))
+            self._text = [self._font.render(text, True, color) for text, color in lines]
+
+        height = 8 + _LINE_H * len(self._text) + 8 + _GRAPH_H + 8
+        if self._panel is None or self._panel.get_height() != height:
+            self._panel = pygame.Surface((_PANEL_W, height), flags=pygame.SRCALPHA)
+            self._panel.fill((0, 0, 0, 170))
+        x0, y0 = 8, 8
+        surf.blit(self._panel, (x0, y0))
+        y = y0 + 8
+        for text in self._text:
+            surf.blit(text, (x0 + 8, y))
+            y += _LINE_H
+
+        # 帧耗时曲线：纵轴上限为 2 倍预算，超预算的柱为红色
+        gy = y + 8
+        gx = x0 + 8
+        gw = _PANEL_W - 16
+        scale = _GRAPH_H / (FRAME_BUDGET_MS * 2)
+        totals = self.history()[-gw:, 0]
+        for k, ms in enumerate(totals.tolist()):
+            h = min(_GRAPH_H, int(ms * scale))
+            color = (230, 80, 80) if ms > FRAME_BUDGET_MS else (90, 200, 120)
+            surf.fill(color, (gx + k, gy + _GRAPH_H - h, 1, h))
+        budget_y = gy + _GRAPH_H - int(FRAME_BUDGET_MS * scale)
+        surf.fill((255, 255, 255), (gx, budget_y, gw, 1))
@@ -0,0 +1,363 @@
+"""输入录像与回放模块。
+
+录像只保存重现一局所需的最少信息：地图生成使用的随机种子、模拟时钟起点、
+逻辑步长、开局存档快照，以及每个逻辑步的输入与商店操作。回放时以相同种子重建
+地图，把录下的输入按步喂回 `Game.update`（无窗口、不节流），即可复现同样的
+金钱/生命/击杀结果，用于稳定地重跑同一场战斗做性能对比。
+
+录制时每隔 `KEYFRAME_EVERY` 个逻辑步插入一个完整状态关键帧（见 game.snapshot），
+文件末尾附关键帧索引。`seek` 通过 mmap 只读取最近的关键帧和其后的输入记录，
+跳到任意逻辑步无需从头模拟。
+
+文件格式（小端）：
+    头部    magic(8s) seed(q) start_time(d) tick_ms(d) state_len(I) + state_len 字节 JSON 开局快照
+    记录    定长 7 字节 tag(c) flags(B) x(h) y(h) extra(b)
+            b'T' 逻辑步：flags 为按键位，(x, y) 为鼠标位置，extra 为数字键索引（-1 表示无）
+            b'S' 商店操作：flags 为操作类型编码，x 为条目索引（-1 表示无）
+    关键帧  b'K' + tick(q) size(I) + size 字节压缩快照，表示执行第 tick+1 步之前的状态
+    结尾    b'E' + ticks(q) money(q) hp(q) kills(q) 录制结束时的结果，用于校验回放
+    索引    每个关键帧 tick(q) offset(q)，随后 index_offset(q) count(I) magic(8s)
+
+录制被中断的文件没有结尾与索引，读取时顺序扫描一遍重建索引。
+"""
+
+import bisect
+import json
+import mmap
+import os
+import struct
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Tuple
+from config.settings import SIM_TICK_MS
+from game.input_source import InputSource, InputState
+from game.shop_ui import ShopAction
+from game import snapshot
+
+MAGIC = b'CDSRPLY2'
+INDEX_MAGIC = b'CDSRIDX1'
+_HEADER = struct.Struct('<8sqddI')
+_RECORD = struct.Struct('<cBhhb')
+_KEYFRAME = struct.Struct('<qI')
+_OUTCOME = struct.Struct('<qqqq')
+_INDEX_ENTRY = struct.Struct('<qq')
+_TRAILER = struct.Struct('<qI8s')
+
+TAG_TICK = b'T'
+TAG_SHOP = b'S'
+TAG_KEYFRAME = b'K'
+TAG_END = b'E'
+
+# 默认关键帧间隔（逻辑步）：60 Hz 下约 10 秒一帧
+KEYFRAME_EVERY = 600
+
+# InputState 布尔字段 -> 位
+_FLAG_BITS = (
+    ('up', 1),
+    ('down', 2),
+    ('left', 4),
+    ('right', 8),
+    ('fire', 16),
+    ('melee', 32),
+    ('melee_key', 64),
+)
+_SHOP_KINDS = ('start', 'buy', 'upgrade', 'equip')
+
+# 开局快照中可录制的存档字段（武器对象在回放时按名称重建）
+_STATE_KEYS = ('money', 'hp', 'equipped_idx', 'inventory', 'weapon_levels')
+
+
+def _clamp16(v):
+    return max(-32768, min(32767, int(v)))
+
+
+def pack_state(initial_state):
+    """把存档字典裁剪为可 JSON 序列化的开局快照。"""
+    if not initial_state:
+        return None
+    state = {k: initial_state[k] for k in _STATE_KEYS if k in initial_state}
+    if 'inventory' not in state and initial_state.get('inventory_objs'):
+        state['inventory'] = [getattr(w, 'name', str(w)) for w in initial_state['inventory_objs']]
+    return state
+
+
+def unpack_state(state):
+    """把开局快照还原为 `Game(initial_state=...)` 可用的字典。"""
+    if not state:
+        return None
+    from game.save_manager import rebuild_inventory
+    data = dict(state)
+    data['inventory_objs'] = rebuild_inventory(data.get('inventory', []))
+    return data
+
+
+class InputRecorder:
+    """把一局的逐步输入（及周期性状态关键帧）写入录像文件。"""
+
+    def __init__(self, path, seed, start_time, initial_state=None, tick_ms=SIM_TICK_MS,
+                 keyframe_every=KEYFRAME_EVERY):
+        self.path = path
+        self.ticks = 0
+        self.keyframe_every = keyframe_every
+        # (tick, 文件偏移)
+        self.keyframes = []
+        payload = json.dumps(pack_state(initial_state), ensure_ascii=False).encode('utf-8')
+        self._f = open(path, 'wb')
+        self._f.write(_HEADER.pack(MAGIC, int(seed), float(start_time), float(tick_ms), len(payload)))
+        self._f.write(payload)
+
+    def tick(self, inp, game=None):
+        """记录一个逻辑步的输入；给出 `game` 且到达间隔时，先写入推进前的状态关键帧。"""
+        if (game is not None and self.keyframe_every and self.ticks
+                and self.ticks % self.keyframe_every == 0):
+            self.keyframe(game)
+        flags = 0
+        for name, bit in _FLAG_BITS:
+            if getattr(inp, name):
+                flags |= bit
+        x, y = inp.mouse_pos
+        equip = -1 if inp.equip is None else inp.equip
+        self._f.write(_RECORD.pack(TAG_TICK, flags, _clamp16(x), _clamp16(y), equip))
+        self.ticks += 1
+
+    def keyframe(self, game):
+        blob = snapshot.capture(game)
+        self.keyframes.append((self.ticks, self._f.tell()))
+        self._f.write(TAG_KEYFRAME + _KEYFRAME.pack(self.ticks, len(blob)))
+        self._f.write(blob)
+
+    def shop_action(self, action):
+        idx = -1 if action.idx is None else action.idx
+        self._f.write(_RECORD.pack(TAG_SHOP, _SHOP_KINDS.index(action.kind), _clamp16(idx), 0, 0))
+
+    def finish(self, game):
+        """写入结果结尾与关键帧索引并关闭文件；重复调用无副作用。"""
+        if self._f is None:
+            return
+        self._f.write(TAG_END + _OUTCOME.pack(self.ticks, int(game.player.money), int(game.player.hp), int(game.kills)))
+        index_offset = self._f.tell()
+        for tick, offset in self.keyframes:
+            self._f.write(_INDEX_ENTRY.pack(tick, offset))
+        self._f.write(_TRAILER.pack(index_offset, len(self.keyframes), INDEX_MAGIC))
+        self._f.close()
+        self._f = None
+
+
+class ReplayFile:
+    """
+    以 mmap 方式打开的录像文件，支持按需读取记录与关键帧。
+
+    记录由 `records(offset)` 惰性解析；文件需在使用期间保持打开（可用 with 语句）。
+    """
+
+    def __init__(self, path):
+        self.path = path
+        size = os.path.getsize(path)
+        if size < _HEADER.size:
+            raise ValueError(f'录像文件过短: {path}')
+        self._file = open(path, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.seed, self.start_time, self.tick_ms, state_len = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f'不是录像文件: {path}')
+        pos = _HEADER.size
+        self.initial_state = unpack_state(json.loads(self._mm[pos:pos + state_len].decode('utf-8')))
+        # 第一条记录的偏移
+        self.records_offset = pos + state_len
+        self.outcome = None
+        # (tick, 文件偏移)，按 tick 升序
+        self.keyframes = []
+        self._ticks = None
+        if not self._read_index():
+            self._scan()
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _read_index(self):
+        mm = self._mm
+        if len(mm) < self.records_offset + _TRAILER.size:
+            return False
+        index_offset, count, magic = _TRAILER.unpack_from(mm, len(mm) - _TRAILER.size)
+        if magic != INDEX_MAGIC:
+            return False
+        self.keyframes = [_INDEX_ENTRY.unpack_from(mm, index_offset + i * _INDEX_ENTRY.size) for i in range(count)]
+        end = index_offset - 1 - _OUTCOME.size
+        if mm[end:end + 1] == TAG_END:
+            self.outcome = _OUTCOME.unpack_from(mm, end + 1)
+            self._ticks = self.outcome[0]
+        return True
+
+    def _scan(self):
+        """没有索引（录制被中断）时顺序扫描，收集关键帧位置并统计逻辑步数。"""
+        ticks = 0
+        for offset, tag in self._walk(self.records_offset):
+            if tag == TAG_TICK:
+                ticks += 1
+            elif tag == TAG_KEYFRAME:
+                self.keyframes.append((_KEYFRAME.unpack_from(self._mm, offset + 1)[0], offset))
+        self._ticks = ticks
+
+    def _walk(self, offset):
+        """逐条产出 (偏移, tag)；遇到结尾或不完整的尾部记录时停止，并在结尾处读取结果。"""
+        mm = self._mm
+        n = len(mm)
+        pos = offset
+        while pos < n:
+            tag = mm[pos:pos + 1]
+            if tag == TAG_END:
+                if pos + 1 + _OUTCOME.size <= n:
+                    self.outcome = _OUTCOME.unpack_from(mm, pos + 1)
+                return
+            if tag == TAG_KEYFRAME:
+                if pos + 1 + _KEYFRAME.size > n:
+                    return
+                _, size = _KEYFRAME.unpack_from(mm, pos + 1)
+                step = 1 + _KEYFRAME.size + size
+            elif tag in (TAG_TICK, TAG_SHOP):
+                step = _RECORD.size
+            else:
+                raise ValueError(f'未知录像记录类型 {tag!r}（偏移 {pos}）')
+            if pos + step > n:
+                # 录制中途被打断：丢弃不完整的尾部记录
+                return
+            yield pos, tag
+            pos += step
+
+    @property
+    def tick_count(self) -> int:
+        return self._ticks
+
+    def records(self, offset=None):
+        """从 `offset`（缺省为第一条记录）起惰性产出 InputState / ShopAction，跳过关键帧。"""
+        mm = self._mm
+        for pos, tag in self._walk(self.records_offset if offset is None else offset):
+            if tag == TAG_KEYFRAME:
+                continue
+            _, flags, x, y, extra = _RECORD.unpack_from(mm, pos)
+            if tag == TAG_TICK:
+                kwargs = {name: bool(flags & bit) for name, bit in _FLAG_BITS}
+                yield InputState(mouse_pos=(x, y), equip=None if extra < 0 else extra, **kwargs)
+            else:
+                yield ShopAction(_SHOP_KINDS[flags], None if x < 0 else x)
+
+    def keyframe_before(self, tick):
+        """返回 tick 不大于给定值的最近关键帧 (tick, offset)，没有则返回 None。"""
+        i = bisect.bisect_right(self.keyframes, (tick, float('inf'))) - 1
+        return self.keyframes[i] if i >= 0 else None
+
+    def read_keyframe(self, offset):
+        """读取位于 `offset` 的关键帧，返回 (tick, 快照字节串, 其后第一条记录的偏移)。"""
+        if self._mm[offset:offset + 1] != TAG_KEYFRAME:
+            raise ValueError(f'偏移 {offset} 处不是关键帧')
+        tick, size = _KEYFRAME.unpack_from(self._mm, offset + 1)
+        start = offset + 1 + _KEYFRAME.size
+        return tick, self._mm[start:start + size], start + size
+
+
+@dataclass
+class Replay:
+    """解析后的录像。`records` 按录制顺序保存 InputState（逻辑步）与 ShopAction（商店操作）。"""
+    seed: int
+    start_time: float
+    tick_ms: float
+    initial_state: Optional[dict] = None
+    records: List[Any] = field(default_factory=list)
+    outcome: Optional[Tuple[int, int, int, int]] = None  # (ticks, money, hp, kills)
+    keyframes: List[Tuple[int, int]] = field(default_factory=list)  # (tick, offset)
+
+    @property
+    def tick_count(self) -> int:
+        return sum(1 for r in self.records if isinstance(r, InputState))
+
+
+def load_replay(path):
+    """一次读出整个录像（不含关键帧内容）；格式不符时抛出 ValueError。"""
+    with ReplayFile(path) as rf:
+        records = list(rf.records())
+        return Replay(seed=rf.seed, start_time=rf.start_time, tick_ms=rf.tick_ms,
+                      initial_state=rf.initial_state, records=records,
+                      outcome=rf.outcome, keyframes=list(rf.keyframes))
+
+
+class ReplayInput(InputSource):
+    """按录制顺序回放输入：逻辑步取下一条 InputState，商店取随后的操作直到 'start'。"""
+
+    def __init__(self, records):
+        self._records = iter(records)
+        self._peeked = None
+        self._consumed = 0
+
+    def _peek(self):
+        if self._peeked is None:
+            self._peeked = next(self._records, None)
+        return self._peeked
+
+    def _next(self):
+        rec = self._peek()
+        self._peeked = None
+        self._consumed += 1
+        return rec
+
+    def poll(self, game) -> InputState:
+        rec = self._next()
+        if not isinstance(rec, InputState):
+            raise ValueError(f'录像与模拟不同步：第 {self._consumed} 条记录应为逻辑步输入')
+        return rec
+
+    def shop_actions(self, state):
+        actions = []
+        while isinstance(self._peek(), ShopAction):
+            action = self._next()
+            actions.append(action)
+            if action.kind == 'start':
+                break
+        if not actions or actions[-1].kind != 'start':
+            actions.append(ShopAction('start'))
+        return actions
+
+
+def seek(rf, tick):
+    """
+    返回位于第 `tick` 步之后状态的无窗口 `Game`：从最近的关键帧恢复，只模拟剩余的步数。
+
+    返回的游戏继续从 `rf` 读取后续输入，可接着 `update` 回放；使用期间需保持 `rf` 打开。
+    """
+    from game.headless import make_headless_game, run_headless
+    tick = max(0, min(tick, rf.tick_count))
+    kf = rf.keyframe_before(tick)
+    if kf is None:
+        game = make_headless_game(rf.seed, ReplayInput(rf.records()), rf.initial_state, start_time=rf.start_time)
+        done = 0
+    else:
+        done, blob, offset = rf.read_keyframe(kf[1])
+        game = make_headless_game(rf.seed, ReplayInput(rf.records(offset)), rf.initial_state, start_time=rf.start_time)
+        snapshot.restore(game, blob)
+    run_headless(tick - done, game=game, tick_ms=rf.tick_ms)
+    return game
+
+
+def replay_file(path):
+    """
+    不节流地回放录像，返回 (Replay, HeadlessReport)。
+
+    可用 `replay.outcome` 与报告中的 ticks/money/hp/kills 对比验证是否复现。
+    """
+    from game.headless import make_headless_game, run_headless
+    with ReplayFile(path) as rf:
+        replay = Replay(seed=rf.seed, start_time=rf.start_time, tick_ms=rf.tick_ms,
+                        initial_state=rf.initial_state, outcome=rf.outcome, keyframes=list(rf.keyframes))
+        game = make_headless_game(rf.seed, ReplayInput(rf.records()), rf.initial_state, start_time=rf.start_time)
+        report = run_headless(rf.tick_count, game=game, tick_ms=rf.tick_ms)
+    return replay, report
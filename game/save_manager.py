@@ -6,14 +6,23 @@
 
 import os
 import json
+import time
 from datetime import datetime, timezone
 
 from entities.weapons import SHOP_WEAPONS
+from game.trace import traced
+from game import metrics
 
 
 SAVE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'save')
 SAVE_FILE = os.path.join(SAVE_DIR, 'savegame.json')
 
+_SAVES = metrics.counter('saves_total', '成功存档次数')
+_SAVE_FAILURES = metrics.counter('save_failures_total', '存档失败次数')
+_SAVE_MS = metrics.gauge('save_ms', '最近一次存档耗时(ms)')
+_RECENT_SAVES = metrics.RateWindow(60.0)
+metrics.gauge('saves_per_minute', '最近 60 秒内的存档次数').set_function(_RECENT_SAVES.count)
+
 
 def ensure_save_dir():
     try:
@@ -22,6 +31,7 @@ def ensure_save_dir():
         pass
 
 
+@traced('save_game', 'io')
 def save_game(player, filename=SAVE_FILE):
         """将相关玩家状态保存为 JSON。
 
@@ -46,12 +56,17 @@ def save_game(player, filename=SAVE_FILE):
             'weapon_levels': getattr(player, 'weapon_levels', {}),
             'saved_at': datetime.now(timezone.utc).isoformat()
         }
+        t0 = time.perf_counter()
         try:
             with open(filename, 'w', encoding='utf-8') as f:
                 json.dump(data, f, ensure_ascii=False, indent=2)
-            return True
         except Exception:
+            _SAVE_FAILURES.inc()
             return False
+        _SAVE_MS.set((time.perf_counter() - t0) * 1000.0)
+        _SAVES.inc()
+        _RECENT_SAVES.mark()
+        return True
 
 
 def load_game(filename=SAVE_FILE):
@@ -70,8 +85,15 @@ def load_game(filename=SAVE_FILE):
     except Exception:
         return None
 
-    # 从SHOP_WEAPONS重建库存
-    names = data.get('inventory', [])
+    data['inventory_objs'] = rebuild_inventory(data.get('inventory', []))
+    # 确保weapon_levels存在
+    if 'weapon_levels' not in data or not isinstance(data.get('weapon_levels'), dict):
+        data['weapon_levels'] = {}
+    return data
+
+
+def rebuild_inventory(names):
+    """按武器名从 `SHOP_WEAPONS` 浅拷贝重建武器对象列表，未知名称会被跳过。"""
     reconstructed = []
     for n in names:
         found = None
@@ -86,8 +108,4 @@ def load_game(filename=SAVE_FILE):
                 break
         if found is not None:
             reconstructed.append(found)
-    data['inventory_objs'] = reconstructed
-    # 确保weapon_levels存在
-    if 'weapon_levels' not in data or not isinstance(data.get('weapon_levels'), dict):
-        data['weapon_levels'] = {}
-    return data
+    return reconstructed
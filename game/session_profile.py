@@ -0,0 +1,137 @@
+"""会话级剖析：把一次真实游玩（或无窗口运行）包在 cProfile 与采样剖析器中。
+
+    python main.py --profile            # cProfile + 采样
+    python main.py --profile sample     # 只采样（开销最小，适合慢机器）
+
+会话结束时在 `PROFILE_DIR` 下写出同名前缀的两个文件：
+
+- `session-YYYYmmdd-HHMMSS.pstats`：cProfile 统计，可用 `python -m pstats` 或 snakeviz 查看；
+- `session-YYYYmmdd-HHMMSS.folded`：采样得到的折叠调用栈（每行 `根;...;叶 次数`），
+  可直接交给 flamegraph.pl / speedscope 生成火焰图。
+
+只在 `active()` 块内计时/采样，菜单等待等时间不计入。
+"""
+
+import cProfile
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from config.settings import PROFILE_DIR, PROFILE_SAMPLE_MS
+
+MODES = ('both', 'cprofile', 'sample')
+
+
+def collapse_stack(frame, lines=False):
+    """把调用栈折叠为 `根;...;叶` 字符串；每帧记为 `文件:函数`（lines=True 时附行号）。"""
+    labels = []
+    while frame is not None:
+        code = frame.f_code
+        label = f'{os.path.basename(code.co_filename)}:{code.co_name}'
+        labels.append(f'{label}:{frame.f_lineno}' if lines else label)
+        frame = frame.f_back
+    return ';'.join(reversed(labels))
+
+
+class StackSampler:
+    """后台线程按固定间隔抓取目标线程的调用栈，累计为折叠栈计数。"""
+
+    def __init__(self, interval_ms=PROFILE_SAMPLE_MS, thread_id=None):
+        self.interval = interval_ms / 1000.0
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.counts = {}
+        self.samples = 0
+        # 未激活时线程只休眠不采样
+        self._active = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name='stack-sampler', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._active.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def resume(self):
+        self._active.set()
+
+    def pause(self):
+        self._active.clear()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self._active.wait()
+            if self._stop.is_set():
+                break
+            self.sample()
+            time.sleep(self.interval)
+
+    def sample(self):
+        frame = sys._current_frames().get(self.thread_id)
+        if frame is None:
+            return
+        key = collapse_stack(frame)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        self.samples += 1
+
+    def write_folded(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for key, n in sorted(self.counts.items(), key=lambda kv: -kv[1]):
+                f.write(f'{key} {n}\n')
+        return path
+
+
+class SessionProfiler:
+    """
+    一次会话的剖析器：`with prof.active(): ...` 包住需要剖析的部分（可多次进入），
+    结束时 `save()` 写出 .pstats 与 .folded。
+
+    参数:
+        mode: 'both' | 'cprofile' | 'sample'
+        out_dir: 输出目录，缺省为 PROFILE_DIR
+    """
+
+    def __init__(self, mode='both', out_dir=None, interval_ms=PROFILE_SAMPLE_MS):
+        if mode not in MODES:
+            raise ValueError(f'未知的剖析模式: {mode}')
+        self.mode = mode
+        self.out_dir = out_dir if out_dir is not None else PROFILE_DIR
+        self.stamp = time.strftime('session-%Y%m%d-%H%M%S')
+        self.profile = cProfile.Profile() if mode in ('both', 'cprofile') else None
+        self.sampler = StackSampler(interval_ms) if mode in ('both', 'sample') else None
+        if self.sampler is not None:
+            self.sampler.start()
+
+    @contextmanager
+    def active(self):
+        if self.profile is not None:
+            self.profile.enable()
+        if self.sampler is not None:
+            self.sampler.resume()
+        try:
+            yield self
+        finally:
+            if self.sampler is not None:
+                self.sampler.pause()
+            if self.profile is not None:
+                self.profile.disable()
+
+    def save(self):
+        """停止采样线程并写出结果，返回写出的文件路径列表。"""
+        os.makedirs(self.out_dir, exist_ok=True)
+        base = os.path.join(self.out_dir, self.stamp)
+        paths = []
+        if self.profile is not None:
+            self.profile.dump_stats(base + '.pstats')
+            paths.append(base + '.pstats')
+        if self.sampler is not None:
+            self.sampler.stop()
+            paths.append(self.sampler.write_folded(base + '.folded'))
+        return paths
@@ -0,0 +1,106 @@
+"""模拟状态快照：把一局游戏的完整逻辑状态编码为紧凑字节串，并能恢复到另一个 `Game` 上。
+
+快照包含模拟时钟、当前地图、击杀数、全局 `random` 状态、玩家（含背包武器与冷却）、
+全部地图（敌人、Boss 状态机字段与计时器、各地图的时间轮定时器与实体注册表、传送门）以及子弹池在用槽位。
+实体对象整体 pickle 后用 zlib 压缩；贴图等渲染资源不写入快照：
+`ImageManager` 换成目标游戏的实例，其缓存中的贴图按缓存键重新取回，其余 Surface 置为 None。
+
+快照用 pickle 编码，只应加载自己生成的文件。
+"""
+
+import io
+import pickle
+import random
+import zlib
+import pygame
+from game.image_manager import ImageManager
+
+SNAPSHOT_VERSION = 5
+
+
+class _StatePickler(pickle.Pickler):
+    def __init__(self, file, images):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        # Surface -> ImageManager 缓存键，恢复时可从目标游戏的贴图缓存重新取回
+        self._surface_keys = {}
+        cache = getattr(images, '_cache', None) or {}
+        for key, surf in cache.items():
+            self._surface_keys[id(surf)] = key
+
+    def persistent_id(self, obj):
+        if isinstance(obj, ImageManager):
+            return ('images',)
+        if isinstance(obj, pygame.Surface):
+            return ('surface', self._surface_keys.get(id(obj)))
+        return None
+
+
+class _StateUnpickler(pickle.Unpickler):
+    def __init__(self, file, images):
+        super().__init__(file)
+        self._images = images
+
+    def persistent_load(self, pid):
+        kind = pid[0]
+        if kind == 'images':
+            return self._images
+        if kind == 'surface':
+            key = pid[1]
+            if key is None or self._images is None:
+                return None
+            surf = self._images._cache.get(key)
+            if surf is None:
+                name, scale, colorkey = key
+                surf = self._images.get(name, scale=scale, colorkey=colorkey)
+            return surf
+        raise pickle.UnpicklingError(f'未知的快照引用 {pid!r}')
+
+
+def _scheduler_state(game):
+    """当前地图敌人批处理的 AI 调度状态；没有启用 LOD 时为 None。"""
+    batch = game._enemy_batch
+    if batch is None or batch.scheduler is None or not batch.matches(game.curmap.enemies):
+        return None
+    return batch.scheduler.state()
+
+
+def capture(game):
+    """返回当前模拟状态的压缩快照字节串。"""
+    state = {
+        'version': SNAPSHOT_VERSION,
+        'sim_time': game.sim_time,
+        'current_map_idx': game.current_map_idx,
+        'kills': game.kills,
+        'rng': random.getstate(),
+        'player': game.player,
+        'maps': game.maps,
+        'bullets': game.bullets.state(),
+        'ai': _scheduler_state(game),
+    }
+    buf = io.BytesIO()
+    _StatePickler(buf, game.images).dump(state)
+    return zlib.compress(buf.getvalue(), 6)
+
+
+def restore(game, blob):
+    """把 `capture` 得到的快照恢复到 `game` 上（替换玩家、地图与子弹，重设随机数状态）。"""
+    state = _StateUnpickler(io.BytesIO(zlib.decompress(blob)), game.images).load()
+    if state.get('version') != SNAPSHOT_VERSION:
+        raise ValueError(f"快照版本不匹配: {state.get('version')}")
+    game.sim_time = state['sim_time']
+    game.current_map_idx = state['current_map_idx']
+    game.kills = state['kills']
+    random.setstate(state['rng'])
+    game.player = state['player']
+    game.maps = state['maps']
+    game.bullets.load_state(state['bullets'])
+    game.running = True
+    # 恢复后不做渲染插值；敌人批处理缓存的是旧对象，需要重建
+    game._prev_centers = {}
+    game._enemy_batch = None
+    if state.get('ai') is not None:
+        # 分档调度的累计 dt/计数也属于模拟状态，否则恢复后远处敌人的推进时机会偏移
+        scheduler = game.enemy_batch().scheduler
+        if scheduler is not None:
+            scheduler.load_state(state['ai'])
+    return game
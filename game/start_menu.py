@@ -8,6 +8,7 @@
 
 import pygame
 from config import settings
+from game import watchdog
 
 
 class StartMenu:
@@ -192,6 +193,7 @@ class StartMenu:
         running = True
         while running:
             dt = clock.tick(fps)
+            watchdog.beat('StartMenu.run')
             now = pygame.time.get_ticks()
             if self.state == 'message' and now >= self.message_until:
                 self.state = 'menu'
@@ -248,6 +250,7 @@ class StartMenu:
         slider_rect = pygame.Rect(self.width // 2 - 160, self.height // 2 + 20, 320, 10)
         while True:
             dt = clock.tick(fps)
+            watchdog.beat('StartMenu.run')
             for ev in pygame.event.get():
                 if ev.type == pygame.QUIT:
                     self.state = 'menu'
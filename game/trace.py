@@ -0,0 +1,178 @@
+"""Chrome trace-event 记录器：把帧、帧内阶段与关键事件写成 `about:tracing` / Perfetto 可读的 JSON。
+
+    python main.py --trace                 # 写到 profiles/trace-YYYYmmdd-HHMMSS.json
+    python main.py --trace run.json
+
+用法：
+
+    from game import trace
+    with trace.span('spawn_maps'):
+        ...
+
+    @trace.traced('save_game', 'io')
+    def save_game(...): ...
+
+未开启时 `span()` 直接返回共享的空上下文，`traced` 包装只多一次全局变量判断，
+开销可忽略。事件以元组暂存，结束时一次性写出；超过 `TRACE_MAX_EVENTS` 的事件丢弃并计数。
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from config.settings import PROFILE_DIR, TRACE_MAX_EVENTS
+
+_NULL_SPAN = nullcontext()
+# 当前的记录器；None 表示未开启
+_tracer = None
+
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'cat', 'args', 't0')
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.complete(self.name, self.cat, self.t0, time.perf_counter(), self.args)
+        return False
+
+
+class TraceRecorder:
+    """
+    收集 trace 事件（完整事件 'X' 与瞬时事件 'i'），`write(path)` 输出 JSON。
+
+    帧接口与 `FrameProfiler` 一致：`begin_frame()`、`lap(name)`、`end_frame()`，
+    每帧生成一个 'frame' 事件，各阶段生成嵌套其中的同名事件。
+    """
+
+    def __init__(self, max_events=TRACE_MAX_EVENTS):
+        self.max_events = max_events
+        self.events = []
+        self.dropped = 0
+        self.frames = 0
+        self._origin = time.perf_counter()
+        self._frame_start = None
+        self._last = None
+        self._pid = os.getpid()
+
+    # ---------------------------- 事件 ----------------------------
+    def _add(self, event):
+        if len(self.events) < self.max_events:
+            self.events.append(event)
+        else:
+            self.dropped += 1
+
+    def complete(self, name, cat, t0, t1, args=None):
+        self._add(('X', name, cat, t0, t1 - t0, threading.get_ident(), args))
+
+    def instant(self, name, cat='app', args=None):
+        self._add(('i', name, cat, time.perf_counter(), 0.0, threading.get_ident(), args))
+
+    def span(self, name, cat='app', args=None):
+        return _Span(self, name, cat, args)
+
+    # ---------------------------- 帧 ----------------------------
+    def begin_frame(self):
+        self._frame_start = self._last = time.perf_counter()
+
+    def lap(self, name):
+        t = time.perf_counter()
+        if self._last is not None:
+            self.complete(name, 'phase', self._last, t)
+        self._last = t
+
+    def end_frame(self):
+        if self._frame_start is None:
+            return
+        self.complete('frame', 'frame', self._frame_start, time.perf_counter(), {'frame': self.frames})
+        self.frames += 1
+        self._frame_start = self._last = None
+
+    # ---------------------------- 输出 ----------------------------
+    def to_json(self):
+        """返回 trace-event 格式的字典（时间单位为微秒，相对记录开始）。"""
+        origin = self._origin
+        names = {t.ident: t.name for t in threading.enumerate()}
+        out = [{'ph': 'M', 'name': 'process_name', 'pid': self._pid, 'args': {'name': 'Cross-Domain-Survival'}}]
+        for tid in sorted({e[5] for e in self.events}):
+            out.append({'ph': 'M', 'name': 'thread_name', 'pid': self._pid, 'tid': tid,
+                        'args': {'name': names.get(tid, f'thread-{tid}')}})
+        for ph, name, cat, t0, dur, tid, args in self.events:
+            ev = {'ph': ph, 'name': name, 'cat': cat, 'ts': round((t0 - origin) * 1e6, 3),
+                  'pid': self._pid, 'tid': tid}
+            if ph == 'X':
+                ev['dur'] = round(dur * 1e6, 3)
+            else:
+                ev['s'] = 't'
+            if args:
+                ev['args'] = args
+            out.append(ev)
+        meta = {'dropped_events': self.dropped, 'frames': self.frames}
+        return {'traceEvents': out, 'displayTimeUnit': 'ms', 'otherData': meta}
+
+    def write(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_json(), f, separators=(',', ':'))
+        return path
+
+
+# ---------------------------- 全局开关 ----------------------------
+def start(max_events=TRACE_MAX_EVENTS):
+    """开启全局记录并返回记录器。"""
+    global _tracer
+    _tracer = TraceRecorder(max_events)
+    return _tracer
+
+
+def stop(path=None, write=True):
+    """关闭全局记录并写出到 path（缺省为 PROFILE_DIR 下带时间戳的文件名），返回路径；write=False 时直接丢弃。"""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is None or not write:
+        return None
+    if not path:
+        path = os.path.join(PROFILE_DIR, time.strftime('trace-%Y%m%d-%H%M%S.json'))
+    return tracer.write(path)
+
+
+def active():
+    """当前记录器；未开启时为 None。"""
+    return _tracer
+
+
+def span(name, cat='app', /, **args):
+    tracer = _tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return tracer.span(name, cat, args or None)
+
+
+def instant(name, cat='app', /, **args):
+    tracer = _tracer
+    if tracer is not None:
+        tracer.instant(name, cat, args or None)
+
+
+def traced(name, cat='app'):
+    """函数装饰器：开启记录时把每次调用记为一个 span。"""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            tracer = _tracer
+            if tracer is None:
+                return fn(*args, **kwargs)
+            with tracer.span(name, cat):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
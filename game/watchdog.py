@@ -0,0 +1,155 @@
+"""卡顿监视：后台线程发现某帧超时后，在超时期间反复采样主线程调用栈，记录最常见的“罪魁”。
+
+    python main.py --watchdog          # 阈值 HITCH_THRESHOLD_MS
+    python main.py --watchdog 50       # 自定义阈值（ms）
+
+各界面循环（`Game.run`、商店、结算界面、`StartMenu.run`）每帧调用 `beat(位置)`；
+距上次心跳超过阈值时开始按 `HITCH_SAMPLE_MS` 采样主线程栈，下一次心跳到达时结束这次卡顿：
+输出一行日志（位置、时长、出现最多的栈），并把样本累计到全局统计，退出时 `report()` 汇总。
+同步存档、`pygame.mixer.music.load`、首次 `smoothscale` 这类偶发尖峰在平均值里看不出来，在这里能直接看到栈。
+
+未开启时 `beat()` 只有一次全局变量判断。
+"""
+
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict
+from config.settings import HITCH_THRESHOLD_MS, HITCH_SAMPLE_MS
+from game.session_profile import collapse_stack
+
+# 当前的监视器；None 表示未开启
+_watchdog = None
+# 日志与汇总里每个栈显示的叶端帧数
+_LEAF_FRAMES = 4
+
+
+@dataclass
+class Hitch:
+    """一次卡顿：开始时所在的循环、时长与期间的栈样本计数。"""
+    where: str
+    start: float
+    duration_ms: float = 0.0
+    samples: Dict[str, int] = field(default_factory=dict)
+
+    def worst(self):
+        """出现次数最多的栈及其次数；没有样本时为 (None, 0)。"""
+        if not self.samples:
+            return None, 0
+        return max(self.samples.items(), key=lambda kv: kv[1])
+
+
+def short_stack(stack, frames=_LEAF_FRAMES):
+    """只保留叶端若干帧，叶在前：`叶 <- 调用者 <- ...`。"""
+    return ' <- '.join(reversed(stack.split(';')[-frames:]))
+
+
+class HitchWatchdog:
+    """
+    心跳驱动的卡顿监视线程。
+
+    参数:
+        threshold_ms: 两次心跳间隔超过该值视为卡顿
+        sample_ms: 卡顿期间的采样间隔（同时是检测的轮询间隔）
+        log: 每次卡顿结束时调用的日志函数，缺省为 print；None 则不输出
+    """
+
+    def __init__(self, threshold_ms=HITCH_THRESHOLD_MS, sample_ms=HITCH_SAMPLE_MS, log=print, thread_id=None):
+        self.threshold = threshold_ms / 1000.0
+        self.interval = sample_ms / 1000.0
+        self.log = log
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.hitches = []
+        # 所有卡顿的栈样本合计，及各循环的卡顿次数
+        self.offenders = {}
+        self.by_where = {}
+        # (心跳时刻, 位置, 序号)：整体替换，读写无需加锁
+        self._beat = (time.perf_counter(), 'startup', 0)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name='hitch-watchdog', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def beat(self, where):
+        self._beat = (time.perf_counter(), where, self._beat[2] + 1)
+
+    # ---------------------------- 监视线程 ----------------------------
+    def _loop(self):
+        current = None
+        seq = None
+        while not self._stop.wait(self.interval):
+            t, where, n = self._beat
+            if current is not None and n != seq:
+                # 新的心跳到达：卡顿以该心跳时刻结束
+                current.duration_ms = (t - current.start) * 1000.0
+                self._finish(current)
+                current = None
+            if current is None and time.perf_counter() - t > self.threshold:
+                current, seq = Hitch(where, t), n
+            if current is not None:
+                frame = sys._current_frames().get(self.thread_id)
+                if frame is not None:
+                    key = collapse_stack(frame, lines=True)
+                    current.samples[key] = current.samples.get(key, 0) + 1
+                    del frame
+
+    def _finish(self, hitch):
+        self.hitches.append(hitch)
+        self.by_where[hitch.where] = self.by_where.get(hitch.where, 0) + 1
+        for key, n in hitch.samples.items():
+            self.offenders[key] = self.offenders.get(key, 0) + n
+        if self.log is not None:
+            stack, n = hitch.worst()
+            at = f' at {short_stack(stack)} ({n}/{sum(hitch.samples.values())})' if stack else ''
+            self.log(f'[Hitch] {hitch.where} {hitch.duration_ms:.1f} ms{at}')
+
+    # ---------------------------- 汇总 ----------------------------
+    def worst_offenders(self, top=10):
+        """样本数最多的栈：[(栈, 次数), ...]。"""
+        return sorted(self.offenders.items(), key=lambda kv: -kv[1])[:top]
+
+    def report(self, top=10):
+        """多行文本：卡顿次数、最长卡顿与出现最多的栈。"""
+        if not self.hitches:
+            return f'[Hitch] 没有超过 {self.threshold * 1000:.0f} ms 的帧'
+        longest = max(self.hitches, key=lambda h: h.duration_ms)
+        where = ', '.join(f'{w}={n}' for w, n in sorted(self.by_where.items(), key=lambda kv: -kv[1]))
+        lines = [f'[Hitch] {len(self.hitches)} 次卡顿（{where}），最长 {longest.duration_ms:.1f} ms @ {longest.where}']
+        for stack, n in self.worst_offenders(top):
+            lines.append(f'  {n:5d}  {short_stack(stack)}')
+        return '\n'.join(lines)
+
+
+# ---------------------------- 全局开关 ----------------------------
+def start(threshold_ms=HITCH_THRESHOLD_MS, sample_ms=HITCH_SAMPLE_MS, log=print):
+    """在当前（主）线程上开启监视并返回监视器。"""
+    global _watchdog
+    stop()
+    _watchdog = HitchWatchdog(threshold_ms, sample_ms, log).start()
+    return _watchdog
+
+
+def stop():
+    """停止监视并返回原监视器（未开启时为 None）。"""
+    global _watchdog
+    watchdog, _watchdog = _watchdog, None
+    if watchdog is not None:
+        watchdog.stop()
+    return watchdog
+
+
+def beat(where):
+    watchdog = _watchdog
+    if watchdog is not None:
+        watchdog.beat(where)
@@ -10,17 +10,38 @@ Cross-Domin-Survival
   - maps/: 地图模块
   - game/: 主游戏逻辑
   - main.py: 启动入口
+
+无窗口快进模拟（脚本玩家，输出每秒逻辑步数）：
+  python main.py --headless --ticks 20000 --seed 7
+录制与回放（回放不节流，并校验金钱/生命/击杀与录制时一致）：
+  python main.py --record fight.rpl
+  python main.py --replay fight.rpl
+  python main.py --replay fight.rpl --seek 5400   # 从最近的关键帧跳到第 5400 步
+会话剖析（写出 profiles/session-*.pstats 与折叠调用栈 .folded）：
+  python main.py --profile
+  python main.py --profile sample   # 只用采样剖析器，开销最小
+时间线 trace（Chrome about:tracing / Perfetto 可打开）：
+  python main.py --trace            # 写到 profiles/trace-*.json
+卡顿监视（单帧超过阈值时采样主线程栈，退出时汇总最常见的栈）：
+  python main.py --watchdog         # 阈值 33 ms
+  python main.py --watchdog 50
+运行指标（帧率、存活子弹/敌人、贴图缓存命中率、每分钟存档次数等）：
+  python main.py --metrics soak.jsonl --metrics-interval 10 --metrics-port 9464
 """
 
+import argparse
 import os
+import sys
 import pycache_init  # must import first to set sys.pycache_prefix
 import pygame
 import random
-from config.settings import WIDTH, HEIGHT, FPS, WINDOW_TITLE, UI_FONT_NAMES
+from contextlib import nullcontext
+from config.settings import WIDTH, HEIGHT, FPS, WINDOW_TITLE, UI_FONT_NAMES, HITCH_THRESHOLD_MS, METRICS_INTERVAL_S
 from game.game import Game
 from game.start_menu import StartMenu
 from game.audio import MusicPlayer
 from game.image_manager import ImageManager
+from game import trace
 
 
 def select_font(name_list, size):
@@ -54,15 +75,194 @@ def play_game_music(music):
     pass
 
 
-def run_game_loop(screen, clock, font, bigfont, images, music, initial_state=None):
-  game = Game(screen, clock, font, bigfont, images=images, music=music, initial_state=initial_state)
-  return game.run()
+def profiling(session):
+  """会话剖析器激活期间的上下文；未开启 --profile 时为空操作。"""
+  return session.active() if session is not None else nullcontext()
+
+
+def finish_profile(session):
+  if session is None:
+    return
+  for path in session.save():
+    print(f'[Profile] 已写出 {path}')
+
+
+def run_game_loop(screen, clock, font, bigfont, images, music, initial_state=None, seed=None, record_path=None,
+                  session=None, mode='campaign'):
+  # 每局开局前重新播种：地图生成只取决于 seed，录像据此复现
+  random.seed(seed)
+  game = Game(screen, clock, font, bigfont, images=images, music=music, initial_state=initial_state, mode=mode)
+  if record_path:
+    from game.replay import InputRecorder
+    game.recorder = InputRecorder(record_path, seed, game.sim_time, initial_state)
+  try:
+    with profiling(session):
+      return game.run()
+  finally:
+    if game.recorder is not None:
+      game.recorder.finish(game)
+
+
+def parse_args(argv=None):
+  parser = argparse.ArgumentParser(description='Cross-Domain-Survival')
+  parser.add_argument('--headless', action='store_true', help='无窗口快进模拟，不节流、由脚本玩家操作')
+  parser.add_argument('--ticks', type=int, default=10000, help='无窗口模式下推进的逻辑步数')
+  parser.add_argument('--seed', type=int, default=None, help='地图生成与脚本玩家使用的随机种子')
+  parser.add_argument('--horde', action='store_true', help='无尽模式：敌人按波次从地图边缘不断刷出（兼作压力测试）')
+  parser.add_argument('--record', metavar='PATH', default=None, help='把（第一局）逐步输入录制到文件')
+  parser.add_argument('--replay', metavar='PATH', default=None, help='无窗口、不节流地回放录像并校验结果')
+  parser.add_argument('--seek', metavar='TICK', type=int, default=None, help='与 --replay 同用：从最近的关键帧跳到指定逻辑步并输出状态')
+  parser.add_argument('--profile', nargs='?', const='both', default=None, choices=('both', 'cprofile', 'sample'),
+                      help='剖析每局游戏（或无窗口运行），退出时写出 .pstats 与折叠调用栈')
+  parser.add_argument('--trace', nargs='?', metavar='PATH', const='', default=None,
+                      help='记录帧/阶段与关键事件的 Chrome trace JSON（缺省写到 profiles/ 下）')
+  parser.add_argument('--metrics', nargs='?', metavar='PATH', const='', default=None,
+                      help='定期把运行指标追加到 JSONL 文件（缺省写到 profiles/ 下）')
+  parser.add_argument('--metrics-interval', metavar='SEC', type=float, default=METRICS_INTERVAL_S,
+                      help='--metrics 的写入间隔（秒）')
+  parser.add_argument('--metrics-port', metavar='PORT', type=int, default=None,
+                      help='在 127.0.0.1:PORT/metrics 以 Prometheus 文本格式提供运行指标')
+  parser.add_argument('--watchdog', nargs='?', metavar='MS', type=float, const=HITCH_THRESHOLD_MS, default=None,
+                      help='监视超过阈值的卡顿帧并采样主线程调用栈，退出时汇总')
+  args = parser.parse_args(argv)
+  if args.horde and (args.record or args.replay):
+    # 录像头只记录种子与存档状态，回放时按闯关模式重建地图
+    parser.error('--horde 暂不支持录像与回放')
+  return args
+
+
+def start_metrics(args):
+  """按参数启动指标导出（JSONL 写入线程 / 本机 HTTP 端点），返回需要在退出时停止的对象。"""
+  exporters = []
+  if args.metrics is None and args.metrics_port is None:
+    return exporters
+  from game.metrics import JsonlWriter, MetricsServer
+  if args.metrics is not None:
+    writer = JsonlWriter(args.metrics, args.metrics_interval).start()
+    print(f'[Metrics] 每 {args.metrics_interval:g} 秒写入 {writer.path}')
+    exporters.append(writer)
+  if args.metrics_port is not None:
+    server = MetricsServer(args.metrics_port).start()
+    print(f'[Metrics] http://127.0.0.1:{server.port}/metrics')
+    exporters.append(server)
+  return exporters
+
+
+def make_session_profiler(args):
+  if not args.profile:
+    return None
+  from game.session_profile import SessionProfiler
+  return SessionProfiler(args.profile)
+
+
+def run_headless_cli(args):
+  from game.headless import make_headless_game, run_headless
+  recorder = None
+  seed = args.seed
+  if args.record:
+    from game.replay import InputRecorder
+    if seed is None:
+      seed = random.SystemRandom().randrange(2 ** 31)
+    recorder = InputRecorder(args.record, seed, 0)
+  game = make_headless_game(seed, recorder=recorder, mode='horde' if args.horde else 'campaign')
+  session = make_session_profiler(args)
+  with profiling(session):
+    report = run_headless(args.ticks, game=game)
+  if recorder is not None:
+    recorder.finish(game)
+  print(report.summary())
+  finish_profile(session)
+  return 0
+
+
+def run_replay_cli(args):
+  from game.replay import replay_file
+  if args.seek is not None:
+    return run_seek_cli(args)
+  replay, report = replay_file(args.replay)
+  print(report.summary())
+  if replay.outcome is None:
+    print('录像缺少结尾（录制被中断），无法校验结果')
+    return 0
+  got = (report.ticks, report.money, report.hp, report.kills)
+  print(f'recorded ticks/money/hp/kills={tuple(replay.outcome)} replayed={got}')
+  return 0 if got == tuple(replay.outcome) else 1
+
+
+def run_seek_cli(args):
+  import time
+  from game.replay import ReplayFile, seek
+  with ReplayFile(args.replay) as rf:
+    kf = rf.keyframe_before(args.seek)
+    t0 = time.perf_counter()
+    game = seek(rf, args.seek)
+    elapsed = time.perf_counter() - t0
+  print(f'seek tick={args.seek} from keyframe={kf[0] if kf else 0} in {elapsed * 1000:.1f} ms')
+  print(f'map={game.current_map_idx + 1} money={game.player.money} hp={game.player.hp} kills={game.kills} '
+        f'bullets={len(game.bullets)} alive_enemies={sum(e.alive for e in game.curmap.enemies)}')
+  return 0
+
+
+def run_menu_loop(screen, clock, font, bigfont, images, music, game_seeds, record_path, session, mode='campaign'):
+  """菜单 -> 游戏 -> 菜单/重开的循环，直到在菜单中退出。"""
+  while True:
+    menu = StartMenu(screen, font, bigfont, images=images, width=WIDTH, height=HEIGHT, music=music)
+    action = menu.run(clock)
+    # action 形如 ('new'|'load'|'quit', state) 或 None
+    if not action:
+      break
+    kind, state = action
+    if kind == 'quit':
+      break
 
+    # 进入游戏前停止菜单音乐
+    try:
+      music.stop()
+    except Exception:
+      pass
+
+    # 跑一局游戏（载入或新开）
+    play_game_music(music)
+    end_action = run_game_loop(screen, clock, font, bigfont, images, music, initial_state=state if kind == 'load' else None,
+                               seed=game_seeds.randrange(2 ** 31), record_path=record_path, session=session,
+                               mode=mode)
+    # 只录制第一局
+    record_path = None
+
+    # 处理游戏结束后的分支
+    if end_action == 'restart':
+      play_game_music(music)
+      end_action = run_game_loop(screen, clock, font, bigfont, images, music, seed=game_seeds.randrange(2 ** 31),
+                                 session=session, mode=mode)
 
-def main():
+    # 其他情况回到菜单（menu/None）
+    play_menu_music(music)
+
+
+
+def main(argv=None):
     """
     游戏启动入口
     """
+    args = parse_args(argv)
+    if args.trace is not None:
+      trace.start()
+    exporters = start_metrics(args)
+    try:
+      return run_cli(args)
+    finally:
+      for exporter in exporters:
+        exporter.stop()
+      if args.trace is not None:
+        print(f'[Trace] 已写出 {trace.stop(args.trace)}')
+
+
+def run_cli(args):
+    if args.replay:
+      return run_replay_cli(args)
+    if args.headless:
+      return run_headless_cli(args)
+
     # 初始化pygame
     pygame.init()
     
@@ -75,7 +275,11 @@ def main():
     bigfont = select_font(UI_FONT_NAMES, 48)
     
     # 创建游戏实例并运行（先显示开始界面）
-    random.seed()
+    random.seed(args.seed)
+    # 每局的地图种子由会话种子派生；未指定 --seed 时每次启动都不同
+    game_seeds = random.Random(args.seed)
+    record_path = args.record
+    session = make_session_profiler(args)
     assets_dir = os.path.join(os.path.dirname(__file__), 'assets', 'images')
     images = ImageManager(assets_dir)
 
@@ -86,34 +290,17 @@ def main():
     play_menu_music(music)
 
     # 主循环：显示菜单 -> 跑游戏 -> 可能返回菜单或重开
-    while True:
-      menu = StartMenu(screen, font, bigfont, images=images, width=WIDTH, height=HEIGHT, music=music)
-      action = menu.run(clock)
-      # action 形如 ('new'|'load'|'quit', state) 或 None
-      if not action:
-        break
-      kind, state = action
-      if kind == 'quit':
-        break
-
-      # 进入游戏前停止菜单音乐
-      try:
-        music.stop()
-      except Exception:
-        pass
-
-      # 跑一局游戏（载入或新开）
-      play_game_music(music)
-      end_action = run_game_loop(screen, clock, font, bigfont, images, music, initial_state=state if kind == 'load' else None)
-
-      # 处理游戏结束后的分支
-      if end_action == 'restart':
-        play_game_music(music)
-        end_action = run_game_loop(screen, clock, font, bigfont, images, music)
-
-      # 其他情况回到菜单（menu/None）
-      play_menu_music(music)
+    if args.watchdog is not None:
+      from game import watchdog
+      watchdog.start(args.watchdog)
+    try:
+      run_menu_loop(screen, clock, font, bigfont, images, music, game_seeds, record_path, session,
+                    mode='horde' if args.horde else 'campaign')
+    finally:
+      finish_profile(session)
+      if args.watchdog is not None:
+        print(watchdog.stop().report())
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
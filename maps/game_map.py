@@ -5,16 +5,24 @@
 import pygame
 import random
 from config.settings import (
-    WIDTH, HEIGHT, RESOURCE_COUNT_PER_MAP,
-    COLOR_BACKGROUND, COLOR_RESOURCE, COLOR_PORTAL, COLOR_EXIT,
-    ENEMY_SPAWN_WEIGHTS
+    WIDTH, HEIGHT, RESOURCE_COUNT_PER_MAP, ENEMY_SIZE,
+    COLOR_BACKGROUND, COLOR_RESOURCE, COLOR_PORTAL, COLOR_EXIT, COLOR_OBSTACLE,
+    ENEMY_SPAWN_WEIGHTS, MAP_OBSTACLE_LAYOUTS
 )
 from entities.factory import EnemyFactory
+from entities.registry import EntityRegistry
+from entities.timer_wheel import TimerWheel
+from maps.navigation import NavGrid, FlowField
+from maps.spawn_table import spawn_table
+from maps.visibility import VisibilityGrid
+
+# 随机选点与障碍物重叠时最多重试的次数
+_SPAWN_ATTEMPTS = 50
 
 
 class GameMap:
     """
-    游戏地图类：管理敌人、资源、传送门和撤离点
+    游戏地图类：管理敌人、障碍物、资源、传送门和撤离点
     """
     
     def __init__(self, idx, is_final=False, images=None):
@@ -28,13 +36,24 @@ class GameMap:
         self.idx = idx
         self.is_final = is_final
         self.images = images
-        self.enemies = []
+        # 敌人的迭代列表与存活计数；最后一个敌人死亡时生成传送门
+        self.registry = EntityRegistry()
+        self.registry.on_cleared(self.spawn_portal)
         self.portal = None
         self.exit_rect = None
         self.resource_img = None
         self.portal_img = None
         self.exit_img = None
         self.enemy_factory = EnemyFactory(images=self.images)
+        # 本地图敌人的冷却与武器视觉定时器；随地图进快照，离开地图时一起暂停
+        self.timers = TimerWheel()
+        # 障碍物与导航：追击型敌人共享指向玩家的流场
+        layout = MAP_OBSTACLE_LAYOUTS[min(idx, len(MAP_OBSTACLE_LAYOUTS) - 1)]
+        self.obstacles = [pygame.Rect(r) for r in layout]
+        self.nav = NavGrid(self.obstacles)
+        self.flow = FlowField(self.nav)
+        # 视线查询：没有障碍物的地图不需要
+        self.vis = VisibilityGrid(self.obstacles) if self.obstacles else None
         if images:
             self.resource_img = images.get('map/resource', scale=(16, 16), fallback_size=(16, 16), fallback_color=COLOR_RESOURCE)
             self.portal_img = images.get('map/portal', scale=(52, 52), fallback_size=(52, 52), fallback_color=COLOR_PORTAL)
@@ -45,14 +64,17 @@ class GameMap:
         """
         生成地图内容：敌人、资源、传送门/撤离点
         """
-        # 通用：按 settings 中的权重决定每张地图的敌人类型
+        # 通用：按 settings 中的权重决定每张地图的敌人类型（抽样用预先构建的别名表）
         spawn_weights = ENEMY_SPAWN_WEIGHTS[min(self.idx, len(ENEMY_SPAWN_WEIGHTS) - 1)]
+        table = spawn_table(self.idx)
 
         # 如果是最终地图且权重配置只包含 boss，则只生成一个 Boss
         if self.is_final and set(spawn_weights.keys()) == {'boss'}:
             bx = WIDTH // 2
             by = HEIGHT // 2
-            self.enemies.append(self.enemy_factory.create('boss', bx, by, patrol_radius=0))
+            boss = self.enemy_factory.create('boss', bx, by, patrol_radius=0)
+            boss.use_timers(self.timers)
+            self.registry.add(boss)
             # 不事先创建撤离点或传送门，玩家需击败 boss 后触发传送门
             self.exit_rect = None
             self.portal = None
@@ -64,8 +86,41 @@ class GameMap:
             x = random.randint(60, WIDTH - 60)
             y = random.randint(60, HEIGHT - 60)
             patrol = random.choice([0, 40, 80])
-            archetype = self._pick_archetype(spawn_weights)
-            self.enemies.append(self.enemy_factory.create(archetype, x, y, patrol_radius=patrol))
+            archetype = table.pick()
+            # 出生点及巡逻圆不能压在障碍物上（没有障碍物时不会多消耗随机数）
+            for _ in range(_SPAWN_ATTEMPTS):
+                if not self._blocked(self._enemy_area(x, y, patrol)):
+                    break
+                x = random.randint(60, WIDTH - 60)
+                y = random.randint(60, HEIGHT - 60)
+            self.registry.add(self._make_enemy(archetype, x, y, patrol))
+
+    @property
+    def enemies(self):
+        """本地图敌人的迭代列表（死者积累到一定比例前仍留在列表中，迭代时需检查 `alive`）。"""
+        return self.registry.entities
+
+    @enemies.setter
+    def enemies(self, enemies):
+        self.registry.reset(enemies)
+
+    def _make_enemy(self, archetype, x, y, patrol):
+        """创建敌人并接入本地图的流场、视线查询与时间轮。"""
+        enemy = self.enemy_factory.create(archetype, x, y, patrol_radius=patrol)
+        enemy.flow = self.flow
+        enemy.vis = self.vis
+        enemy.use_timers(self.timers)
+        return enemy
+
+    @staticmethod
+    def _enemy_area(x, y, patrol):
+        """敌人出生矩形与整个巡逻圆（按敌人边长外扩）的外包矩形。"""
+        half = ENEMY_SIZE // 2
+        circle = pygame.Rect(x - patrol - half, y - patrol - half, 2 * (patrol + half), 2 * (patrol + half))
+        return circle.union(pygame.Rect(x, y, ENEMY_SIZE, ENEMY_SIZE))
+
+    def _blocked(self, rect):
+        return rect.collidelist(self.obstacles) != -1
 
     def spawn_portal(self):
         """在随机的有效位置生成一个传送门（在非最终地图和敌人被清除后的最终地图中均会使用）。"""
@@ -73,19 +128,17 @@ class GameMap:
             return
         px = random.randint(80, WIDTH - 120)
         py = random.randint(80, HEIGHT - 120)
+        for _ in range(_SPAWN_ATTEMPTS):
+            if not self._blocked(pygame.Rect(px, py, 52, 52)):
+                break
+            px = random.randint(80, WIDTH - 120)
+            py = random.randint(80, HEIGHT - 120)
         self.portal = pygame.Rect(px, py, 52, 52)
 
-    def _pick_archetype(self, weights):
-        """基于提供的字典进行加权选择；返回原型名称。"""
-        total = sum(weights.values())
-        r = random.random() * total
-        acc = 0.0
-        for name, w in weights.items():
-            acc += w
-            if r <= acc:
-                return name
-        # 备选
-        return next(iter(weights.keys()))
+    def update(self, dt, now):
+        """每个逻辑步在推进敌人之前调用：执行到期的冷却/武器视觉定时器，死者较多时压缩敌人列表。"""
+        self.timers.advance(now)
+        self.registry.compact()
 
     def draw(self, surf):
         """
@@ -96,6 +149,10 @@ class GameMap:
         """
         # 背景
         surf.fill(COLOR_BACKGROUND)
+
+        # 障碍物
+        for rect in self.obstacles:
+            pygame.draw.rect(surf, COLOR_OBSTACLE, rect)
         
         # 绘制传送门
         if self.portal:
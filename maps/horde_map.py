@@ -0,0 +1,103 @@
+"""
+无尽模式地图：按波次从地图边缘刷出越来越多的敌人，全部沿共享流场追击玩家
+
+每波人数按 `HORDE_WAVE_GROWTH` 递增（几波之后就是上百个敌人），在场人数受 `HORDE_MAX_ALIVE` 限制。
+刷怪按 `HORDE_SPAWN_INTERVAL_MS` 分批进行：新敌人追加到注册表的迭代列表，死者积累较多时注册表换成只含存活者的新列表，
+`Game` 据列表身份与长度重建 `EnemyBatch`，平时敌人列表保持不变。
+敌人类型按波次取 `ENEMY_SPAWN_WEIGHTS` 中不含 Boss 的各组别名表，整批一次抽样。
+
+这张地图同时是 `Game.update` 各热点路径（批量追击与分离、视线、子弹池、碰撞）的压力测试。
+"""
+
+import math
+import random
+from config.settings import (
+    WIDTH, HEIGHT, ENEMY_SIZE,
+    HORDE_LAYOUT, HORDE_FIRST_WAVE, HORDE_WAVE_GROWTH, HORDE_MAX_WAVE, HORDE_MAX_ALIVE,
+    HORDE_CLEAR_RATIO, HORDE_WAVE_INTERVAL_MS, HORDE_SPAWN_INTERVAL_MS, HORDE_SPAWN_BURST,
+    HORDE_CHASE_SPEED, HORDE_CHASE_STOP,
+)
+from maps.game_map import GameMap, _SPAWN_ATTEMPTS
+from maps.spawn_table import SPAWN_TABLES
+
+# 各波的敌人类型表：第 k 波取第 k 组不含 Boss 的权重（超出则用最后一组）
+HORDE_TABLES = [t for t in SPAWN_TABLES if t.names != ['boss']]
+# 出生点离地图边缘的距离（像素）
+_EDGE_MARGIN = 20
+
+
+def wave_size(wave):
+    """第 `wave` 波（从 1 开始）的敌人数。"""
+    return min(HORDE_MAX_WAVE, int(round(HORDE_FIRST_WAVE * HORDE_WAVE_GROWTH ** (wave - 1))))
+
+
+class HordeMap(GameMap):
+    """无尽模式地图：没有传送门与撤离点，`update` 负责开波与分批刷怪。"""
+
+    def __init__(self, images=None):
+        # 当前波次（0 表示尚未开始）、本波人数、尚未刷出的人数
+        self.wave = 0
+        self.wave_total = 0
+        self.pending = 0
+        self.wave_started = 0.0
+        # 下一次刷怪检查的模拟时间(ms)；None 表示第一次 update 时立即检查
+        self.next_spawn = None
+        super().__init__(HORDE_LAYOUT, is_final=False, images=images)
+
+    def make_content(self):
+        """开局不放敌人：第一波在第一次 `update` 时开始。"""
+        self.portal = None
+        self.exit_rect = None
+
+    def spawn_portal(self):
+        """无尽模式没有传送门。"""
+        pass
+
+    def update(self, dt, now):
+        super().update(dt, now)
+        if self.next_spawn is not None and now < self.next_spawn:
+            return
+        self.next_spawn = now + HORDE_SPAWN_INTERVAL_MS
+        alive = self.registry.live
+        if self.pending == 0 and (self.wave == 0 or alive <= self.wave_total * HORDE_CLEAR_RATIO
+                                  or now - self.wave_started >= HORDE_WAVE_INTERVAL_MS):
+            self.wave += 1
+            self.wave_total = self.pending = wave_size(self.wave)
+            self.wave_started = now
+        count = max(0, min(self.pending, HORDE_SPAWN_BURST, HORDE_MAX_ALIVE - alive))
+        if count == 0:
+            return
+        self.pending -= count
+        self.registry.extend(self._spawn_burst(count))
+
+    def _spawn_burst(self, count):
+        """在地图边缘的可通行位置刷出 `count` 个追击敌人。"""
+        if count == 0:
+            return []
+        table = HORDE_TABLES[min(self.wave - 1, len(HORDE_TABLES) - 1)]
+        names = table.pick_many([random.random() for _ in range(count)])
+        out = []
+        for name in names:
+            x, y = self._edge_point()
+            enemy = self._make_enemy(name, x, y, 0)
+            # 全图追击：不按检测范围放弃；原型没有追击参数的用无尽模式的缺省值
+            enemy.chase_range = math.inf
+            if enemy.chase_speed <= 0:
+                enemy.chase_speed = HORDE_CHASE_SPEED
+                enemy.chase_stop = HORDE_CHASE_STOP
+            out.append(enemy)
+        return out
+
+    def _edge_point(self):
+        """随机取地图四边之一上的出生点（敌人矩形左上角），避开障碍物。"""
+        for _ in range(_SPAWN_ATTEMPTS):
+            side = random.randrange(4)
+            if side < 2:
+                x = random.randint(_EDGE_MARGIN, WIDTH - _EDGE_MARGIN - ENEMY_SIZE)
+                y = _EDGE_MARGIN if side == 0 else HEIGHT - _EDGE_MARGIN - ENEMY_SIZE
+            else:
+                x = _EDGE_MARGIN if side == 2 else WIDTH - _EDGE_MARGIN - ENEMY_SIZE
+                y = random.randint(_EDGE_MARGIN, HEIGHT - _EDGE_MARGIN - ENEMY_SIZE)
+            if not self._blocked(self._enemy_area(x, y, 0)):
+                break
+        return x, y
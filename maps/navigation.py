@@ -0,0 +1,202 @@
+"""
+导航网格与共享流场寻路
+
+地图按 `NAV_CELL_SIZE` 划分为网格，障碍物按敌人半径外扩后覆盖到的格子不可通行
+（敌人中心留在可通行格内，身体就不会嵌进障碍物）。
+
+`FlowField` 以玩家所在格为源做一次 Dijkstra（8 邻接，直行代价 1、斜行 √2，斜行不允许贴角穿过），
+得到每格到玩家的路径长度和“下一格”。所有追击玩家的敌人只查表取下一个路点，不各自寻路；
+玩家换格后流场标记为过期，下一次有敌人查询时才重算（没有追击者的地图不产生开销）。
+"""
+
+import heapq
+import math
+import numpy as np
+import pygame
+from config.settings import WIDTH, HEIGHT, NAV_CELL_SIZE, ENEMY_SIZE
+
+_DIAG = math.sqrt(2)
+# (dc, dr, 代价)：先四个直行方向，再四个斜行方向
+_STEPS = (
+    (1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+    (1, 1, _DIAG), (1, -1, _DIAG), (-1, 1, _DIAG), (-1, -1, _DIAG),
+)
+
+
+class NavGrid:
+    """
+    障碍物栅格化后的导航网格。
+
+    参数:
+        obstacles: 障碍物矩形列表（pygame.Rect 或 (x, y, w, h)）
+        clearance: 障碍物外扩距离（像素），缺省为敌人半边长
+    """
+
+    def __init__(self, obstacles, width=WIDTH, height=HEIGHT, cell=NAV_CELL_SIZE, clearance=ENEMY_SIZE // 2):
+        self.cell = cell
+        self.cols = -(-width // cell)
+        self.rows = -(-height // cell)
+        self.clearance = clearance
+        self.obstacles = [pygame.Rect(r) for r in obstacles]
+        self.blocked = [False] * (self.cols * self.rows)
+        for r in self.obstacles:
+            # 格子中心落在外扩矩形内即不可通行
+            c0 = max(0, int((r.left - clearance) // cell))
+            c1 = min(self.cols - 1, int((r.right + clearance) // cell))
+            r0 = max(0, int((r.top - clearance) // cell))
+            r1 = min(self.rows - 1, int((r.bottom + clearance) // cell))
+            for row in range(r0, r1 + 1):
+                cy = (row + 0.5) * cell
+                if not (r.top - clearance < cy < r.bottom + clearance):
+                    continue
+                for col in range(c0, c1 + 1):
+                    cx = (col + 0.5) * cell
+                    if r.left - clearance < cx < r.right + clearance:
+                        self.blocked[row * self.cols + col] = True
+        self._build_neighbors()
+
+    def _build_neighbors(self):
+        """每格可走到的相邻可通行格 [(格, 代价)]；不可通行格也有列表，便于玩家贴墙时作为源点。"""
+        cols, rows, blocked = self.cols, self.rows, self.blocked
+        self.neighbors = neighbors = []
+        for idx in range(cols * rows):
+            row, col = divmod(idx, cols)
+            out = []
+            for dc, dr, cost in _STEPS:
+                c, r = col + dc, row + dr
+                if not (0 <= c < cols and 0 <= r < rows) or blocked[r * cols + c]:
+                    continue
+                if dc and dr and (blocked[row * cols + c] or blocked[r * cols + col]):
+                    continue
+                out.append((r * cols + c, cost))
+            neighbors.append(out)
+
+    def __getstate__(self):
+        # 邻接表可由障碍物重建，不写进快照
+        state = self.__dict__.copy()
+        del state['neighbors']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._build_neighbors()
+
+    def cell_of(self, pos):
+        """坐标所在格的下标（超出地图的坐标夹到边缘格）。"""
+        col = min(max(int(pos[0] // self.cell), 0), self.cols - 1)
+        row = min(max(int(pos[1] // self.cell), 0), self.rows - 1)
+        return row * self.cols + col
+
+    def center_of(self, idx):
+        row, col = divmod(idx, self.cols)
+        return ((col + 0.5) * self.cell, (row + 0.5) * self.cell)
+
+    def is_blocked(self, pos):
+        return self.blocked[self.cell_of(pos)]
+
+
+class FlowField:
+    """
+    指向某个目标（玩家）的共享流场。
+
+    每个逻辑步调用 `retarget(玩家中心)`；目标换格时只标记过期，第一次 `steer` 时重算。
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.target = None
+        self.target_cell = None
+        self.dist = None
+        self.next = None
+        self._stale = False
+        # 数组形式的流场（供 EnemyBatch 向量化查表），随流场重算一起失效
+        self._arrays = None
+        # 累计重算次数（测试/基准用）
+        self.builds = 0
+
+    def __getstate__(self):
+        # 流场可由目标重建，快照里只保留目标
+        state = self.__dict__.copy()
+        state['dist'] = state['next'] = state['_arrays'] = None
+        state['_stale'] = state['target_cell'] is not None
+        return state
+
+    def retarget(self, pos):
+        """更新目标位置；目标所在格变化时返回 True（流场将在下次查询时重算）。"""
+        self.target = pos
+        cell = self.grid.cell_of(pos)
+        if cell == self.target_cell:
+            return False
+        self.target_cell = cell
+        self._stale = True
+        return True
+
+    def _build(self):
+        grid = self.grid
+        n = grid.cols * grid.rows
+        src = self.target_cell
+        dist = [math.inf] * n
+        nxt = [-1] * n
+        dist[src] = 0.0
+        heap = [(0.0, src)]
+        neighbors = grid.neighbors
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            for v, cost in neighbors[u]:
+                nd = d + cost
+                if nd < dist[v]:
+                    dist[v] = nd
+                    nxt[v] = u
+                    heapq.heappush(heap, (nd, v))
+        cell = grid.cell
+        self.dist = [d * cell for d in dist]
+        self.next = nxt
+        self._arrays = None
+        self._stale = False
+        self.builds += 1
+
+    def steer(self, pos):
+        """
+        从 `pos` 出发的下一个路点。
+
+        Returns:
+            (路点 x, 路点 y, 到目标的路径长度 px)；已在目标格时路点为目标本身；目标不可达或未设置时为 None
+        """
+        if self.target_cell is None:
+            return None
+        if self._stale:
+            self._build()
+        cell = self.grid.cell_of(pos)
+        if cell == self.target_cell:
+            return self.target[0], self.target[1], 0.0
+        nxt = self.next[cell]
+        if nxt < 0:
+            return None
+        wx, wy = self.grid.center_of(nxt)
+        return wx, wy, self.dist[cell]
+
+    def arrays(self):
+        """
+        `steer` 的查表数据（NumPy 数组，按格下标索引）。
+
+        Returns:
+            (路点 x, 路点 y, 路径长度 px)；没有下一格的格子路点为 nan、路径长度为 inf。目标未设置时为 None。
+            目标格本身的路点应取 `target`（与 `steer` 一致），由调用方处理
+        """
+        if self.target_cell is None:
+            return None
+        if self._stale:
+            self._build()
+        if self._arrays is None:
+            grid = self.grid
+            nxt = np.array(self.next, dtype=np.intp)
+            has = nxt >= 0
+            safe = np.where(has, nxt, 0)
+            cell = grid.cell
+            wx = np.where(has, (safe % grid.cols + 0.5) * cell, np.nan)
+            wy = np.where(has, (safe // grid.cols + 0.5) * cell, np.nan)
+            dist = np.where(has, np.array(self.dist), np.inf)
+            self._arrays = (wx, wy, dist)
+        return self._arrays
@@ -0,0 +1,69 @@
+"""
+敌人类型加权抽样：按 `ENEMY_SPAWN_WEIGHTS` 预先构建别名表（Vose alias method）
+
+逐个累加权重的线性扫描每次抽样是 O(类型数)；别名表构建一次后每次抽样是 O(1)：
+一个均匀随机数的整数部分选列、小数部分与该列的概率比较，决定取本列还是它的“别名”。
+每次抽样只消耗一个 `random.random()`，与原先的线性扫描相同，种子决定的随机序列长度不变。
+"""
+
+import random
+import numpy as np
+from config.settings import ENEMY_SPAWN_WEIGHTS
+
+
+class AliasTable:
+    """
+    参数:
+        weights: {名称: 权重} 字典（权重为非负数，总和大于 0）
+    """
+
+    def __init__(self, weights):
+        self.names = list(weights)
+        n = len(self.names)
+        total = float(sum(weights.values()))
+        if n == 0 or total <= 0:
+            raise ValueError('权重表为空或总权重不为正')
+        scaled = [w * n / total for w in weights.values()]
+        prob = [1.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            g = large.pop()
+            prob[s] = scaled[s]
+            alias[s] = g
+            # 大列把缺口补给小列后，剩余部分可能变成小列
+            scaled[g] += scaled[s] - 1.0
+            (small if scaled[g] < 1.0 else large).append(g)
+        # 剩下的列（含浮点误差留下的）概率记为 1
+        self.prob = prob
+        self.alias = alias
+        self._prob = np.array(prob)
+        self._alias = np.array(alias, dtype=np.intp)
+
+    def __len__(self):
+        return len(self.names)
+
+    def pick(self, r=None):
+        """抽一个名称；`r` 为 [0, 1) 内的均匀随机数，缺省取 `random.random()`。"""
+        u = (random.random() if r is None else r) * len(self.names)
+        i = int(u)
+        return self.names[i] if u - i < self.prob[i] else self.names[self.alias[i]]
+
+    def pick_many(self, r):
+        """`pick` 的数组版本：`r` 为均匀随机数数组，返回名称列表。"""
+        u = np.asarray(r, dtype=np.float64) * len(self.names)
+        i = u.astype(np.intp)
+        idx = np.where(u - i < self._prob[i], i, self._alias[i])
+        names = self.names
+        return [names[k] for k in idx.tolist()]
+
+
+# 每张地图一张别名表，与 ENEMY_SPAWN_WEIGHTS 一一对应
+SPAWN_TABLES = [AliasTable(w) for w in ENEMY_SPAWN_WEIGHTS]
+
+
+def spawn_table(idx):
+    """第 `idx` 张地图的敌人类型别名表（超出则用最后一张，与权重表的取法一致）。"""
+    return SPAWN_TABLES[min(idx, len(SPAWN_TABLES) - 1)]
@@ -0,0 +1,96 @@
+"""
+视线（LOS）查询：障碍物预先栅格化为不透明格，结果按 (起点格, 终点格) 缓存
+
+射线在格子层面行进（supercover：恰好穿过格角时两侧格子都要透明），所以结果只取决于两端所在的格；
+地图障碍物不变，缓存项不会过期——敌人或玩家换格时只是换一个键，同格内移动直接命中缓存。
+只要线段碰到任何与障碍物重叠的格子就视为被挡，判定偏保守（误差不超过一个 `LOS_CELL_SIZE`）。
+"""
+
+import pygame
+from config.settings import WIDTH, HEIGHT, LOS_CELL_SIZE, LOS_CACHE_MAX
+
+
+class VisibilityGrid:
+    """
+    参数:
+        obstacles: 障碍物矩形列表（pygame.Rect 或 (x, y, w, h)）
+        cache_max: 缓存项上限，超过后整体清空（地图格数很多时避免无限增长）
+    """
+
+    def __init__(self, obstacles, width=WIDTH, height=HEIGHT, cell=LOS_CELL_SIZE, cache_max=LOS_CACHE_MAX):
+        self.cell = cell
+        self.cols = -(-width // cell)
+        self.rows = -(-height // cell)
+        self.cache_max = cache_max
+        self.opaque = [False] * (self.cols * self.rows)
+        for r in map(pygame.Rect, obstacles):
+            c0 = max(0, r.left // cell)
+            c1 = min(self.cols - 1, (r.right - 1) // cell)
+            r0 = max(0, r.top // cell)
+            r1 = min(self.rows - 1, (r.bottom - 1) // cell)
+            for row in range(r0, r1 + 1):
+                for col in range(c0, c1 + 1):
+                    self.opaque[row * self.cols + col] = True
+        self._cache = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __getstate__(self):
+        # 缓存可随时重建，不写进快照
+        state = self.__dict__.copy()
+        state['_cache'] = {}
+        return state
+
+    def cell_of(self, pos):
+        col = min(max(int(pos[0] // self.cell), 0), self.cols - 1)
+        row = min(max(int(pos[1] // self.cell), 0), self.rows - 1)
+        return row * self.cols + col
+
+    def visible(self, a, b):
+        """坐标 a 与 b 之间是否没有障碍物遮挡。"""
+        cell, cols, rows = self.cell, self.cols, self.rows
+        ca = min(max(int(a[1]) // cell, 0), rows - 1) * cols + min(max(int(a[0]) // cell, 0), cols - 1)
+        cb = min(max(int(b[1]) // cell, 0), rows - 1) * cols + min(max(int(b[0]) // cell, 0), cols - 1)
+        # 视线对称：无序格对作键
+        key = (ca, cb) if ca <= cb else (cb, ca)
+        hit = self._cache.get(key)
+        if hit is not None:
+            self.hits += 1
+            return hit
+        self.misses += 1
+        if len(self._cache) >= self.cache_max:
+            self._cache.clear()
+        result = self._cache[key] = self.cells_clear(key[0], key[1])
+        return result
+
+    def cells_clear(self, a, b):
+        """不经缓存，按格行进判断两格之间是否透明。"""
+        cols, opaque = self.cols, self.opaque
+        if opaque[a] or opaque[b]:
+            return False
+        r, c = divmod(a, cols)
+        r1, c1 = divmod(b, cols)
+        nc, nr = abs(c1 - c), abs(r1 - r)
+        sc = 1 if c1 > c else -1
+        sr = 1 if r1 > r else -1
+        ic = ir = 0
+        while ic < nc or ir < nr:
+            # 比较下一条竖线与横线在线段上的位置：(0.5 + ic) / nc 与 (0.5 + ir) / nr
+            d = (1 + 2 * ic) * nr - (1 + 2 * ir) * nc
+            if d == 0:
+                # 恰好穿过格角：两侧格子都必须透明
+                if opaque[r * cols + c + sc] or opaque[(r + sr) * cols + c]:
+                    return False
+                c += sc
+                r += sr
+                ic += 1
+                ir += 1
+            elif d < 0:
+                c += sc
+                ic += 1
+            else:
+                r += sr
+                ir += 1
+            if opaque[r * cols + c]:
+                return False
+        return True
@@ -0,0 +1,102 @@
+import os
+import math
+import pycache_init  # must import first to set sys.pycache_prefix
+import numpy as np
+import pygame
+import pytest
+
+from config.settings import SIM_TICK_MS, AI_PATROL_INTERVAL
+from entities.ai_scheduler import AIScheduler, classify, FULL, REDUCED, PATROL
+from entities.enemy import Enemy
+from entities.enemy_batch import EnemyBatch
+from entities.projectile_pool import ProjectilePool
+
+
+@pytest.fixture(autouse=True)
+def init_pygame():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+def test_classify_tiers():
+    dist = np.array([50.0, 300.0, 300.0, 900.0, 900.0])
+    detect = np.full(5, 360.0)
+    until_ready = np.array([800.0, 800.0, 100.0, -5.0, 800.0])
+    tiers = classify(dist, detect, until_ready, near=160, lookahead=150)
+    # 近距 / 较远 / 较远但即将开火 / 超出范围（冷却好了也只巡逻）
+    assert tiers.tolist() == [FULL, REDUCED, FULL, PATROL, PATROL]
+
+
+def test_budget_defers_oldest_last_and_never_full():
+    n = 10
+    sched = AIScheduler(n, budget=3, reduced_interval=1, patrol_interval=1)
+    alive = np.ones(n, dtype=bool)
+    dist = np.full(n, 300.0)
+    dist[0] = 10.0
+    detect = np.full(n, 360.0)
+    slow = np.full(n, 1000.0)
+    due, aim, dts = sched.plan(SIM_TICK_MS, dist, detect, slow, alive)
+    assert due[0] and np.count_nonzero(due) == 4
+    assert sched.stats['deferred'] == 6 and sched.stats['full'] == 1
+    # 顺延的行累计时间，下一步优先推进并拿到两步的 dt
+    due2, _, dts2 = sched.plan(SIM_TICK_MS, dist, detect, slow, alive)
+    deferred = np.flatnonzero(due2 & ~due & (np.arange(n) > 0))
+    assert len(deferred) == 3
+    assert dts2[deferred] == pytest.approx([2 * SIM_TICK_MS] * 3)
+    assert dts2[0] == pytest.approx(SIM_TICK_MS)
+
+
+def test_far_enemies_patrol_at_reduced_rate_without_aiming():
+    ref = Enemy(100, 100, patrol_radius=40)
+    lod = Enemy(100, 100, patrol_radius=40)
+    # 固定起始相位：随机相位下最后一步可能恰好是水平移动，朝向与初始值相同
+    ref._angle = lod._angle = 0.3
+    start_dir = lod.dir
+    batch = EnemyBatch([lod], min_size=0, lod=True)
+    far = (900, 600)
+    now = 0.0
+    moves = 0
+    for t in range(4 * AI_PATROL_INTERVAL):
+        now += SIM_TICK_MS
+        ref.update(SIM_TICK_MS, now)
+        before = lod.rect.center
+        batch.step(SIM_TICK_MS, now, far, ProjectilePool())
+        moves += lod.rect.center != before
+        if batch.scheduler.age[0] == 0:
+            # 到期时一次推进累计的 dt，位置与逐步推进一致
+            assert lod.rect.center == ref.rect.center
+    assert batch.scheduler.tier[0] == PATROL
+    assert moves <= 4
+    # 只巡逻：朝向来自移动方向而不是玩家
+    to_player = math.atan2(far[1] - lod.rect.centery, far[0] - lod.rect.centerx)
+    assert lod.dir != start_dir
+    assert math.atan2(lod.dir[1], lod.dir[0]) != pytest.approx(to_player)
+
+
+def test_near_enemies_fire_on_time():
+    ref = [Enemy(200 + 20 * i, 200, archetype='grunt') for i in range(6)]
+    fast = [Enemy(200 + 20 * i, 200, archetype='grunt') for i in range(6)]
+    batch = EnemyBatch(fast, min_size=0, lod=True)
+    target = (260, 260)
+    ref_pool, fast_pool = ProjectilePool(), ProjectilePool()
+    now = 0.0
+    for t in range(300):
+        now += SIM_TICK_MS
+        for e in ref:
+            e.update(SIM_TICK_MS, now)
+            e.try_shoot(target, now, pool=ref_pool)
+        batch.step(SIM_TICK_MS, now, target, fast_pool)
+        assert [e.last_shot for e in fast] == [e.last_shot for e in ref]
+    assert ref_pool.count == fast_pool.count > 0
+
+
+def test_state_roundtrip():
+    sched = AIScheduler(4)
+    sched.plan(SIM_TICK_MS, np.full(4, 300.0), np.full(4, 360.0), np.full(4, 1000.0), np.ones(4, dtype=bool))
+    copy = AIScheduler(4)
+    copy.load_state(sched.state())
+    assert copy.accum.tolist() == sched.accum.tolist() and copy.age.tolist() == sched.age.tolist()
+    with pytest.raises(ValueError):
+        AIScheduler(3).load_state(sched.state())
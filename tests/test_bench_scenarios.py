@@ -0,0 +1,27 @@
+import copy
+import pycache_init  # must import first to set sys.pycache_prefix
+
+from benchmarks.bench_scenarios import SCENARIOS, compare, percentiles, run_suite
+
+
+def test_percentiles_nearest_rank():
+    p = percentiles(list(range(1, 101)))
+    assert (p['p50'], p['p95'], p['p99'], p['max']) == (50, 95, 99, 100)
+    assert percentiles([])['p99'] == 0.0
+
+
+def test_suite_smoke_and_compare():
+    results = run_suite(frames=3, warmup=1, alloc_frames=2)
+    assert set(results['scenarios']) == set(SCENARIOS)
+    grunts = results['scenarios']['bullets_vs_grunts']
+    assert grunts['frames'] == 3
+    assert {'spawn', 'enemies', 'bullets', 'collision', 'draw_bullets'} <= set(grunts['phases_ms'])
+    assert grunts['alloc']['frames'] == 2
+
+    slower = copy.deepcopy(results)
+    for res in slower['scenarios'].values():
+        for key in ('p50', 'p95'):
+            res['frame_ms'][key] = res['frame_ms'][key] * 2 + 1
+    regressions = compare(slower, results, fail_over=10)
+    assert {name for name, _ in regressions} == set(SCENARIOS)
+    assert compare(results, results, fail_over=10) == []
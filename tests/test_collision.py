@@ -0,0 +1,49 @@
+import os
+import pycache_init  # must import first to set sys.pycache_prefix
+import pygame
+import pytest
+
+from entities.player import Player
+from entities.enemy import Enemy
+from entities.bullet import Bullet
+from game.collision import SpatialHash, CollisionWorld
+
+
+@pytest.fixture(autouse=True)
+def init_pygame():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+def test_spatial_hash_only_returns_nearby_candidates():
+    grid = SpatialHash(cell_size=64)
+    near = pygame.Rect(10, 10, 36, 36)
+    far = pygame.Rect(500, 400, 36, 36)
+    grid.insert('near', near)
+    grid.insert('far', far)
+
+    assert grid.query_rect(pygame.Rect(20, 20, 6, 6)) == ['near']
+    assert grid.first_overlap(pygame.Rect(20, 20, 6, 6)) == 'near'
+    assert grid.first_overlap(pygame.Rect(300, 300, 6, 6)) is None
+
+
+def test_first_hit_respects_layers_and_list_order():
+    player = Player(400, 400)
+    first = Enemy(100, 100)
+    second = Enemy(110, 100)
+    world = CollisionWorld()
+    world.rebuild(player, [first, second])
+
+    bullet = Bullet((120, 110), (1, 0), speed=0, owner='player')
+    # overlaps both enemies: earlier enemy wins, as in the old linear scan
+    assert world.first_hit(bullet) is first
+    first.alive = False
+    assert world.first_hit(bullet) is second
+
+    # enemy bullets never hit enemies, only the player
+    enemy_bullet = Bullet((120, 110), (1, 0), speed=0, owner='enemy')
+    assert world.first_hit(enemy_bullet) is None
+    enemy_bullet.rect.center = player.rect.center
+    assert world.first_hit(enemy_bullet) is player
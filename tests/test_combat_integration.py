@@ -6,7 +6,7 @@ import pytest
 from entities.player import Player
 from entities.enemy import Enemy
 from entities.bullet import Bullet
-from config.settings import MONEY_PER_ENEMY
+from config.settings import MONEY_PER_ENEMY, SIM_TICK_MS
 
 
 @pytest.fixture(autouse=True)
@@ -52,3 +52,52 @@ def test_enemy_bullet_damages_player():
 
     assert player.hp == 35
     assert enemy_bullet.alive is False
+
+
+def test_resolver_applies_damage_once_per_target_and_pays_rewards():
+    from game.combat import CombatResolver
+    player = Player(0, 0)
+    player.money = 0
+    player.hp = 100
+    tough, weak = Enemy(50, 50), Enemy(200, 50)
+    tough.hp, weak.hp = 100, 30
+    weak.money = 77
+    combat = CombatResolver()
+    for _ in range(3):
+        combat.hit(tough, 10)
+    combat.hit(weak, 20)
+    assert weak.alive and weak.hp == 30
+    combat.hit(weak, 20)
+    # 致死的那次登记立即标记死亡，生命值要到结算时才扣
+    assert not weak.alive and weak.hp == 30
+    combat.hurt_player(15)
+    combat.hurt_player(5)
+    stats = combat.resolve(player)
+    assert (tough.hp, weak.hp, player.hp, player.money) == (70, -10, 80, 77)
+    assert (stats.hits, stats.damage_dealt, stats.damage_taken, stats.kills, stats.money) == (7, 70, 20, 1, 77)
+    assert combat.resolve(player).hits == 0 and player.money == 77
+
+
+def test_melee_key_kill_pays_enemy_money():
+    from game.headless import make_headless_game
+    from game.input_source import InputSource, InputState
+    from entities.weapons import MeleeWeapon
+
+    class PressE(InputSource):
+        def poll(self, game):
+            return InputState(mouse_pos=(game.player.rect.centerx + 40, game.player.rect.centery), melee_key=True)
+
+    game = make_headless_game(seed=1, input_source=PressE())
+    enemy = game.curmap.enemies[0]
+    game.curmap.enemies = [enemy]
+    game.player.inventory.append(MeleeWeapon('Blade', 0, 300, damage=999, radius=80))
+    game.player.equipped_idx = len(game.player.inventory) - 1
+    game.player.last_melee = -1000
+    enemy.rect.center = (game.player.rect.centerx + 40, game.player.rect.centery)
+    enemy.patrol_radius = 0
+    enemy.money = MONEY_PER_ENEMY + 123
+    money = game.player.money
+    game.update(SIM_TICK_MS)
+    assert not enemy.alive and game.kills == 1
+    assert game.player.money == money + MONEY_PER_ENEMY + 123
+    assert game.combat.stats.kills == 1 and game.curmap.portal is not None
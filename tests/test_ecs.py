@@ -0,0 +1,194 @@
+import os
+import random
+import pycache_init  # must import first to set sys.pycache_prefix
+import numpy as np
+import pygame
+import pytest
+
+from config.settings import SIM_TICK_MS
+from entities.ecs import Archetype, World, Column
+from entities.enemy import Enemy
+from entities.enemy_batch import EnemyBatch, ENEMY_ARCHETYPE
+from entities.projectile_pool import ProjectilePool
+from entities.systems import RenderSystem, SpriteCache, collision_system, remember_positions
+from game.collision import CollisionWorld
+from game.image_manager import ImageManager
+
+
+@pytest.fixture(autouse=True)
+def init_pygame():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+def test_archetype_stays_contiguous():
+    table = Archetype('t', [('a', np.float64), ('b', np.int64)], capacity=2)
+    world_ids = np.arange(5)
+    table.extend(world_ids, list('vwxyz'), {'a': np.arange(5) * 1.5, 'b': 7})
+    assert table.capacity >= 5 and len(table) == 5
+    assert table.column('b').tolist() == [7] * 5
+    # 删除中间一行：最后一行补进空位
+    table.remove(1)
+    assert table.column('a').tolist() == [0.0, 6.0, 3.0, 4.5]
+    assert table.owners == list('vzxy') and table.row(4) == 1 and 1 not in table
+    with pytest.raises(KeyError):
+        table.extend([9], ['q'], {'c': 1})
+
+
+def test_world_spawns_queries_and_despawns():
+    world = World()
+    world.archetype('mob', [('x', np.float64), ('hp', np.int64)])
+    world.archetype('prop', [('x', np.float64)])
+    mobs = world.spawn('mob', ['m0', 'm1'], x=[1.0, 2.0], hp=3)
+    props = world.spawn('prop', ['p0'], x=5.0)
+    assert mobs.tolist() == [0, 1] and props.tolist() == [2]
+    assert [t.name for t in world.query('x')] == ['mob', 'prop']
+    assert [t.name for t in world.query('x', 'hp')] == ['mob']
+    assert world.owner(2) == 'p0'
+    world.despawn(0)
+    assert world.owner(1) == 'm1' and world.archetype('mob').column('x').tolist() == [2.0]
+    world.clear('prop')
+    assert [t.name for t in world.query('x')] == ['mob']
+    with pytest.raises(ValueError):
+        world.archetype('mob', [('x', np.float64)])
+
+
+def test_column_descriptor_writes_in_place():
+    class Mobs:
+        x = Column()
+
+        def __init__(self):
+            self.table = Archetype('m', [('x', np.float64)])
+            self.table.extend([0, 1, 2], [None] * 3, {'x': [1, 2, 3]})
+
+    mobs = Mobs()
+    storage = mobs.table.columns['x']
+    mobs.x = mobs.x * 2
+    mobs.x[0] = -1
+    assert storage[:3].tolist() == [-1.0, 4.0, 6.0]
+
+
+def make_enemies(count, seed, images=None):
+    rng = random.Random(seed)
+    out = []
+    for k in range(count):
+        e = Enemy(rng.randint(40, 860), rng.randint(40, 560), patrol_radius=rng.choice([0, 30]),
+                  images=images, archetype=rng.choice(['grunt', 'shotgunner', 'sniper']))
+        # 朝向取 45° 的整数倍：量化缓存的旋转贴图与逐个旋转逐像素一致
+        ang = rng.randrange(8) * np.pi / 4
+        e.dir = (float(np.cos(ang)), float(np.sin(ang)))
+        e.angle = round(float(np.degrees(ang)))
+        e.hp = rng.randint(1, e.max_hp)
+        out.append(e)
+    return out
+
+
+@pytest.mark.parametrize('with_images', [False, True])
+def test_render_system_matches_object_draw(tmp_path, with_images):
+    images = ImageManager(str(tmp_path)) if with_images else None
+    enemies = make_enemies(40, seed=3, images=images)
+    enemies[5].alive = False
+    batch = EnemyBatch(enemies, min_size=0)
+    # 一部分武器仍在后坐力/抖动中：交回对象绘制
+    for i in (2, 9):
+        enemies[i].weapon.trigger_fire_visual()
+        enemies[i].weapon.shake_timer = 0
+    batch.animating = False
+    batch.animating[[2, 9]] = True
+    expected = pygame.Surface((960, 640))
+    for e in enemies:
+        if e.alive:
+            e.draw(expected)
+    got = pygame.Surface((960, 640))
+    assert RenderSystem(images).draw(got, batch.table) == 39
+    assert pygame.image.tobytes(got, 'RGB') == pygame.image.tobytes(expected, 'RGB')
+
+
+def test_render_system_interpolates_like_lerp():
+    enemies = make_enemies(30, seed=8)
+    batch = EnemyBatch(enemies, min_size=0)
+    batch.animating = False
+    prev = [e.rect.center for e in enemies]
+    remember_positions(batch.world)
+    for _ in range(5):
+        batch.step(SIM_TICK_MS, 0, (-10000, -10000))
+    alpha = 0.37
+    expected = pygame.Surface((960, 640))
+    for e, p in zip(enemies, prev):
+        cur = e.rect.center
+        e.rect.center = (round(p[0] + (cur[0] - p[0]) * alpha), round(p[1] + (cur[1] - p[1]) * alpha))
+        e.draw(expected)
+        e.rect.center = cur
+    got = pygame.Surface((960, 640))
+    renderer = RenderSystem()
+    renderer.sprites = SpriteCache(step=0)
+    renderer.draw(got, batch.table, alpha)
+    assert pygame.image.tobytes(got, 'RGB') == pygame.image.tobytes(expected, 'RGB')
+
+
+def test_sprite_cache_quantizes_angles():
+    cache = SpriteCache(step=1.0)
+    base = pygame.Surface((14, 5))
+    a = cache.rotated('gun', 30.2, lambda: base)
+    b = cache.rotated('gun', 29.8, lambda: base)
+    c = cache.rotated('gun', 30.2, lambda: base, flip=True)
+    assert a is b and c is not a and (cache.hits, cache.misses) == (1, 2)
+
+
+def hit_sequence(hits, kill_every=2):
+    """消费命中生成器：每个目标挨 `kill_every` 发后死亡，记录 (槽位, 目标编号)。"""
+    taken = {}
+    seq = []
+    for slot, target in hits:
+        seq.append((slot, getattr(target, 'tag', 'player')))
+        if hasattr(target, 'tag'):
+            taken[target.tag] = taken.get(target.tag, 0) + 1
+            if taken[target.tag] >= kill_every:
+                target.alive = False
+    return seq
+
+
+def test_collision_system_matches_collision_world():
+    rng = random.Random(11)
+    runs = []
+    for system in (False, True):
+        enemies = make_enemies(60, seed=21)
+        for k, e in enumerate(enemies):
+            e.tag = k
+        enemies[7].alive = False
+        batch = EnemyBatch(enemies, min_size=0)
+        player = Enemy(450, 300)
+        pool = ProjectilePool()
+        rng.seed(11)
+        for _ in range(600):
+            swept = rng.random() < 0.25
+            pool.spawn((rng.uniform(0, 960), rng.uniform(0, 640)), (rng.uniform(-1, 1), rng.uniform(-1, 1)),
+                       40 if swept else 6, 'player' if rng.random() < 0.8 else 'enemy', swept=swept)
+        for _ in range(3):
+            pool.spawn(player.rect.center, (1, 0), 2, 'enemy')
+        pool.update(SIM_TICK_MS)
+        if system:
+            hits = collision_system(batch.table, pool, player)
+        else:
+            world = CollisionWorld()
+            world.rebuild(player, enemies)
+            hits = world.pool_hits(pool)
+        runs.append(hit_sequence(hits))
+    assert runs[0] == runs[1]
+    assert len(runs[0]) > 50 and any(tag == 'player' for _, tag in runs[0])
+
+
+def test_batch_columns_live_in_world_table():
+    world = World()
+    enemies = make_enemies(10, seed=2)
+    batch = EnemyBatch(enemies, min_size=0, world=world)
+    table = world.archetype(ENEMY_ARCHETYPE)
+    assert batch.table is table and table.owners == enemies
+    assert np.shares_memory(batch.x, table.columns['x'])
+    batch.step(SIM_TICK_MS, 0, (480, 320))
+    assert table.column('x').tolist() == [e.rect.centerx for e in enemies]
+    # 重建批处理时清空旧表
+    rebuilt = EnemyBatch(enemies[:4], min_size=0, world=world)
+    assert rebuilt.table is table and len(table) == 4
@@ -0,0 +1,108 @@
+import os
+import math
+import random
+import pycache_init  # must import first to set sys.pycache_prefix
+import numpy as np
+import pygame
+import pytest
+
+from config.settings import SIM_TICK_MS, WIDTH, HEIGHT
+from entities.enemy import Enemy, BossEnemy
+from entities.enemy_batch import EnemyBatch, batchable
+from entities.projectile_pool import ProjectilePool
+from game.headless import make_headless_game
+
+
+@pytest.fixture(autouse=True)
+def init_pygame():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+def make_enemies(seed, n=24):
+    rng = random.Random(seed)
+    random.seed(seed)
+    out = []
+    for i in range(n):
+        x = rng.randint(20, WIDTH - 20)
+        y = rng.randint(20, HEIGHT - 20)
+        kind = ('grunt', 'shotgunner', 'sniper')[i % 3]
+        out.append(Enemy(x, y, patrol_radius=rng.choice([0, 40, 80]), archetype=kind))
+    return out
+
+
+def player_path(t):
+    return (int(WIDTH / 2 + math.cos(t * 0.01) * 300), int(HEIGHT / 2 + math.sin(t * 0.013) * 200))
+
+
+def bullets_of(pool):
+    n = pool.count
+    return sorted(zip(pool.x[:n].round(6), pool.y[:n].round(6), pool.dx[:n].round(9), pool.damage[:n]))
+
+
+def test_batch_matches_per_object_updates():
+    ref = make_enemies(5)
+    fast = make_enemies(5)
+    ref_pool, fast_pool = ProjectilePool(), ProjectilePool()
+    batch = EnemyBatch(fast, min_size=0)
+    now = 0.0
+    for t in range(400):
+        now += SIM_TICK_MS
+        target = player_path(t)
+        if t == 150:
+            ref[3].alive = fast[3].alive = False
+        for e in ref:
+            if e.alive:
+                e.update(SIM_TICK_MS, now)
+                e.try_shoot(target, now, pool=ref_pool)
+        batch.step(SIM_TICK_MS, now, target, fast_pool)
+
+        for a, b in zip(ref, fast):
+            assert a.rect.center == b.rect.center
+            assert a.last_shot == b.last_shot
+            assert b.dir == pytest.approx(a.dir)
+            assert b.angle == pytest.approx(a.angle)
+            assert b.weapon.recoil == pytest.approx(a.weapon.recoil)
+        assert bullets_of(fast_pool) == bullets_of(ref_pool)
+        ref_pool.update(SIM_TICK_MS)
+        fast_pool.update(SIM_TICK_MS)
+    assert fast_pool.count > 0
+
+
+def test_ready_mask_and_distance():
+    enemies = [Enemy(100, 100, archetype='grunt'), Enemy(700, 500, archetype='grunt')]
+    for e in enemies:
+        e.last_shot = 0
+    enemies[1].detect_range = 100
+    batch = EnemyBatch(enemies, min_size=0)
+    fired = batch.step(SIM_TICK_MS, 5000, (150, 100), ProjectilePool())
+    assert fired == 1
+    assert batch.ready.tolist() == [True, False]
+    assert batch.dist[0] == pytest.approx(math.hypot(150 - enemies[0].rect.centerx, 100 - enemies[0].rect.centery))
+    assert enemies[0].last_shot == 5000 and enemies[1].last_shot == 0
+    # 冷却中不再开火
+    assert batch.step(SIM_TICK_MS, 5000 + SIM_TICK_MS, (150, 100), ProjectilePool()) == 0
+
+
+def test_bosses_are_stepped_per_object():
+    random.seed(1)
+    boss = BossEnemy(300, 300)
+    grunt = Enemy(100, 100)
+    assert not batchable(boss) and batchable(grunt)
+    batch = EnemyBatch([grunt, boss], min_size=0)
+    assert batch.enemies == [grunt] and batch.others == [boss]
+    # 普通敌人太少时全部逐个推进
+    small = EnemyBatch([grunt, boss], min_size=2)
+    assert small.enemies == [] and small.others == [grunt, boss]
+
+
+def test_game_rebuilds_batch_on_map_change():
+    game = make_headless_game(seed=2)
+    first = game.enemy_batch()
+    game.update(SIM_TICK_MS)
+    assert game.enemy_batch() is first
+    game.current_map_idx += 1
+    second = game.enemy_batch()
+    assert second is not first and second.source is game.curmap.enemies
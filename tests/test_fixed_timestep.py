@@ -0,0 +1,93 @@
+import os
+import pycache_init  # must import first to set sys.pycache_prefix
+import pygame
+import pytest
+
+from config.settings import WIDTH, HEIGHT, SIM_TICK_MS, MAX_SIM_STEPS_PER_FRAME
+from entities.bullet import Bullet
+from entities.projectile_pool import ProjectilePool
+from game.game import Game
+
+
+@pytest.fixture(autouse=True)
+def init_pygame():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+class FakeClock:
+    """按预设序列返回帧耗时的时钟。"""
+
+    def __init__(self, frames):
+        self.frames = list(frames)
+
+    def tick(self, fps=0):
+        return self.frames.pop(0)
+
+
+def make_game(frames):
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    font = pygame.font.SysFont(None, 24)
+    g = Game(screen, FakeClock(frames), font, font)
+    g.curmap.enemies = []
+    g.curmap.portal = None
+    return g
+
+
+def test_bullet_distance_independent_of_step_size():
+    coarse = Bullet((100, 100), (1, 0), 9, 'player')
+    fine = Bullet((100, 100), (1, 0), 9, 'player')
+    coarse.update(SIM_TICK_MS * 4)
+    for _ in range(4):
+        fine.update(SIM_TICK_MS)
+    assert coarse.x == pytest.approx(fine.x) == pytest.approx(136)
+
+    pool = ProjectilePool()
+    pool.spawn((100, 100), (0, 1), 9, 'enemy')
+    pool.update(SIM_TICK_MS * 2)
+    assert next(iter(pool)).y == pytest.approx(118)
+
+
+def test_run_steps_at_fixed_rate_and_interpolates():
+    frames = [SIM_TICK_MS * 2.5, SIM_TICK_MS * 0.25, 0]
+    g = make_game(frames)
+    steps, alphas = [], []
+    real_update = g.update
+
+    def update(dt):
+        steps.append(dt)
+        real_update(dt)
+
+    def draw(alpha=1.0):
+        alphas.append(alpha)
+        if not g.clock.frames:
+            g.running = False
+
+    g.update = update
+    g.draw = draw
+    start = g.sim_time
+    g.run()
+
+    assert steps == [SIM_TICK_MS] * 2
+    assert g.sim_time == pytest.approx(start + 2 * SIM_TICK_MS)
+    assert alphas == pytest.approx([0.5, 0.75, 0.75])
+
+
+def test_run_skips_render_when_behind():
+    # 一次长卡顿需要的步数超过单帧上限：先跳过渲染追赶，再恢复渲染
+    frames = [SIM_TICK_MS * (MAX_SIM_STEPS_PER_FRAME + 2), 0, 0]
+    g = make_game(frames)
+    steps, alphas = [], []
+    g.update = lambda dt: steps.append(dt)
+
+    def draw(alpha=1.0):
+        alphas.append(alpha)
+        g.running = False
+
+    g.draw = draw
+    g.run()
+
+    assert len(steps) == MAX_SIM_STEPS_PER_FRAME + 2
+    assert len(alphas) == 1
@@ -0,0 +1,90 @@
+import math
+import random
+import pycache_init  # must import first to set sys.pycache_prefix
+import numpy as np
+import pytest
+
+from utils import (
+    vec_from_points, distance, aim_info, vecs_from_points, distances, aim_infos, neighbor_pairs, separation_pushes,
+)
+
+
+def random_pairs(n=400, seed=3):
+    rng = random.Random(seed)
+    pts = []
+    for i in range(n):
+        a = (rng.randint(-50, 50), rng.randint(-50, 50))
+        # 约十分之一的点对重合；另有一些正好在水平/竖直方向上（翻转边界）
+        if i % 10 == 0:
+            b = a
+        elif i % 10 == 1:
+            b = (a[0] + rng.choice([-7, 7]), a[1])
+        elif i % 10 == 2:
+            b = (a[0], a[1] + rng.choice([-7, 7]))
+        else:
+            b = (rng.uniform(-50, 50), rng.uniform(-50, 50))
+        pts.append((a, b))
+    ax, ay = np.array([p[0] for p in pts], dtype=float).T
+    bx, by = np.array([p[1] for p in pts], dtype=float).T
+    return pts, ax, ay, bx, by
+
+
+def test_vecs_and_distances_match_scalar():
+    pts, ax, ay, bx, by = random_pairs()
+    dx, dy, dist = vecs_from_points(ax, ay, bx, by)
+    d2 = distances(ax, ay, bx, by)
+    for i, (a, b) in enumerate(pts):
+        sdx, sdy, sdist = vec_from_points(a, b)
+        assert (dx[i], dy[i], dist[i]) == pytest.approx((sdx, sdy, sdist))
+        assert d2[i] == pytest.approx(distance(a, b))
+    assert (dist == 0).sum() == 40 and not dx[dist == 0].any()
+
+
+def test_aim_infos_match_scalar_with_fallbacks():
+    pts, ax, ay, bx, by = random_pairs()
+    dx, dy, angle, flip = aim_infos(ax, ay, bx, by, fallback_dir=(0, -3))
+    rng = random.Random(9)
+    per_row = [(rng.uniform(-1, 1), rng.uniform(-1, 1)) for _ in pts]
+    per_row[0] = (0, 0)
+    rdx, rdy, rangle, rflip = aim_infos(ax, ay, bx, by, fallback_dir=np.array(per_row))
+    for i, (a, b) in enumerate(pts):
+        assert (dx[i], dy[i], angle[i]) == pytest.approx(aim_info(a, b, fallback_dir=(0, -3))[:3])
+        assert flip[i] == aim_info(a, b, fallback_dir=(0, -3))[3]
+        expect = aim_info(a, b, fallback_dir=per_row[i])
+        assert (rdx[i], rdy[i], rangle[i]) == pytest.approx(expect[:3])
+        assert rflip[i] == expect[3]
+    assert flip.any() and not flip.all()
+    assert np.all(np.abs(angle) <= 90)
+
+
+def test_scalar_broadcast():
+    dx, dy, dist = vecs_from_points(0, 0, np.array([3.0, 0.0]), np.array([4.0, 0.0]))
+    assert dx.tolist() == [0.6, 0.0] and dy.tolist() == [0.8, 0.0] and dist.tolist() == [5.0, 0.0]
+    _, _, angle, flip = aim_infos(np.array([0.0]), np.array([0.0]), -1.0, 0.0)
+    assert angle[0] == pytest.approx(0.0) and bool(flip[0])
+    assert math.isclose(distances(0, 0, 3, 4), 5.0)
+
+
+def test_neighbor_pairs_match_brute_force():
+    rng = np.random.default_rng(5)
+    # 含负坐标与完全重合的点
+    x = np.concatenate([rng.uniform(-100, 400, 300), [50.0, 50.0]])
+    y = np.concatenate([rng.uniform(-100, 400, 300), [60.0, 60.0]])
+    n = len(x)
+    brute = {(i, j) for i in range(n) for j in range(n)
+             if i != j and (x[i] - x[j]) ** 2 + (y[i] - y[j]) ** 2 < 30 ** 2}
+    i, j = neighbor_pairs(x, y, 30)
+    assert set(zip(i.tolist(), j.tolist())) == brute and len(i) == len(brute)
+    rows = [0, 7, n - 1]
+    i, j = neighbor_pairs(x, y, 30, rows)
+    assert set(zip(i.tolist(), j.tolist())) == {p for p in brute if p[0] in rows}
+
+
+def test_separation_pushes_apart_and_splits_coincident_points():
+    px, py = separation_pushes([0.0, 10.0, 500.0], [0.0, 0.0, 0.0], 30)
+    assert px[0] < 0 < px[1] and px[2] == 0
+    assert px[0] == pytest.approx(-px[1]) and px[1] == pytest.approx(1 - 10 / 30)
+    # 完全重合的两点被推向不同方向
+    px, py = separation_pushes([5.0, 5.0], [5.0, 5.0], 30)
+    assert math.hypot(px[0], py[0]) == pytest.approx(1.0)
+    assert (px[0], py[0]) != pytest.approx((px[1], py[1]))
@@ -0,0 +1,66 @@
+import os
+import pycache_init  # must import first to set sys.pycache_prefix
+import pygame
+import pytest
+
+from config.settings import SIM_TICK_MS
+from game.headless import make_headless_game, run_headless
+from game.input_source import InputSource, InputState, LiveInput
+from game.shop_ui import ShopAction
+
+
+@pytest.fixture(autouse=True)
+def init_pygame():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+class HoldRight(InputSource):
+    """一直向右走，商店里先买第二把武器再离开。"""
+
+    def poll(self, game):
+        return InputState(right=True, mouse_pos=(0, 0))
+
+    def shop_actions(self, state):
+        return [ShopAction('buy', 1), ShopAction('start')]
+
+
+def test_same_seed_reproduces_run():
+    a = run_headless(600, seed=11)
+    b = run_headless(600, seed=11)
+    assert (a.ticks, a.money, a.hp, a.map_idx) == (b.ticks, b.money, b.hp, b.map_idx)
+    assert a.ticks > 0
+
+
+def test_scripted_input_drives_update_and_shop():
+    game = make_headless_game(seed=1, input_source=HoldRight())
+    game.curmap.enemies = []
+    x0 = game.player.rect.x
+    run_headless(30, game=game)
+    assert game.player.rect.x > x0
+    assert game.sim_time == pytest.approx(30 * SIM_TICK_MS)
+
+    game.player.money = 10000
+    game.open_shop()
+    assert game.current_map_idx == 1
+    assert len(game.player.inventory) == 2
+
+
+def test_headless_end_screen_returns_menu():
+    game = make_headless_game(seed=2)
+    game.player.hp = 0
+    game.update(SIM_TICK_MS)
+    assert not game.running
+    assert game.end_action == 'menu'
+
+
+def test_live_input_key_edges_last_one_poll():
+    src = LiveInput()
+    src.handle_event(pygame.event.Event(pygame.KEYDOWN, {'key': pygame.K_e}))
+    src.handle_event(pygame.event.Event(pygame.KEYDOWN, {'key': pygame.K_3}))
+    first = src.poll(None)
+    assert first.melee_key and first.equip == 2
+    second = src.poll(None)
+    assert not second.melee_key and second.equip is None
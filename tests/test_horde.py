@@ -0,0 +1,182 @@
+import os
+import math
+import random
+import pycache_init  # must import first to set sys.pycache_prefix
+import numpy as np
+import pygame
+import pytest
+
+from config.settings import SIM_TICK_MS, ENEMY_SPAWN_WEIGHTS, HORDE_SPAWN_BURST, HORDE_SPAWN_INTERVAL_MS, WIDTH, HEIGHT
+from entities.enemy import Enemy
+from entities.enemy_batch import EnemyBatch
+from entities.projectile_pool import ProjectilePool
+from maps.horde_map import HordeMap, wave_size
+from maps.navigation import NavGrid, FlowField
+from maps.spawn_table import AliasTable, spawn_table
+from game.headless import make_headless_game, run_headless
+from game.input_source import InputSource, InputState
+from game import snapshot
+
+
+@pytest.fixture(autouse=True)
+def init_pygame():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+def test_alias_table_reproduces_weights():
+    weights = {'a': 0.5, 'b': 0.1, 'c': 0.25, 'd': 0.15}
+    table = AliasTable(weights)
+    # 均匀分层的随机数：每个名称抽中的比例就是其精确概率
+    r = (np.arange(100000) + 0.5) / 100000
+    names = table.pick_many(r)
+    for name, w in weights.items():
+        assert names.count(name) / len(names) == pytest.approx(w, abs=1e-4)
+    assert [table.pick(v) for v in r[::997]] == names[::997]
+    with pytest.raises(ValueError):
+        AliasTable({'a': 0})
+
+
+def test_tables_follow_spawn_weights():
+    for idx, weights in enumerate(ENEMY_SPAWN_WEIGHTS):
+        assert spawn_table(idx).names == list(weights)
+    assert spawn_table(99) is spawn_table(len(ENEMY_SPAWN_WEIGHTS) - 1)
+    # 与线性扫描一样每次抽样只消耗一个随机数
+    random.seed(4)
+    spawn_table(2).pick()
+    after = random.random()
+    random.seed(4)
+    random.random()
+    assert random.random() == after
+
+
+def test_waves_escalate_into_hundreds():
+    sizes = [wave_size(w) for w in range(1, 16)]
+    assert sizes == sorted(sizes) and sizes[0] < 20
+    assert max(sizes) >= 300
+
+
+def test_horde_map_spawns_waves_in_bursts():
+    random.seed(2)
+    horde = HordeMap()
+    assert horde.enemies == [] and horde.portal is None
+    horde.update(SIM_TICK_MS, 0)
+    first = horde.enemies
+    assert horde.wave == 1 and 0 < len(first) <= HORDE_SPAWN_BURST
+    for e in first:
+        assert e.chases() and e.chase_range == math.inf and e.patrol_radius == 0
+        assert e.rect.collidelist(horde.obstacles) == -1
+        # 出生在地图边缘
+        x, y = e.rect.center
+        assert min(x, y, WIDTH - x, HEIGHT - y) < 60
+    # 两次刷怪之间列表保持不变（批处理不重建）
+    horde.update(SIM_TICK_MS, HORDE_SPAWN_INTERVAL_MS / 2)
+    assert horde.enemies is first
+    # 打死本波大部分敌人后开始下一波，死者被剔除出新列表
+    now = 0
+    while horde.pending:
+        now += HORDE_SPAWN_INTERVAL_MS
+        horde.update(SIM_TICK_MS, now)
+    for e in horde.enemies:
+        e.alive = False
+    horde.update(SIM_TICK_MS, now + HORDE_SPAWN_INTERVAL_MS)
+    assert horde.wave == 2 and all(e.alive for e in horde.enemies)
+    horde.spawn_portal()
+    assert horde.portal is None
+
+
+def make_chasers(flow, count, seed):
+    rng = random.Random(seed)
+    enemies = []
+    while len(enemies) < count:
+        x, y = rng.randint(40, 900), rng.randint(40, 600)
+        if flow.grid.is_blocked((x, y)):
+            continue
+        e = Enemy(x, y, patrol_radius=rng.choice([0, 40]), archetype=rng.choice(['grunt', 'shotgunner']))
+        e._angle = rng.random() * math.tau
+        e.detect_range = rng.choice([300, 900])
+        e.flow = flow
+        enemies.append(e)
+    return enemies
+
+
+def test_batched_chase_matches_per_object():
+    grid = NavGrid([pygame.Rect(200, 200, 80, 80), pygame.Rect(580, 420, 80, 80)])
+    ref_flow, flow = FlowField(grid), FlowField(grid)
+    ref = make_chasers(ref_flow, 30, seed=5)
+    objs = make_chasers(flow, 30, seed=5)
+    batch = EnemyBatch(objs, min_size=0, separation=0)
+    assert batch.n == 30 and batch.chasers.any()
+    pool_a, pool_b = ProjectilePool(), ProjectilePool()
+    now = 0
+    for t in range(300):
+        now += SIM_TICK_MS
+        target = (int(480 + 300 * math.cos(t * 0.02)), int(320 + 250 * math.sin(t * 0.03)))
+        ref_flow.retarget(target)
+        flow.retarget(target)
+        for e in ref:
+            e.update(SIM_TICK_MS, now)
+            e.try_shoot(target, now, pool=pool_a)
+        batch.step(SIM_TICK_MS, now, target, pool_b)
+    for a, b in zip(ref, objs):
+        assert a.rect.center == b.rect.center
+        assert a._chase_pos == b._chase_pos and a.patrol_center == pytest.approx(b.patrol_center)
+        assert a.angle == pytest.approx(b.angle) and a.last_shot == b.last_shot
+    assert pool_a.count == pool_b.count
+
+
+def test_separation_spreads_a_stacked_crowd():
+    grid = NavGrid([])
+    spread = {}
+    for radius in (0, 30):
+        flow = FlowField(grid)
+        crowd = []
+        for _ in range(40):
+            e = Enemy(600, 400, archetype='shotgunner')
+            e.flow = flow
+            e.chase_range = math.inf
+            crowd.append(e)
+        batch = EnemyBatch(crowd, min_size=0, separation=radius)
+        for _ in range(240):
+            flow.retarget((100, 100))
+            batch.step(SIM_TICK_MS, 0, (100, 100))
+        pts = np.array([e.rect.center for e in crowd], dtype=float)
+        d = np.hypot(pts[:, None, 0] - pts[None, :, 0], pts[:, None, 1] - pts[None, :, 1])
+        spread[radius] = np.median(d[np.triu_indices(len(crowd), 1)])
+        assert all(not grid.is_blocked(e.rect.center) for e in crowd)
+    assert spread[0] < 2
+    assert spread[30] > 40
+
+
+def test_headless_horde_run_is_deterministic():
+    reports = []
+    for _ in range(2):
+        game = make_headless_game(seed=3, mode='horde')
+        assert len(game.maps) == 1 and isinstance(game.curmap, HordeMap)
+        game.player.hp = 10 ** 9
+        report = run_headless(600, game=game)
+        reports.append((report.ticks, report.kills, report.wave, len(game.curmap.enemies),
+                        [e.rect.center for e in game.curmap.enemies]))
+    assert reports[0] == reports[1]
+    assert reports[0][2] >= 1 and reports[0][3] > 0
+
+
+class _HoldFire(InputSource):
+    def poll(self, game):
+        return InputState(mouse_pos=(900, 600), fire=True)
+
+
+def test_snapshot_resumes_horde_waves():
+    game = make_headless_game(seed=5, mode='horde', input_source=_HoldFire())
+    game.player.hp = 10 ** 9
+    run_headless(400, game=game)
+    blob = snapshot.capture(game)
+    run_headless(300, game=game)
+    clone = make_headless_game(seed=5, mode='horde', input_source=_HoldFire())
+    snapshot.restore(clone, blob)
+    run_headless(300, game=clone)
+    assert game.curmap.wave >= 1
+    assert (clone.curmap.wave, clone.curmap.pending, clone.kills) == (game.curmap.wave, game.curmap.pending, game.kills)
+    assert [e.rect.center for e in clone.curmap.enemies] == [e.rect.center for e in game.curmap.enemies]
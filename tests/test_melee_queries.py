@@ -0,0 +1,91 @@
+import os
+import math
+import random
+from copy import copy
+import pycache_init  # must import first to set sys.pycache_prefix
+import numpy as np
+import pygame
+import pytest
+
+from entities.bullet import Bullet
+from entities.enemy import Enemy
+from entities.player import Player
+from entities.projectile_pool import ProjectilePool
+from entities.weapons import SHOP_WEAPONS
+from game.collision import SpatialHash
+
+
+@pytest.fixture(autouse=True)
+def init_pygame():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+def make_player_with(weapon_idx):
+    player = Player(200, 200)
+    player.inventory = [copy(SHOP_WEAPONS[weapon_idx])]
+    player.equipped_idx = 0
+    player.last_melee = -9999
+    return player
+
+
+def test_cleaver_only_hits_inside_swing_arc():
+    player = make_player_with(3)  # Cleaver, radius 48
+    cx, cy = player.rect.center
+    front = Enemy(0, 0)
+    front.rect.center = (cx + 30, cy)
+    behind = Enemy(0, 0)
+    behind.rect.center = (cx - 30, cy)
+    index = SpatialHash()
+    for e in (front, behind):
+        index.insert(e, e.rect)
+
+    hit, _ = player.try_melee(0, [front, behind], [], aim_pos=(cx + 100, cy), index=index)
+    assert hit == [front]
+
+
+def test_spatial_hash_radius_query_matches_scan():
+    rng = random.Random(11)
+    enemies = [Enemy(rng.randint(0, 900), rng.randint(0, 600)) for _ in range(120)]
+    index = SpatialHash()
+    for e in enemies:
+        index.insert(e, e.rect)
+    center, radius, facing = (400, 300), 150, (0.0, -1.0)
+
+    expected = []
+    for e in enemies:
+        dx = e.rect.centerx - center[0]
+        dy = e.rect.centery - center[1]
+        dist = math.hypot(dx, dy)
+        if dist <= radius and (dist == 0 or (dx * facing[0] + dy * facing[1]) / dist >= math.cos(math.radians(70))):
+            expected.append(e)
+    assert index.query_arc(center, radius, facing, 140) == expected
+
+
+def test_pool_radius_query_matches_scan():
+    rng = random.Random(3)
+    pool = ProjectilePool()
+    for i in range(500):
+        owner = 'enemy' if i % 3 else 'player'
+        pool.spawn((rng.uniform(-40, 990), rng.uniform(-40, 670)), (1, 0), 0, owner)
+    center, radius = (300, 250), 90
+
+    got = pool.query_radius(center, radius, owner='enemy')
+    d = np.hypot(pool.x[:len(pool)] - center[0], pool.y[:len(pool)] - center[1])
+    expected = np.flatnonzero((d <= radius) & (pool.owner[:len(pool)] == 1))
+    assert got.tolist() == expected.tolist()
+
+
+def test_reflector_reflects_only_bullets_in_front():
+    player = make_player_with(4)  # Reflector Sword, radius 64
+    cx, cy = player.rect.center
+    pool = ProjectilePool()
+    pool.append(Bullet((cx + 40, cy), (-1, 0), 5, owner='enemy', damage=10, max_range=300))
+    pool.append(Bullet((cx - 40, cy), (1, 0), 5, owner='enemy', damage=10, max_range=300))
+
+    _, reflected = player.try_melee(0, [], pool, aim_pos=(cx + 100, cy))
+    assert len(reflected) == 1
+    assert reflected[0].x == pytest.approx(cx + 40)
+    assert reflected[0].owner == 'player'
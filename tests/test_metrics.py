@@ -0,0 +1,93 @@
+import json
+import os
+import urllib.request
+import pycache_init  # must import first to set sys.pycache_prefix
+import pygame
+import pytest
+
+from game import metrics
+from game.headless import make_headless_game
+from game.image_manager import ImageManager
+from game.metrics import JsonlWriter, MetricsServer, RateWindow, Registry
+from game.save_manager import save_game
+
+
+@pytest.fixture(autouse=True)
+def init_pygame():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+def test_registry_counters_gauges_and_text():
+    reg = Registry(prefix='t_')
+    c = reg.counter('hits_total', 'hits')
+    assert reg.counter('hits_total') is c
+    c.inc()
+    c.inc(2)
+    g = reg.gauge('depth')
+    g.set(4.5)
+    broken = reg.gauge('broken')
+    broken.set_function(lambda: 1 / 0)
+    assert reg.snapshot() == {'hits_total': 3, 'depth': 4.5}
+    text = reg.prometheus_text()
+    assert '# HELP t_hits_total hits\n# TYPE t_hits_total counter\nt_hits_total 3\n' in text
+    assert '# TYPE t_depth gauge\nt_depth 4.5\n' in text
+    with pytest.raises(ValueError):
+        reg.gauge('hits_total')
+
+
+def test_rate_window():
+    rate = RateWindow(60.0)
+    for t in (0, 10, 50):
+        rate.mark(now=t)
+    assert rate.count(now=55) == 3
+    assert rate.count(now=65) == 2
+
+
+def test_instrumented_points(tmp_path):
+    pygame.display.set_mode((10, 10))
+    snap = metrics.REGISTRY.snapshot
+    before = snap()
+    images = ImageManager(str(tmp_path))
+    images.get('a')
+    images.get('a')
+    images.get('a')
+    save_game(type('P', (), {'money': 1})(), filename=str(tmp_path / 'save.json'))
+    after = snap()
+    assert after['image_cache_misses_total'] - before['image_cache_misses_total'] == 1
+    assert after['image_cache_hits_total'] - before['image_cache_hits_total'] == 2
+    assert after['image_cache_size'] - before['image_cache_size'] == 1
+    assert 0 < after['image_cache_hit_ratio'] <= 1
+    assert after['saves_total'] - before['saves_total'] == 1
+    assert after['saves_per_minute'] >= 1
+
+    game = make_headless_game(seed=3)
+    game.update(16)
+    after = snap()
+    assert after['sim_ticks_total'] - before['sim_ticks_total'] == 1
+    assert after['enemies_alive'] == sum(e.alive for e in game.curmap.enemies)
+    assert after['bullets_alive'] == len(game.bullets)
+    assert after['map_index'] == 0
+
+
+def test_jsonl_writer_and_http_endpoint(tmp_path):
+    reg = Registry(prefix='t_')
+    reg.counter('ticks_total').inc(7)
+    path = tmp_path / 'm.jsonl'
+    writer = JsonlWriter(str(path), interval_s=0.01, registry=reg).start()
+    server = MetricsServer(0, registry=reg).start()
+    try:
+        with urllib.request.urlopen(f'http://127.0.0.1:{server.port}/metrics', timeout=5) as resp:
+            body = resp.read().decode('utf-8')
+            assert resp.headers['Content-Type'].startswith('text/plain')
+        assert 't_ticks_total 7' in body
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f'http://127.0.0.1:{server.port}/other', timeout=5)
+    finally:
+        server.stop()
+        writer.stop()
+    lines = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+    assert lines and lines[-1]['metrics'] == {'ticks_total': 7}
+    assert 'ts' in lines[-1]
@@ -0,0 +1,166 @@
+import os
+import math
+import pickle
+import random
+import pycache_init  # must import first to set sys.pycache_prefix
+import pygame
+import pytest
+
+from config.settings import SIM_TICK_MS, MAP_OBSTACLE_LAYOUTS
+from entities.enemy import Enemy
+from entities.enemy_batch import batchable
+from entities.player import Player
+from maps.game_map import GameMap
+from maps.navigation import NavGrid, FlowField
+from game.headless import make_headless_game
+
+
+@pytest.fixture(autouse=True)
+def init_pygame():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+# 320x320 的小地图，中间一堵竖墙，只在底部留出通道
+WALL = pygame.Rect(144, 0, 32, 256)
+
+
+def small_grid():
+    return NavGrid([WALL], width=320, height=320, cell=32, clearance=18)
+
+
+def walk(flow, start, limit=100):
+    """沿流场逐格走到目标格，返回经过的格子中心。"""
+    path = [start]
+    pos = start
+    for _ in range(limit):
+        step = flow.steer(pos)
+        assert step is not None
+        pos = (step[0], step[1])
+        path.append(pos)
+        if flow.grid.cell_of(pos) == flow.target_cell:
+            return path
+    raise AssertionError('没有到达目标')
+
+
+def test_grid_inflates_obstacles_by_clearance():
+    grid = small_grid()
+    assert grid.is_blocked(WALL.center)
+    # 墙左侧一格（中心距墙 16px < 18px）也不可通行，再往外一格可以
+    assert grid.is_blocked((WALL.left - 16, 100))
+    assert not grid.is_blocked((WALL.left - 48, 100))
+    assert not grid.is_blocked((160, 300))
+
+
+def test_flow_routes_around_wall_without_cutting_corners():
+    grid = small_grid()
+    flow = FlowField(grid)
+    flow.retarget((272, 48))
+    path = walk(flow, (48, 48))
+    assert all(not grid.is_blocked(p) for p in path)
+    # 必须绕到墙下方的通道
+    assert max(y for _, y in path) > WALL.bottom
+    for (x0, y0), (x1, y1) in zip(path, path[1:]):
+        if x0 != x1 and y0 != y1:
+            assert not grid.is_blocked((x1, y0)) and not grid.is_blocked((x0, y1))
+    # 路径长度约等于绕行距离，远大于直线距离
+    assert flow.steer((48, 48))[2] > 2 * math.dist((48, 48), (272, 48))
+
+
+def test_flow_rebuilds_only_when_target_changes_cell():
+    flow = FlowField(small_grid())
+    assert flow.steer((48, 48)) is None
+    assert flow.retarget((272, 48))
+    flow.steer((48, 48))
+    assert not flow.retarget((280, 60))
+    for _ in range(5):
+        flow.steer((48, 48))
+    assert flow.builds == 1
+    # 换格只标记过期，查询时才重算
+    assert flow.retarget((272, 112))
+    assert flow.builds == 1
+    flow.steer((48, 48))
+    assert flow.builds == 2
+
+
+def test_unreachable_target_returns_none():
+    grid = NavGrid([pygame.Rect(144, 0, 32, 320)], width=320, height=320, cell=32, clearance=18)
+    flow = FlowField(grid)
+    flow.retarget((272, 48))
+    assert flow.steer((48, 48)) is None
+
+
+def test_chaser_follows_flow_and_stops_in_range():
+    flow = FlowField(small_grid())
+    enemy = Enemy(30, 30, archetype='shotgunner')
+    enemy.detect_range = 1000
+    enemy.flow = flow
+    assert enemy.chases() and batchable(enemy)
+    target = (272, 48)
+    for _ in range(2000):
+        flow.retarget(target)
+        enemy.update(SIM_TICK_MS)
+        assert not enemy.rect.colliderect(WALL)
+    assert math.dist(enemy.rect.center, target) <= enemy.chase_stop + 2
+    assert enemy.rect.centerx > WALL.right
+
+
+def test_chaser_resumes_patrol_without_jumping():
+    flow = FlowField(small_grid())
+    enemy = Enemy(30, 30, patrol_radius=40, archetype='shotgunner')
+    enemy.flow = flow
+    enemy.detect_range = 1000
+    flow.retarget((60, 290))
+    for _ in range(30):
+        enemy.update(SIM_TICK_MS)
+    # 玩家跑出追击范围：回到巡逻，位置连续
+    enemy.detect_range = 10
+    before = enemy.rect.center
+    enemy.update(SIM_TICK_MS)
+    assert math.dist(before, enemy.rect.center) < 3
+
+
+def test_player_slides_along_obstacles():
+    player = Player(100, 100)
+    wall = pygame.Rect(200, 0, 40, 400)
+    for _ in range(40):
+        player.move(4, 2, [wall])
+    assert player.rect.right == wall.left
+    assert player.rect.y > 100
+
+
+def test_map_layouts_keep_spawns_clear():
+    for idx in range(len(MAP_OBSTACLE_LAYOUTS)):
+        random.seed(idx)
+        gm = GameMap(idx)
+        assert len(gm.obstacles) == len(MAP_OBSTACLE_LAYOUTS[idx])
+        assert pygame.Rect(62, 62, 36, 36).collidelist(gm.obstacles) == -1
+        for e in gm.enemies:
+            assert e.rect.collidelist(gm.obstacles) == -1
+            assert e.flow is gm.flow
+        gm.spawn_portal()
+        assert gm.portal.collidelist(gm.obstacles) == -1
+
+
+def test_obstacles_stop_bullets_in_game():
+    game = make_headless_game(seed=1)
+    game.current_map_idx = 1
+    wall = game.curmap.obstacles[0]
+    game.player.rect.center = (wall.left - 60, wall.centery)
+    game.curmap.enemies[:] = []
+    game.bullets.spawn((wall.left - 5, wall.centery), (1, 0), 9, 'player')
+    game.update(SIM_TICK_MS)
+    assert game.bullets.count >= 1 and not game.bullets.alive[0]
+
+
+def test_map_pickles_without_derived_tables():
+    random.seed(3)
+    gm = GameMap(2)
+    gm.flow.retarget((80, 80))
+    first = gm.flow.steer((900, 600))
+    clone = pickle.loads(pickle.dumps(gm))
+    assert clone.enemies[0].flow is clone.flow
+    assert clone.flow.dist is None
+    assert clone.flow.steer((900, 600)) == first
@@ -0,0 +1,61 @@
+import os
+import math
+from copy import copy
+import pycache_init  # must import first to set sys.pycache_prefix
+import pygame
+import pytest
+
+from entities.enemy import BossEnemy
+from entities.player import Player
+from entities.projectile_pool import ProjectilePool
+from entities.weapons import SHOP_WEAPONS
+from entities.patterns import spread_pattern, ring_pattern, compile_pattern
+
+
+@pytest.fixture(autouse=True)
+def init_pygame():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+def test_spread_matches_per_pellet_trig():
+    pellets, spread = 5, 0.9
+    aim = (0.6, -0.8)
+    dxs, dys = spread_pattern(pellets, spread).directions(aim)
+    base = math.atan2(aim[1], aim[0])
+    for i, (dx, dy) in enumerate(zip(dxs, dys)):
+        ang = base + ((i - (pellets - 1) / 2) / (pellets - 1)) * spread
+        assert dx == pytest.approx(math.cos(ang))
+        assert dy == pytest.approx(math.sin(ang))
+
+
+def test_ring_with_gaps_and_cache():
+    ring = ring_pattern(20, 5, (3, 4))
+    assert len(ring) == 12  # 18 directions minus 6 gap slots
+    assert compile_pattern('boss_ring') is ring
+
+
+def test_spiral_rotates_each_emission():
+    spiral = compile_pattern({'kind': 'spiral', 'arms': 4, 'step_deg': 90})
+    first = spiral.directions((1, 0), emission=0)
+    second = spiral.directions((1, 0), emission=1)
+    assert first[0][0] == pytest.approx(1)
+    assert second[1][0] == pytest.approx(1)  # rotated by 90 degrees
+
+
+def test_shotgun_and_boss_emit_batches_into_pool():
+    pool = ProjectilePool()
+    player = Player(0, 0)
+    player.inventory = [copy(SHOP_WEAPONS[1])]
+    player.last_shot = -9999
+    assert player.try_shoot((100, 100), 0, pool=pool) == 5
+    assert len(pool) == 5
+
+    boss = BossEnemy(480, 320)
+    before = len(pool)
+    emitted = boss._emit_skill1(1, 0, pool=pool)
+    assert emitted == len(ring_pattern(20, 5, (3, 4)))
+    assert len(pool) == before + emitted
+    assert set(pool.owner[before:len(pool)].tolist()) == {1}
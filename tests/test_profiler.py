@@ -0,0 +1,114 @@
+import csv
+import os
+import pycache_init  # must import first to set sys.pycache_prefix
+import pygame
+import pytest
+
+import game.game as game_module
+from config.settings import WIDTH, HEIGHT, SIM_TICK_MS
+from game.game import Game
+from game.profiler import FrameProfiler, PHASES
+
+
+@pytest.fixture(autouse=True)
+def init_pygame():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+def fill(prof, totals):
+    """直接写入若干帧：第 k 帧整帧耗时为 totals[k]，input 阶段为其一半。"""
+    col = PHASES.index('input') + 1
+    for ms in totals:
+        prof.begin_frame()
+        prof.end_frame()
+        prof._rows[(prof.frames - 1) % prof.capacity, 0] = ms
+        prof._rows[(prof.frames - 1) % prof.capacity, col] = ms / 2
+
+
+def test_ring_buffer_keeps_latest_frames_in_order():
+    prof = FrameProfiler(capacity=4)
+    fill(prof, [1, 2, 3, 4, 5, 6])
+    assert prof.frames == 6
+    assert prof.history()[:, 0].tolist() == [3, 4, 5, 6]
+
+
+def test_averages_over_window():
+    prof = FrameProfiler(capacity=8)
+    assert prof.averages()[0] == 0.0
+    fill(prof, [2, 4, 6, 8])
+    total, phases = prof.averages(window=2)
+    assert total == pytest.approx(7)
+    assert phases['input'] == pytest.approx(3.5)
+    assert phases['flip'] == 0.0
+
+
+def test_lap_accumulates_repeated_phases_and_ignores_unknown():
+    prof = FrameProfiler(capacity=4)
+    prof.begin_frame()
+    prof.lap('input')
+    prof.lap('not_a_phase')
+    prof.lap('input')
+    prof.end_frame()
+    row = prof.history()[-1]
+    assert row[PHASES.index('input') + 1] > 0
+    assert row[0] >= row[1:].sum() - 1e-6
+
+
+def test_dump_csv(tmp_path):
+    prof = FrameProfiler(capacity=3)
+    fill(prof, [1, 2, 3, 4])
+    path = prof.dump_csv(str(tmp_path / 'out' / 'frames.csv'))
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = list(csv.reader(f))
+    assert rows[0][:2] == ['frame', 'total_ms'] and len(rows[0]) == len(PHASES) + 2
+    assert [int(r[0]) for r in rows[1:]] == [1, 2, 3]
+    assert float(rows[-1][1]) == pytest.approx(4)
+
+
+def test_overlay_draws_on_surface():
+    prof = FrameProfiler(capacity=16)
+    fill(prof, [5, 30, 10])
+    surf = pygame.Surface((WIDTH, HEIGHT))
+    surf.fill((200, 200, 200))
+    prof.draw(surf)
+    # 半透明面板压暗左上角，面板外不受影响
+    assert surf.get_at((10, 10))[0] < 200
+    assert surf.get_at((WIDTH - 1, HEIGHT - 1))[:3] == (200, 200, 200)
+
+
+class FakeClock:
+    def __init__(self, frames):
+        self.frames = list(frames)
+
+    def tick(self, fps=0):
+        return self.frames.pop(0) if self.frames else SIM_TICK_MS
+
+
+def test_game_run_records_phases_and_dumps_after_f3(tmp_path, monkeypatch):
+    monkeypatch.setattr(game_module, 'PROFILE_DIR', str(tmp_path))
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    font = pygame.font.SysFont(None, 24)
+    g = Game(screen, FakeClock([SIM_TICK_MS] * 3), font, font)
+    g.curmap.enemies = []
+    g.curmap.portal = None
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_F3, mod=0, unicode='', scancode=0))
+    real_draw = g.draw
+    drawn = []
+
+    def draw(alpha=1.0):
+        real_draw(alpha)
+        drawn.append(alpha)
+        if len(drawn) == 3:
+            g.running = False
+
+    g.draw = draw
+    g.run()
+
+    assert g.profiler.visible and g.profiler.frames == 3
+    _, phases = g.profiler.averages()
+    for name in ('events', 'input', 'draw_map', 'draw_hud', 'overlay', 'flip'):
+        assert phases[name] > 0, name
+    assert len(list(tmp_path.glob('frames-*.csv'))) == 1
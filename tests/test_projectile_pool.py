@@ -0,0 +1,72 @@
+import os
+from copy import copy
+import pycache_init  # must import first to set sys.pycache_prefix
+import pygame
+import pytest
+
+from config.settings import WIDTH, SIM_TICK_MS
+from entities.bullet import Bullet
+from entities.player import Player
+from entities.weapons import SHOP_WEAPONS
+from entities.projectile_pool import ProjectilePool
+
+
+@pytest.fixture(autouse=True)
+def init_pygame():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+def test_pool_advances_and_culls_by_range_and_bounds():
+    pool = ProjectilePool(capacity=16)
+    pool.spawn((100, 100), (1, 0), 10, 'player', damage=5, max_range=25)
+    pool.spawn((WIDTH + 45, 100), (1, 0), 10, 'enemy')
+    pool.spawn((200, 200), (0, 1), 2, 'enemy', max_range=500)
+
+    pool.update(SIM_TICK_MS)
+    assert len(pool) == 2  # second bullet left the screen margin
+    pool.update(SIM_TICK_MS)
+    pool.update(SIM_TICK_MS)
+    # first bullet exhausted its 25px range after 3 steps of 10px
+    views = list(pool)
+    assert len(views) == 1
+    assert views[0].owner == 'enemy'
+    assert views[0].y == pytest.approx(206)
+
+
+def test_pool_grows_and_matches_bullet_objects():
+    pool = ProjectilePool(capacity=16)
+    reference = []
+    for i in range(40):
+        b = Bullet((10 + i, 20 + i), (0.6, 0.8), 3, 'player', damage=7, max_range=300)
+        reference.append(Bullet((10 + i, 20 + i), (0.6, 0.8), 3, 'player', damage=7, max_range=300))
+        pool.append(b)
+    assert pool.capacity >= 40
+
+    for _ in range(5):
+        pool.update(SIM_TICK_MS)
+        for b in reference:
+            b.update(SIM_TICK_MS)
+    for view, b in zip(pool, reference):
+        assert view.x == pytest.approx(b.x)
+        assert view.y == pytest.approx(b.y)
+        assert view.rect == b.rect
+
+
+def test_reflector_sword_reflects_pooled_bullet():
+    player = Player(0, 0)
+    player.inventory = [copy(SHOP_WEAPONS[4])]
+    player.equipped_idx = 0
+    player.last_melee = -9999
+
+    pool = ProjectilePool()
+    pool.append(Bullet(player.rect.center, (1, 0), 5, owner='enemy', damage=10, max_range=50))
+    hit_enemies, reflected = player.try_melee(0, enemies=[], bullets=pool)
+
+    assert len(reflected) == 1
+    view = next(iter(pool))
+    assert view.owner == 'player'
+    assert view.dx == -1
+    assert view.damage == 9
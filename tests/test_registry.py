@@ -0,0 +1,97 @@
+import os
+import pickle
+import random
+import pycache_init  # must import first to set sys.pycache_prefix
+import pygame
+import pytest
+
+from config.settings import SIM_TICK_MS
+from entities.enemy import Enemy
+from entities.registry import EntityRegistry
+from maps.game_map import GameMap
+
+
+@pytest.fixture(autouse=True)
+def init_pygame():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+def make_enemies(kinds):
+    return [Enemy(40 * i, 40, archetype=kind) for i, kind in enumerate(kinds)]
+
+
+def test_counts_follow_deaths_and_compaction_keeps_order():
+    enemies = make_enemies(['grunt', 'sniper', 'grunt', 'shotgunner', 'grunt', 'sniper', 'grunt', 'grunt'])
+    registry = EntityRegistry(compact_ratio=0.25)
+    registry.extend(enemies)
+    assert registry.counts == {'grunt': 5, 'sniper': 2, 'shotgunner': 1} and len(registry) == 8
+    enemies[1].alive = False
+    enemies[1].alive = False
+    assert registry.counts['sniper'] == 1 and registry.live == 7 and registry.dead == 1
+    # 1 个死者不超过 7 * 0.25：保留原列表
+    first = registry.entities
+    assert not registry.compact() and registry.entities is first
+    enemies[0].alive = False
+    assert registry.compact()
+    assert registry.entities == [e for e in enemies if e.alive] and registry.dead == 0
+    assert registry.counts['grunt'] == 4
+
+
+def test_cleared_fires_once_when_last_entity_dies():
+    calls = []
+    registry = EntityRegistry(make_enemies(['grunt', 'grunt']))
+    registry.on_cleared(lambda: calls.append(registry.live))
+    registry.entities[0].alive = False
+    assert calls == []
+    registry.entities[1].alive = False
+    assert calls == [0]
+    assert registry.compact() and registry.entities == []
+    # 换成空列表只在原来还有存活者时算清场
+    registry.reset([])
+    assert calls == [0]
+
+
+def test_reset_detaches_replaced_entities():
+    old = make_enemies(['grunt'])
+    registry = EntityRegistry(old)
+    registry.reset(make_enemies(['grunt', 'sniper']))
+    old[0].alive = False
+    assert old[0].registry is None and registry.live == 2
+
+
+def test_map_spawns_portal_on_cleared_event():
+    random.seed(5)
+    gm = GameMap(1)
+    assert gm.portal is None and gm.registry.live == len(gm.enemies) > 0
+    for e in gm.enemies[:-1]:
+        e.alive = False
+    assert gm.portal is None
+    gm.enemies[-1].alive = False
+    assert gm.portal is not None
+    gm.update(SIM_TICK_MS, 0)
+    assert gm.enemies == []
+
+
+def test_registry_survives_map_pickling():
+    random.seed(6)
+    gm = GameMap(0)
+    gm.enemies[0].alive = False
+    clone = pickle.loads(pickle.dumps(gm))
+    assert clone.registry.live == gm.registry.live and clone.enemies[0].registry is clone.registry
+    for e in clone.enemies:
+        e.alive = False
+    assert clone.portal is not None and gm.portal is None
+
+
+def test_game_compacts_dead_enemies_out_of_iteration():
+    from game.headless import make_headless_game
+    game = make_headless_game(seed=3)
+    enemies = game.curmap.enemies
+    for e in enemies[:len(enemies) // 2 + 1]:
+        e.alive = False
+    game.update(SIM_TICK_MS)
+    assert all(e.alive for e in game.curmap.enemies)
+    assert game.enemy_batch().matches(game.curmap.enemies)
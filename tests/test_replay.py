@@ -0,0 +1,126 @@
+import os
+import random
+import pycache_init  # must import first to set sys.pycache_prefix
+import pygame
+import pytest
+
+from config.settings import WIDTH, HEIGHT, SIM_TICK_MS
+from game.game import Game
+from game.input_source import AutoPilot, InputState
+from game.replay import InputRecorder, load_replay, replay_file
+from game.save_manager import rebuild_inventory
+from game.shop_ui import ShopAction
+
+
+@pytest.fixture(autouse=True)
+def init_pygame():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+def test_record_roundtrip(tmp_path):
+    path = tmp_path / 'r.rpl'
+    rec = InputRecorder(path, 42, 1234.5, initial_state={'money': 300, 'inventory_objs': rebuild_inventory(['Shotgun'])})
+    rec.tick(InputState(up=True, fire=True, mouse_pos=(950, 630), equip=2))
+    rec.shop_action(ShopAction('buy', 3))
+    rec.shop_action(ShopAction('start'))
+    rec.tick(InputState(melee_key=True))
+
+    class Done:
+        kills = 1
+
+        class player:
+            money = 7
+            hp = 9
+    rec.finish(Done)
+
+    replay = load_replay(path)
+    assert (replay.seed, replay.start_time, replay.tick_ms) == (42, 1234.5, pytest.approx(SIM_TICK_MS))
+    assert replay.initial_state['money'] == 300
+    assert [w.name for w in replay.initial_state['inventory_objs']] == ['Shotgun']
+    assert replay.records == [
+        InputState(up=True, fire=True, mouse_pos=(950, 630), equip=2),
+        ShopAction('buy', 3),
+        ShopAction('start'),
+        InputState(melee_key=True),
+    ]
+    assert replay.tick_count == 2
+    assert replay.outcome == (2, 7, 9, 1)
+
+
+def test_replay_reproduces_rendered_run(tmp_path):
+    # 录制时穿插渲染（带插值），回放时不渲染，结果应完全一致
+    path = tmp_path / 'fight.rpl'
+    seed = 9
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    font = pygame.font.SysFont(None, 24)
+    random.seed(seed)
+    game = Game(screen, None, font, font, input_source=AutoPilot(seed), headless=True, start_time=5000)
+    game.recorder = InputRecorder(path, seed, game.sim_time)
+    for _ in range(1500):
+        if not game.running:
+            break
+        game.update(SIM_TICK_MS)
+        if game.running:
+            game.draw(0.5)
+    game.recorder.finish(game)
+
+    replay, report = replay_file(path)
+    assert replay.outcome == (report.ticks, report.money, report.hp, report.kills)
+    assert report.kills > 0
+
+
+def _fingerprint(game):
+    boss_fields = []
+    for gm in game.maps:
+        for e in gm.enemies:
+            boss_fields.append((e.alive, e.hp, e.rect.center, getattr(e, 'state', None),
+                                getattr(e, 'skill1_cooldown_remaining', None), e.last_shot))
+    return (game.sim_time, game.current_map_idx, game.kills, game.player.rect.center, game.player.hp,
+            game.player.money, game.player.last_shot, len(game.bullets),
+            game.bullets.x[:len(game.bullets)].tolist(), boss_fields)
+
+
+def test_seek_from_keyframe_matches_linear_replay(tmp_path):
+    from game.headless import make_headless_game, run_headless
+    from game.replay import ReplayFile, ReplayInput, seek
+
+    path = tmp_path / 'kf.rpl'
+    seed = 4
+    rec = InputRecorder(path, seed, 0, keyframe_every=100)
+    game = make_headless_game(seed, recorder=rec)
+    run_headless(700, game=game)
+    rec.finish(game)
+
+    with ReplayFile(path) as rf:
+        assert [t for t, _ in rf.keyframes][:3] == [100, 200, 300]
+        assert rf.keyframe_before(250)[0] == 200
+        for target in (0, 250, 640):
+            linear = make_headless_game(seed, ReplayInput(rf.records()), start_time=0)
+            run_headless(target, game=linear)
+            assert _fingerprint(seek(rf, target)) == _fingerprint(linear)
+
+        # 从关键帧继续回放到结尾，结果与录制一致
+        resumed = seek(rf, 350)
+        run_headless(rf.tick_count - 350, game=resumed)
+        assert (resumed.player.money, resumed.player.hp, resumed.kills) == tuple(rf.outcome[1:])
+
+
+def test_truncated_recording_is_scanned(tmp_path):
+    from game.headless import make_headless_game, run_headless
+    from game.replay import ReplayFile
+
+    path = tmp_path / 'cut.rpl'
+    rec = InputRecorder(path, 3, 0, keyframe_every=50)
+    game = make_headless_game(3, recorder=rec)
+    run_headless(180, game=game)
+    rec._f.close()  # 模拟录制中途退出：没有结尾与索引
+    data = path.read_bytes()
+    path.write_bytes(data[:-3])
+
+    with ReplayFile(path) as rf:
+        assert rf.outcome is None
+        assert [t for t, _ in rf.keyframes] == [50, 100, 150]
+        assert rf.tick_count == 179
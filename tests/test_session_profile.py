@@ -0,0 +1,59 @@
+import pstats
+import pycache_init  # must import first to set sys.pycache_prefix
+import pytest
+
+from game.session_profile import SessionProfiler, StackSampler
+from main import parse_args
+
+
+def busy_work(n=200000):
+    total = 0
+    for i in range(n):
+        total += i * i
+    return total
+
+
+def test_session_writes_pstats_and_folded(tmp_path):
+    prof = SessionProfiler('both', out_dir=str(tmp_path), interval_ms=1)
+    with prof.active():
+        for _ in range(10):
+            busy_work()
+    paths = prof.save()
+    assert [p.rsplit('.', 1)[1] for p in paths] == ['pstats', 'folded']
+
+    stats = pstats.Stats(paths[0])
+    assert any(func[2] == 'busy_work' for func in stats.stats)
+    with open(paths[1], encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(' ', 1)
+    assert int(count) > 0
+    assert any('test_session_profile.py:busy_work' in line for line in lines)
+
+
+def test_sampler_only_counts_while_active(tmp_path):
+    prof = SessionProfiler('sample', out_dir=str(tmp_path), interval_ms=1)
+    busy_work()
+    assert prof.sampler.samples == 0
+    with prof.active():
+        busy_work(2000000)
+    paths = prof.save()
+    assert len(paths) == 1 and paths[0].endswith('.folded')
+    assert prof.sampler.samples > 0
+
+
+def test_sampler_collapses_stack_root_first():
+    sampler = StackSampler()
+    sampler.sample()
+    (key, n), = sampler.counts.items()
+    assert n == 1
+    assert key.endswith('session_profile.py:sample')
+    assert 'test_session_profile.py:test_sampler_collapses_stack_root_first' in key
+
+
+def test_profile_option():
+    assert parse_args([]).profile is None
+    assert parse_args(['--profile']).profile == 'both'
+    assert parse_args(['--profile', 'sample']).profile == 'sample'
+    with pytest.raises(SystemExit):
+        parse_args(['--profile', 'nope'])
@@ -0,0 +1,68 @@
+import os
+import random
+from copy import copy
+import pycache_init  # must import first to set sys.pycache_prefix
+import pygame
+import pytest
+
+from entities.bullet import Bullet
+from entities.enemy import Enemy
+from entities.player import Player
+from entities.projectile_pool import ProjectilePool
+from entities.weapons import SHOP_WEAPONS
+from game.collision import CollisionWorld
+from utils import segment_aabb_entry, segment_aabb_hits
+
+
+@pytest.fixture(autouse=True)
+def init_pygame():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+def test_segment_kernels_agree():
+    rng = random.Random(5)
+    segs = [(rng.uniform(0, 200), rng.uniform(0, 200), rng.uniform(0, 200), rng.uniform(0, 200)) for _ in range(300)]
+    segs.append((10, 60, 90, 60))  # horizontal, zero dy
+    segs.append((10, 10, 10, 10))  # degenerate point
+    x0, y0, x1, y1 = zip(*segs)
+    vec = segment_aabb_hits(x0, y0, x1, y1, 50, 50, 100, 80)
+    for hit, seg in zip(vec.tolist(), segs):
+        assert hit == (segment_aabb_entry(*seg, 50, 50, 100, 80) is not None)
+
+
+def test_sniper_marks_bullets_swept():
+    sniper = copy(SHOP_WEAPONS[2])
+    assert sniper.swept is True
+    assert all(b.swept for b in sniper.fire((0, 0), (10, 0)))
+    assert not any(b.swept for b in copy(SHOP_WEAPONS[0]).fire((0, 0), (10, 0)))
+
+
+def test_fast_bullet_tunnels_unless_swept():
+    player = Player(800, 600)
+    enemy = Enemy(100, 100)
+    world = CollisionWorld()
+    world.rebuild(player, [enemy])
+
+    # 80 px in one step jumps clean over the 36 px enemy
+    for swept, expected in ((False, 0), (True, 1)):
+        pool = ProjectilePool()
+        pool.append(Bullet((70, 118), (1, 0), 80, 'player', swept=swept))
+        pool.update(16)
+        assert len(list(world.pool_hits(pool))) == expected
+
+        b = Bullet((70, 118), (1, 0), 80, 'player', swept=swept)
+        b.update(16)
+        assert (world.first_hit(b) is enemy) == bool(expected)
+
+
+def test_swept_enemy_bullet_hits_player():
+    player = Player(300, 300)
+    world = CollisionWorld()
+    world.rebuild(player, [])
+    pool = ProjectilePool()
+    pool.append(Bullet((318, 250), (0, 1), 120, 'enemy', swept=True))
+    pool.update(16)
+    assert [t for _, t in world.pool_hits(pool)] == [player]
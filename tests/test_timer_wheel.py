@@ -0,0 +1,186 @@
+import os
+import pickle
+import pycache_init  # must import first to set sys.pycache_prefix
+import pygame
+import pytest
+
+from config.settings import SIM_TICK_MS
+from entities.enemy import Enemy, BossEnemy
+from entities.timer_wheel import TimerWheel
+
+
+@pytest.fixture(autouse=True)
+def init_pygame():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+class Log:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, now, tag):
+        self.calls.append((now, tag))
+
+
+def run_ticks(wheel, start, ticks, dt=SIM_TICK_MS):
+    now = start
+    for _ in range(ticks):
+        now += dt
+        wheel.advance(now)
+    return now
+
+
+def test_timers_fire_in_order_on_first_due_tick():
+    wheel = TimerWheel(tick_ms=10, slots=8, levels=2)
+    log = Log()
+    wheel.advance(0)
+    for at, tag in [(35, 'c'), (12, 'a'), (35, 'd'), (12.5, 'b'), (40, 'e')]:
+        wheel.schedule(at, log, tag)
+    assert len(wheel) == 5
+    # 12 与 12.5 落在第 1 步，但 now=10 时都未到期
+    wheel.advance(10)
+    assert log.calls == []
+    wheel.advance(20)
+    wheel.advance(36)
+    assert log.calls == [(20, 'a'), (20, 'b'), (36, 'c'), (36, 'd')]
+    wheel.advance(40)
+    assert log.calls[-1] == (40, 'e') and len(wheel) == 0 and wheel.fired == 5
+
+
+def test_fractional_deadline_inside_current_tick():
+    wheel = TimerWheel(tick_ms=10, slots=8, levels=2)
+    log = Log()
+    wheel.advance(100)
+    # 与当前步同一格、稍晚于 now：下一次 advance 才到期
+    wheel.schedule(104, log, 'x')
+    wheel.advance(103)
+    assert log.calls == []
+    wheel.advance(104)
+    assert log.calls == [(104, 'x')]
+    # 登记在过去的定时器在下一次 advance 立即执行
+    wheel.schedule(50, log, 'late')
+    wheel.advance(105)
+    assert log.calls[-1] == (105, 'late')
+
+
+def test_cancel_and_callback_cancelling_later_timer():
+    wheel = TimerWheel(tick_ms=10, slots=8, levels=2)
+    log = Log()
+    wheel.advance(0)
+    dropped = wheel.schedule(30, log, 'dropped')
+    # 同一时刻先登记的回调先执行，可以取消后登记的定时器
+    timers = []
+    wheel.schedule(50, lambda now: wheel.cancel(timers[0]))
+    timers.append(wheel.schedule(50, log, 'later'))
+    wheel.cancel(dropped)
+    assert len(wheel) == 2
+    run_ticks(wheel, 0, 10, dt=10)
+    assert log.calls == [] and len(wheel) == 0
+
+
+def test_far_timers_cascade_through_levels_and_overflow():
+    wheel = TimerWheel(tick_ms=1, slots=4, levels=2)
+    log = Log()
+    wheel.advance(3)
+    # 2 层 x 4 槽只覆盖 16 步：更远的放进溢出表
+    deadlines = [5, 9, 16, 17, 30, 63, 64, 200]
+    for at in deadlines:
+        wheel.schedule(at, log, at)
+    for now in range(4, 260):
+        wheel.advance(now)
+    assert log.calls == [(at, at) for at in deadlines]
+
+
+def test_long_pause_rebases_instead_of_spinning():
+    wheel = TimerWheel(tick_ms=1, slots=4, levels=2)
+    log = Log()
+    wheel.advance(0)
+    wheel.schedule(3, log, 'soon')
+    wheel.schedule(10_000, log, 'far')
+    wheel.schedule(10_002, log, 'after')
+    wheel.advance(10_000)
+    assert log.calls == [(10_000, 'soon'), (10_000, 'far')]
+    wheel.advance(10_002)
+    assert log.calls[-1] == (10_002, 'after')
+
+
+def test_wheel_pickles_with_bound_callbacks():
+    enemy = Enemy(100, 100)
+    wheel = TimerWheel()
+    wheel.advance(0)
+    enemy.use_timers(wheel)
+    enemy_copy, wheel_copy = pickle.loads(pickle.dumps((enemy, wheel)))
+    assert not enemy_copy._loaded and len(wheel_copy) == 1
+    wheel_copy.advance(enemy.fire_cooldown)
+    assert enemy_copy._loaded and not enemy._loaded
+
+
+def shooting_trace(wheel, ticks=400):
+    """逐步推进一个追着移动玩家开火的敌人，记录开火时刻、武器视觉状态与 `weapon.update` 调用次数。"""
+    enemy = Enemy(300, 300, patrol_radius=40)
+    enemy._angle = 0.0
+    timers = None
+    if wheel:
+        timers = TimerWheel()
+        enemy.use_timers(timers)
+    calls = [0]
+    update = enemy.weapon.update
+
+    def counted(dt):
+        calls[0] += 1
+        update(dt)
+    enemy.weapon.update = counted
+    shots, visuals = [], []
+    now = 0.0
+    for k in range(ticks):
+        now += SIM_TICK_MS
+        if timers is not None:
+            timers.advance(now)
+        enemy.update(SIM_TICK_MS, now)
+        # 玩家时而进入、时而离开检测范围
+        player = (300 + (k % 120) * 8, 300)
+        if enemy.try_shoot(player, now) is not None:
+            shots.append(k)
+        w = enemy.weapon
+        visuals.append((round(w.recoil, 9), round(w.flash_timer, 9), round(w.shake_timer, 9)))
+    return shots, visuals, calls[0]
+
+
+def test_enemy_timers_match_polling_and_skip_idle_weapons():
+    legacy_shots, legacy_visuals, legacy_updates = shooting_trace(wheel=False)
+    shots, visuals, updates = shooting_trace(wheel=True)
+    assert len(shots) > 3
+    assert shots == legacy_shots and visuals == legacy_visuals
+    assert legacy_updates == 400 and updates < legacy_updates // 2
+
+
+def test_boss_skills_end_and_recharge_via_timers():
+    runs = []
+    for wheel in (False, True):
+        boss = BossEnemy(400, 300)
+        # 冷却取逻辑步的非整数倍：整数倍时逐步递减的浮点残差可能让轮询晚到一步
+        boss.skill1_cooldown = 3590
+        boss.skill2_cooldown = 1390
+        timers = None
+        if wheel:
+            timers = TimerWheel()
+            boss.use_timers(timers)
+        states = []
+        now = 0.0
+        for _ in range(900):
+            now += SIM_TICK_MS
+            if timers is not None:
+                timers.advance(now)
+            boss.update(SIM_TICK_MS, now)
+            boss.try_shoot((boss.rect.centerx + 150, boss.rect.centery), now)
+            ready = (boss.skill1_cooldown_remaining <= 0, boss.skill2_cooldown_remaining <= 0)
+            states.append((boss.state, boss.skill1_active, boss.skill2_active) + ready)
+        runs.append(states)
+        if wheel:
+            # 冷却中的剩余值保持为完整冷却时长，只在到期时归零
+            assert boss.skill1_cooldown_remaining in (0, boss.skill1_cooldown)
+    assert runs[0] == runs[1]
+    assert any(s[0] == 'BURST' for s in runs[1]) and any(s[0] == 'DASH' for s in runs[1])
@@ -0,0 +1,113 @@
+import json
+import os
+import pycache_init  # must import first to set sys.pycache_prefix
+import pygame
+import pytest
+
+from config.settings import WIDTH, HEIGHT, SIM_TICK_MS
+from game import trace
+from game.game import Game
+from game.headless import run_headless
+from game.image_manager import ImageManager
+from game.save_manager import save_game
+
+
+@pytest.fixture(autouse=True)
+def init_pygame():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    yield
+    trace.stop(write=False)
+    pygame.quit()
+
+
+def names(tracer, ph='X'):
+    return [e[1] for e in tracer.events if e[0] == ph]
+
+
+def test_disabled_is_noop():
+    assert trace.active() is None
+    assert trace.span('x') is trace.span('y')
+    with trace.span('x', k=1):
+        pass
+    trace.instant('y')
+    assert trace.stop() is None
+
+
+def test_spans_nest_and_write_json(tmp_path):
+    tracer = trace.start()
+    with trace.span('outer', n=3):
+        with trace.span('inner'):
+            pass
+    trace.instant('marker')
+    tracer.begin_frame()
+    tracer.lap('input')
+    tracer.lap('flip')
+    tracer.end_frame()
+    path = trace.stop(str(tmp_path / 'trace.json'))
+    assert trace.active() is None
+
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    events = {e['name']: e for e in data['traceEvents'] if e['ph'] in ('X', 'i')}
+    assert set(events) == {'outer', 'inner', 'marker', 'input', 'flip', 'frame'}
+    outer, inner = events['outer'], events['inner']
+    assert outer['args'] == {'n': 3}
+    assert outer['ts'] <= inner['ts'] and inner['ts'] + inner['dur'] <= outer['ts'] + outer['dur'] + 1e-3
+    frame = events['frame']
+    assert frame['args'] == {'frame': 0}
+    assert frame['ts'] <= events['input']['ts'] <= events['flip']['ts'] <= frame['ts'] + frame['dur']
+    assert any(e['ph'] == 'M' and e['name'] == 'thread_name' for e in data['traceEvents'])
+
+
+def test_event_cap_counts_dropped():
+    tracer = trace.start(max_events=2)
+    for _ in range(5):
+        trace.instant('x')
+    assert len(tracer.events) == 2 and tracer.dropped == 3
+    assert tracer.to_json()['otherData']['dropped_events'] == 3
+
+
+def test_image_cache_miss_and_save_are_traced(tmp_path):
+    pygame.display.set_mode((10, 10))
+    images = ImageManager(str(tmp_path))
+    tracer = trace.start()
+    images.get('missing', scale=(8, 8))
+    images.get('missing', scale=(8, 8))
+    save_game(type('P', (), {'money': 1})(), filename=str(tmp_path / 'save.json'))
+    assert names(tracer) == ['ImageManager.get', 'save_game']
+
+
+def test_game_frames_and_maps_are_traced():
+    tracer = trace.start()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    font = pygame.font.SysFont(None, 24)
+
+    class Clock:
+        def tick(self, fps=0):
+            return SIM_TICK_MS
+
+    g = Game(screen, Clock(), font, font)
+    g.curmap.enemies = []
+    g.curmap.portal = None
+    real_draw = g.draw
+    drawn = []
+
+    def draw(alpha=1.0):
+        real_draw(alpha)
+        drawn.append(alpha)
+        g.running = len(drawn) < 2
+
+    g.draw = draw
+    g.run()
+    got = names(tracer)
+    assert got[0] == 'spawn_maps'
+    assert got.count('frame') == 2
+    for name in ('events', 'input', 'collision', 'draw_map', 'draw_hud', 'flip'):
+        assert name in got, name
+
+
+def test_headless_ticks_are_frames():
+    tracer = trace.start()
+    run_headless(5, seed=1)
+    assert names(tracer).count('frame') == 5
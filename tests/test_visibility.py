@@ -0,0 +1,93 @@
+import os
+import pickle
+import pycache_init  # must import first to set sys.pycache_prefix
+import pygame
+import pytest
+
+from config.settings import SIM_TICK_MS
+from entities.enemy import Enemy
+from entities.enemy_batch import EnemyBatch
+from entities.projectile_pool import ProjectilePool
+from maps.visibility import VisibilityGrid
+
+
+@pytest.fixture(autouse=True)
+def init_pygame():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+WALL = pygame.Rect(160, 64, 32, 128)
+
+
+def grid():
+    return VisibilityGrid([WALL], width=320, height=320, cell=16)
+
+
+def test_wall_blocks_and_open_lines_are_clear():
+    vis = grid()
+    assert not vis.visible((40, 128), (300, 128))
+    assert not vis.visible((300, 128), (40, 128))
+    # 从墙上方/下方经过
+    assert vis.visible((40, 20), (300, 20))
+    assert vis.visible((40, 280), (300, 250))
+    # 斜穿墙体
+    assert not vis.visible((100, 60), (260, 200))
+
+
+def test_grazing_a_corner_is_blocked():
+    vis = VisibilityGrid([pygame.Rect(16, 0, 16, 16), pygame.Rect(0, 16, 16, 16)], width=64, height=64, cell=16)
+    # 两个不透明格只在格角相接：恰好穿过这个角的视线被挡
+    assert not vis.cells_clear(vis.cell_of((8, 8)), vis.cell_of((40, 40)))
+    assert vis.cells_clear(vis.cell_of((40, 8)), vis.cell_of((40, 40)))
+
+
+def test_results_are_cached_per_cell_pair():
+    vis = grid()
+    vis.visible((40, 128), (300, 128))
+    # 同一对格子内移动（以及反向查询）都命中缓存
+    vis.visible((44, 130), (302, 130))
+    vis.visible((300, 128), (40, 128))
+    assert (vis.hits, vis.misses) == (2, 1)
+    vis.visible((40, 128), (300, 20))
+    assert vis.misses == 2
+
+
+def test_cache_is_bounded_and_not_pickled():
+    vis = VisibilityGrid([WALL], width=320, height=320, cell=16, cache_max=3)
+    for x in range(0, 320, 16):
+        vis.visible((8, 8), (x + 8, 300))
+    assert len(vis._cache) <= 3
+    clone = pickle.loads(pickle.dumps(vis))
+    assert clone._cache == {} and clone.opaque == vis.opaque
+
+
+def test_enemies_hold_fire_without_line_of_sight():
+    vis = grid()
+    player = (300, 128)
+    hidden = Enemy(40, 110)
+    hidden.vis = vis
+    hidden.last_shot = -10000
+    assert hidden.try_shoot(player, 0, pool=ProjectilePool()) is None
+    assert hidden.last_shot == -10000
+    # 绕到墙的上方，视线打开后立即开火
+    hidden.rect.center = (40, 20)
+    pool = ProjectilePool()
+    assert hidden.try_shoot((300, 20), 0, pool=pool)
+    assert pool.count > 0 and hidden.last_shot == 0
+
+
+def test_batch_applies_line_of_sight():
+    vis = grid()
+    blocked = Enemy(22, 110)
+    clear = Enemy(22, 2)
+    for e in (blocked, clear):
+        e.vis = vis
+        e.last_shot = -10000
+    batch = EnemyBatch([blocked, clear], min_size=0)
+    fired = batch.step(SIM_TICK_MS, 0, (280, 30), ProjectilePool())
+    assert fired == 1
+    assert batch.ready.tolist() == [False, True]
+    assert blocked.last_shot == -10000 and clear.last_shot == 0
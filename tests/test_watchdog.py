@@ -0,0 +1,66 @@
+import time
+import pycache_init  # must import first to set sys.pycache_prefix
+
+from game import watchdog
+from game.watchdog import HitchWatchdog, short_stack
+
+
+def slow_save(ms):
+    time.sleep(ms / 1000.0)
+
+
+def run_frames(dog, where, frames, hitch_at=None, hitch_ms=0):
+    for i in range(frames):
+        dog.beat(where)
+        if i == hitch_at:
+            slow_save(hitch_ms)
+        else:
+            time.sleep(0.002)
+    dog.beat(where)
+
+
+def test_hitch_sampled_and_logged():
+    lines = []
+    dog = HitchWatchdog(threshold_ms=20, sample_ms=1, log=lines.append).start()
+    try:
+        run_frames(dog, 'Game.run', 10, hitch_at=4, hitch_ms=120)
+        time.sleep(0.02)
+    finally:
+        dog.stop()
+
+    assert len(dog.hitches) == 1
+    hitch = dog.hitches[0]
+    assert hitch.where == 'Game.run'
+    assert 100 <= hitch.duration_ms < 400
+    stack, n = hitch.worst()
+    assert 'test_watchdog.py:slow_save' in stack and n > 0
+    assert len(lines) == 1 and lines[0].startswith('[Hitch] Game.run')
+    assert 'slow_save' in lines[0]
+
+    (top, count), = dog.worst_offenders(1)
+    assert top == stack and count == n
+    report = dog.report()
+    assert 'Game.run=1' in report and 'slow_save' in report
+
+
+def test_short_frames_are_not_hitches():
+    dog = HitchWatchdog(threshold_ms=50, sample_ms=1, log=None).start()
+    try:
+        run_frames(dog, 'StartMenu.run', 20)
+    finally:
+        dog.stop()
+    assert dog.hitches == []
+    assert '没有超过 50 ms' in dog.report()
+
+
+def test_short_stack_leaf_first():
+    assert short_stack('a;b;c;d;e;f', frames=3) == 'f <- e <- d'
+
+
+def test_module_switch():
+    assert watchdog.stop() is None
+    watchdog.beat('noop')
+    dog = watchdog.start(threshold_ms=1000, log=None)
+    watchdog.beat('x')
+    assert dog._beat[1] == 'x'
+    assert watchdog.stop() is dog
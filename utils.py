@@ -8,6 +8,8 @@ import os
 import sys
 import shutil
 
+import numpy as np
+
 
 def setup_pycache_path():
     """
@@ -108,3 +110,263 @@ def aim_info(src, tgt, fallback_dir=(1, 0)):
         flip = True
 
     return dx, dy, angle, flip
+
+
+def vecs_from_points(ax, ay, bx, by):
+    """
+    `vec_from_points` 的数组版本：起点/终点坐标为等长数组（或可广播的标量）。
+
+    Returns:
+        (dx, dy, dist) 三个数组；距离为 0 的行方向与距离均为 0
+    """
+    ddx = np.asarray(bx, dtype=np.float64) - np.asarray(ax, dtype=np.float64)
+    ddy = np.asarray(by, dtype=np.float64) - np.asarray(ay, dtype=np.float64)
+    dist = np.hypot(ddx, ddy)
+    zero = dist == 0
+    safe = np.where(zero, 1.0, dist)
+    return np.where(zero, 0.0, ddx / safe), np.where(zero, 0.0, ddy / safe), dist
+
+
+def distances(x1, y1, x2, y2):
+    """`distance` 的数组版本：返回每对点之间的欧几里得距离数组。"""
+    return np.hypot(np.asarray(x2, dtype=np.float64) - x1, np.asarray(y2, dtype=np.float64) - y1)
+
+
+def aim_infos(sx, sy, tx, ty, fallback_dir=(1, 0)):
+    """
+    `aim_info` 的数组版本。
+
+    Args:
+        sx, sy / tx, ty: 起点与目标坐标数组（或可广播的标量）
+        fallback_dir: 起点与目标重合时使用的方向；可为单个 (x, y) 或形如 (n, 2) 的逐行方向
+
+    Returns:
+        (dx, dy, angle_deg, flip) 四个数组，约定与 `aim_info` 相同
+    """
+    dx, dy, dist = vecs_from_points(sx, sy, tx, ty)
+    zero = dist == 0
+    if zero.any():
+        fb = np.asarray(fallback_dir, dtype=np.float64)
+        fx, fy = fb[..., 0], fb[..., 1]
+        mag = np.hypot(fx, fy)
+        safe = np.where(mag == 0, 1.0, mag)
+        dx = np.where(zero, fx / safe, dx)
+        dy = np.where(zero, fy / safe, dy)
+
+    # y 轴向下，渲染时采用 atan2(-dy, dx) 以获得与贴图翻转一致的角度
+    angle = np.degrees(np.arctan2(-dy, dx))
+    low = angle < -90
+    high = angle > 90
+    angle = np.where(low, angle + 180, np.where(high, angle - 180, angle))
+    return dx, dy, angle, low | high
+
+
+def segment_aabb_entry(x0, y0, x1, y1, left, top, right, bottom):
+    """
+    线段与轴对齐矩形的相交检测（slab 法）。
+
+    Args:
+        x0, y0: 线段起点
+        x1, y1: 线段终点
+        left, top, right, bottom: 矩形边界
+
+    Returns:
+        线段首次进入矩形时的参数 t（0~1，起点已在矩形内时为 0），不相交返回 None
+    """
+    t_enter = 0.0
+    t_exit = 1.0
+    for p, d, lo, hi in ((x0, x1 - x0, left, right), (y0, y1 - y0, top, bottom)):
+        if d == 0:
+            if p < lo or p > hi:
+                return None
+            continue
+        ta = (lo - p) / d
+        tb = (hi - p) / d
+        if ta > tb:
+            ta, tb = tb, ta
+        if ta > t_enter:
+            t_enter = ta
+        if tb < t_exit:
+            t_exit = tb
+        if t_enter > t_exit:
+            return None
+    return t_enter
+
+
+def segment_aabb_entries(x0, y0, x1, y1, left, top, right, bottom):
+    """
+    `segment_aabb_entry` 的数组版本：参数按 NumPy 规则广播（例如线段取 (k, 1)、矩形取 (n,) 得到 k×n 的结果）。
+
+    Returns:
+        线段首次进入矩形时的参数 t 数组，不相交处为 inf
+    """
+    x0 = np.asarray(x0, dtype=np.float64)
+    y0 = np.asarray(y0, dtype=np.float64)
+    t_enter = np.zeros(())
+    t_exit = np.ones(())
+    ok = np.ones((), dtype=bool)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for p, d, lo, hi in ((x0, np.asarray(x1) - x0, left, right), (y0, np.asarray(y1) - y0, top, bottom)):
+            still = d == 0
+            ok = ok & (~still | ((p >= lo) & (p <= hi)))
+            ta = (lo - p) / d
+            tb = (hi - p) / d
+            near = np.where(still, 0.0, np.minimum(ta, tb))
+            far = np.where(still, 1.0, np.maximum(ta, tb))
+            t_enter = np.maximum(t_enter, near)
+            t_exit = np.minimum(t_exit, far)
+    return np.where(ok & (t_enter <= t_exit), t_enter, np.inf)
+
+
+def segment_aabb_hits(x0, y0, x1, y1, left, top, right, bottom):
+    """
+    `segment_aabb_entry` 的数组版本：x0/y0/x1/y1 为等长数组，矩形为标量。
+
+    Returns:
+        布尔数组，表示每条线段是否与矩形相交
+    """
+    return np.isfinite(segment_aabb_entries(x0, y0, x1, y1, left, top, right, bottom))
+
+
+def in_arc(dx, dy, facing, half_arc_cos):
+    """
+    判断相对向量 (dx, dy) 是否落在以 `facing` 为中心的扇形角度内。
+
+    Args:
+        dx, dy: 目标相对扇形顶点的偏移
+        facing: (fx, fy) 扇形中心方向（单位向量）
+        half_arc_cos: 半张角的余弦；<= -1 表示整圆
+
+    Returns:
+        是否在扇形角度内（与顶点重合视为在内）
+    """
+    if half_arc_cos <= -1:
+        return True
+    dist = math.hypot(dx, dy)
+    if dist == 0:
+        return True
+    return (dx * facing[0] + dy * facing[1]) >= half_arc_cos * dist
+
+
+def arc_mask(dx, dy, facing, half_arc_cos):
+    """`in_arc` 的数组版本：dx/dy 为等长数组，返回布尔数组。"""
+    dx = np.asarray(dx, dtype=np.float64)
+    dy = np.asarray(dy, dtype=np.float64)
+    if half_arc_cos <= -1:
+        return np.ones(dx.shape, dtype=bool)
+    dist = np.hypot(dx, dy)
+    return (dist == 0) | ((dx * facing[0] + dy * facing[1]) >= half_arc_cos * dist)
+
+
+def arc_half_cos(arc_deg):
+    """扇形总张角（度）-> 半张角余弦；张角 >= 360 时返回 -1 表示整圆。"""
+    if arc_deg is None or arc_deg >= 360:
+        return -1.0
+    return math.cos(math.radians(max(0.0, arc_deg) * 0.5))
+
+
+# 黄金角（弧度）：完全重合的点按下标取不同的推开方向
+_GOLDEN_ANGLE = math.pi * (3 - math.sqrt(5))
+
+
+def grid_pairs(qx, qy, x, y, cell):
+    """
+    均匀网格候选对：返回查询点 (qx, qy) 与点集 (x, y) 中落在查询点所在格及周围 8 格内的全部 (i, j)，
+    i 为查询点下标、j 为点集下标，按 (格偏移, i) 分组、组内按格键排序。
+
+    点集按边长为 `cell` 的格子排序，对每个偏移用 searchsorted 一次性找出所有查询点在排序数组中的区间并展开，
+    整个查询只有 9 次数组级循环，开销与候选对数成正比。两点中心在两轴上都相距小于 `cell` 时一定是候选，
+    精确条件由调用方再过滤。
+
+    Returns:
+        (i, j) 两个下标数组
+    """
+    qx = np.asarray(qx, dtype=np.float64)
+    qy = np.asarray(qy, dtype=np.float64)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if len(qx) == 0 or len(x) == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    gx = np.floor(x / cell).astype(np.int64)
+    gy = np.floor(y / cell).astype(np.int64)
+    qgx = np.floor(qx / cell).astype(np.int64)
+    qgy = np.floor(qy / cell).astype(np.int64)
+    # 平移到从 1 开始，相邻格的键不会越界或与别的格重叠
+    mx = min(gx.min(), qgx.min()) - 1
+    my = min(gy.min(), qgy.min()) - 1
+    gx -= mx
+    gy -= my
+    qgx -= mx
+    qgy -= my
+    span = int(max(gy.max(), qgy.max())) + 2
+    key = gx * span + gy
+    order = np.argsort(key, kind='stable')
+    skey = key[order]
+    base = qgx * span + qgy
+    rows = np.arange(len(qx))
+    pi, pj = [], []
+    for ox in (-1, 0, 1):
+        for oy in (-1, 0, 1):
+            k = base + (ox * span + oy)
+            lo = np.searchsorted(skey, k, 'left')
+            cnt = np.searchsorted(skey, k, 'right') - lo
+            total = int(cnt.sum())
+            if total == 0:
+                continue
+            # 第 m 个候选在排序数组中的位置：所属行的区间起点 + 行内序号
+            start = np.cumsum(cnt) - cnt
+            pos = np.arange(total) + np.repeat(lo - start, cnt)
+            pi.append(np.repeat(rows, cnt))
+            pj.append(order[pos])
+    if not pi:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    return np.concatenate(pi), np.concatenate(pj)
+
+
+def neighbor_pairs(x, y, radius, rows=None):
+    """
+    均匀网格邻居查询：返回距离小于 `radius` 的全部有序点对 (i, j)，i 取自 `rows`（缺省全部点），i != j。
+
+    以 `rows` 为查询点、全部点为点集做一次 `grid_pairs`（格边长取 `radius`），再按距离过滤。
+
+    Returns:
+        (i, j) 两个下标数组
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    rows = np.arange(n) if rows is None else np.asarray(rows, dtype=np.intp)
+    if n < 2 or len(rows) == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    qi, j = grid_pairs(x[rows], y[rows], x, y, radius)
+    i = rows[qi]
+    keep = (i != j) & ((x[i] - x[j]) ** 2 + (y[i] - y[j]) ** 2 < radius * radius)
+    return i[keep], j[keep]
+
+
+def separation_pushes(x, y, radius, rows=None):
+    """
+    分离转向：每个点受半径内邻居的排斥，权重随距离线性衰减（重合为 1，距离 radius 为 0）。
+
+    Args:
+        rows: 需要计算排斥的点（缺省全部）；邻居始终取全部点
+
+    Returns:
+        (px, py) 与输入等长的排斥向量之和；不在 `rows` 中的点为 0
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    i, j = neighbor_pairs(x, y, radius, rows)
+    if len(i) == 0:
+        return np.zeros(n), np.zeros(n)
+    dx = x[i] - x[j]
+    dy = y[i] - y[j]
+    d = np.hypot(dx, dy)
+    zero = d == 0
+    safe = np.where(zero, 1.0, d)
+    ang = i * _GOLDEN_ANGLE
+    w = 1.0 - d / radius
+    ux = np.where(zero, np.cos(ang), dx / safe) * w
+    uy = np.where(zero, np.sin(ang), dy / safe) * w
+    return np.bincount(i, weights=ux, minlength=n), np.bincount(i, weights=uy, minlength=n)